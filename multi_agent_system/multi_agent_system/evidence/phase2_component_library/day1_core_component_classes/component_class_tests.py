@@ -138,6 +138,94 @@ class TestEnhancedSource:
         is_valid = await source.validate_configuration()
         assert not is_valid
     
+    @pytest.mark.asyncio
+    async def test_chunked_file_source_and_rate_limiting(self):
+        """Test chunked file reads keep order, skip bad lines and respect the token bucket"""
+        import time
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            records = [{"id": i, "name": f"user_{i}", "score": i * 0.5} for i in range(50000)]
+            lines = [json.dumps(record) for record in records]
+            lines[1000:1000] = ["", "{not json"]
+            file_path = Path(temp_dir) / "input.jsonl"
+            file_path.write_text("\n".join(lines) + "\n")
+            
+            def file_source(**requirements):
+                return EnhancedSource(ComponentConfiguration(
+                    name="file_source",
+                    component_type="file_source",
+                    service_type="file_source",
+                    base_type="Source",
+                    outputs={"file_data": {"schema": {"type": "object"}}},
+                    environment_variables={"file_path": str(file_path)},
+                    resource_requirements=requirements
+                ))
+            
+            # Unthrottled batches: small chunks split lines across reads, loop stays responsive
+            source = file_source(throttle=False, read_chunk_size=64 * 1024, batch_size=500)
+            await source.initialize()
+            await source.start()
+            
+            max_lag = 0.0
+            async def ticker():
+                nonlocal max_lag
+                while True:
+                    before = time.perf_counter()
+                    await asyncio.sleep(0.001)
+                    max_lag = max(max_lag, time.perf_counter() - before - 0.001)
+            ticker_task = asyncio.create_task(ticker())
+            
+            start = time.perf_counter()
+            received = []
+            async for batch in source.generate_batches():
+                assert 0 < len(batch) <= 500
+                received.extend(batch)
+            elapsed = time.perf_counter() - start
+            ticker_task.cancel()
+            await source.stop()
+            
+            assert received == records
+            assert source.generation_errors == 1
+            assert source.bytes_read == file_path.stat().st_size
+            print(f"File source throughput: {len(received) / elapsed:,.0f} records/s, "
+                  f"{source.bytes_read / elapsed / 1e6:.1f} MB/s, max loop lag {max_lag * 1000:.1f}ms")
+            
+            # Throttled per-record reads: ~1000 records at 2000/s take about half a second
+            source = file_source(generation_rate=2000, max_records=1000)
+            await source.initialize()
+            await source.start()
+            start = time.perf_counter()
+            received = [data async for data in source.generate_data()]
+            elapsed = time.perf_counter() - start
+            await source.stop()
+            
+            assert received == records[:1000]
+            assert 0.35 < elapsed < 2.0
+            assert source.rate_limiter.total_wait_time > 0
+    
+    def test_file_chunk_with_multi_value_line(self):
+        """Test a line holding several JSON values is rejected rather than shifting records"""
+        import io
+        
+        source = EnhancedSource(ComponentConfiguration(
+            name="file_source",
+            component_type="file_source",
+            service_type="file_source",
+            base_type="Source",
+            outputs={"file_data": {"schema": {"type": "object"}}},
+            environment_variables={"file_path": "unused.jsonl"}
+        ))
+        chunk = io.BytesIO(b'{"id": 1}\n1, 2\n{"id": 2}\n')
+        records, errors, remainder, _, _ = source._read_file_chunk(chunk, b"")
+        assert records == [{"id": 1}, {"id": 2}]
+        assert errors == 1 and remainder == b""
+        
+        # Two values on one line and one value split over two lines keep the count equal
+        chunk = io.BytesIO(b'{"a": 1}, {"b": 2}\n{"c": [{"x": 1}\n{"y": 2}]}\n{"id": 3}\n')
+        records, errors, _, _, _ = source._read_file_chunk(chunk, b"")
+        assert records == [{"id": 3}]
+        assert errors == 3
+    
     def test_wrong_base_type(self):
         """Test source with wrong base type"""
         config = ComponentConfiguration(
@@ -249,6 +337,89 @@ class TestEnhancedTransformer:
         transformer = EnhancedTransformer(config)
         is_valid = await transformer.validate_configuration()
         assert not is_valid
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_and_native_batch_transforms(self):
+        """Test batch paths keep order, isolate failing records and overlap I/O"""
+        import time
+        
+        # Data processor: native batch split across a process pool, bad record isolated
+        transformer = EnhancedTransformer(ComponentConfiguration(
+            name="batch_processor",
+            component_type="data_processor",
+            service_type="data_processor",
+            base_type="Transformer",
+            inputs={"input_data": {"schema": {"type": "object", "required": ["id"]}}},
+            outputs={"processed_data": {"schema": {"type": "object"}}},
+            validation_config={"transformation_logic": {"type": "uppercase_strings"}},
+            resource_requirements={"batch_size": 1000, "process_pool_workers": 2, "offload_min_records": 100}
+        ))
+        await transformer.initialize()
+        await transformer.start()
+        
+        batch = [{"id": i, "name": f"user_{i}"} for i in range(500)]
+        batch[250] = {"name": "no id"}
+        results = await transformer.transform_batch(batch, return_exceptions=True)
+        assert len(results) == 500
+        assert isinstance(results[250], ComponentOperationError)
+        assert [result["processed_data"]["name"] for i, result in enumerate(results) if i != 250] == \
+            [f"USER_{i}" for i in range(500) if i != 250]
+        assert transformer.records_processed == 499 and transformer.processing_errors == 1
+        assert transformer.batches_processed == 1
+        
+        with pytest.raises(ComponentOperationError, match="1 of 3 records"):
+            await transformer.transform_batch([{"id": 1}, {}, {"id": 2}])
+        assert transformer.records_processed == 501
+        
+        # Custom native batch handler replaces the built-in one
+        async def doubled(records):
+            return [{"processed_data": {"id": record["id"] * 2}} for record in records]
+        transformer.register_batch_handler("data_processor", doubled)
+        assert await transformer.transform_batch([{"id": 1}, {"id": 2}]) == [
+            {"processed_data": {"id": 2}}, {"processed_data": {"id": 4}}
+        ]
+        await transformer.stop()
+        assert (await transformer.health_check())["process_pool_active"] is False
+        
+        # Web service: I/O-bound records overlap up to max_concurrency
+        def web_service(max_concurrency):
+            return EnhancedTransformer(ComponentConfiguration(
+                name="batch_web_service",
+                component_type="web_service",
+                service_type="web_service",
+                base_type="Transformer",
+                inputs={"request_data": {"schema": {"type": "object"}}},
+                outputs={"response_data": {"schema": {"type": "object"}}},
+                resource_requirements={"port": 8080, "batch_size": 100, "max_concurrency": max_concurrency}
+            ))
+        
+        async def timed_batch(transformer):
+            original = transformer._transform_web_service
+            async def slow_upstream(input_data):
+                await asyncio.sleep(0.02)  # Simulated upstream call
+                if input_data.get("fail"):
+                    raise ConnectionError("upstream refused")
+                return await original(input_data)
+            transformer._transform_web_service = slow_upstream
+            
+            await transformer.initialize()
+            await transformer.start()
+            batch = [{"request_data": {"n": i}, "fail": i == 7} for i in range(50)]
+            start = time.perf_counter()
+            results = await transformer.transform_batch(batch, return_exceptions=True)
+            elapsed = time.perf_counter() - start
+            await transformer.stop()
+            
+            assert isinstance(results[7], ComponentOperationError) and "upstream refused" in str(results[7])
+            assert [result["response_data"]["result"]["n"] for i, result in enumerate(results) if i != 7] == \
+                [i for i in range(50) if i != 7]
+            return elapsed
+        
+        serial_time = await timed_batch(web_service(1))
+        concurrent_time = await timed_batch(web_service(10))
+        print(f"Web service batch of 50 (20ms each): serial {serial_time * 1000:.0f}ms, "
+              f"concurrency 10 {concurrent_time * 1000:.0f}ms")
+        assert concurrent_time < serial_time / 3
 
 
 class TestEnhancedSink:
@@ -325,6 +496,175 @@ class TestEnhancedSink:
             stored_data = json.loads(content.strip())
             assert stored_data == test_data
     
+    @pytest.mark.asyncio
+    async def test_batched_file_and_database_writes(self):
+        """Test batches reach the backend whole and outperform per-record stores"""
+        import sqlite3
+        import time
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def file_sink(name, **requirements):
+                return EnhancedSink(ComponentConfiguration(
+                    name=name,
+                    component_type="file_output",
+                    service_type="file_output",
+                    base_type="Sink",
+                    inputs={"data_to_write": {"schema": {"type": "object", "required": ["id"]}}},
+                    environment_variables={"output_path": str(Path(temp_dir) / f"{name}.jsonl")},
+                    resource_requirements={"storage_format": "json", **requirements}
+                ))
+            
+            records = [{"id": i, "name": f"user_{i}", "score": i * 0.5, "tags": ["a", "b"]} for i in range(20000)]
+            
+            # One buffer per batch (offloaded above offload_min_records), invalid records skipped
+            sink = file_sink("batched")
+            await sink.initialize()
+            await sink.start()
+            stored = await sink.store_batch(records[:100] + [{"missing": "id"}] + records[100:150])
+            assert stored == 150
+            assert sink.batches_written == 1 and sink.records_stored == 150 and sink.storage_errors == 1
+            await sink.store_batch(records[150:160])
+            await sink.stop()
+            lines = (Path(temp_dir) / "batched.jsonl").read_text().splitlines()
+            assert [json.loads(line) for line in lines] == records[:160]
+            assert sink.total_bytes_stored == (Path(temp_dir) / "batched.jsonl").stat().st_size
+            
+            # Size-based flush policy keeps small batches buffered until the threshold
+            sink = file_sink("buffered", flush_bytes=64 * 1024)
+            await sink.initialize()
+            await sink.start()
+            await sink.store_batch(records[:10])
+            assert sink.unflushed_bytes > 0
+            assert (Path(temp_dir) / "buffered.jsonl").stat().st_size == 0
+            await sink.store_batch(records[10:2000])
+            assert sink.unflushed_bytes == 0
+            await sink.stop()
+            
+            # SQLite database sink inserts the batch with multi-row INSERTs
+            db_path = Path(temp_dir) / "sink.db"
+            sink = EnhancedSink(ComponentConfiguration(
+                name="db_sink",
+                component_type="database",
+                service_type="database",
+                base_type="Sink",
+                inputs={"data_to_store": {"schema": {"type": "object"}}},
+                environment_variables={"database_url": f"sqlite:///{db_path}", "table_name": "events"}
+            ))
+            await sink.initialize()
+            await sink.start()
+            assert await sink.store_batch(records[:1000]) == 1000
+            await sink.stop()
+            with sqlite3.connect(db_path) as connection:
+                rows = connection.execute("SELECT record FROM events ORDER BY rowid").fetchall()
+            assert [json.loads(row[0]) for row in rows] == records[:1000]
+            
+            # JSONL benchmark: per-record store() vs store_batch() of 1000 records
+            sink = file_sink("per_record")
+            await sink.initialize()
+            await sink.start()
+            start = time.perf_counter()
+            for record in records:
+                await sink.store(record)
+            per_record_rate = len(records) / (time.perf_counter() - start)
+            await sink.stop()
+            
+            sink = file_sink("batch_benchmark")
+            await sink.initialize()
+            await sink.start()
+            start = time.perf_counter()
+            for i in range(0, len(records), 1000):
+                await sink.store_batch(records[i:i + 1000])
+            batch_rate = len(records) / (time.perf_counter() - start)
+            await sink.stop()
+            
+            print(f"JSONL sink throughput: store() {per_record_rate:,.0f} records/s, "
+                  f"store_batch() {batch_rate:,.0f} records/s ({batch_rate / per_record_rate:.1f}x)")
+            # Measured 3.5-3.9x, not an order of magnitude: JSON encoding (~5µs per record)
+            # is paid on both paths and caps store_batch() near 190k records/s
+            assert batch_rate > per_record_rate * 2
+            
+            # A timer flush on the writer thread holds back inline writes until it finishes
+            sink = file_sink("ordered", flush_bytes=64 * 1024)
+            await sink.initialize()
+            await sink.start()
+            events = []
+            flush_file, write_file_buffer = sink._flush_file, sink._write_file_buffer
+            
+            def slow_flush():
+                time.sleep(0.05)
+                events.append("flush")
+                flush_file()
+            
+            def record_write(batch):
+                events.append("write")
+                return write_file_buffer(batch)
+            
+            sink._write_file_buffer = record_write
+            flush = asyncio.create_task(sink._run_on_writer_thread(slow_flush))
+            await asyncio.sleep(0)
+            await sink.store_batch(records[:5])
+            await flush
+            assert events == ["flush", "write"]
+            await sink.stop()
+    
+    @pytest.mark.asyncio
+    async def test_message_queue_batch_keeps_record_shape(self):
+        """Test batched queue writes publish one message per record"""
+        sink = EnhancedSink(ComponentConfiguration(
+            name="test_queue_batch",
+            component_type="message_queue",
+            service_type="message_queue",
+            base_type="Sink",
+            inputs={"message_data": {"schema": {"type": "object"}}},
+            validation_config={"queue_config": {"type": "redis", "queue_name": "events"}}
+        ))
+        await sink.initialize()
+        await sink.start()
+        
+        published = []
+        store_to_queue = sink._store_to_queue
+        
+        async def record_publish(data):
+            published.append(data)
+            return await store_to_queue(data)
+        
+        sink._store_to_queue = record_publish
+        records = [{"id": i} for i in range(5)]
+        assert await sink.store_batch(records) == 5
+        assert published == records
+        assert sink.batches_written == 1
+        await sink.stop()
+    
+    @pytest.mark.asyncio
+    async def test_message_queue_batch_counts_only_failed_records(self):
+        """Test a record the queue refuses fails alone instead of failing its batch"""
+        sink = EnhancedSink(ComponentConfiguration(
+            name="test_queue_partial",
+            component_type="message_queue",
+            service_type="message_queue",
+            base_type="Sink",
+            inputs={"message_data": {"schema": {"type": "object"}}},
+            validation_config={"queue_config": {"type": "redis", "queue_name": "events"}}
+        ))
+        await sink.initialize()
+        await sink.start()
+        
+        store_to_queue = sink._store_to_queue
+        
+        async def refuse_third(data):
+            if data["id"] == 2:
+                raise ComponentOperationError("queue refused the message")
+            return await store_to_queue(data)
+        
+        sink._store_to_queue = refuse_third
+        assert await sink.store_batch([{"id": i} for i in range(5)]) == 4
+        assert sink.records_stored == 4 and sink.storage_errors == 1
+        
+        with pytest.raises(ComponentOperationError):
+            await sink.store({"id": 2})
+        assert sink.records_stored == 4 and sink.storage_errors == 2
+        await sink.stop()
+    
     @pytest.mark.asyncio
     async def test_api_output_validation(self):
         """Test API output sink configuration validation"""
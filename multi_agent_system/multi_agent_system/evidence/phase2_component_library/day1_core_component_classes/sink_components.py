@@ -12,6 +12,15 @@ Supported V5.0 Service Types:
 - message_queue: Message queue output sink
 
 All sink components map to Phase 2 base type: Sink
+
+Writes are batched end to end: store_batch() and flushes of pending
+records hand the whole batch to the backend, and metrics are updated once
+per batch. Files get one encoded buffer per batch and databases a
+multi-row INSERT; API and queue backends keep one record per
+request/message (API requests share one session) and report failures
+per record, so one refused record does not fail the batch. Large file and
+database batches, and timer flushes that follow them, run off the event
+loop on a single writer thread, which keeps writes in order.
 """
 
 from enhanced_base import (
@@ -19,13 +28,20 @@ from enhanced_base import (
     ComponentInitializationError, ComponentOperationError, ConfigurationValidator
 )
 from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import json
+import os
+import sqlite3
 import time
 from pathlib import Path
 import hashlib
 
 
+# One shared encoder instead of the per-call setup of json.dumps (same output as json.dumps)
+_encode_json_line = json.JSONEncoder().encode
+
+
 class EnhancedSink(EnhancedBaseComponent):
     """Enhanced Sink component for V5.0 data output"""
     
@@ -41,6 +57,11 @@ class EnhancedSink(EnhancedBaseComponent):
         self.batch_size = self.get_resource_requirement("batch_size", 1)
         self.flush_interval = self.get_resource_requirement("flush_interval", 5.0)
         
+        # Write path configuration
+        self.flush_bytes = self.get_resource_requirement("flush_bytes", 0)  # 0: flush file after every write
+        self.fsync_policy = self.get_resource_requirement("fsync", "none")  # none, flush
+        self.offload_min_records = self.get_resource_requirement("offload_min_records", 64)
+        
         # Sink state tracking
         self.records_stored = 0
         self.storage_errors = 0
@@ -52,8 +73,16 @@ class EnhancedSink(EnhancedBaseComponent):
         self.connection_established = False
         self.file_handle = None
         self.database_connected = False
+        self.database_connection = None
         self.api_endpoint_validated = False
         
+        # Batched write state
+        self.batches_written = 0
+        self.unflushed_bytes = 0
+        self.last_flush_time = time.time()
+        self._writer_executor: Optional[ThreadPoolExecutor] = None
+        self._offloaded_writes = 0
+        
         self.logger.info(f"💾 Enhanced Sink '{self.name}' created (service_type: {self.service_type})")
     
     async def initialize(self) -> None:
@@ -98,8 +127,8 @@ class EnhancedSink(EnhancedBaseComponent):
         self.is_running = True
         self.startup_time = time.time()
         
-        # Start flush timer if using batching
-        if self.batch_size > 1:
+        # Start flush timer if using batching or size-based file flushing
+        if self.batch_size > 1 or self.flush_bytes > 0:
             asyncio.create_task(self._flush_timer())
         
         self.logger.info(f"🚀 Enhanced Sink '{self.name}' started")
@@ -147,16 +176,30 @@ class EnhancedSink(EnhancedBaseComponent):
         if not self.is_running:
             raise ComponentOperationError(f"Sink '{self.name}' not running")
         
-        stored_count = 0
+        # Validate records up front; invalid ones are skipped
+        valid_records = [data for data in data_batch if self._validate_input_schema(data)]
         
-        for data in data_batch:
-            try:
-                await self.store(data)
-                stored_count += 1
-            except Exception as e:
-                self.logger.error(f"Failed to store record in batch: {e}")
+        invalid_count = len(data_batch) - len(valid_records)
+        if invalid_count:
+            self.storage_errors += invalid_count
+            self.logger.error(f"Failed to store {invalid_count} records in batch: input data doesn't match schema for '{self.name}'")
+        
+        if not valid_records:
+            return 0
         
-        return stored_count
+        try:
+            if self.batch_size > 1:
+                self.pending_records.extend(valid_records)
+                if len(self.pending_records) >= self.batch_size:
+                    await self._flush_pending_records()
+                return len(valid_records)
+            stored = await self._write_batch(valid_records)
+            self.storage_errors += len(valid_records) - stored
+            return stored
+        except Exception as e:
+            self.storage_errors += len(valid_records)
+            self.logger.error(f"❌ Batch storage failed for '{self.name}': {e}")
+            return 0
     
     async def health_check(self) -> Dict[str, Any]:
         """Return sink health status"""
@@ -172,6 +215,7 @@ class EnhancedSink(EnhancedBaseComponent):
             "storage_errors": self.storage_errors,
             "pending_records": len(self.pending_records),
             "total_bytes_stored": self.total_bytes_stored,
+            "batches_written": self.batches_written,
             "last_storage_time": self.last_storage_time
         }
         
@@ -255,7 +299,19 @@ class EnhancedSink(EnhancedBaseComponent):
         # Mock database connection test
         try:
             # In real implementation, would use actual database client
-            if "postgresql://" in db_url or "mysql://" in db_url or "sqlite:" in db_url:
+            if "postgresql://" in db_url or "mysql://" in db_url:
+                self.database_connected = True
+                self.logger.info(f"✅ Database connection test passed for '{self.name}'")
+            elif "sqlite:" in db_url:
+                # SQLite sinks store each record as a JSON document row
+                database_path = db_url.split("sqlite:", 1)[1].lstrip("/") or ":memory:"
+                if db_url.startswith("sqlite:////"):
+                    database_path = "/" + database_path
+                self.database_connection = sqlite3.connect(database_path, check_same_thread=False)
+                self.database_connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table_name} (record TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self.database_connection.commit()
                 self.database_connected = True
                 self.logger.info(f"✅ Database connection test passed for '{self.name}'")
             else:
@@ -340,48 +396,99 @@ class EnhancedSink(EnhancedBaseComponent):
         """Start storage operation"""
         self.logger.info(f"Starting storage for '{self.name}'")
         
+        if self.service_type in ("file_output", "database"):
+            # Single writer thread keeps batches in order
+            self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sink-{self.name}")
+        
         if self.service_type == "file_output":
-            # Open file handle for writing
+            # Open file handle for writing (encoded batches are written as bytes)
             output_path = self.get_environment_variable("output_path", required=True)
-            self.file_handle = open(output_path, 'a', encoding='utf-8')
+            self.file_handle = open(output_path, 'ab')
+            self.unflushed_bytes = 0
+            self.last_flush_time = time.time()
             self.logger.info(f"File handle opened for '{self.name}'")
     
     async def _stop_storage(self) -> None:
         """Stop storage operation"""
         self.logger.info(f"Stopping storage for '{self.name}'")
         
+        if self._writer_executor:
+            self._writer_executor.shutdown(wait=True)
+            self._writer_executor = None
+        
         if self.service_type == "file_output" and self.file_handle:
+            self._flush_file()
             self.file_handle.close()
             self.file_handle = None
             self.logger.info(f"File handle closed for '{self.name}'")
         elif self.service_type == "database":
             # Close database connection
+            if self.database_connection:
+                self.database_connection.close()
+                self.database_connection = None
             self.database_connected = False
             self.logger.info(f"Database connection closed for '{self.name}'")
     
     # Storage implementation methods
     async def _store_single_record(self, data: Dict[str, Any]) -> None:
         """Store a single record"""
+        if not await self._write_batch([data]):
+            raise ComponentOperationError(f"Record was not stored by '{self.name}'")
+    
+    async def _write_batch(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Hand a whole batch to the backend and update metrics once
+        
+        File and database batches succeed or raise as a whole; API and queue
+        backends report each record, so callers count only the records that
+        were not stored as storage errors.
+        
+        Returns:
+            Number of records stored
+        """
+        failed = 0
         if self.service_type == "database":
-            await self._store_to_database(data)
+            bytes_stored = await self._store_batch_to_database(records)
         elif self.service_type == "file_output":
-            await self._store_to_file(data)
-        elif self.service_type == "api_output":
-            await self._store_to_api(data)
-        elif self.service_type == "message_queue":
-            await self._store_to_queue(data)
+            bytes_stored = await self._store_batch_to_file(records)
+        elif self.service_type in ("api_output", "message_queue"):
+            if self.service_type == "api_output":
+                outcomes = await self._store_batch_to_api(records)
+            else:
+                outcomes = await self._store_batch_to_queue(records)
+            failed = outcomes.count(None)
+            bytes_stored = sum(size for size in outcomes if size is not None)
+        else:
+            bytes_stored = 0
         
-        self.records_stored += 1
+        stored = len(records) - failed
+        self.records_stored += stored
+        self.batches_written += 1
         self.last_storage_time = time.time()
-        
-        # Estimate bytes stored
-        data_str = json.dumps(data)
-        self.total_bytes_stored += len(data_str.encode('utf-8'))
+        self.total_bytes_stored += bytes_stored
         
         self.log_component_metrics({
             "records_stored": self.records_stored,
-            "total_bytes_stored": self.total_bytes_stored
+            "total_bytes_stored": self.total_bytes_stored,
+            "batch_records": len(records)
         })
+        return stored
+    
+    async def _run_writer(self, records: List[Dict[str, Any]], write, *args):
+        """Run a blocking write inline for small batches, on the writer thread otherwise"""
+        # Inline writes must not overtake (or race with) a batch still on the writer thread
+        if self._writer_executor is None or (len(records) < self.offload_min_records and not self._offloaded_writes):
+            return write(records, *args)
+        return await self._run_on_writer_thread(write, records, *args)
+    
+    async def _run_on_writer_thread(self, function, *args):
+        """Run a blocking call on the writer thread; inline writes queue behind it until it finishes"""
+        self._offloaded_writes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._writer_executor, function, *args)
+        finally:
+            self._offloaded_writes -= 1
     
     async def _flush_pending_records(self) -> None:
         """Flush pending records in batch"""
@@ -393,51 +500,133 @@ class EnhancedSink(EnhancedBaseComponent):
         
         self.logger.info(f"Flushing {len(batch)} pending records for '{self.name}'")
         
-        for record in batch:
-            await self._store_single_record(record)
+        stored = await self._write_batch(batch)
+        self.storage_errors += len(batch) - stored
     
     async def _flush_timer(self) -> None:
-        """Timer to flush pending records periodically"""
+        """Timer to flush pending records and buffered file output periodically"""
         while self.is_running:
             await asyncio.sleep(self.flush_interval)
             if self.pending_records:
                 await self._flush_pending_records()
+            if self.file_handle and self.unflushed_bytes:
+                if self._writer_executor:
+                    await self._run_on_writer_thread(self._flush_file)
+                else:
+                    self._flush_file()
     
     # Service-specific storage methods
-    async def _store_to_database(self, data: Dict[str, Any]) -> None:
-        """Store data to database"""
+    async def _store_batch_to_database(self, records: List[Dict[str, Any]]) -> int:
+        """Store a batch to the database as multi-row INSERTs"""
         if not self.database_connected:
             raise ComponentOperationError("Database not connected")
         
         table_name = self.get_environment_variable("table_name", "data_sink")
         
-        # Mock database insert
-        # In real implementation, would use actual database client
-        self.logger.debug(f"Storing to database table '{table_name}': {data}")
+        if self.database_connection is None:
+            # Mock database insert
+            # In real implementation, would use actual database client
+            rows = [json.dumps(record) for record in records]
+            self.logger.debug(f"Storing {len(rows)} rows to database table '{table_name}' in one INSERT")
+            return sum(len(row) for row in rows)
+        
+        return await self._run_writer(records, self._insert_rows, table_name)
+    
+    def _insert_rows(self, records: List[Dict[str, Any]], table_name: str) -> int:
+        """Insert records as multi-row INSERT statements in one transaction (writer thread)"""
+        rows_per_statement = 400  # 2 parameters per row, below SQLite's 999 variable limit
+        stored_at = time.time()
+        encoded = [_encode_json_line(record) for record in records]
+        
+        with self.database_connection:
+            for start in range(0, len(encoded), rows_per_statement):
+                chunk = encoded[start:start + rows_per_statement]
+                params = []
+                for row in chunk:
+                    params.append(row)
+                    params.append(stored_at)
+                values = ", ".join(["(?, ?)"] * len(chunk))
+                self.database_connection.execute(
+                    f"INSERT INTO {table_name} (record, stored_at) VALUES {values}", params
+                )
+        return sum(len(row) for row in encoded)
     
-    async def _store_to_file(self, data: Dict[str, Any]) -> None:
-        """Store data to file"""
+    async def _store_batch_to_file(self, records: List[Dict[str, Any]]) -> int:
+        """Store a batch to file as one encoded buffer"""
         if not self.file_handle:
             raise ComponentOperationError("File handle not open")
         
+        return await self._run_writer(records, self._write_file_buffer)
+    
+    def _write_file_buffer(self, records: List[Dict[str, Any]]) -> int:
+        """Encode a batch into one buffer, write it and apply the flush policy"""
         if self.storage_format == "json":
-            line = json.dumps(data) + "\n"
+            text = "\n".join(map(_encode_json_line, records))
         elif self.storage_format == "csv":
             # Simple CSV format - in real implementation would use csv module
-            line = ",".join(str(v) for v in data.values()) + "\n"
+            text = "\n".join(",".join(str(v) for v in data.values()) for data in records)
         else:
-            line = str(data) + "\n"
+            text = "\n".join(map(str, records))
+        buffer = (text + "\n").encode("utf-8")
+        
+        self.file_handle.write(buffer)
+        self.unflushed_bytes += len(buffer)
         
-        self.file_handle.write(line)
+        # Flush by size (or every write when flush_bytes is 0); the flush timer covers time
+        if self.unflushed_bytes >= self.flush_bytes:
+            self._flush_file()
+        return len(buffer)
+    
+    def _flush_file(self) -> None:
+        """Flush buffered file output, fsyncing if configured"""
+        if not self.file_handle:
+            return
         self.file_handle.flush()
+        if self.fsync_policy == "flush":
+            os.fsync(self.file_handle.fileno())
+        self.unflushed_bytes = 0
+        self.last_flush_time = time.time()
     
-    async def _store_to_api(self, data: Dict[str, Any]) -> None:
+    async def _store_batch_to_api(self, records: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Store a batch to the API endpoint, one request per record over a shared session
+        
+        Returns:
+            Bytes sent per record, None for records the endpoint did not take
+        """
+        import aiohttp
+        
+        outcomes = []
+        async with aiohttp.ClientSession() as session:
+            for data in records:
+                try:
+                    outcomes.append(await self._store_to_api(data, session))
+                except Exception as e:
+                    self.logger.error(f"❌ API storage failed for a record in '{self.name}': {e}")
+                    outcomes.append(None)
+        return outcomes
+    
+    async def _store_batch_to_queue(self, records: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Publish a batch to the message queue, one message per record
+        
+        Returns:
+            Bytes published per record, None for records that were not published
+        """
+        outcomes = []
+        for data in records:
+            try:
+                outcomes.append(await self._store_to_queue(data))
+            except Exception as e:
+                self.logger.error(f"❌ Queue publish failed for a record in '{self.name}': {e}")
+                outcomes.append(None)
+        return outcomes
+    
+    async def _store_to_api(self, data: Dict[str, Any], session) -> int:
         """Store data to API endpoint"""
         endpoint = self.get_environment_variable("endpoint", required=True)
         api_key = self.get_environment_variable("api_key")
         
-        import aiohttp
-        
         headers = {"Content-Type": "application/json"}
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
@@ -449,13 +638,14 @@ class EnhancedSink(EnhancedBaseComponent):
             "timestamp": time.time()
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(endpoint, json=payload, headers=headers, timeout=30) as response:
-                if response.status >= 400:
-                    response_text = await response.text()
-                    raise ComponentOperationError(f"API storage failed with status {response.status}: {response_text}")
+        body = json.dumps(payload)
+        async with session.post(endpoint, data=body, headers=headers, timeout=30) as response:
+            if response.status >= 400:
+                response_text = await response.text()
+                raise ComponentOperationError(f"API storage failed with status {response.status}: {response_text}")
+        return len(body)
     
-    async def _store_to_queue(self, data: Dict[str, Any]) -> None:
+    async def _store_to_queue(self, data: Dict[str, Any]) -> int:
         """Store data to message queue"""
         if not self.connection_established:
             raise ComponentOperationError("Message queue not connected")
@@ -478,6 +668,8 @@ class EnhancedSink(EnhancedBaseComponent):
             topic = queue_config.get("topic")
             # Mock Kafka publish
             self.logger.debug(f"Publishing to Kafka topic '{topic}': {message}")
+        
+        return len(json.dumps(message))
     
     # Utility methods
     def _extract_schema_from_inputs(self) -> Dict[str, Any]:
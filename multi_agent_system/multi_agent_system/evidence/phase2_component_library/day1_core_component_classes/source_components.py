@@ -12,19 +12,58 @@ Supported V5.0 Service Types:
 - stream_source: Real-time stream data source
 
 All source components map to Phase 2 base type: Source
+
+Generation is paced by a token bucket that only sleeps when the source
+is ahead of generation_rate ("throttle": False disables pacing). File
+sources read large chunks off the event loop, decode each chunk's lines
+in one pass over the joined text and can be consumed record by record
+(generate_data) or in batches (generate_batches).
 """
 
 from enhanced_base import (
     EnhancedBaseComponent, ComponentConfiguration, ComponentValidationError,
     ComponentInitializationError, ComponentOperationError, ConfigurationValidator
 )
-from typing import Dict, Any, AsyncGenerator, Optional, List
+from typing import Dict, Any, AsyncGenerator, Optional, List, Tuple
 import asyncio
 import json
 import time
 from pathlib import Path
 
 
+_decode_json_value = json.JSONDecoder().raw_decode
+
+
+class TokenBucket:
+    """Token bucket rate limiter that sleeps only when ahead of the rate"""
+    
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, (rate or 0) * 0.1)  # 100ms of burst
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.total_wait_time = 0.0
+    
+    @property
+    def unthrottled(self) -> bool:
+        return not self.rate or self.rate == float("inf")
+    
+    async def acquire(self, tokens: float = 1) -> None:
+        """Take tokens, sleeping just long enough to pay back any deficit"""
+        if self.unthrottled:
+            return
+        
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate) - tokens
+        self.last_refill = now
+        
+        # Requests larger than the bucket go into debt instead of waiting forever
+        if self.tokens < 0:
+            wait_time = -self.tokens / self.rate
+            self.total_wait_time += wait_time
+            await asyncio.sleep(wait_time)
+
+
 class EnhancedSource(EnhancedBaseComponent):
     """Enhanced Source component for V5.0 data ingestion"""
     
@@ -39,11 +78,17 @@ class EnhancedSource(EnhancedBaseComponent):
         self.generation_rate = self.get_resource_requirement("generation_rate", 1.0)
         self.max_records = self.get_resource_requirement("max_records", None)
         self.data_format = self.outputs.get("format", "json")
+        self.throttle = self.get_resource_requirement("throttle", True)
+        self.burst = self.get_resource_requirement("burst", None)
+        self.read_chunk_size = self.get_resource_requirement("read_chunk_size", 1024 * 1024)
+        self.batch_size = self.get_resource_requirement("batch_size", 1000)
+        self.rate_limiter = TokenBucket(self.generation_rate if self.throttle else None, self.burst)
         
         # Source state tracking
         self.records_generated = 0
         self.last_generation_time = None
         self.generation_errors = 0
+        self.bytes_read = 0
         
         self.logger.info(f"🔌 Enhanced Source '{self.name}' created (service_type: {self.service_type})")
     
@@ -74,7 +119,7 @@ class EnhancedSource(EnhancedBaseComponent):
             self.is_initialized = True
             self.health_status = "healthy"
             self.logger.info(f"✅ Enhanced Source '{self.name}' initialized successfully")
-            
+        
         except Exception as e:
             self.health_status = "failed"
             self.logger.error(f"❌ Failed to initialize Source '{self.name}': {e}")
@@ -120,6 +165,32 @@ class EnhancedSource(EnhancedBaseComponent):
             self.logger.error(f"❌ Data generation failed for '{self.name}': {e}")
             raise ComponentOperationError(f"Data generation failed: {e}") from e
     
+    async def generate_batches(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Generate data in batches, paced per batch (file sources read and decode in bulk)"""
+        if not self.is_running:
+            raise ComponentOperationError(f"Source '{self.name}' not running")
+        
+        try:
+            if self.service_type == "file_source":
+                async for batch in self._generate_file_batches():
+                    await self.rate_limiter.acquire(len(batch))
+                    yield batch
+            else:
+                batch = []
+                async for data in self.generate_data():
+                    batch.append(data)
+                    if len(batch) >= self.batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+        except ComponentOperationError:
+            raise
+        except Exception as e:
+            self.generation_errors += 1
+            self.logger.error(f"❌ Data generation failed for '{self.name}': {e}")
+            raise ComponentOperationError(f"Data generation failed: {e}") from e
+    
     async def health_check(self) -> Dict[str, Any]:
         """Return source health status"""
         health_data = {
@@ -133,7 +204,9 @@ class EnhancedSource(EnhancedBaseComponent):
             "generation_rate": self.generation_rate,
             "records_generated": self.records_generated,
             "generation_errors": self.generation_errors,
-            "last_generation_time": self.last_generation_time
+            "last_generation_time": self.last_generation_time,
+            "throttled": not self.rate_limiter.unthrottled,
+            "rate_limit_wait_time": self.rate_limiter.total_wait_time
         }
         
         # Service-type specific health checks
@@ -145,6 +218,7 @@ class EnhancedSource(EnhancedBaseComponent):
             health_data["file_path_configured"] = bool(file_path)
             if file_path:
                 health_data["file_exists"] = Path(file_path).exists()
+            health_data["bytes_read"] = self.bytes_read
         
         return health_data
     
@@ -188,7 +262,7 @@ class EnhancedSource(EnhancedBaseComponent):
                     return False
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Configuration validation failed: {e}")
             return False
@@ -198,7 +272,7 @@ class EnhancedSource(EnhancedBaseComponent):
         """Initialize generic data source"""
         self.logger.info(f"Initializing data source '{self.name}'")
         # Validate data generation parameters
-        if self.generation_rate <= 0:
+        if self.throttle and self.generation_rate <= 0:
             raise ComponentValidationError("Generation rate must be positive")
     
     async def _initialize_api_source(self) -> None:
@@ -284,7 +358,7 @@ class EnhancedSource(EnhancedBaseComponent):
             yield data
             
             # Control generation rate
-            await asyncio.sleep(1.0 / self.generation_rate)
+            await self.rate_limiter.acquire()
     
     async def _generate_api_source(self) -> AsyncGenerator[Dict[str, Any], None]:
         """Generate data from API source"""
@@ -319,29 +393,99 @@ class EnhancedSource(EnhancedBaseComponent):
     
     async def _generate_file_source(self) -> AsyncGenerator[Dict[str, Any], None]:
         """Generate data from file source"""
+        async for batch in self._generate_file_batches():
+            for data in batch:
+                if not self.is_running:
+                    return
+                await self.rate_limiter.acquire()
+                yield data
+    
+    async def _generate_file_batches(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Read the file in large chunks on a worker thread, one chunk ahead of the consumer"""
         file_path = self.get_environment_variable("file_path", required=True)
+        loop = asyncio.get_running_loop()
         
-        with open(file_path, 'r') as file:
-            for line in file:
-                if not self.is_running:
-                    break
-                if self.max_records and self.records_generated >= self.max_records:
-                    break
-                
-                try:
-                    if self.data_format == "json":
-                        data = json.loads(line.strip())
-                    else:
-                        data = {"content": line.strip()}
+        with open(file_path, 'rb') as file:
+            remainder = b""
+            pending = loop.run_in_executor(None, self._read_file_chunk, file, remainder)
+            try:
+                while True:
+                    records, errors, remainder, bytes_read, at_end = await pending
+                    if not at_end and self.is_running:
+                        pending = loop.run_in_executor(None, self._read_file_chunk, file, remainder)
                     
-                    self.records_generated += 1
-                    self.last_generation_time = time.time()
-                    yield data
+                    self.bytes_read += bytes_read
+                    if errors:
+                        self.generation_errors += errors
+                        self.logger.error(f"Failed to parse {errors} lines in '{file_path}'")
                     
-                    await asyncio.sleep(1.0 / self.generation_rate)
-                except Exception as e:
-                    self.generation_errors += 1
-                    self.logger.error(f"Failed to parse line: {e}")
+                    # Yield the chunk in batches
+                    for start in range(0, len(records), self.batch_size):
+                        if not self.is_running:
+                            return
+                        batch = records[start:start + self.batch_size]
+                        if self.max_records:
+                            remaining = self.max_records - self.records_generated
+                            if remaining <= 0:
+                                return
+                            batch = batch[:remaining]
+                        
+                        self.records_generated += len(batch)
+                        self.last_generation_time = time.time()
+                        yield batch
+                    
+                    if at_end or not self.is_running:
+                        return
+            finally:
+                # Never close the file under a read still running on the worker thread
+                if not pending.done():
+                    await asyncio.wait([pending])
+    
+    def _read_file_chunk(self, file, remainder: bytes) -> Tuple[List[Dict[str, Any]], int, bytes, int, bool]:
+        """Read one chunk, split it into complete lines and decode them in bulk (worker thread)"""
+        chunk = file.read(self.read_chunk_size)
+        at_end = not chunk
+        data = remainder + chunk
+        
+        if at_end:
+            lines, remainder = data.split(b"\n"), b""
+        else:
+            end = data.rfind(b"\n")
+            if end < 0:
+                # No complete line yet; keep reading
+                return [], 0, data, len(chunk), False
+            lines, remainder = data[:end].split(b"\n"), data[end + 1:]
+        lines = [line for line in lines if line]
+        
+        if self.data_format != "json":
+            return [{"content": line.decode("utf-8").strip()} for line in lines], 0, remainder, len(chunk), at_end
+        
+        # Decode all lines in one pass over the joined text. Every value must end at the
+        # next line break, so a line holding several values (e.g. "1, 2") or a value
+        # continued on the next line cannot shift records onto the wrong lines
+        try:
+            text = b"\n".join(lines).decode("utf-8")
+            records, position = [], 0
+            for _ in lines:
+                record, end = _decode_json_value(text, position)
+                if end < len(text) and text[end] != "\n":
+                    raise ValueError("line holds more than one JSON value")
+                records.append(record)
+                position = end + 1
+            return records, 0, remainder, len(chunk), at_end
+        except ValueError:
+            pass
+        
+        # Fall back to line by line to isolate bad lines
+        records, errors = [], 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                errors += 1
+        return records, errors, remainder, len(chunk), at_end
     
     async def _generate_stream_source(self) -> AsyncGenerator[Dict[str, Any], None]:
         """Generate data from stream source"""
@@ -365,7 +509,7 @@ class EnhancedSource(EnhancedBaseComponent):
             self.last_generation_time = time.time()
             yield data
             
-            await asyncio.sleep(1.0 / self.generation_rate)
+            await self.rate_limiter.acquire()
     
     def _extract_schema_from_outputs(self) -> Dict[str, Any]:
         """Extract schema from outputs configuration"""
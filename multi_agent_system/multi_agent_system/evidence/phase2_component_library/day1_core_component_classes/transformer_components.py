@@ -12,13 +12,20 @@ Supported V5.0 Service Types:
 - message_processor: Message processing transformer
 
 All transformer components map to Phase 2 base type: Transformer
+
+transform_batch() validates the batch with schema checks compiled once at
+construction and logs metrics once per batch. I/O-bound service types fan
+records out under a concurrency limit; CPU-bound ones use a native batch
+handler, optionally offloaded to a process pool. Output order is kept and
+a failing record never fails its neighbours.
 """
 
 from enhanced_base import (
     EnhancedBaseComponent, ComponentConfiguration, ComponentValidationError,
     ComponentInitializationError, ComponentOperationError, ConfigurationValidator
 )
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
 import json
 import time
@@ -26,6 +33,92 @@ from pathlib import Path
 import hashlib
 
 
+# Service types whose per-record work is mostly waiting on I/O
+IO_BOUND_SERVICE_TYPES = {"web_service"}
+
+BatchHandler = Callable[[List[Dict[str, Any]]], Awaitable[List[Any]]]
+
+
+def _transformation_logic(data: Dict[str, Any], transform_type: str, required_props: Tuple[str, ...],
+                          transformer_name: str) -> Dict[str, Any]:
+    """Apply a transformation type and fill in required output properties (picklable for worker processes)"""
+    if transform_type == "passthrough":
+        result = data
+    elif transform_type == "uppercase_strings":
+        result = {}
+        for key, value in data.items():
+            if isinstance(value, str):
+                result[key] = value.upper()
+            else:
+                result[key] = value
+    elif transform_type == "add_metadata":
+        result = {
+            **data,
+            "_metadata": {
+                "transformer": transformer_name,
+                "timestamp": time.time(),
+                "version": "1.0"
+            }
+        }
+    else:
+        result = data
+    
+    # If schema requires specific properties that aren't in the result, add them
+    for prop in required_props:
+        if prop not in result:
+            if prop == "result":
+                # Keep the transformed data as-is and add a "result" field with summary
+                result["result"] = "transformation_complete"
+            elif prop == "value" and "value" not in result:
+                # Try to find any data to map to "value"
+                if isinstance(data, dict) and "value" in data:
+                    result["value"] = data["value"]
+                elif isinstance(data, dict) and len(data) > 0:
+                    first_value = next(iter(data.values()))
+                    result["value"] = first_value
+                else:
+                    result["value"] = str(data)
+    
+    return result
+
+
+def _mock_prediction(input_data: Dict[str, Any]) -> Any:
+    """Generate mock ML prediction from the input hash"""
+    input_str = json.dumps(input_data, sort_keys=True)
+    hash_val = int(hashlib.md5(input_str.encode()).hexdigest()[:8], 16)
+    
+    # Return different prediction types based on hash
+    if hash_val % 3 == 0:
+        return {"class": "positive", "probability": 0.85}
+    elif hash_val % 3 == 1:
+        return {"class": "negative", "probability": 0.75}
+    else:
+        return {"class": "neutral", "probability": 0.65}
+
+
+def _transform_payloads(payloads: List[Dict[str, Any]], transform_type: str, required_props: Tuple[str, ...],
+                        transformer_name: str) -> List[Any]:
+    """Transform payloads, returning the exception in place of any record that fails"""
+    results = []
+    for payload in payloads:
+        try:
+            results.append(_transformation_logic(payload, transform_type, required_props, transformer_name))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _predict_payloads(payloads: List[Dict[str, Any]]) -> List[Any]:
+    """Run mock predictions, returning the exception in place of any record that fails"""
+    results = []
+    for payload in payloads:
+        try:
+            results.append(_mock_prediction(payload))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
 class EnhancedTransformer(EnhancedBaseComponent):
     """Enhanced Transformer component for V5.0 data processing"""
     
@@ -41,9 +134,26 @@ class EnhancedTransformer(EnhancedBaseComponent):
         self.transformation_logic = self.validation_config.get("transformation_logic", {}) if self.validation_config else {}
         self.processing_timeout = self.get_resource_requirement("processing_timeout", 30.0)
         self.batch_size = self.get_resource_requirement("batch_size", 1)
+        self.max_concurrency = self.get_resource_requirement("max_concurrency", 32)
+        self.process_pool_workers = self.get_resource_requirement("process_pool_workers", 0)
+        self.offload_min_records = self.get_resource_requirement("offload_min_records", 256)
+        
+        # Schema checks are compiled once and reused for every record
+        self._logic_required_props = tuple(self.output_schema.get("required", [])) if self.output_schema.get("type") == "object" else ()
+        self._check_input = self._compile_input_check()
+        self._check_output = self._compile_output_check()
+        
+        # Native batch implementations by service type (see register_batch_handler)
+        self.batch_handlers: Dict[str, BatchHandler] = {
+            "data_processor": self._transform_data_processor_batch,
+            "ml_model": self._transform_ml_model_batch,
+            "message_processor": self._transform_message_processor_batch
+        }
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         
         # Transformer state tracking
         self.records_processed = 0
+        self.batches_processed = 0
         self.processing_errors = 0
         self.last_processing_time = None
         self.average_processing_time = 0.0
@@ -87,7 +197,7 @@ class EnhancedTransformer(EnhancedBaseComponent):
             self.is_initialized = True
             self.health_status = "healthy"
             self.logger.info(f"✅ Enhanced Transformer '{self.name}' initialized successfully")
-            
+        
         except Exception as e:
             self.health_status = "failed"
             self.logger.error(f"❌ Failed to initialize Transformer '{self.name}': {e}")
@@ -122,16 +232,7 @@ class EnhancedTransformer(EnhancedBaseComponent):
                 raise ComponentOperationError(f"Input data doesn't match schema for '{self.name}'")
             
             # Apply transformation based on service type
-            if self.service_type == "web_service":
-                result = await self._transform_web_service(input_data)
-            elif self.service_type == "data_processor":
-                result = await self._transform_data_processor(input_data)
-            elif self.service_type == "ml_model":
-                result = await self._transform_ml_model(input_data)
-            elif self.service_type == "message_processor":
-                result = await self._transform_message_processor(input_data)
-            else:
-                raise ComponentOperationError(f"Unknown service type: {self.service_type}")
+            result = await self._transform_record(input_data)
             
             # Validate output against schema
             if not self._validate_output_schema(result):
@@ -150,27 +251,93 @@ class EnhancedTransformer(EnhancedBaseComponent):
             })
             
             return result
-            
+        
         except Exception as e:
             self.processing_errors += 1
             self.logger.error(f"❌ Transformation failed for '{self.name}': {e}")
             raise ComponentOperationError(f"Transformation failed: {e}") from e
     
-    async def transform_batch(self, input_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Transform batch of input data"""
+    async def transform_batch(self, input_batch: List[Dict[str, Any]],
+                              return_exceptions: bool = False) -> List[Any]:
+        """Transform batch of input data
+        
+        Args:
+            input_batch: Records to transform
+            return_exceptions: Put a ComponentOperationError in place of each failed
+                record instead of raising after the batch completes
+        
+        Returns:
+            Transformed records in input order
+        """
         if not self.is_running:
             raise ComponentOperationError(f"Transformer '{self.name}' not running")
         
         if len(input_batch) > self.batch_size:
             raise ComponentOperationError(f"Batch size {len(input_batch)} exceeds maximum {self.batch_size}")
         
-        results = []
-        for input_data in input_batch:
-            result = await self.transform(input_data)
-            results.append(result)
+        start_time = time.time()
+        results: List[Any] = [None] * len(input_batch)
+        
+        # Validate inputs for the whole batch before any work is scheduled
+        valid_indices = []
+        for index, input_data in enumerate(input_batch):
+            error = self._check_input(input_data)
+            if error:
+                results[index] = ComponentOperationError(f"Input data doesn't match schema for '{self.name}': {error}")
+            else:
+                valid_indices.append(index)
+        
+        outputs = await self._run_batch([input_batch[index] for index in valid_indices])
+        
+        for index, output in zip(valid_indices, outputs):
+            if isinstance(output, Exception):
+                results[index] = ComponentOperationError(f"Transformation failed: {output}")
+                continue
+            error = self._check_output(output)
+            if error:
+                results[index] = ComponentOperationError(f"Output data doesn't match schema for '{self.name}': {error}")
+            else:
+                results[index] = output
+        
+        # Batch metrics replace per-record logging
+        failures = [result for result in results if isinstance(result, Exception)]
+        processing_time = time.time() - start_time
+        self.records_processed += len(input_batch) - len(failures)
+        self.processing_errors += len(failures)
+        self.batches_processed += 1
+        self.last_processing_time = time.time()
+        if input_batch:
+            self._update_processing_metrics(processing_time / len(input_batch))
+        
+        if failures:
+            self.logger.error(f"❌ {len(failures)} of {len(input_batch)} records failed transformation for '{self.name}': {failures[0]}")
+        
+        self.log_component_metrics({
+            "batch_size": len(input_batch),
+            "batch_errors": len(failures),
+            "records_processed": self.records_processed,
+            "batch_processing_time": processing_time,
+            "average_processing_time": self.average_processing_time
+        })
+        
+        if failures and not return_exceptions:
+            raise ComponentOperationError(
+                f"Batch transformation failed for {len(failures)} of {len(input_batch)} records: {failures[0]}"
+            ) from failures[0]
         
         return results
     
+    def register_batch_handler(self, service_type: str, handler: BatchHandler) -> None:
+        """Register a native batch implementation for a service type
+        
+        Args:
+            service_type: Service type the handler serves
+            handler: Async callable taking the validated records and returning one
+                result (or exception) per record, in order
+        """
+        self.batch_handlers[service_type] = handler
+        self.logger.info(f"🔧 Batch handler registered for '{service_type}' on '{self.name}'")
+    
     async def health_check(self) -> Dict[str, Any]:
         """Return transformer health status"""
         health_data = {
@@ -184,9 +351,11 @@ class EnhancedTransformer(EnhancedBaseComponent):
             "output_schema_valid": bool(self.output_schema),
             "dependencies_count": len(self.dependencies),
             "records_processed": self.records_processed,
+            "batches_processed": self.batches_processed,
             "processing_errors": self.processing_errors,
             "average_processing_time": self.average_processing_time,
-            "last_processing_time": self.last_processing_time
+            "last_processing_time": self.last_processing_time,
+            "process_pool_active": self._process_pool is not None
         }
         
         # Service-type specific health checks
@@ -245,7 +414,7 @@ class EnhancedTransformer(EnhancedBaseComponent):
                     return False
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Configuration validation failed: {e}")
             return False
@@ -273,6 +442,8 @@ class EnhancedTransformer(EnhancedBaseComponent):
             raise ComponentValidationError("Processing timeout must be positive")
         if self.batch_size <= 0:
             raise ComponentValidationError("Batch size must be positive")
+        if self.process_pool_workers < 0:
+            raise ComponentValidationError("Process pool workers cannot be negative")
         
         self.processor_initialized = True
         self.logger.info(f"✅ Data processor configuration validated for '{self.name}'")
@@ -315,6 +486,10 @@ class EnhancedTransformer(EnhancedBaseComponent):
         elif self.service_type == "ml_model":
             # Warm up model
             self.logger.info(f"ML model '{self.name}' warmed up and ready")
+        
+        if self.process_pool_workers and self.service_type not in IO_BOUND_SERVICE_TYPES:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_pool_workers)
+            self.logger.info(f"Process pool with {self.process_pool_workers} workers started for '{self.name}'")
     
     async def _stop_processing(self) -> None:
         """Stop processing operation"""
@@ -323,6 +498,108 @@ class EnhancedTransformer(EnhancedBaseComponent):
         if self.service_type == "web_service":
             # Stop HTTP server
             self.logger.info(f"Web service '{self.name}' stopped")
+        
+        if self._process_pool:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+    
+    # Batch execution
+    async def _transform_record(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform one record with the service-type implementation (no validation or metrics)"""
+        if self.service_type == "web_service":
+            return await self._transform_web_service(input_data)
+        elif self.service_type == "data_processor":
+            return await self._transform_data_processor(input_data)
+        elif self.service_type == "ml_model":
+            return await self._transform_ml_model(input_data)
+        elif self.service_type == "message_processor":
+            return await self._transform_message_processor(input_data)
+        else:
+            raise ComponentOperationError(f"Unknown service type: {self.service_type}")
+    
+    async def _run_batch(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Run validated records through the best batch path, one result or exception per record"""
+        if not records:
+            return []
+        
+        handler = self.batch_handlers.get(self.service_type)
+        if handler:
+            try:
+                return await handler(records)
+            except Exception as e:
+                return [e] * len(records)
+        
+        if self.service_type in IO_BOUND_SERVICE_TYPES:
+            return await self._fan_out(records)
+        
+        results = []
+        for input_data in records:
+            try:
+                results.append(await self._transform_record(input_data))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def _fan_out(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Transform records concurrently, at most max_concurrency in flight"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def transform_one(input_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.wait_for(self._transform_record(input_data), self.processing_timeout)
+        
+        return await asyncio.gather(*(transform_one(input_data) for input_data in records), return_exceptions=True)
+    
+    async def _map_payloads(self, function: Callable[..., List[Any]], payloads: List[Dict[str, Any]], *args) -> List[Any]:
+        """Run a pure batch function inline, or split across the process pool for large batches"""
+        if self._process_pool is None or len(payloads) < self.offload_min_records:
+            return function(payloads, *args)
+        
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(payloads) // self.process_pool_workers)
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self._process_pool, function, payloads[start:start + chunk_size], *args)
+            for start in range(0, len(payloads), chunk_size)
+        ))
+        return [result for chunk in chunks for result in chunk]
+    
+    async def _transform_data_processor_batch(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Native batch implementation for data processors"""
+        payloads = [input_data.get("input_data", input_data) for input_data in records]
+        processed = await self._map_payloads(
+            _transform_payloads, payloads, self.transformation_logic.get("type", "passthrough"),
+            self._logic_required_props, self.name
+        )
+        return [data if isinstance(data, Exception) else self._wrap_processed_data(data) for data in processed]
+    
+    async def _transform_ml_model_batch(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Native batch implementation for ML models"""
+        if not self.model_loaded:
+            raise ComponentOperationError("ML model not loaded")
+        
+        payloads = [input_data.get("model_input", input_data) for input_data in records]
+        predictions = await self._map_payloads(_predict_payloads, payloads)
+        return [prediction if isinstance(prediction, Exception) else self._wrap_prediction(prediction)
+                for prediction in predictions]
+    
+    async def _transform_message_processor_batch(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Native batch implementation for message processors"""
+        payloads = [input_data.get("message_data", input_data) for input_data in records]
+        processed = _transform_payloads(
+            payloads, self.transformation_logic.get("type", "passthrough"), self._logic_required_props, self.name
+        )
+        timestamp = time.time()
+        return [
+            content if isinstance(content, Exception) else {
+                "processed_message": {
+                    "message_id": f"{self.name}_{int(timestamp * 1000)}_{self.records_processed + index}",
+                    "processed_content": content,
+                    "processing_timestamp": timestamp,
+                    "processor_id": self.name
+                }
+            }
+            for index, content in enumerate(processed)
+        ]
     
     # Service-type specific transformation methods
     async def _transform_web_service(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -347,7 +624,10 @@ class EnhancedTransformer(EnhancedBaseComponent):
         # Apply data processing transformation
         processed_data = self._apply_transformation_logic(input_payload)
         
-        # Return result that matches output schema structure
+        return self._wrap_processed_data(processed_data)
+    
+    def _wrap_processed_data(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape processed data to match the output schema structure"""
         # Check if outputs configuration has specific keys (like "processed_data")
         output_keys = list(self.outputs.keys())
         
@@ -381,7 +661,11 @@ class EnhancedTransformer(EnhancedBaseComponent):
         # Apply ML model transformation (mock prediction)
         prediction = self._generate_mock_prediction(model_input)
         
-        result = {
+        return self._wrap_prediction(prediction)
+    
+    def _wrap_prediction(self, prediction: Any) -> Dict[str, Any]:
+        """Build the model output record for a prediction"""
+        return {
             "model_output": {
                 "prediction": prediction,
                 "confidence": 0.85,  # Mock confidence score
@@ -389,8 +673,6 @@ class EnhancedTransformer(EnhancedBaseComponent):
                 "inference_time": 0.05
             }
         }
-        
-        return result
     
     async def _transform_message_processor(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Transform data for message processor"""
@@ -409,123 +691,76 @@ class EnhancedTransformer(EnhancedBaseComponent):
     # Utility methods
     def _validate_input_schema(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data against input schema"""
-        # Extract actual data from input wrapper if present
-        actual_data = input_data
-        for input_name, input_config in self.inputs.items():
-            if input_name in input_data:
-                actual_data = input_data[input_name]
-                break
+        error = self._check_input(input_data)
+        if error:
+            self.logger.error(error)
+            return False
+        return True
+    
+    def _validate_output_schema(self, output_data: Dict[str, Any]) -> bool:
+        """Validate output data against output schema"""
+        error = self._check_output(output_data)
+        if error:
+            self.logger.error(error)
+            return False
+        return True
+    
+    def _compile_input_check(self) -> Callable[[Dict[str, Any]], Optional[str]]:
+        """Build the input check once; it returns an error message or None"""
+        input_names = tuple(self.inputs.keys())
         
         # Simple validation - in real implementation would use jsonschema
-        schema_type = self.input_schema.get("type", "object")
-        
-        if schema_type == "object":
-            required_props = self.input_schema.get("required", [])
+        required_props = tuple(self.input_schema.get("required", [])) if self.input_schema.get("type", "object") == "object" else ()
+        
+        def check_input(input_data: Dict[str, Any]) -> Optional[str]:
+            # Extract actual data from input wrapper if present
+            actual_data = input_data
+            for input_name in input_names:
+                if input_name in input_data:
+                    actual_data = input_data[input_name]
+                    break
+            
             for prop in required_props:
                 if prop not in actual_data:
-                    self.logger.error(f"Missing required input property: {prop}")
-                    return False
+                    return f"Missing required input property: {prop}"
+            return None
         
-        return True
+        return check_input
     
-    def _validate_output_schema(self, output_data: Dict[str, Any]) -> bool:
-        """Validate output data against output schema"""
-        # If outputs configuration has specific keys, validate the nested data
+    def _compile_output_check(self) -> Callable[[Dict[str, Any]], Optional[str]]:
+        """Build the output check once; it returns an error message or None"""
         output_keys = list(self.outputs.keys())
+        required_props = self._output_required_props()
         
-        if output_keys and len(output_keys) == 1:
-            # Single output key - validate the nested data against the nested schema
-            output_key = output_keys[0]
-            if output_key in output_data:
-                nested_data = output_data[output_key]
-                
-                # Simple validation against the extracted schema
-                schema_type = self.output_schema.get("type", "object")
-                
-                if schema_type == "object":
-                    required_props = self.output_schema.get("required", [])
-                    for prop in required_props:
-                        if prop not in nested_data:
-                            self.logger.error(f"Missing required output property: {prop}")
-                            return False
-                return True
-            else:
-                self.logger.error(f"Missing expected output key: {output_key}")
-                return False
-        else:
-            # Multiple output keys or no specific keys - validate top-level data
-            schema_type = self.output_schema.get("type", "object")
+        # Single output key - validate the nested data against the nested schema
+        nested_key = output_keys[0] if len(output_keys) == 1 else None
+        
+        def check_output(output_data: Dict[str, Any]) -> Optional[str]:
+            if nested_key is not None:
+                if nested_key not in output_data:
+                    return f"Missing expected output key: {nested_key}"
+                output_data = output_data[nested_key]
             
-            if schema_type == "object":
-                required_props = self.output_schema.get("required", [])
-                for prop in required_props:
-                    if prop not in output_data:
-                        self.logger.error(f"Missing required output property: {prop}")
-                        return False
+            for prop in required_props:
+                if prop not in output_data:
+                    return f"Missing required output property: {prop}"
+            return None
         
-        return True
+        return check_output
+    
+    def _output_required_props(self) -> Tuple[str, ...]:
+        """Required properties of the output schema (empty unless it is an object schema)"""
+        if self.output_schema.get("type", "object") != "object":
+            return ()
+        return tuple(self.output_schema.get("required", []))
     
     def _apply_transformation_logic(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply configured transformation logic and ensure output matches schema requirements"""
-        # Simple transformation logic based on configuration
-        transform_type = self.transformation_logic.get("type", "passthrough")
-        
-        if transform_type == "passthrough":
-            result = data
-        elif transform_type == "uppercase_strings":
-            result = {}
-            for key, value in data.items():
-                if isinstance(value, str):
-                    result[key] = value.upper()
-                else:
-                    result[key] = value
-        elif transform_type == "add_metadata":
-            result = {
-                **data,
-                "_metadata": {
-                    "transformer": self.name,
-                    "timestamp": time.time(),
-                    "version": "1.0"
-                }
-            }
-        else:
-            result = data
-        
-        # Ensure output matches schema requirements
-        if self.output_schema.get("type") == "object":
-            required_props = self.output_schema.get("required", [])
-            
-            # If schema requires specific properties that aren't in the result, add them
-            for prop in required_props:
-                if prop not in result:
-                    if prop == "result":
-                        # Keep the transformed data as-is and add a "result" field with summary
-                        result["result"] = "transformation_complete"
-                    elif prop == "value" and "value" not in result:
-                        # Try to find any data to map to "value"
-                        if isinstance(data, dict) and "value" in data:
-                            result["value"] = data["value"]
-                        elif isinstance(data, dict) and len(data) > 0:
-                            first_value = next(iter(data.values()))
-                            result["value"] = first_value
-                        else:
-                            result["value"] = str(data)
-        
-        return result
+        return _transformation_logic(data, self.transformation_logic.get("type", "passthrough"), self._logic_required_props, self.name)
     
     def _generate_mock_prediction(self, input_data: Dict[str, Any]) -> Any:
         """Generate mock ML prediction"""
-        # Simple mock prediction based on input hash
-        input_str = json.dumps(input_data, sort_keys=True)
-        hash_val = int(hashlib.md5(input_str.encode()).hexdigest()[:8], 16)
-        
-        # Return different prediction types based on hash
-        if hash_val % 3 == 0:
-            return {"class": "positive", "probability": 0.85}
-        elif hash_val % 3 == 1:
-            return {"class": "negative", "probability": 0.75}
-        else:
-            return {"class": "neutral", "probability": 0.65}
+        return _mock_prediction(input_data)
     
     def _generate_message_id(self) -> str:
         """Generate unique message ID"""
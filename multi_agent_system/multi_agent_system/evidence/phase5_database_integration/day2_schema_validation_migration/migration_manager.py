@@ -8,7 +8,8 @@ import time
 import logging
 import json
 import hashlib
-from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -51,6 +52,8 @@ class MigrationStep:
     dependencies: List[str] = field(default_factory=list)
     validation_query: Optional[str] = None
     estimated_duration: float = 0.0
+    backfill_table: Optional[str] = None  # Run as a batched backfill over this table's key ranges
+    backfill_key: str = "id"
 
 
 @dataclass
@@ -78,6 +81,8 @@ class MigrationResult:
     error_message: Optional[str] = None
     rollback_performed: bool = False
     completed_at: float = field(default_factory=time.time)
+    rows_backfilled: int = 0
+    resumed: bool = False
 
 
 @dataclass
@@ -93,10 +98,36 @@ class MigrationHistory:
     steps_completed: int = 0
     error_message: Optional[str] = None
     rollback_steps: List[str] = field(default_factory=list)
+    backfill_progress: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # step_id -> checkpoint
+
+
+@dataclass
+class SchemaChangeEvent:
+    """Notification that a migration changed (or may have changed) the schema"""
+    migration_id: str
+    from_version: str
+    to_version: str
+    event_type: str  # migrated, failed, rolled_back
+    occurred_at: float = field(default_factory=time.time)
 
 
 class MigrationManager:
-    """Database migration management system with rollback support"""
+    """
+    Database migration management system with rollback support
+    
+    Steps with a backfill_table rewrite data online: instead of one
+    statement over the whole table, forward_sql runs once per primary-key
+    range in its own short transaction, bound to :batch_start and
+    :batch_end (inclusive, DB-API named paramstyle). The batch size adapts
+    to the observed batch latency and the manager sleeps between batches
+    so concurrent writers get the database back. The last completed key is
+    checkpointed in the migration history, so re-running an interrupted
+    migration resumes where it stopped, and the step's validation_query is
+    checked per batch range (it must return a zero violation count).
+    
+    DB-API calls block, so they run on a dedicated database thread and the
+    event loop keeps serving other coroutines while a batch executes.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -108,13 +139,32 @@ class MigrationManager:
         self.max_rollback_steps = config.get("max_rollback_steps", 100)
         self.migration_timeout = config.get("migration_timeout", 300)  # 5 minutes
         
+        # Online (batched) backfill configuration
+        self.online_migrations = config.get("online_migrations", True)
+        self.backfill_batch_size = config.get("backfill_batch_size", 1000)
+        self.backfill_min_batch_size = config.get("backfill_min_batch_size", 50)
+        self.backfill_max_batch_size = config.get("backfill_max_batch_size", 10000)
+        self.backfill_target_latency = config.get("backfill_target_latency", 0.05)  # seconds per batch
+        self.backfill_throttle_ratio = config.get("backfill_throttle_ratio", 0.5)  # pause per second of batch work
+        self.backfill_checkpoint_interval = config.get("backfill_checkpoint_interval", 10)  # batches
+        
         # State
         self.migration_history: List[MigrationHistory] = []
         self.rollback_scripts: Dict[str, List[str]] = {}
         self.active_migration: Optional[str] = None
+        self.registered_steps: Dict[Tuple[str, str], List[MigrationStep]] = {}
+        self.step_definitions: Dict[str, MigrationStep] = {}  # step_id -> step of a planned migration
+        
+        # Statistics
+        self.backfill_rows = 0
+        self.backfill_batches = 0
         
-        # Database connection (would be injected)
+        # Database connection (DB-API, would be injected), used only from the database thread
         self.db_connection = None
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Listeners notified after schema changes (e.g. to drop prepared statements)
+        self.schema_change_listeners: List[Callable[[SchemaChangeEvent], Any]] = []
         
         logger.info("MigrationManager initialized")
     
@@ -147,35 +197,45 @@ class MigrationManager:
             raise MigrationError(f"Migration already in progress: {self.active_migration}")
         
         start_time = time.time()
+        
+        # Resume an interrupted run of the same migration from its checkpoint
+        history_record = self._find_interrupted_migration(from_version, to_version)
+        resumed = history_record is not None
+        if resumed:
+            migration_id = history_record.migration_id
+            logger.info(f"Resuming interrupted migration {migration_id} after {history_record.steps_completed} steps")
         self.active_migration = migration_id
         
         try:
             # Create migration history record
-            history_record = MigrationHistory(
-                migration_id=migration_id,
-                from_version=from_version,
-                to_version=to_version,
-                status=MigrationStatus.PENDING,
-                started_at=start_time
-            )
-            self.migration_history.append(history_record)
+            if not resumed:
+                history_record = MigrationHistory(
+                    migration_id=migration_id,
+                    from_version=from_version,
+                    to_version=to_version,
+                    status=MigrationStatus.PENDING,
+                    started_at=start_time
+                )
+                self.migration_history.append(history_record)
             
             # Plan migration path
             migration_plan = await self._plan_migration_path(from_version, to_version)
             history_record.status = MigrationStatus.RUNNING
             
             # Backup current state if enabled
-            if self.backup_enabled:
+            if self.backup_enabled and not resumed:
                 await self._create_migration_backup(migration_id)
+            await self._save_migration_history()
             
             # Execute migration steps
-            completed_steps = 0
-            rollback_steps = []
+            completed_steps = history_record.steps_completed
+            rollback_steps = [step.step_id for step in reversed(migration_plan.steps[:completed_steps])]
+            rows_before = self.backfill_rows
             
-            for step in migration_plan.steps:
+            for step in migration_plan.steps[completed_steps:]:
                 try:
                     # Execute migration step
-                    await self._execute_migration_step(step)
+                    await self._execute_migration_step(step, history_record)
                     completed_steps += 1
                     
                     # Store rollback step
@@ -183,12 +243,18 @@ class MigrationManager:
                     
                     # Update history
                     history_record.steps_completed = completed_steps
+                    await self._save_migration_history()
                     
                     logger.debug(f"Migration step completed: {step.step_id}")
                     
                 except Exception as step_error:
                     logger.error(f"Migration step failed: {step.step_id} - {step_error}")
                     
+                    # A backfill commits batch by batch, so a failed one is partly applied
+                    if step.backfill_table and self.db_connection:
+                        rollback_steps.insert(0, step.step_id)
+                        history_record.backfill_progress.pop(step.step_id, None)
+                    
                     # Attempt rollback
                     rollback_successful = await self._rollback_migration_steps(rollback_steps)
                     
@@ -199,6 +265,11 @@ class MigrationManager:
                     history_record.execution_time = time.time() - start_time
                     history_record.rollback_steps = rollback_steps
                     
+                    if completed_steps:
+                        await self._notify_schema_change(SchemaChangeEvent(
+                            migration_id, from_version, to_version, "failed"
+                        ))
+                    
                     result = MigrationResult(
                         successful=False,
                         from_version=from_version,
@@ -214,6 +285,9 @@ class MigrationManager:
             
             # Update schema version
             await self._update_schema_version(to_version)
+            await self._notify_schema_change(SchemaChangeEvent(
+                migration_id, from_version, to_version, "migrated"
+            ))
             
             # Update history record
             execution_time = time.time() - start_time
@@ -236,7 +310,9 @@ class MigrationManager:
                 to_version=to_version,
                 steps_completed=completed_steps,
                 total_steps=len(migration_plan.steps),
-                execution_time=execution_time
+                execution_time=execution_time,
+                rows_backfilled=self.backfill_rows - rows_before,
+                resumed=resumed
             )
             
         except Exception as e:
@@ -273,6 +349,9 @@ class MigrationManager:
                 for history_record in self.migration_history:
                     if history_record.migration_id == migration_id:
                         history_record.status = MigrationStatus.ROLLED_BACK
+                        await self._notify_schema_change(SchemaChangeEvent(
+                            migration_id, history_record.to_version, history_record.from_version, "rolled_back"
+                        ))
                         break
                 
                 logger.info(f"Migration {migration_id} rolled back successfully")
@@ -284,6 +363,37 @@ class MigrationManager:
             logger.error(f"Migration rollback failed: {e}")
             raise MigrationRollbackError(f"Rollback failed: {e}")
     
+    def register_migration_steps(self, from_version: str, to_version: str, steps: List[MigrationStep]):
+        """Use explicit steps for a migration instead of the generated ones"""
+        self.registered_steps[(from_version, to_version)] = list(steps)
+    
+    def _find_interrupted_migration(self, from_version: str, to_version: str) -> Optional[MigrationHistory]:
+        """Latest run of this migration that stopped while RUNNING (cancelled or crashed)"""
+        for record in reversed(self.migration_history):
+            if record.from_version == from_version and record.to_version == to_version:
+                return record if record.status == MigrationStatus.RUNNING else None
+        return None
+    
+    def add_schema_change_listener(self, listener: Callable[[SchemaChangeEvent], Any]):
+        """Register a callable (sync or async) invoked after each schema change"""
+        if listener not in self.schema_change_listeners:
+            self.schema_change_listeners.append(listener)
+    
+    def remove_schema_change_listener(self, listener: Callable[[SchemaChangeEvent], Any]):
+        """Unregister a schema change listener"""
+        if listener in self.schema_change_listeners:
+            self.schema_change_listeners.remove(listener)
+    
+    async def _notify_schema_change(self, event: SchemaChangeEvent):
+        """Notify listeners; a failing listener never fails the migration"""
+        for listener in list(self.schema_change_listeners):
+            try:
+                result = listener(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Schema change listener failed for {event.migration_id}: {e}")
+    
     async def _plan_migration_path(self, from_version: str, to_version: str) -> MigrationPlan:
         """Plan migration path from source to target version"""
         logger.info(f"Planning migration path: {from_version} -> {to_version}")
@@ -305,7 +415,9 @@ class MigrationManager:
             # Generate migration steps based on version difference
             steps = []
             
-            if from_ver < to_ver:
+            if (from_version, to_version) in self.registered_steps:
+                steps = list(self.registered_steps[(from_version, to_version)])
+            elif from_ver < to_ver:
                 # Forward migration
                 steps = await self._generate_forward_migration_steps(from_ver, to_ver)
             else:
@@ -317,6 +429,7 @@ class MigrationManager:
                 to_version=to_version,
                 steps=steps
             )
+            self.step_definitions.update((step.step_id, step) for step in steps)
             
             logger.info(f"Migration plan created with {len(steps)} steps, estimated duration: {migration_plan.total_estimated_duration:.2f}s")
             
@@ -383,11 +496,17 @@ class MigrationManager:
         
         return steps
     
-    async def _execute_migration_step(self, step: MigrationStep):
+    async def _execute_migration_step(self, step: MigrationStep, history_record: Optional[MigrationHistory] = None):
         """Execute individual migration step"""
         logger.debug(f"Executing migration step: {step.step_id}")
         
         try:
+            # Data rewrites run as batched backfills with per-batch validation
+            if step.backfill_table and self.db_connection:
+                await self._run_backfill(step, history_record.backfill_progress if history_record else {})
+                logger.debug(f"Migration step {step.step_id} executed successfully")
+                return
+            
             # Validate step before execution
             if step.validation_query:
                 await self._validate_migration_preconditions(step.validation_query)
@@ -410,6 +529,64 @@ class MigrationManager:
             logger.error(f"Migration step {step.step_id} execution failed: {e}")
             raise MigrationError(f"Step execution failed: {e}")
     
+    async def _run_backfill(self, step: MigrationStep, checkpoints: Dict[str, Dict[str, Any]]):
+        """Run a data step in primary-key ordered batches, checkpointing the last completed key"""
+        progress = checkpoints.setdefault(
+            step.step_id, {"last_key": None, "rows": 0, "batches": 0, "completed": False}
+        )
+        if progress["completed"]:
+            return
+        
+        table, key = step.backfill_table, step.backfill_key
+        batch_size = self.backfill_batch_size
+        if progress["last_key"] is not None:
+            logger.info(f"Resuming backfill {step.step_id} after {key} {progress['last_key']} ({progress['rows']} rows done)")
+        
+        try:
+            while True:
+                # Bounds of the next batch: the next batch_size keys after the checkpoint
+                after = f" WHERE {key} > :last_key" if progress["last_key"] is not None else ""
+                limit = f" LIMIT {batch_size}" if self.online_migrations else ""
+                first_key, last_key, row_count = await self._query_one(
+                    f"SELECT MIN({key}), MAX({key}), COUNT(*) FROM "
+                    f"(SELECT {key} FROM {table}{after} ORDER BY {key}{limit})",
+                    {"last_key": progress["last_key"]}
+                )
+                if not row_count:
+                    break
+                
+                bounds = {"batch_start": first_key, "batch_end": last_key}
+                batch_started = time.perf_counter()
+                await self._execute_sql(step.forward_sql, bounds)
+                if step.validation_query:
+                    await self._validate_migration_postconditions(step.validation_query, bounds)
+                batch_latency = time.perf_counter() - batch_started
+                
+                progress["last_key"] = last_key
+                progress["rows"] += row_count
+                progress["batches"] += 1
+                self.backfill_rows += row_count
+                self.backfill_batches += 1
+                if progress["batches"] % self.backfill_checkpoint_interval == 0:
+                    await self._save_migration_history()
+                
+                if not self.online_migrations:
+                    break
+                
+                # Throttle: size batches toward the target latency and pause between them
+                if batch_latency > self.backfill_target_latency:
+                    batch_size = max(self.backfill_min_batch_size, batch_size // 2)
+                elif batch_latency < self.backfill_target_latency / 2:
+                    batch_size = min(self.backfill_max_batch_size, batch_size * 2)
+                await asyncio.sleep(batch_latency * self.backfill_throttle_ratio)
+            
+            progress["completed"] = True
+            logger.info(f"Backfill {step.step_id} completed: {progress['rows']} rows in {progress['batches']} batches")
+            
+        finally:
+            # Checkpoint on completion, failure and cancellation alike
+            await self._save_migration_history()
+    
     async def _rollback_migration_steps(self, rollback_steps: List[str]) -> bool:
         """Rollback migration steps in reverse order"""
         logger.info(f"Rolling back {len(rollback_steps)} migration steps")
@@ -459,25 +636,63 @@ class MigrationManager:
             pass
         return True
     
-    async def _validate_migration_postconditions(self, validation_query: str) -> bool:
-        """Validate migration postconditions"""
+    async def _validate_migration_postconditions(self, validation_query: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Validate migration postconditions (the query returns a count of violating rows)"""
         # Execute validation query
         if self.db_connection:
-            # Would execute actual validation query
-            pass
+            row = await self._query_one(validation_query, params)
+            if row and row[0]:
+                raise MigrationError(f"Postcondition failed: {row[0]} rows violate {validation_query!r} for {params}")
         return True
     
-    async def _execute_sql(self, sql: str):
-        """Execute SQL statement"""
+    async def _execute_sql(self, sql: str, params: Optional[Dict[str, Any]] = None):
+        """Execute SQL statement in its own transaction"""
         if self.db_connection:
-            # Would execute actual SQL
-            pass
+            await self._run_on_db_thread(self._execute_sql_blocking, sql, params)
         else:
             # Simulate SQL execution
             await asyncio.sleep(0.01)
     
+    async def _query_one(self, sql: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple]:
+        """Fetch the first row of a query"""
+        return await self._run_on_db_thread(self._query_one_blocking, sql, params)
+    
+    async def _run_on_db_thread(self, function: Callable, *args):
+        """Run a blocking DB-API call on the database thread"""
+        if self._db_executor is None:
+            self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="migration-db")
+        future = asyncio.get_running_loop().run_in_executor(self._db_executor, function, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Let the statement finish so the connection is idle once the cancellation propagates
+            await asyncio.wait([future])
+            raise
+    
+    def _execute_sql_blocking(self, sql: str, params: Optional[Dict[str, Any]]):
+        cursor = self.db_connection.cursor()
+        try:
+            cursor.execute(sql, params or {})
+            self.db_connection.commit()
+        except Exception:
+            self.db_connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def _query_one_blocking(self, sql: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+        cursor = self.db_connection.cursor()
+        try:
+            cursor.execute(sql, params or {})
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+    
     async def _get_rollback_sql(self, step_id: str) -> str:
         """Get rollback SQL for step"""
+        step = self.step_definitions.get(step_id)
+        if step is not None:
+            return step.rollback_sql
         # This would retrieve the actual rollback SQL
         return f"-- Rollback SQL for step {step_id}"
     
@@ -512,7 +727,8 @@ class MigrationManager:
                         execution_time=record_dict.get("execution_time", 0.0),
                         steps_completed=record_dict.get("steps_completed", 0),
                         error_message=record_dict.get("error_message"),
-                        rollback_steps=record_dict.get("rollback_steps", [])
+                        rollback_steps=record_dict.get("rollback_steps", []),
+                        backfill_progress=record_dict.get("backfill_progress", {})
                     )
                     self.migration_history.append(record)
                 
@@ -539,7 +755,8 @@ class MigrationManager:
                     "execution_time": record.execution_time,
                     "steps_completed": record.steps_completed,
                     "error_message": record.error_message,
-                    "rollback_steps": record.rollback_steps
+                    "rollback_steps": record.rollback_steps,
+                    "backfill_progress": record.backfill_progress
                 }
                 history_data.append(record_dict)
             
@@ -585,7 +802,10 @@ class MigrationManager:
             "success_rate": successful_migrations / total_migrations if total_migrations > 0 else 0.0,
             "active_migration": self.active_migration,
             "rollback_scripts_available": len(self.rollback_scripts),
-            "migrations_path": self.migrations_path
+            "migrations_path": self.migrations_path,
+            "online_migrations": self.online_migrations,
+            "backfill_rows": self.backfill_rows,
+            "backfill_batches": self.backfill_batches
         }
     
     async def cleanup(self):
@@ -596,6 +816,10 @@ class MigrationManager:
         await self._save_migration_history()
         await self._save_rollback_scripts()
         
+        if self._db_executor is not None:
+            self._db_executor.shutdown(wait=True)
+            self._db_executor = None
+        
         # Clear state
         self.migration_history.clear()
         self.rollback_scripts.clear()
@@ -9,8 +9,9 @@ import time
 import tempfile
 import shutil
 from unittest.mock import Mock, AsyncMock, patch
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import os
+from pathlib import Path
 
 # Import components under test
 import sys
@@ -366,6 +367,86 @@ class TestSchemaRegistry:
         assert backup_path is not None
         assert os.path.exists(backup_path)
     
+    @pytest.mark.asyncio
+    async def test_lazy_loading_and_index_log(self, registry_config):
+        """Test lazy schema loading, hash index and index log compaction"""
+        registry_config.update({"max_versions": 100, "schema_cache_size": 4, "index_compaction_threshold": 25})
+        registry = SchemaRegistry(registry_config)
+        await registry.initialize()
+        
+        for i in range(2, 32):
+            schema = SchemaDefinition(
+                version=SchemaVersion(f"{i}.0.0"),
+                name=f"lazy_schema_{i}",
+                fields=[SchemaField("id", "string", required=True), SchemaField(f"field_{i}", "number")]
+            )
+            await registry.register_schema(schema, f"{i}.0.0")
+            assert await registry._find_schema_by_hash(schema.get_schema_hash()) == f"{i}.0.0"
+        
+        # Changes are appended to the log and compacted atomically every 25 records
+        stats = registry.get_registry_statistics()
+        assert stats["index_compactions"] == 1
+        assert stats["index_log_records"] == 32 - 25
+        assert stats["cached_schemas"] == 4
+        
+        # A fresh registry loads only the index; bodies are read on first access
+        reloaded = SchemaRegistry(registry_config)
+        await reloaded.initialize()
+        assert len(reloaded.schemas) == 31
+        assert len(reloaded.schemas.cache) == 0
+        assert reloaded.active_version == "1.0.0"
+        assert reloaded.version_history == registry.version_history
+        
+        schema = await reloaded.get_schema("17.0.0")
+        assert schema.name == "lazy_schema_17"
+        assert reloaded.schemas.misses == 1
+        await reloaded.get_schema("17.0.0")
+        assert reloaded.schemas.hits == 1
+        
+        # Deletes replay from the log and the compacted index agrees
+        await registry.delete_version("2.0.0")
+        await registry.set_active_version("30.0.0")
+        await registry.compact_registry_index()
+        reloaded = SchemaRegistry(registry_config)
+        await reloaded.initialize()
+        assert "2.0.0" not in reloaded.schemas
+        assert reloaded.active_version == "30.0.0"
+        assert reloaded.metadata["30.0.0"].is_active and not reloaded.metadata["1.0.0"].is_active
+    
+    @pytest.mark.asyncio
+    async def test_torn_index_log_is_truncated(self, registry_config, sample_schema_definition):
+        """Test that replay cuts a torn log tail so later records are not lost behind it"""
+        registry = SchemaRegistry(registry_config)
+        await registry.initialize()
+        await registry.register_schema(sample_schema_definition, "2.0.0")
+        
+        log_file = Path(registry_config["registry_path"]) / "registry_index.log"
+        intact_size = log_file.stat().st_size
+        with open(log_file, "a") as f:
+            f.write('{"sequence": 99, "op": "regis')  # Crash mid-append
+        
+        reloaded = SchemaRegistry(registry_config)
+        await reloaded.initialize()
+        assert log_file.stat().st_size == intact_size
+        await reloaded.set_active_version("2.0.0")
+        
+        reloaded = SchemaRegistry(registry_config)
+        await reloaded.initialize()
+        assert "2.0.0" in reloaded.schemas
+        assert reloaded.active_version == "2.0.0"
+    
+    @pytest.mark.asyncio
+    async def test_delete_skips_versions_without_metadata(self, registry_config, sample_schema_definition):
+        """Test that deleting a version tolerates history entries that have no metadata"""
+        registry = SchemaRegistry(registry_config)
+        await registry.initialize()
+        await registry.register_schema(sample_schema_definition, "2.0.0")
+        registry.version_history.insert(0, "0.9.0")  # Listed in the history, metadata missing
+        
+        assert await registry.delete_version("2.0.0")
+        assert "2.0.0" not in registry.schemas
+        assert sample_schema_definition.get_schema_hash() not in registry.hash_index
+    
     def test_registry_statistics(self, schema_registry):
         """Test registry statistics"""
         stats = schema_registry.get_registry_statistics()
@@ -469,6 +550,36 @@ class TestMigrationManager:
         # Clean up
         migration_manager.active_migration = None
     
+    @pytest.mark.asyncio
+    async def test_schema_change_listeners(self, migration_manager):
+        """Test listeners are notified after migrations and rollbacks"""
+        await migration_manager.initialize()
+        
+        sync_events = []
+        async_events = []
+        
+        async def async_listener(event):
+            async_events.append(event)
+        
+        def failing_listener(event):
+            raise RuntimeError("listener failure")
+        
+        migration_manager.add_schema_change_listener(sync_events.append)
+        migration_manager.add_schema_change_listener(async_listener)
+        migration_manager.add_schema_change_listener(failing_listener)
+        
+        result = await migration_manager.migrate_schema("1.0.0", "1.1.0")
+        assert result.successful is True
+        assert [e.event_type for e in sync_events] == ["migrated"]
+        assert async_events[0].to_version == "1.1.0"
+        
+        await migration_manager.rollback_migration(sync_events[0].migration_id)
+        assert [e.event_type for e in sync_events] == ["migrated", "rolled_back"]
+        assert sync_events[1].to_version == "1.0.0"
+        
+        migration_manager.remove_schema_change_listener(sync_events.append)
+        assert len(migration_manager.schema_change_listeners) == 2
+    
     @pytest.mark.asyncio
     async def test_migration_history_tracking(self, migration_manager):
         """Test migration history tracking"""
@@ -516,6 +627,211 @@ class TestMigrationManager:
             assert step.description is not None
             assert step.forward_sql is not None
             assert step.rollback_sql is not None
+    
+    @pytest.fixture
+    def backfill_database(self, temp_migrations_path):
+        """SQLite database with 50k rows missing a derived column"""
+        import sqlite3
+        db_path = os.path.join(temp_migrations_path, "accounts.db")
+        connection = sqlite3.connect(db_path, check_same_thread=False)  # The manager uses it from its database thread
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE accounts (id INTEGER PRIMARY KEY, email TEXT, email_lower TEXT)")
+        connection.executemany(
+            "INSERT INTO accounts (id, email) VALUES (?, ?)",
+            ((i, f"User{i}@Example.COM") for i in range(1, 50001))
+        )
+        connection.commit()
+        yield db_path, connection
+        connection.close()
+    
+    @staticmethod
+    def _backfill_step():
+        return MigrationStep(
+            step_id="backfill_email_lower",
+            description="Populate email_lower",
+            forward_sql="UPDATE accounts SET email_lower = lower(email) WHERE id BETWEEN :batch_start AND :batch_end",
+            rollback_sql="UPDATE accounts SET email_lower = NULL",
+            step_type="dml",
+            validation_query="SELECT COUNT(*) FROM accounts WHERE id BETWEEN :batch_start AND :batch_end "
+                             "AND email_lower IS NOT lower(email)",
+            backfill_table="accounts"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_online_backfill_with_concurrent_writers(self, migration_config, backfill_database):
+        """Test batched backfill keeps concurrent writers unblocked compared to one big rewrite"""
+        import sqlite3
+        import threading
+        db_path, connection = backfill_database
+        new_ids = iter(range(1_000_000, 2_000_000))
+        
+        async def migrate_with_writer(online: bool, to_version: str) -> Tuple[MigrationResult, float]:
+            manager = MigrationManager({**migration_config, "online_migrations": online, "backup_enabled": False})
+            await manager.initialize()
+            manager.db_connection = connection
+            manager.register_migration_steps("1.0.0", to_version, [self._backfill_step()])
+            
+            # Writer thread dual-writes new rows while the migration runs
+            stop = threading.Event()
+            latencies = []
+            
+            def writer():
+                writer_connection = sqlite3.connect(db_path, timeout=30)
+                while not stop.is_set():
+                    next_id = next(new_ids)
+                    started = time.perf_counter()
+                    writer_connection.execute(
+                        "INSERT INTO accounts (id, email, email_lower) VALUES (?, ?, ?)",
+                        (next_id, f"New{next_id}@Example.COM", f"new{next_id}@example.com")
+                    )
+                    writer_connection.commit()
+                    latencies.append(time.perf_counter() - started)
+                    time.sleep(0.001)
+                writer_connection.close()
+            
+            thread = threading.Thread(target=writer)
+            thread.start()
+            await asyncio.sleep(0.05)
+            try:
+                result = await manager.migrate_schema("1.0.0", to_version)
+            finally:
+                stop.set()
+                thread.join()
+            return result, max(latencies)
+        
+        offline_result, offline_max_latency = await migrate_with_writer(False, "1.1.0")
+        assert offline_result.successful and offline_result.rows_backfilled >= 50000
+        
+        connection.execute("UPDATE accounts SET email_lower = NULL WHERE id <= 50000")
+        connection.commit()
+        
+        online_result, online_max_latency = await migrate_with_writer(True, "1.2.0")
+        assert online_result.successful and online_result.rows_backfilled >= 50000
+        remaining = connection.execute(
+            "SELECT COUNT(*) FROM accounts WHERE email_lower IS NOT lower(email)"
+        ).fetchone()[0]
+        assert remaining == 0
+        
+        print(f"Max writer latency: single statement {offline_max_latency * 1000:.1f}ms, "
+              f"batched backfill {online_max_latency * 1000:.1f}ms")
+        assert online_max_latency < offline_max_latency
+    
+    @pytest.mark.asyncio
+    async def test_backfill_leaves_event_loop_to_coroutine_writers(self, migration_config, backfill_database):
+        """Test a writer coroutine on the same event loop keeps running while a batch executes"""
+        import sqlite3
+        db_path, connection = backfill_database
+        manager = MigrationManager({**migration_config, "backup_enabled": False, "backfill_batch_size": 25000,
+                                    "backfill_max_batch_size": 25000})
+        await manager.initialize()
+        manager.db_connection = connection
+        manager.register_migration_steps("1.0.0", "1.1.0", [self._backfill_step()])
+        
+        writer_connection = sqlite3.connect(db_path, timeout=0)
+        stop = asyncio.Event()
+        turns_during_first_batch = 0
+        rows_written = 0
+        
+        async def writer():
+            nonlocal turns_during_first_batch, rows_written
+            next_id = 1_000_000
+            while not stop.is_set():
+                if manager.active_migration and manager.backfill_batches == 0:
+                    turns_during_first_batch += 1
+                try:
+                    writer_connection.execute(
+                        "INSERT INTO accounts (id, email, email_lower) VALUES (?, ?, ?)",
+                        (next_id, f"New{next_id}@Example.COM", f"new{next_id}@example.com")
+                    )
+                    writer_connection.commit()
+                    next_id += 1
+                    rows_written += 1
+                except sqlite3.OperationalError:
+                    writer_connection.rollback()  # Locked by a batch: retry on the next turn
+                await asyncio.sleep(0.001)
+        
+        writer_task = asyncio.create_task(writer())
+        try:
+            result = await manager.migrate_schema("1.0.0", "1.1.0")
+        finally:
+            stop.set()
+            await writer_task
+            writer_connection.close()
+            await manager.cleanup()
+        
+        assert result.successful and result.rows_backfilled >= 50000
+        assert turns_during_first_batch > 0, "The writer coroutine should run while a batch executes"
+        assert rows_written > 0
+        remaining = connection.execute(
+            "SELECT COUNT(*) FROM accounts WHERE email_lower IS NOT lower(email)"
+        ).fetchone()[0]
+        assert remaining == 0
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_backfill_resumes(self, migration_config, backfill_database):
+        """Test an interrupted backfill resumes from its checkpoint"""
+        _, connection = backfill_database
+        config = {**migration_config, "backup_enabled": False, "backfill_batch_size": 500,
+                  "backfill_max_batch_size": 500, "backfill_checkpoint_interval": 1}
+        
+        manager = MigrationManager(config)
+        await manager.initialize()
+        manager.db_connection = connection
+        manager.register_migration_steps("1.0.0", "1.1.0", [self._backfill_step()])
+        
+        task = asyncio.create_task(manager.migrate_schema("1.0.0", "1.1.0"))
+        while manager.backfill_batches < 5:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        # A new manager picks up the checkpoint from the saved history
+        resumed_manager = MigrationManager(config)
+        await resumed_manager.initialize()
+        record = resumed_manager.migration_history[-1]
+        assert record.status == MigrationStatus.RUNNING
+        checkpoint = record.backfill_progress["backfill_email_lower"]
+        assert checkpoint["rows"] == checkpoint["last_key"] >= 2500
+        rows_done = checkpoint["rows"]
+        
+        resumed_manager.db_connection = connection
+        resumed_manager.register_migration_steps("1.0.0", "1.1.0", [self._backfill_step()])
+        result = await resumed_manager.migrate_schema("1.0.0", "1.1.0")
+        
+        assert result.successful and result.resumed
+        assert result.rows_backfilled == 50000 - rows_done
+        assert resumed_manager.migration_history[-1].migration_id == record.migration_id
+        remaining = connection.execute(
+            "SELECT COUNT(*) FROM accounts WHERE email_lower IS NOT lower(email)"
+        ).fetchone()[0]
+        assert remaining == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_backfill_is_rolled_back(self, migration_config, backfill_database):
+        """Test a backfill whose validation fails partway undoes the batches it committed"""
+        _, connection = backfill_database
+        config = {**migration_config, "backup_enabled": False, "backfill_batch_size": 5000,
+                  "backfill_max_batch_size": 5000}
+        step = self._backfill_step()
+        step.validation_query = ("SELECT COUNT(*) FROM accounts WHERE id BETWEEN :batch_start AND :batch_end "
+                                 "AND (email_lower IS NOT lower(email) OR id > 20000)")
+        
+        manager = MigrationManager(config)
+        await manager.initialize()
+        manager.db_connection = connection
+        manager.register_migration_steps("1.0.0", "1.1.0", [step])
+        
+        with pytest.raises(MigrationError):
+            await manager.migrate_schema("1.0.0", "1.1.0")
+        assert manager.backfill_rows >= 20000, "Earlier batches committed before the failure"
+        
+        rewritten = connection.execute("SELECT COUNT(*) FROM accounts WHERE email_lower IS NOT NULL").fetchone()[0]
+        assert rewritten == 0
+        record = manager.migration_history[-1]
+        assert record.status == MigrationStatus.FAILED
+        assert record.rollback_steps == ["backfill_email_lower"]
+        assert "backfill_email_lower" not in record.backfill_progress
 
 
 class TestSchemaIntegration:
@@ -8,7 +8,9 @@ import time
 import logging
 import json
 import os
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Any, Optional, List, Callable, Iterator, Set
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
@@ -47,8 +49,82 @@ class SchemaMetadata:
             self.tags = []
 
 
+class LazySchemaCache(MutableMapping):
+    """
+    Version -> schema mapping that loads schema bodies on first access
+    
+    Every known version counts for len/in/iteration, but only the most
+    recently used bodies are kept in memory (bounded LRU); evicted or
+    never-loaded versions are read back through the loader.
+    """
+    
+    def __init__(self, loader: Callable[[str], Any], capacity: int = 32):
+        self.loader = loader
+        self.capacity = max(capacity, 1)
+        self.versions: Set[str] = set()
+        self.cache: "OrderedDict[str, Any]" = OrderedDict()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __getitem__(self, version: str):
+        if version in self.cache:
+            self.cache.move_to_end(version)
+            self.hits += 1
+            return self.cache[version]
+        if version not in self.versions:
+            raise KeyError(version)
+        
+        self.misses += 1
+        schema = self.loader(version)
+        self._cache_put(version, schema)
+        return schema
+    
+    def __setitem__(self, version: str, schema):
+        self.versions.add(version)
+        self._cache_put(version, schema)
+    
+    def __delitem__(self, version: str):
+        self.versions.remove(version)
+        self.cache.pop(version, None)
+    
+    def __contains__(self, version) -> bool:
+        return version in self.versions
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.versions)
+    
+    def __len__(self) -> int:
+        return len(self.versions)
+    
+    def add_version(self, version: str):
+        """Register a version whose body is loaded on first access"""
+        self.versions.add(version)
+    
+    def clear(self):
+        self.versions.clear()
+        self.cache.clear()
+    
+    def _cache_put(self, version: str, schema):
+        self.cache[version] = schema
+        self.cache.move_to_end(version)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+
 class SchemaRegistry:
-    """Schema registry for managing schema definitions and versions"""
+    """
+    Schema registry for managing schema definitions and versions
+    
+    Startup reads only the registry index: schema bodies are deserialized
+    lazily by LazySchemaCache, and hash lookups use an in-memory
+    hash -> version map. Index changes are appended to registry_index.log
+    and folded into registry_index.json by an atomic compaction (write temp
+    file, then rename) every index_compaction_threshold records.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -58,13 +134,21 @@ class SchemaRegistry:
         self.auto_backup = config.get("auto_backup", True)
         self.max_versions = config.get("max_versions", 10)
         self.compression_enabled = config.get("compression", False)
+        self.schema_cache_size = config.get("schema_cache_size", 32)
+        self.index_compaction_threshold = config.get("index_compaction_threshold", 100)
         
         # Internal state
-        self.schemas: Dict[str, Any] = {}  # version -> schema
+        self.schemas = LazySchemaCache(self._load_schema_file, self.schema_cache_size)  # version -> schema
         self.metadata: Dict[str, SchemaMetadata] = {}  # version -> metadata
+        self.hash_index: Dict[str, str] = {}  # schema hash -> version
         self.version_history: List[str] = []
         self.active_version: Optional[str] = None
         
+        # Index log state
+        self.index_sequence = 0  # Sequence number of the last index record
+        self.index_log_records = 0  # Records appended since the last compaction
+        self.index_compactions = 0
+        
         # Registry loaded flag
         self.registry_loaded = False
         
@@ -125,15 +209,15 @@ class SchemaRegistry:
                 logger.warning(f"Schema with same hash already exists: {existing_hash}")
             
             # Store schema and metadata
+            record = {"op": "register", "version": version, "metadata": asdict(schema_metadata)}
+            self._apply_index_record(record)
             self.schemas[version] = schema_definition
-            self.metadata[version] = schema_metadata
-            self.version_history.append(version)
             
             # Persist to storage
             await self._persist_schema(version, schema_definition, schema_metadata)
             
             # Update registry index
-            await self._update_registry_index()
+            await self._append_index_record(record)
             
             # Set as active if first schema or explicitly requested
             if not self.active_version or (metadata and metadata.get("set_active", False)):
@@ -230,16 +314,12 @@ class SchemaRegistry:
         if version not in self.schemas:
             raise SchemaNotFoundError(f"Schema version {version} not found")
         
-        # Update metadata for previous active version
-        if self.active_version and self.active_version in self.metadata:
-            self.metadata[self.active_version].is_active = False
-        
         # Set new active version
-        self.active_version = version
-        self.metadata[version].is_active = True
+        record = {"op": "activate", "version": version}
+        self._apply_index_record(record)
         
         # Persist changes
-        await self._update_registry_index()
+        await self._append_index_record(record)
         
         logger.info(f"Active schema version set to {version}")
         return True
@@ -284,15 +364,14 @@ class SchemaRegistry:
         
         try:
             # Remove from memory
-            del self.schemas[version]
-            del self.metadata[version]
-            self.version_history.remove(version)
+            record = {"op": "delete", "version": version}
+            self._apply_index_record(record)
             
             # Remove from storage
             await self._delete_schema_file(version)
             
             # Update registry index
-            await self._update_registry_index()
+            await self._append_index_record(record)
             
             logger.info(f"Schema version {version} deleted successfully")
             return True
@@ -310,6 +389,9 @@ class SchemaRegistry:
         logger.info(f"Creating registry backup at {backup_path}")
         
         try:
+            # Fold the index log into the index so the backup is self-contained
+            await self.compact_registry_index()
+            
             # Create backup directory
             backup_dir = Path(backup_path)
             backup_dir.mkdir(parents=True, exist_ok=True)
@@ -339,7 +421,7 @@ class SchemaRegistry:
         registry_dir.mkdir(parents=True, exist_ok=True)
     
     async def _load_registry(self):
-        """Load existing registry from storage"""
+        """Load registry index and replay the index log; schema bodies load lazily"""
         logger.info("Loading schema registry from storage")
         
         registry_dir = Path(self.registry_path)
@@ -350,33 +432,100 @@ class SchemaRegistry:
             try:
                 index_data = json.loads(index_file.read_text())
                 self.active_version = index_data.get("active_version")
-                self.version_history = index_data.get("version_history", [])
+                self.index_sequence = index_data.get("index_sequence", 0)
                 
                 # Load metadata
                 for version, metadata_dict in index_data.get("metadata", {}).items():
                     self.metadata[version] = SchemaMetadata(**metadata_dict)
+                    self.hash_index.setdefault(self.metadata[version].hash, version)
                 
-            except Exception as e:
-                logger.warning(f"Failed to load registry index: {e}")
-        
-        # Load individual schema files
-        for schema_file in registry_dir.glob("schema_*.json"):
-            try:
-                version = schema_file.stem.replace("schema_", "")
-                schema_data = json.loads(schema_file.read_text())
-                
-                # Reconstruct schema object
-                schema = await self._deserialize_schema(schema_data)
-                self.schemas[version] = schema
-                
-                # Add to version history if not already there
-                if version not in self.version_history:
+                for version in index_data.get("version_history", []):
                     self.version_history.append(version)
+                    self.schemas.add_version(version)
                 
             except Exception as e:
-                logger.warning(f"Failed to load schema file {schema_file}: {e}")
+                logger.warning(f"Failed to load registry index: {e}")
+        else:
+            # No index: discover versions from schema file names without parsing them
+            for schema_file in registry_dir.glob("schema_*.json"):
+                version = schema_file.stem.replace("schema_", "")
+                self.version_history.append(version)
+                self.schemas.add_version(version)
         
-        logger.info(f"Loaded {len(self.schemas)} schemas from registry")
+        # Replay changes appended since the last compaction
+        log_file = registry_dir / "registry_index.log"
+        if log_file.exists():
+            with open(log_file, "rb") as f:
+                data = f.read()
+            
+            valid_end = 0
+            for line in data.split(b"\n")[:-1]:  # The part after the last newline is incomplete
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn record: nothing after it was acknowledged
+                valid_end += len(line) + 1
+                
+                # Records already folded in by a compaction that crashed before truncating the log
+                if record["sequence"] <= self.index_sequence:
+                    continue
+                self._apply_index_record(record)
+                self.index_sequence = record["sequence"]
+                self.index_log_records += 1
+            
+            if valid_end < len(data):
+                # Cut the torn tail so new records are not appended after it
+                logger.warning(f"Registry index log has a torn tail at byte {valid_end}, truncating")
+                with open(log_file, "r+b") as f:
+                    f.truncate(valid_end)
+                    f.flush()
+                    os.fsync(f.fileno())
+        
+        logger.info(f"Loaded {len(self.schemas)} schema versions from registry index")
+    
+    def _apply_index_record(self, record: Dict[str, Any]):
+        """Apply a register/activate/delete record to the in-memory index"""
+        version = record["version"]
+        
+        if record["op"] == "register":
+            if version not in self.schemas:
+                self.version_history.append(version)
+            metadata = SchemaMetadata(**record["metadata"])
+            self.metadata[version] = metadata
+            self.hash_index.setdefault(metadata.hash, version)
+            self.schemas.add_version(version)
+        
+        elif record["op"] == "activate":
+            # Update metadata for previous active version
+            if self.active_version and self.active_version in self.metadata:
+                self.metadata[self.active_version].is_active = False
+            self.active_version = version
+            if version in self.metadata:
+                self.metadata[version].is_active = True
+        
+        elif record["op"] == "delete":
+            metadata = self.metadata.pop(version, None)
+            if version in self.schemas:
+                del self.schemas[version]
+            if version in self.version_history:
+                self.version_history.remove(version)
+            if metadata and self.hash_index.get(metadata.hash) == version:
+                del self.hash_index[metadata.hash]
+                # Another version may share the hash
+                for other_version in self.version_history:
+                    other_metadata = self.metadata.get(other_version)
+                    if other_metadata and other_metadata.hash == metadata.hash:
+                        self.hash_index[metadata.hash] = other_version
+                        break
+    
+    def _load_schema_file(self, version: str):
+        """Read and deserialize one schema body (LazySchemaCache loader)"""
+        schema_file = Path(self.registry_path) / f"schema_{version}.json"
+        try:
+            schema_data = json.loads(schema_file.read_text())
+        except Exception as e:
+            raise SchemaRegistryError(f"Failed to load schema file {schema_file}: {e}")
+        return self._build_schema(schema_data)
     
     async def _initialize_default_schema(self):
         """Initialize default schema"""
@@ -415,10 +564,7 @@ class SchemaRegistry:
     
     async def _find_schema_by_hash(self, schema_hash: str) -> Optional[str]:
         """Find schema version by hash"""
-        for version, metadata in self.metadata.items():
-            if metadata.hash == schema_hash:
-                return version
-        return None
+        return self.hash_index.get(schema_hash)
     
     async def _persist_schema(self, version: str, schema_definition, metadata: SchemaMetadata):
         """Persist schema to storage"""
@@ -433,10 +579,26 @@ class SchemaRegistry:
         
         logger.debug(f"Schema {version} persisted to {schema_file}")
     
-    async def _update_registry_index(self):
-        """Update registry index file"""
+    async def _append_index_record(self, record: Dict[str, Any]):
+        """Append one change to the index log, compacting when the log grows too long"""
+        self.index_sequence += 1
+        record = {"sequence": self.index_sequence, **record}
+        
+        log_file = Path(self.registry_path) / "registry_index.log"
+        with open(log_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.index_log_records += 1
+        
+        if self.index_log_records >= self.index_compaction_threshold:
+            await self.compact_registry_index()
+    
+    async def compact_registry_index(self):
+        """Fold the index log into registry_index.json (write temp file, then rename)"""
         registry_dir = Path(self.registry_path)
         index_file = registry_dir / "registry_index.json"
+        temp_file = registry_dir / "registry_index.json.tmp"
         
         # Prepare index data
         index_data = {
@@ -446,13 +608,24 @@ class SchemaRegistry:
                 version: asdict(metadata)
                 for version, metadata in self.metadata.items()
             },
+            "index_sequence": self.index_sequence,
             "last_updated": time.time()
         }
         
-        # Write index file
-        index_file.write_text(json.dumps(index_data, indent=2))
+        with open(temp_file, "w") as f:
+            json.dump(index_data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, index_file)
         
-        logger.debug(f"Registry index updated at {index_file}")
+        # Records up to index_sequence are now in the index; replay skips them if truncation is lost
+        log_file = registry_dir / "registry_index.log"
+        if log_file.exists():
+            log_file.write_text("")
+        self.index_log_records = 0
+        self.index_compactions += 1
+        
+        logger.debug(f"Registry index compacted at {index_file}")
     
     async def _cleanup_old_versions(self):
         """Cleanup old schema versions if limit exceeded"""
@@ -510,6 +683,10 @@ class SchemaRegistry:
     
     async def _deserialize_schema(self, schema_data: Dict[str, Any]):
         """Deserialize schema definition from JSON format"""
+        return self._build_schema(schema_data)
+    
+    def _build_schema(self, schema_data: Dict[str, Any]):
+        """Reconstruct a SchemaDefinition from its serialized form"""
         try:
             from schema_validator import SchemaDefinition, SchemaField, SchemaVersion
         except ImportError:
@@ -548,7 +725,13 @@ class SchemaRegistry:
             "registry_loaded": self.registry_loaded,
             "version_history_count": len(self.version_history),
             "auto_backup_enabled": self.auto_backup,
-            "max_versions": self.max_versions
+            "max_versions": self.max_versions,
+            "cached_schemas": len(self.schemas.cache),
+            "schema_cache_hits": self.schemas.hits,
+            "schema_cache_misses": self.schemas.misses,
+            "schema_cache_evictions": self.schemas.evictions,
+            "index_log_records": self.index_log_records,
+            "index_compactions": self.index_compactions
         }
     
     async def cleanup(self):
@@ -563,9 +746,17 @@ class SchemaRegistry:
             except Exception as e:
                 logger.warning(f"Auto-backup failed during cleanup: {e}")
         
+        # Fold pending index records into the index
+        if self.registry_loaded and self.index_log_records:
+            try:
+                await self.compact_registry_index()
+            except Exception as e:
+                logger.warning(f"Registry index compaction failed during cleanup: {e}")
+        
         # Clear memory
         self.schemas.clear()
         self.metadata.clear()
+        self.hash_index.clear()
         self.version_history.clear()
         self.active_version = None
         self.registry_loaded = False
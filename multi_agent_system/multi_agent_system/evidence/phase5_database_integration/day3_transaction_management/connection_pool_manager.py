@@ -4,10 +4,13 @@ Advanced connection pooling with health monitoring and distributed transaction s
 """
 
 import asyncio
+import math
 import time
 import logging
 import uuid
-from typing import Dict, Any, Optional, List, Set, Callable
+import sqlite3
+from collections import deque
+from typing import Dict, Any, Optional, List, Set, Callable, Deque
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
@@ -79,6 +82,108 @@ class PoolMetrics:
     avg_response_time: float = 0.0
     peak_usage: int = 0
     uptime: float = 0.0
+    total_wait_time: float = 0.0
+    waited_requests: int = 0  # Acquires that had to queue for a connection
+    timeouts: int = 0
+    in_use: int = 0  # Connections currently handed out to callers
+    interval_peak_in_use: int = 0  # Peak in_use since the last sizing sample
+
+
+@dataclass
+class PoolSizingSample:
+    """Pool activity over one sizing interval"""
+    requests: int
+    waited_requests: int
+    timeouts: int
+    avg_wait_time: float
+    utilization: float  # Peak connections in use / pool size
+    queue_length: int
+    pool_size: int
+
+
+@dataclass
+class AdaptiveSizingConfig:
+    """Configuration for adaptive pool sizing"""
+    interval: float = 1.0
+    grow_wait_threshold: float = 0.005  # Average acquire wait (s) that triggers growth
+    grow_utilization: float = 0.8  # Peak utilization that triggers growth before queueing starts
+    shrink_utilization: float = 0.3  # Peak utilization below which an interval counts as calm
+    grow_step_ratio: float = 0.5  # Grow by this fraction of the current size (at least 1)
+    shrink_step: int = 1
+    shrink_after_intervals: int = 3  # Consecutive calm intervals required before shrinking
+    database_caps: Dict[str, int] = field(default_factory=dict)  # database_type -> max connections
+
+
+class AdaptivePoolSizer:
+    """
+    Target pool size controller fed by PoolMetrics
+    
+    Grows quickly on pressure (queued or timed-out acquires, slow waits or
+    utilization above grow_utilization) and shrinks one step at a time after
+    shrink_after_intervals calm intervals. Utilization between the two
+    thresholds holds the current size, which gives the controller hysteresis.
+    """
+    
+    def __init__(self, config: AdaptiveSizingConfig, min_size: int, max_size: int):
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.target = min_size
+        self.history: List[int] = []
+        self._calm_intervals = 0
+        self._last_requests = 0
+        self._last_waited = 0
+        self._last_timeouts = 0
+        self._last_wait_time = 0.0
+    
+    def sample(self, metrics: PoolMetrics, queue_length: int, pool_size: int) -> PoolSizingSample:
+        """Turn cumulative pool metrics into a sample for the interval since the last call"""
+        requests = metrics.total_requests - self._last_requests
+        waited = metrics.waited_requests - self._last_waited
+        wait_time = metrics.total_wait_time - self._last_wait_time
+        sample = PoolSizingSample(
+            requests=requests,
+            waited_requests=waited,
+            timeouts=metrics.timeouts - self._last_timeouts,
+            avg_wait_time=wait_time / requests if requests else 0.0,
+            utilization=metrics.interval_peak_in_use / max(pool_size, 1),
+            queue_length=queue_length,
+            pool_size=pool_size
+        )
+        
+        self._last_requests = metrics.total_requests
+        self._last_waited = metrics.waited_requests
+        self._last_timeouts = metrics.timeouts
+        self._last_wait_time = metrics.total_wait_time
+        metrics.interval_peak_in_use = metrics.in_use
+        return sample
+    
+    def evaluate(self, sample: PoolSizingSample) -> int:
+        """Update and return the target size for one interval"""
+        config = self.config
+        pressured = (sample.timeouts > 0 or sample.queue_length > 0 or
+                     sample.avg_wait_time > config.grow_wait_threshold or
+                     sample.utilization >= config.grow_utilization)
+        
+        if pressured:
+            self._calm_intervals = 0
+            step = max(1, math.ceil(self.target * config.grow_step_ratio))
+            self.target = min(self.max_size, self.target + step)
+        elif sample.utilization <= config.shrink_utilization:
+            self._calm_intervals += 1
+            if self._calm_intervals >= config.shrink_after_intervals:
+                self._calm_intervals = 0
+                self.target = max(self.min_size, self.target - config.shrink_step)
+        else:
+            self._calm_intervals = 0
+        
+        self.history.append(self.target)
+        return self.target
+    
+    def note_demand(self, required: int) -> int:
+        """Raise the target to cover the connections that current demand needs"""
+        self.target = min(self.max_size, max(self.target, required))
+        return self.target
 
 
 class DatabaseConnection(ABC):
@@ -236,8 +341,99 @@ class PostgreSQLConnection(DatabaseConnection):
             return False
 
 
+class SQLiteConnection(DatabaseConnection):
+    """SQLite database connection implementation (local, no server required)"""
+    
+    async def connect(self) -> bool:
+        """Open SQLite database"""
+        try:
+            database_path = self.config.get("database_path", ":memory:")
+            logger.debug(f"Connecting SQLite connection {self.connection_id} to {database_path}")
+            # Autocommit mode; transactions are explicit BEGIN/COMMIT/ROLLBACK
+            self._connection = sqlite3.connect(database_path, check_same_thread=False, isolation_level=None)
+            self.state = ConnectionState.IDLE
+            return True
+        except Exception as e:
+            logger.error(f"SQLite connection failed: {e}")
+            self.state = ConnectionState.INVALID
+            return False
+    
+    async def disconnect(self) -> bool:
+        """Close SQLite database"""
+        try:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+            self.state = ConnectionState.CLOSED
+            logger.debug(f"Disconnected SQLite connection {self.connection_id}")
+            return True
+        except Exception as e:
+            logger.error(f"SQLite disconnect failed: {e}")
+            return False
+    
+    async def execute(self, query: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Execute SQLite query"""
+        if self.state != ConnectionState.ACTIVE:
+            raise ConnectionError(f"Connection {self.connection_id} not active")
+        
+        try:
+            cursor = self._connection.execute(query, params or {})
+            rows = cursor.fetchall()
+            return {"rows_affected": cursor.rowcount, "data": rows}
+        except Exception as e:
+            logger.error(f"SQLite query execution failed: {e}")
+            raise ConnectionError(f"Query execution failed: {e}")
+    
+    async def begin_transaction(self, transaction_id: str) -> bool:
+        """Begin SQLite transaction"""
+        try:
+            self._connection.execute("BEGIN")
+            return True
+        except Exception as e:
+            logger.error(f"SQLite begin transaction failed: {e}")
+            return False
+    
+    async def commit_transaction(self, transaction_id: str) -> bool:
+        """Commit SQLite transaction"""
+        try:
+            self._connection.execute("COMMIT")
+            return True
+        except Exception as e:
+            logger.error(f"SQLite commit failed: {e}")
+            return False
+    
+    async def rollback_transaction(self, transaction_id: str) -> bool:
+        """Rollback SQLite transaction"""
+        try:
+            self._connection.execute("ROLLBACK")
+            return True
+        except Exception as e:
+            logger.error(f"SQLite rollback failed: {e}")
+            return False
+    
+    async def health_check(self) -> bool:
+        """Check SQLite connection health"""
+        try:
+            if not self._connection:
+                return False
+            self._connection.execute("SELECT 1").fetchone()
+            return True
+        except Exception as e:
+            logger.warning(f"SQLite health check failed: {e}")
+            return False
+
+
 class ConnectionPool:
-    """Advanced connection pool with health monitoring"""
+    """
+    Advanced connection pool with health monitoring
+    
+    Idle connections are kept in a LIFO deque so acquire/release are O(1) and
+    the most recently used (warmest) connection is reused first. Waiters sit
+    in a FIFO deque of futures and a released connection is handed directly
+    to the oldest waiter. Connections are only validated on acquire when they
+    have been idle longer than validation_idle_threshold; routine health
+    checking happens in the background health check loop.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -250,17 +446,33 @@ class ConnectionPool:
         self.health_check_interval = config.get("health_check_interval", 60.0)  # 1 minute
         self.max_connection_age = config.get("max_connection_age", 3600.0)  # 1 hour
         self.database_type = config.get("database_type", "postgresql")
+        self.validation_idle_threshold = config.get("validation_idle_threshold", 30.0)
+        
+        # Adaptive sizing: target size moves between min_connections and the per-database cap
+        self.sizer: Optional[AdaptivePoolSizer] = None
+        adaptive_config = config.get("adaptive_sizing")
+        if adaptive_config:
+            sizing_config = (adaptive_config if isinstance(adaptive_config, AdaptiveSizingConfig)
+                             else AdaptiveSizingConfig(**adaptive_config))
+            cap = min(self.max_connections,
+                      sizing_config.database_caps.get(self.database_type, self.max_connections))
+            self.sizer = AdaptivePoolSizer(sizing_config, self.min_connections, cap)
+        self.target_size = self.min_connections
         
         # Pool state
         self.state = PoolState.INITIALIZING
         self.connections: Dict[str, DatabaseConnection] = {}
         self.connection_metrics: Dict[str, ConnectionMetrics] = {}
         self.pool_metrics = PoolMetrics()
-        self.wait_queue: List[asyncio.Future] = []
+        self.idle_connections: Deque[DatabaseConnection] = deque()  # LIFO: append/pop on the right
+        self.wait_queue: Deque[asyncio.Future] = deque()  # FIFO
+        self._pending_creations = 0
         
         # Background tasks
         self._health_check_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
+        self._sizing_task: Optional[asyncio.Task] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
         self._started_at = time.time()
         
         logger.info(f"Connection pool initialized: {self.min_connections}-{self.max_connections} connections")
@@ -275,10 +487,13 @@ class ConnectionPool:
                 connection = await self._create_connection()
                 if connection:
                     await self._add_connection(connection)
+                    self.idle_connections.append(connection)
             
             # Start background tasks
             self._health_check_task = asyncio.create_task(self._health_check_loop())
             self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+            if self.sizer:
+                self._sizing_task = asyncio.create_task(self._sizing_loop())
             
             self.state = PoolState.ACTIVE
             self.pool_metrics.uptime = time.time() - self._started_at
@@ -307,9 +522,19 @@ class ConnectionPool:
                 await self._update_pool_metrics(wait_time, True)
                 return connection
             
-            # Create new connection if under limit
-            if len(self.connections) < self.max_connections:
-                connection = await self._create_connection()
+            # Adaptive pools grow in the background and hand the new connection to the waiter;
+            # demand is every connection plus one per queued acquire, this one included
+            if self.sizer:
+                self.target_size = self.sizer.note_demand(len(self.connections) + len(self.wait_queue) + 1)
+                self._schedule_prewarm()
+            
+            # Create new connection if under limit (the slot is reserved while connecting)
+            elif len(self.connections) + self._pending_creations < self.max_connections:
+                self._pending_creations += 1
+                try:
+                    connection = await self._create_connection()
+                finally:
+                    self._pending_creations -= 1
                 if connection:
                     await self._add_connection(connection)
                     connection.mark_active(transaction_id)
@@ -318,8 +543,8 @@ class ConnectionPool:
                     await self._update_pool_metrics(wait_time, True)
                     return connection
             
-            # Wait for available connection
-            future = asyncio.Future()
+            # Wait for a released connection to be handed over
+            future = asyncio.get_running_loop().create_future()
             self.wait_queue.append(future)
             
             try:
@@ -327,12 +552,16 @@ class ConnectionPool:
                 connection.mark_active(transaction_id)
                 
                 wait_time = time.time() - start_time
+                self.pool_metrics.waited_requests += 1
                 await self._update_pool_metrics(wait_time, True)
                 return connection
                 
             except asyncio.TimeoutError:
-                if future in self.wait_queue:
+                try:
                     self.wait_queue.remove(future)
+                except ValueError:
+                    pass
+                self.pool_metrics.timeouts += 1
                 raise ConnectionTimeoutError(f"Connection acquisition timed out after {timeout}s")
             
         except Exception as e:
@@ -342,6 +571,8 @@ class ConnectionPool:
     async def release_connection(self, connection: DatabaseConnection):
         """Release connection back to pool"""
         try:
+            if connection.state == ConnectionState.ACTIVE and self.pool_metrics.in_use > 0:
+                self.pool_metrics.in_use -= 1
             connection.mark_idle()
             
             # Update connection metrics
@@ -352,11 +583,8 @@ class ConnectionPool:
                 metrics.state = ConnectionState.IDLE
                 metrics.transaction_id = None
             
-            # Notify waiting clients
-            if self.wait_queue:
-                future = self.wait_queue.pop(0)
-                if not future.cancelled():
-                    future.set_result(connection)
+            if connection.connection_id in self.connections:
+                self._return_to_pool(connection)
             
             logger.debug(f"Released connection {connection.connection_id}")
             
@@ -374,17 +602,40 @@ class ConnectionPool:
         finally:
             await self.release_connection(connection)
     
+    def _return_to_pool(self, connection: DatabaseConnection):
+        """Hand an idle connection to the oldest waiter, or park it in the idle deque"""
+        while self.wait_queue:
+            future = self.wait_queue.popleft()
+            if not future.done():
+                # Reserved for the waiter until it resumes and marks it with its transaction
+                connection.mark_active()
+                future.set_result(connection)
+                return
+        self.idle_connections.append(connection)
+    
     async def _get_available_connection(self, transaction_id: Optional[str] = None) -> Optional[DatabaseConnection]:
-        """Get available connection from pool"""
-        for connection in self.connections.values():
-            if connection.is_available():
-                # Check if connection is still healthy
-                if await connection.health_check():
-                    connection.mark_active(transaction_id)
-                    return connection
-                else:
-                    # Mark as invalid and continue
+        """Get the most recently used idle connection from the pool"""
+        while self.idle_connections:
+            connection = self.idle_connections.pop()
+            
+            # Skip entries removed by cleanup or invalidated while parked
+            if connection.connection_id not in self.connections or not connection.is_available():
+                continue
+            
+            # Only validate connections that have sat idle long enough to have gone stale
+            if time.time() - connection.last_used_at > self.validation_idle_threshold:
+                connection.state = ConnectionState.TESTING
+                try:
+                    healthy = await connection.health_check()
+                except Exception:
+                    healthy = False
+                if not healthy:
                     connection.mark_invalid()
+                    await self._remove_connection(connection.connection_id)
+                    continue
+            
+            connection.mark_active(transaction_id)
+            return connection
         
         return None
     
@@ -395,6 +646,8 @@ class ConnectionPool:
             
             if self.database_type == "postgresql":
                 connection = PostgreSQLConnection(connection_id, self.config)
+            elif self.database_type == "sqlite":
+                connection = SQLiteConnection(connection_id, self.config)
             else:
                 raise ValueError(f"Unsupported database type: {self.database_type}")
             
@@ -467,8 +720,12 @@ class ConnectionPool:
         
         if success:
             self.pool_metrics.successful_requests += 1
+            self.pool_metrics.in_use += 1
+            if self.pool_metrics.in_use > self.pool_metrics.interval_peak_in_use:
+                self.pool_metrics.interval_peak_in_use = self.pool_metrics.in_use
         else:
             self.pool_metrics.failed_requests += 1
+        self.pool_metrics.total_wait_time += wait_time
         
         # Update average wait time
         total_wait_time = self.pool_metrics.avg_wait_time * (self.pool_metrics.total_requests - 1)
@@ -491,34 +748,47 @@ class ConnectionPool:
         """Perform health checks on all connections"""
         logger.debug("Performing connection health checks")
         
-        invalid_connections = []
+        # Take idle connections out of circulation while they are tested
+        parked = list(self.idle_connections)
+        self.idle_connections.clear()
         
-        for connection_id, connection in self.connections.items():
-            if connection.state != ConnectionState.ACTIVE:  # Don't check active connections
-                try:
-                    connection.state = ConnectionState.TESTING
-                    healthy = await connection.health_check()
-                    
-                    if healthy:
-                        connection.state = ConnectionState.IDLE
-                    else:
-                        connection.mark_invalid()
-                        invalid_connections.append(connection_id)
-                        
-                except Exception as e:
-                    logger.warning(f"Health check failed for connection {connection_id}: {e}")
+        for connection in parked:
+            connection_id = connection.connection_id
+            if connection_id not in self.connections or not connection.is_available():
+                continue
+            try:
+                connection.state = ConnectionState.TESTING
+                healthy = await connection.health_check()
+                
+                if healthy:
+                    connection.state = ConnectionState.IDLE
+                else:
                     connection.mark_invalid()
-                    invalid_connections.append(connection_id)
+                    
+            except Exception as e:
+                logger.warning(f"Health check failed for connection {connection_id}: {e}")
+                connection.mark_invalid()
+        
+        invalid_connections = [
+            connection_id for connection_id, connection in self.connections.items()
+            if connection.state == ConnectionState.INVALID
+        ]
         
         # Remove invalid connections
         for connection_id in invalid_connections:
             await self._remove_connection(connection_id)
         
+        # Return healthy connections to circulation in their previous order
+        for connection in parked:
+            if connection.connection_id in self.connections and connection.is_available():
+                self._return_to_pool(connection)
+        
         # Ensure minimum connections
         while len(self.connections) < self.min_connections:
             connection = await self._create_connection()
             if connection:
                 await self._add_connection(connection)
+                self._return_to_pool(connection)
             else:
                 break  # Can't create connections, pool is degraded
         
@@ -530,6 +800,64 @@ class ConnectionPool:
         
         self._update_connection_counts()
     
+    async def _sizing_loop(self):
+        """Background loop that re-evaluates the target pool size"""
+        while self.state != PoolState.SHUTDOWN:
+            try:
+                await asyncio.sleep(self.sizer.config.interval)
+                await self.adjust_pool_size()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Pool sizing loop error: {e}")
+    
+    async def adjust_pool_size(self) -> int:
+        """
+        Evaluate one sizing interval and move the pool toward the new target
+        
+        Returns:
+            The new target pool size
+        """
+        if not self.sizer:
+            return self.target_size
+        
+        pool_size = len(self.connections) + self._pending_creations
+        sample = self.sizer.sample(self.pool_metrics, len(self.wait_queue), pool_size)
+        self.target_size = self.sizer.evaluate(sample)
+        
+        if self.target_size > pool_size:
+            self._schedule_prewarm()
+        else:
+            # Shrink by closing the least recently used idle connections
+            excess = pool_size - self.target_size
+            while excess > 0 and self.idle_connections:
+                connection = self.idle_connections.popleft()
+                if connection.connection_id in self.connections and connection.is_available():
+                    await self._remove_connection(connection.connection_id)
+                    excess -= 1
+        
+        logger.debug(f"Pool sizing: {sample} -> target {self.target_size}")
+        return self.target_size
+    
+    def _schedule_prewarm(self):
+        """Start background connection creation up to the target size if not already running"""
+        if self._prewarm_task is None or self._prewarm_task.done():
+            self._prewarm_task = asyncio.create_task(self._prewarm_connections())
+    
+    async def _prewarm_connections(self):
+        """Create connections until the pool reaches its target size"""
+        while (self.state != PoolState.SHUTDOWN and
+               len(self.connections) + self._pending_creations < self.target_size):
+            self._pending_creations += 1
+            try:
+                connection = await self._create_connection()
+            finally:
+                self._pending_creations -= 1
+            if connection is None:
+                break
+            await self._add_connection(connection)
+            self._return_to_pool(connection)
+    
     async def _cleanup_loop(self):
         """Background cleanup loop for idle and old connections"""
         while self.state != PoolState.SHUTDOWN:
@@ -559,7 +887,7 @@ class ConnectionPool:
             # Remove idle connections if we have more than minimum
             if (connection.state == ConnectionState.IDLE and 
                 current_time - connection.last_used_at > self.idle_timeout and
-                len(self.connections) > self.min_connections):
+                len(self.connections) > max(self.min_connections, self.target_size if self.sizer else 0)):
                 connections_to_remove.append(connection_id)
         
         # Remove selected connections
@@ -600,7 +928,11 @@ class ConnectionPool:
             "avg_response_time": avg_response_time,
             "peak_usage": self.pool_metrics.peak_usage,
             "uptime": self.pool_metrics.uptime,
-            "queue_length": len(self.wait_queue)
+            "queue_length": len(self.wait_queue),
+            "in_use": self.pool_metrics.in_use,
+            "timeouts": self.pool_metrics.timeouts,
+            "target_size": self.target_size,
+            "adaptive_sizing": self.sizer is not None
         }
     
     async def shutdown(self):
@@ -610,6 +942,14 @@ class ConnectionPool:
         self.state = PoolState.SHUTDOWN
         
         # Cancel background tasks
+        for task in (self._sizing_task, self._prewarm_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        
         if self._health_check_task:
             self._health_check_task.cancel()
             try:
@@ -626,9 +966,10 @@ class ConnectionPool:
         
         # Cancel waiting requests
         for future in self.wait_queue:
-            if not future.cancelled():
+            if not future.done():
                 future.cancel()
         self.wait_queue.clear()
+        self.idle_connections.clear()
         
         # Close all connections
         for connection_id in list(self.connections.keys()):
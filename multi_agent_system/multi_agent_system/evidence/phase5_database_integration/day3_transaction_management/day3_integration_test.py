@@ -8,9 +8,13 @@ import asyncio
 import tempfile
 import shutil
 import time
-from transaction_manager import TransactionManager, IsolationLevel, TransactionOperation, DatabaseParticipant
-from connection_pool_manager import ConnectionPool, PostgreSQLConnection
-from distributed_transaction_coordinator import DistributedTransactionCoordinator, DistributedTransactionParticipant
+from transaction_manager import (TransactionManager, IsolationLevel, TransactionOperation, DatabaseParticipant,
+                                 LockManager, LockMode, TransactionDeadlockError, TransactionTimeoutError)
+from connection_pool_manager import (ConnectionPool, PostgreSQLConnection, AdaptivePoolSizer,
+                                     AdaptiveSizingConfig, PoolSizingSample, ConnectionTimeoutError)
+from distributed_transaction_coordinator import (DistributedTransactionCoordinator, DistributedTransactionParticipant,
+                                                DistributedTransactionError, GlobalTransactionState)
+from write_ahead_log import WriteAheadLog, WALConfiguration, WALError
 
 
 async def test_transaction_manager():
@@ -99,12 +103,146 @@ async def test_transaction_manager():
         
         await manager.cleanup()
         return True
-        
+    
     except Exception as e:
         print(f"❌ Transaction manager test failed: {e}")
         return False
 
 
+async def test_lock_manager():
+    """Test shared/exclusive locking, FIFO hand-off and deadlock victims"""
+    print("🔧 Testing Lock Manager...")
+    
+    try:
+        # Shared locks are held together; an exclusive request waits for both
+        locks = LockManager()
+        assert await locks.acquire("orders", "r1", LockMode.SHARED)
+        assert await locks.acquire("orders", "r2", LockMode.SHARED)
+        writer = asyncio.create_task(locks.acquire("orders", "w1", LockMode.EXCLUSIVE))
+        await asyncio.sleep(0)
+        assert not writer.done(), "Writer should wait for readers"
+        
+        # A later reader queues behind the writer instead of starving it
+        late_reader = asyncio.create_task(locks.acquire("orders", "r3", LockMode.SHARED))
+        await asyncio.sleep(0)
+        assert locks.wait_for["r3"]["orders"] == {"w1"}
+        
+        locks.release("orders", "r1")
+        await asyncio.sleep(0)
+        assert not writer.done()
+        locks.release("orders", "r2")
+        await asyncio.sleep(0)
+        assert writer.done() and not late_reader.done()
+        locks.release_all("w1")
+        await asyncio.sleep(0)
+        assert late_reader.done()
+        locks.release_all("r3")
+        assert not locks.resources and not locks.wait_for
+        print("✅ Concurrent readers with FIFO hand-off to writers")
+        
+        # Intent locks and conversion: IX + S on the same table becomes SIX
+        assert await locks.acquire("accounts", "t1", LockMode.INTENT_EXCLUSIVE)
+        assert await locks.acquire("accounts", "t2", LockMode.INTENT_SHARED)
+        assert not await locks.acquire("accounts", "t3", LockMode.SHARED, wait=False)
+        locks.release_all("t3")
+        assert await locks.acquire("accounts", "t1", LockMode.SHARED)
+        assert locks.locks_held("t1")["accounts"] == LockMode.SHARED_INTENT_EXCLUSIVE
+        
+        upgrade = asyncio.create_task(locks.acquire("accounts", "t1", LockMode.EXCLUSIVE))
+        await asyncio.sleep(0)
+        assert not upgrade.done(), "Upgrade should wait for the other intent holder"
+        locks.release_all("t2")
+        await asyncio.sleep(0)
+        assert upgrade.done() and locks.locks_held("t1")["accounts"] == LockMode.EXCLUSIVE
+        locks.release_all("t1")
+        
+        try:
+            await locks.acquire("accounts", "t1", LockMode.EXCLUSIVE)
+            await locks.acquire("accounts", "t2", LockMode.SHARED, timeout=0.01)
+            assert False, "Lock wait should time out"
+        except TransactionTimeoutError:
+            assert "t2" not in locks.pending_requests
+        locks.release_all("t1")
+        print("✅ Intent modes, upgrades and lock wait timeouts working")
+        
+        # Deadlock victim policies on a three-transaction cycle
+        for policy, expected_victim in (("requester", "c"), ("youngest", "c"), ("fewest_locks", "b")):
+            locks = LockManager(victim_policy=policy)
+            await locks.acquire("x", "a")
+            await locks.acquire("x2", "a")
+            await locks.acquire("y", "b")
+            await locks.acquire("z", "c")
+            await locks.acquire("z2", "c")
+            waiters = {
+                "a": asyncio.create_task(locks.acquire("y", "a")),
+                "b": asyncio.create_task(locks.acquire("z", "b"))
+            }
+            await asyncio.sleep(0)
+            waiters["c"] = asyncio.create_task(locks.acquire("x", "c"))  # Closes the cycle
+            await asyncio.sleep(0.001)
+            
+            victims = [name for name, task in waiters.items()
+                       if task.done() and isinstance(task.exception(), TransactionDeadlockError)]
+            assert victims == [expected_victim], f"{policy}: victims {victims}, expected {expected_victim}"
+            assert locks.deadlocks_detected == 1
+            
+            # Aborting the victim lets the rest of the cycle proceed
+            for name in [expected_victim] + [name for name in "abc" if name != expected_victim]:
+                locks.release_all(name)
+                await asyncio.sleep(0)
+            await asyncio.gather(*waiters.values(), return_exceptions=True)
+            assert not locks.resources
+        
+        # A requester withdrawn as the victim of a nested cycle is not reported as granted
+        locks = LockManager(victim_policy="youngest")
+        await locks.acquire("r1", "w", LockMode.SHARED)
+        await locks.acquire("r2", "z", LockMode.SHARED)
+        await asyncio.sleep(0.001)
+        await locks.acquire("r2", "r", LockMode.SHARED)
+        await asyncio.sleep(0.001)
+        assert not await locks.acquire("r2", "y", LockMode.EXCLUSIVE, wait=False)  # Youngest
+        assert not await locks.acquire("r2", "z", LockMode.EXCLUSIVE, wait=False)  # Conversion, queued first
+        assert not await locks.acquire("r2", "w", LockMode.SHARED, wait=False)
+        try:
+            # Closes r -> w -> y -> r; withdrawing y closes w -> z -> r -> w, whose youngest is r
+            await locks.acquire("r1", "r", LockMode.EXCLUSIVE)
+            assert False, "Withdrawn request should raise"
+        except TransactionDeadlockError:
+            assert "r1" not in locks.locks_held("r") and "r" not in locks.pending_requests
+        assert locks.deadlocks_detected == 2
+        print("✅ Deadlock victim policies: requester, youngest, fewest_locks")
+        
+        # Contention benchmark: 50 readers (10ms each) and 5 writers on one resource
+        async def run_workload(reader_mode: LockMode):
+            locks = LockManager()
+            
+            async def worker(transaction_id: str, mode: LockMode):
+                await locks.acquire("hot_table", transaction_id, mode)
+                await asyncio.sleep(0.01)
+                locks.release_all(transaction_id)
+            
+            workers = [worker(f"reader_{i}", reader_mode) for i in range(50)]
+            for i in range(5):
+                workers.insert(i * 10 + 5, worker(f"writer_{i}", LockMode.EXCLUSIVE))
+            start = time.perf_counter()
+            await asyncio.gather(*workers)
+            return time.perf_counter() - start, locks.get_statistics()
+        
+        exclusive_time, exclusive_stats = await run_workload(LockMode.EXCLUSIVE)
+        shared_time, shared_stats = await run_workload(LockMode.SHARED)
+        assert shared_stats["max_concurrent_holders"] > 1
+        assert shared_time < exclusive_time / 2
+        print(f"✅ Contention benchmark: shared readers {shared_time * 1000:.0f}ms "
+              f"(peak {shared_stats['max_concurrent_holders']} holders) vs all-exclusive "
+              f"{exclusive_time * 1000:.0f}ms ({exclusive_time / shared_time:.1f}x)")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Lock manager test failed: {e}")
+        return False
+
+
 async def test_connection_pool():
     """Test connection pool with health monitoring"""
     print("\n🔧 Testing Connection Pool Management...")
@@ -162,12 +300,220 @@ async def test_connection_pool():
         
         await pool.shutdown()
         return True
-        
+    
     except Exception as e:
         print(f"❌ Connection pool test failed: {e}")
         return False
 
 
+async def test_connection_pool_idle_management():
+    """Test LIFO idle reuse, FIFO waiter hand-off and idle-threshold validation"""
+    print("\n🔧 Testing Connection Pool Idle Management...")
+    
+    config = {
+        "min_connections": 2,
+        "max_connections": 2,
+        "connection_timeout": 2.0,
+        "health_check_interval": 60.0,
+        "validation_idle_threshold": 30.0,
+        "database_type": "sqlite"
+    }
+    
+    pool = ConnectionPool(config)
+    
+    try:
+        await pool.initialize()
+        
+        health_checks = []
+        for conn in pool.connections.values():
+            original_check = conn.health_check
+            
+            async def counted_check(conn_id=conn.connection_id, check=original_check):
+                health_checks.append(conn_id)
+                return await check()
+            conn.health_check = counted_check
+        
+        # The most recently released connection is reused first, without validation
+        first = await pool.acquire_connection()
+        await first.execute("CREATE TABLE items (id INTEGER)")
+        await pool.release_connection(first)
+        again = await pool.acquire_connection()
+        assert again is first, "Idle connections should be reused LIFO"
+        assert health_checks == [], "Recently used connections should not be validated"
+        
+        # With the pool exhausted, waiters are served in arrival order by direct hand-off
+        other = await pool.acquire_connection()
+        served = []
+        
+        async def waiter(name):
+            conn = await pool.acquire_connection(transaction_id=name)
+            served.append((name, conn.current_transaction_id))
+            return conn
+        
+        waiters = [asyncio.create_task(waiter(f"tx_{i}")) for i in range(2)]
+        await asyncio.sleep(0.01)
+        assert len(pool.wait_queue) == 2
+        
+        await pool.release_connection(again)
+        await pool.release_connection(other)
+        handed = await asyncio.gather(*waiters)
+        assert served == [("tx_0", "tx_0"), ("tx_1", "tx_1")], "Waiters should be served FIFO"
+        assert len(pool.idle_connections) == 0, "Released connections should go straight to waiters"
+        
+        # Connections idle past the threshold are validated once on acquire
+        for conn in handed:
+            await pool.release_connection(conn)
+            conn.last_used_at -= 60.0
+        stale = await pool.acquire_connection()
+        assert health_checks == [stale.connection_id]
+        await pool.release_connection(stale)
+        
+        print("✅ LIFO reuse, FIFO hand-off and idle validation working")
+        
+        await pool.shutdown()
+        return True
+    
+    except Exception as e:
+        print(f"❌ Connection pool idle management test failed: {e}")
+        return False
+
+
+async def test_connection_pool_scaling():
+    """Benchmark acquire/release latency as the pool grows"""
+    print("\n📊 Benchmarking Connection Pool Acquire/Release...")
+    
+    try:
+        latencies = {}
+        for pool_size in [4, 64, 512]:
+            pool = ConnectionPool({
+                "min_connections": pool_size,
+                "max_connections": pool_size,
+                "health_check_interval": 3600.0,
+                "database_type": "sqlite"
+            })
+            await pool.initialize()
+            
+            # Keep all but one connection busy so a linear scan would walk the pool
+            held = [await pool.acquire_connection() for _ in range(pool_size - 1)]
+            
+            iterations = 5000
+            start = time.perf_counter()
+            for _ in range(iterations):
+                conn = await pool.acquire_connection()
+                await pool.release_connection(conn)
+            latencies[pool_size] = (time.perf_counter() - start) / iterations * 1e6
+            
+            for conn in held:
+                await pool.release_connection(conn)
+            await pool.shutdown()
+            
+            print(f"   pool size {pool_size:4d}: {latencies[pool_size]:.1f}µs per acquire/release")
+        
+        assert latencies[512] < latencies[4] * 3, "Acquire/release latency should not grow with pool size"
+        print("✅ Acquire/release latency flat across pool sizes")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Connection pool scaling benchmark failed: {e}")
+        return False
+
+
+async def test_adaptive_pool_sizing():
+    """Test adaptive pool sizing with a deterministic load replay against SQLite"""
+    print("\n🔧 Testing Adaptive Pool Sizing...")
+    
+    try:
+        # Controller replay: pressure grows, the middle band holds, calm intervals shrink
+        sizer = AdaptivePoolSizer(AdaptiveSizingConfig(shrink_after_intervals=2), min_size=2, max_size=8)
+        
+        def sample(utilization, waited=0, queue=0):
+            return PoolSizingSample(requests=10, waited_requests=waited, timeouts=0, avg_wait_time=0.0,
+                                    utilization=utilization, queue_length=queue, pool_size=sizer.target)
+        
+        targets = [sizer.evaluate(s) for s in [
+            sample(1.0), sample(0.9), sample(0.5, queue=3), sample(1.0),
+            sample(0.1), sample(0.5), sample(0.1), sample(0.1), sample(0.1), sample(0.1)
+        ]]
+        assert targets == [3, 5, 8, 8, 8, 8, 8, 7, 7, 6], f"Unexpected target sequence {targets}"
+        print(f"✅ Sizer replay targets: {targets}")
+        
+        # Load replay: concurrent requests per interval, one sizing decision per interval
+        pool = ConnectionPool({
+            "min_connections": 2,
+            "max_connections": 20,
+            "connection_timeout": 2.0,
+            "health_check_interval": 3600.0,
+            "database_type": "sqlite",
+            "adaptive_sizing": {
+                "interval": 3600.0,  # Driven manually below
+                "shrink_after_intervals": 3,
+                "database_caps": {"sqlite": 6}
+            }
+        })
+        await pool.initialize()
+        
+        async def request():
+            conn = await pool.acquire_connection()
+            try:
+                await conn.execute("SELECT 1")
+                await asyncio.sleep(0.005)
+            finally:
+                await pool.release_connection(conn)
+        
+        trace = [2, 2, 8, 8, 8, 1, 1, 1, 1, 1, 1, 1]
+        sizes = []
+        for concurrent_requests in trace:
+            await asyncio.gather(*(request() for _ in range(concurrent_requests)))
+            await pool.adjust_pool_size()
+            if pool._prewarm_task:
+                await pool._prewarm_task
+            sizes.append(len(pool.connections))
+        
+        print(f"   load trace {trace}")
+        print(f"   pool sizes {sizes}")
+        assert sizes[:5] == [3, 3, 6, 6, 6], "Pool should grow under load up to the per-database cap"
+        assert sizes[5:7] == [6, 6], "Pool should hold its size until enough calm intervals pass"
+        assert sizes[7] == 5 and sizes[-1] < 6, "Pool should shrink gradually during the lull"
+        assert max(sizes) <= 6, "Pool must not exceed the per-database cap"
+        assert pool.pool_metrics.timeouts == 0
+        assert pool.pool_metrics.in_use == 0
+        
+        await pool.shutdown()
+        
+        # Acquires that keep finding no idle connection only raise the target to their demand
+        pool = ConnectionPool({
+            "min_connections": 2,
+            "max_connections": 20,
+            "connection_timeout": 0.05,
+            "health_check_interval": 3600.0,
+            "database_type": "sqlite",
+            "adaptive_sizing": {"interval": 3600.0}
+        })
+        await pool.initialize()
+        held = [await pool.acquire_connection() for _ in range(2)]
+        
+        async def unreachable():
+            return None
+        pool._create_connection = unreachable
+        
+        for _ in range(5):
+            try:
+                await pool.acquire_connection()
+            except ConnectionTimeoutError:
+                pass
+        assert pool.target_size == 3, f"Target should track demand, not acquire count: {pool.target_size}"
+        
+        for conn in held:
+            await pool.release_connection(conn)
+        await pool.shutdown()
+        print("✅ Adaptive sizing grows ahead of load, respects caps and shrinks with hysteresis")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Adaptive pool sizing test failed: {e}")
+        return False
+
+
 async def test_distributed_transactions():
     """Test distributed transaction coordinator with 2PC"""
     print("\n🔧 Testing Distributed Transaction Coordinator...")
@@ -236,7 +582,7 @@ async def test_distributed_transactions():
         
         await coordinator.shutdown()
         return True
-        
+    
     except Exception as e:
         print(f"❌ Distributed transaction test failed: {e}")
         return False
@@ -245,6 +591,345 @@ async def test_distributed_transactions():
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+async def test_write_ahead_log():
+    """Test group commit, rotation, checkpoints and crash recovery of the coordinator WAL"""
+    print("\n🔧 Testing Write-Ahead Log...")
+    
+    temp_dir = tempfile.mkdtemp()
+    
+    class InstantParticipant(DistributedTransactionParticipant):
+        """Participant without simulated latency, so only logging cost is measured"""
+        
+        async def _validate_transaction(self, global_txn_id, transaction_data):
+            return True
+        
+        async def _acquire_locks(self, global_txn_id, transaction_data):
+            return True
+        
+        async def _release_locks(self, global_txn_id):
+            pass
+        
+        async def _apply_changes(self, global_txn_id):
+            pass
+        
+        async def _rollback_changes(self, global_txn_id):
+            pass
+        
+        async def _write_prepare_record(self, global_txn_id, transaction_data):
+            pass
+        
+        async def _write_commit_record(self, global_txn_id):
+            pass
+        
+        async def _write_abort_record(self, global_txn_id):
+            pass
+    
+    async def start_coordinator(**overrides):
+        config = {
+            "coordinator_id": "wal_coordinator",
+            "log_directory": temp_dir,
+            "recovery_interval": 3600.0,
+            "checkpoint_interval": 50,
+            "wal_segment_max_bytes": 4096
+        }
+        config.update(overrides)
+        coordinator = DistributedTransactionCoordinator(config)
+        await coordinator.initialize()
+        for participant_id in ("db_1", "db_2"):
+            coordinator.register_participant(InstantParticipant(participant_id, "database", {}))
+        return coordinator
+    
+    async def run_commit(coordinator):
+        txn_id = await coordinator.begin_global_transaction(["db_1", "db_2"])
+        return await coordinator.commit_global_transaction(txn_id)
+    
+    try:
+        # Commits/sec: one at a time (an fsync per event) vs concurrent (events share fsyncs)
+        coordinator = await start_coordinator(coordinator_id="wal_benchmark", checkpoint_interval=10_000,
+                                              wal_segment_max_bytes=64 * 1024 * 1024)
+        start_time = time.perf_counter()
+        for _ in range(50):
+            assert await run_commit(coordinator)
+        serial_rate = 50 / (time.perf_counter() - start_time)
+        serial_fsyncs = coordinator.wal.metrics.fsyncs
+        
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(run_commit(coordinator) for _ in range(400)))
+        concurrent_rate = 400 / (time.perf_counter() - start_time)
+        assert all(results)
+        wal_stats = coordinator.wal.get_statistics()
+        concurrent_fsyncs = wal_stats["fsyncs"] - serial_fsyncs
+        print(f"    Serial:     {serial_rate:7.0f} commits/s, {serial_fsyncs / 50:.1f} fsyncs per commit")
+        print(f"    Concurrent: {concurrent_rate:7.0f} commits/s, {concurrent_fsyncs / 400:.2f} fsyncs per commit "
+              f"(max batch {wal_stats['max_batch_size']})")
+        assert concurrent_fsyncs < 400, "Concurrent commits should share fsyncs"
+        assert concurrent_rate > serial_rate
+        await coordinator.shutdown()
+        
+        # Rotation, checkpoints and compaction keep the log bounded
+        coordinator = await start_coordinator()
+        for _ in range(30):
+            assert await run_commit(coordinator)
+        await asyncio.sleep(0.05)  # Let the background checkpoint finish
+        wal_stats = coordinator.wal.get_statistics()
+        assert wal_stats["segments_created"] > 1 and wal_stats["checkpoints"] >= 1
+        assert wal_stats["segments_removed"] >= 1, "Checkpoints should compact old segments"
+        
+        # Crash injection: one transaction prepared, one just begun, then a torn write kills the process
+        prepared_txn = await coordinator.begin_global_transaction(["db_1", "db_2"])
+        assert await coordinator._prepare_phase(coordinator.global_transactions[prepared_txn])
+        begun_txn = await coordinator.begin_global_transaction(["db_1"])
+        
+        wal = coordinator.wal
+        
+        def torn_write(batch):
+            payload = batch[0][1]
+            wal._file.write(payload[:len(payload) // 2])
+            wal._file.flush()
+            raise OSError("injected crash during write")
+        
+        wal._write_batch = torn_write
+        try:
+            await coordinator._log_transaction_event(prepared_txn, "COMMIT_START", {})
+            assert False, "Torn write should not be acknowledged"
+        except Exception as e:
+            assert "injected crash" in str(e)
+        
+        try:
+            await asyncio.wait_for(wal.checkpoint({}), timeout=1.0)
+            assert False, "A failed log should refuse checkpoints"
+        except WALError:
+            pass
+        
+        # Process dies: no shutdown, no final checkpoint
+        if coordinator._recovery_task:
+            coordinator._recovery_task.cancel()
+        wal._file.close()
+        wal._executor.shutdown(wait=True)
+        written_records = wal.metrics.records_written
+        
+        recovered = await start_coordinator()
+        stats = recovered.get_coordinator_statistics()
+        assert stats["wal"]["torn_records_discarded"] == 1, "Torn record should be discarded"
+        assert stats["recovered_log_records"] < written_records, "Recovery should replay only the tail"
+        assert prepared_txn in recovered._in_flight, "Prepared transaction stays in doubt"
+        assert recovered._in_flight[prepared_txn]["event_type"] == "PREPARED"
+        assert begun_txn not in recovered._in_flight, "Undecided transaction should be presumed aborted"
+        assert len(recovered._in_flight) == 1, "Committed transactions should be compacted away"
+        
+        # New records append cleanly after the truncated tail
+        assert await run_commit(recovered)
+        await recovered.shutdown()
+        
+        restarted = await start_coordinator()
+        assert restarted.metrics.recovered_log_records == 0, "Shutdown checkpoint leaves no tail to replay"
+        assert list(restarted._in_flight) == [prepared_txn]
+        await restarted.shutdown()
+        
+        # Damage before the last segment's tail would drop acknowledged records: recovery refuses it
+        wal_config = WALConfiguration(directory=f"{temp_dir}/corrupt", name="corrupt", segment_max_bytes=64)
+        wal = WriteAheadLog(wal_config)
+        await wal.open()
+        for i in range(8):
+            await wal.append({"n": i})
+        await wal.close()
+        first_segment = wal._segment_path(wal._list_segments()[0])
+        data = first_segment.read_bytes()
+        first_segment.write_bytes(b"#" + data[1:])
+        try:
+            await WriteAheadLog(wal_config).open()
+            assert False, "Recovery should fail on a corrupt earlier segment"
+        except WALError:
+            pass
+        assert first_segment.read_bytes() == b"#" + data[1:] and len(wal._list_segments()) > 1
+        
+        print(f"✅ Recovery replayed {stats['recovered_log_records']} of {written_records} records, "
+              f"discarded {stats['wal']['torn_records_discarded']} torn record")
+        print("✅ Group commit, rotation, checkpoints and crash recovery working")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Write-ahead log test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def test_parallel_two_phase_commit():
+    """Test as-completed prepare with early abort, read-only votes and bounded phase 2 fan-out with retries"""
+    print("\n🔧 Testing Parallel Two-Phase Commit...")
+    
+    temp_dir = tempfile.mkdtemp()
+    phase2_load = {"current": 0, "max": 0}
+    
+    class LatencyParticipant(DistributedTransactionParticipant):
+        """Participant with injected prepare/commit latency and failures"""
+        
+        def __init__(self, participant_id, prepare_delay=0.0, commit_delay=0.0, vote=True, commit_failures=0):
+            super().__init__(participant_id, "database", {})
+            self.prepare_delay = prepare_delay
+            self.commit_delay = commit_delay
+            self.vote = vote
+            self.commit_failures = commit_failures
+            self.commit_calls = 0
+        
+        async def prepare(self, global_txn_id, transaction_data):
+            await asyncio.sleep(self.prepare_delay)
+            if not self.vote:
+                return False
+            return await super().prepare(global_txn_id, transaction_data)
+        
+        async def commit(self, global_txn_id):
+            self.commit_calls += 1
+            phase2_load["current"] += 1
+            phase2_load["max"] = max(phase2_load["max"], phase2_load["current"])
+            try:
+                await asyncio.sleep(self.commit_delay)
+                if self.commit_failures > 0:
+                    self.commit_failures -= 1
+                    return False
+                return await super().commit(global_txn_id)
+            finally:
+                phase2_load["current"] -= 1
+        
+        async def _validate_transaction(self, global_txn_id, transaction_data):
+            return True
+        
+        async def _acquire_locks(self, global_txn_id, transaction_data):
+            return True
+        
+        async def _release_locks(self, global_txn_id):
+            pass
+        
+        async def _apply_changes(self, global_txn_id):
+            pass
+        
+        async def _rollback_changes(self, global_txn_id):
+            pass
+        
+        async def _write_prepare_record(self, global_txn_id, transaction_data):
+            pass
+        
+        async def _write_commit_record(self, global_txn_id):
+            pass
+        
+        async def _write_abort_record(self, global_txn_id):
+            pass
+    
+    async def start_coordinator(participants, **overrides):
+        config = {
+            "coordinator_id": "parallel_2pc",
+            "log_directory": temp_dir,
+            "recovery_interval": 3600.0,
+            "retry_base_delay": 0.01,
+            "wal_fsync": False
+        }
+        config.update(overrides)
+        coordinator = DistributedTransactionCoordinator(config)
+        await coordinator.initialize()
+        for participant in participants:
+            coordinator.register_participant(participant)
+        return coordinator
+    
+    async def timed_commit(coordinator, participant_ids):
+        txn_id = await coordinator.begin_global_transaction(participant_ids)
+        start_time = time.perf_counter()
+        committed = await coordinator.commit_global_transaction(txn_id)
+        return txn_id, committed, time.perf_counter() - start_time
+    
+    try:
+        # Commit latency follows the slowest participant that still has work, not the sum
+        participants = [
+            LatencyParticipant("db_fast", prepare_delay=0.05, commit_delay=0.05),
+            LatencyParticipant("db_medium", prepare_delay=0.1, commit_delay=0.1),
+            LatencyParticipant("db_slow", prepare_delay=0.2, commit_delay=0.2),
+            LatencyParticipant("cache_read_only", prepare_delay=0.02, commit_delay=1.0)
+        ]
+        coordinator = await start_coordinator(participants)
+        txn_id = await coordinator.begin_global_transaction([p.participant_id for p in participants])
+        participants[3].mark_read_only(txn_id)
+        start_time = time.perf_counter()
+        assert await coordinator.commit_global_transaction(txn_id)
+        commit_latency = time.perf_counter() - start_time
+        assert participants[3].commit_calls == 0, "Read-only participant should skip phase 2"
+        assert coordinator.global_transactions[txn_id].read_only_participants == {"cache_read_only"}
+        assert commit_latency < 0.55, f"Commit took {commit_latency:.3f}s, slowest path is 0.4s"
+        print(f"    Commit with 0.05/0.1/0.2s participants + read-only 1.0s committer: {commit_latency * 1000:.0f}ms")
+        
+        # A fast no vote aborts at once and cancels the slow prepare
+        slow = LatencyParticipant("db_stuck", prepare_delay=2.0)
+        coordinator.register_participant(slow)
+        coordinator.register_participant(LatencyParticipant("db_no", prepare_delay=0.02, vote=False))
+        txn_id, committed, abort_latency = await timed_commit(coordinator, ["db_stuck", "db_no"])
+        assert not committed and abort_latency < 0.3, f"Abort took {abort_latency:.3f}s"
+        assert coordinator.global_transactions[txn_id].state == GlobalTransactionState.ABORTED
+        assert txn_id not in slow.prepared_transactions
+        stats = coordinator.get_coordinator_statistics()
+        assert stats["early_aborts"] == 1 and stats["cancelled_prepares"] == 1
+        print(f"    Early abort with a 2.0s prepare outstanding: {abort_latency * 1000:.0f}ms")
+        await coordinator.shutdown()
+        
+        # Phase 2 fan-out is bounded
+        fan_out = [LatencyParticipant(f"shard_{i}", commit_delay=0.02) for i in range(12)]
+        coordinator = await start_coordinator(fan_out, coordinator_id="bounded_2pc", phase2_concurrency=4)
+        phase2_load["max"] = 0
+        _, committed, _ = await timed_commit(coordinator, [p.participant_id for p in fan_out])
+        assert committed and phase2_load["max"] == 4, f"Peak phase 2 concurrency {phase2_load['max']}"
+        
+        # A failed delivery goes straight to the retry queue instead of holding up the commit
+        flaky = LatencyParticipant("db_flaky", commit_delay=0.1, commit_failures=1)
+        coordinator.register_participant(flaky)
+        txn_id, committed, flaky_latency = await timed_commit(coordinator, ["shard_0", "db_flaky"])
+        assert not committed and flaky.commit_calls == 1, f"{flaky.commit_calls} commit attempts inline"
+        assert flaky_latency < 0.2, f"Commit with a failing participant took {flaky_latency:.3f}s"
+        await asyncio.sleep(0.02)
+        assert await coordinator.retry_pending_deliveries() == 1
+        assert coordinator.global_transactions[txn_id].state == GlobalTransactionState.COMMITTED
+        
+        # A participant only remembers its most recent commits
+        bounded = LatencyParticipant("db_bounded")
+        bounded.committed_history_size = 2
+        coordinator.register_participant(bounded)
+        txn_ids = [(await timed_commit(coordinator, ["shard_2", "db_bounded"]))[0] for _ in range(3)]
+        assert list(bounded.committed_transactions) == txn_ids[1:]
+        assert await bounded.commit(txn_ids[2]), "Redelivered commit should be acknowledged"
+        
+        unreachable = LatencyParticipant("db_down", commit_failures=100)
+        coordinator.register_participant(unreachable)
+        txn_id, committed, _ = await timed_commit(coordinator, ["shard_1", "db_down"])
+        assert not committed and coordinator.global_transactions[txn_id].state == GlobalTransactionState.UNCERTAIN
+        assert coordinator.get_coordinator_statistics()["pending_deliveries"] == 1
+        
+        # Once the commit decision is logged the transaction cannot be aborted
+        try:
+            await coordinator.abort_global_transaction(txn_id)
+            assert False, "Abort after the commit decision should be refused"
+        except DistributedTransactionError:
+            assert coordinator._retry_queue[txn_id].action == "commit"
+        
+        unreachable.commit_failures = 0
+        await asyncio.sleep(0.02)
+        assert await coordinator.retry_pending_deliveries() == 1
+        assert coordinator.global_transactions[txn_id].state == GlobalTransactionState.COMMITTED
+        assert txn_id not in coordinator._in_flight and not coordinator._retry_queue
+        await coordinator.shutdown()
+        
+        print("✅ As-completed prepare, early abort, read-only votes and bounded fan-out with retries working")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Parallel two-phase commit test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 async def test_integrated_transaction_flow():
     """Test integrated transaction flow with all components"""
     print("\n🔧 Testing Integrated Transaction Flow...")
@@ -346,7 +1031,7 @@ async def test_integrated_transaction_flow():
         await pool.shutdown()
         
         return True
-        
+    
     except Exception as e:
         print(f"❌ Integrated transaction flow test failed: {e}")
         import traceback
@@ -430,7 +1115,7 @@ async def test_error_handling_and_recovery():
         await pool.shutdown()
         
         return True
-        
+    
     except Exception as e:
         print(f"❌ Error handling test failed: {e}")
         return False
@@ -445,8 +1130,14 @@ async def main():
     test_results = []
     
     test_results.append(await test_transaction_manager())
+    test_results.append(await test_lock_manager())
     test_results.append(await test_connection_pool())
+    test_results.append(await test_connection_pool_idle_management())
+    test_results.append(await test_connection_pool_scaling())
+    test_results.append(await test_adaptive_pool_sizing())
     test_results.append(await test_distributed_transactions())
+    test_results.append(await test_write_ahead_log())
+    test_results.append(await test_parallel_two_phase_commit())
     test_results.append(await test_integrated_transaction_flow())
     test_results.append(await test_error_handling_and_recovery())
     
@@ -467,8 +1158,14 @@ async def main():
         print(f"❌ Some tests failed ({passed_tests}/{total_tests})")
         test_names = [
             "Transaction Manager",
+            "Lock Manager",
             "Connection Pool", 
+            "Connection Pool Idle Management",
+            "Connection Pool Scaling",
+            "Adaptive Pool Sizing",
             "Distributed Coordinator",
+            "Write-Ahead Log",
+            "Parallel Two-Phase Commit",
             "Integrated Flow",
             "Error Handling"
         ]
@@ -8,12 +8,15 @@ import time
 import logging
 import uuid
 import json
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Set, Callable, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import weakref
 from pathlib import Path
 
+from write_ahead_log import WriteAheadLog, WALConfiguration
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +55,13 @@ class GlobalTransactionState(Enum):
     UNCERTAIN = "uncertain"  # During recovery
 
 
+class PrepareVote(Enum):
+    """Participant vote in the prepare phase"""
+    COMMIT = "commit"
+    ABORT = "abort"
+    READ_ONLY = "read_only"  # No changes: the participant has released everything and skips phase 2
+
+
 @dataclass
 class ParticipantInfo:
     """Information about transaction participant"""
@@ -79,6 +89,17 @@ class GlobalTransaction:
     prepared_at: Optional[float] = None
     completed_at: Optional[float] = None
     recovery_count: int = 0
+    read_only_participants: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class PendingDelivery:
+    """Phase 2 decision not yet acknowledged by some participants"""
+    global_txn_id: str
+    action: str  # "commit" or "abort"
+    participant_ids: Set[str]
+    attempts: int = 0
+    next_attempt_at: float = 0.0
 
 
 @dataclass
@@ -91,7 +112,13 @@ class CoordinatorMetrics:
     average_commit_time: float = 0.0
     average_prepare_time: float = 0.0
     participant_timeouts: int = 0
+    early_aborts: int = 0
+    cancelled_prepares: int = 0
+    read_only_votes: int = 0
+    phase2_retries: int = 0
+    queued_deliveries: int = 0
     coordinator_recoveries: int = 0
+    recovered_log_records: int = 0
     uptime: float = 0.0
 
 
@@ -104,8 +131,16 @@ class DistributedTransactionParticipant:
         self.config = config
         self.active_transactions: Set[str] = set()
         self.prepared_transactions: Set[str] = set()
+        self.read_only_transactions: Set[str] = set()
+        # Recently committed ids, oldest first, so a redelivered commit is acknowledged
+        self.committed_transactions: "OrderedDict[str, None]" = OrderedDict()
+        self.committed_history_size = config.get("committed_history_size", 10000)
+    
+    def mark_read_only(self, global_txn_id: str):
+        """Record that a transaction made no changes at this participant"""
+        self.read_only_transactions.add(global_txn_id)
     
-    async def prepare(self, global_txn_id: str, transaction_data: Dict[str, Any]) -> bool:
+    async def prepare(self, global_txn_id: str, transaction_data: Dict[str, Any]) -> Union[bool, PrepareVote]:
         """Phase 1: Prepare to commit"""
         try:
             logger.info(f"Participant {self.participant_id} preparing transaction {global_txn_id}")
@@ -114,6 +149,14 @@ class DistributedTransactionParticipant:
             if not await self._validate_transaction(global_txn_id, transaction_data):
                 return False
             
+            # Nothing to commit: finish now and take no part in phase 2
+            if global_txn_id in self.read_only_transactions:
+                await self._release_locks(global_txn_id)
+                self.read_only_transactions.discard(global_txn_id)
+                self.active_transactions.discard(global_txn_id)
+                logger.info(f"Participant {self.participant_id} read-only for transaction {global_txn_id}")
+                return PrepareVote.READ_ONLY
+            
             # Lock resources
             if not await self._acquire_locks(global_txn_id, transaction_data):
                 return False
@@ -126,7 +169,7 @@ class DistributedTransactionParticipant:
             
             logger.info(f"Participant {self.participant_id} prepared transaction {global_txn_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Participant {self.participant_id} prepare failed for {global_txn_id}: {e}")
             return False
@@ -134,6 +177,9 @@ class DistributedTransactionParticipant:
     async def commit(self, global_txn_id: str) -> bool:
         """Phase 2: Commit transaction"""
         try:
+            if global_txn_id in self.committed_transactions:
+                return True  # Redelivered commit
+            
             if global_txn_id not in self.prepared_transactions:
                 logger.error(f"Transaction {global_txn_id} not prepared by participant {self.participant_id}")
                 return False
@@ -149,13 +195,16 @@ class DistributedTransactionParticipant:
             # Remove from prepared set
             self.prepared_transactions.discard(global_txn_id)
             self.active_transactions.discard(global_txn_id)
+            self.committed_transactions[global_txn_id] = None
+            while len(self.committed_transactions) > self.committed_history_size:
+                self.committed_transactions.popitem(last=False)
             
             # Write commit record
             await self._write_commit_record(global_txn_id)
             
             logger.info(f"Participant {self.participant_id} committed transaction {global_txn_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Participant {self.participant_id} commit failed for {global_txn_id}: {e}")
             return False
@@ -180,7 +229,7 @@ class DistributedTransactionParticipant:
             
             logger.info(f"Participant {self.participant_id} aborted transaction {global_txn_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Participant {self.participant_id} abort failed for {global_txn_id}: {e}")
             return False
@@ -234,6 +283,9 @@ class DistributedTransactionCoordinator:
         self.commit_timeout = config.get("commit_timeout", 30.0)
         self.recovery_interval = config.get("recovery_interval", 60.0)
         self.log_directory = Path(config.get("log_directory", "./dtc_logs"))
+        self.checkpoint_interval = config.get("checkpoint_interval", 1000)  # Log records between checkpoints
+        self.phase2_concurrency = config.get("phase2_concurrency", 32)  # Concurrent commit/abort messages per transaction
+        self.retry_base_delay = config.get("retry_base_delay", 0.05)  # Doubles per attempt
         
         # State
         self.state = DTCState.INITIALIZING
@@ -241,9 +293,19 @@ class DistributedTransactionCoordinator:
         self.participants: Dict[str, DistributedTransactionParticipant] = {}
         self.metrics = CoordinatorMetrics()
         
-        # Recovery and persistence
-        self.transaction_log: List[Dict[str, Any]] = []
+        # Recovery and persistence: a group-commit WAL plus the in-flight state checkpointed into it
+        self.wal = WriteAheadLog(WALConfiguration(
+            directory=self.log_directory,
+            name=f"dtc_{self.coordinator_id}",
+            segment_max_bytes=config.get("wal_segment_max_bytes", 16 * 1024 * 1024),
+            group_commit_delay=config.get("wal_group_commit_delay", 0.0),
+            fsync=config.get("wal_fsync", True)
+        ))
+        self._in_flight: Dict[str, Dict[str, Any]] = {}  # txn_id -> last logged event
+        self._records_since_checkpoint = 0
+        self._checkpoint_task: Optional[asyncio.Task] = None
         self._recovery_task: Optional[asyncio.Task] = None
+        self._retry_queue: Dict[str, PendingDelivery] = {}  # Decisions still owed to unreachable participants
         self._started_at = time.time()
         
         logger.info(f"Distributed Transaction Coordinator {self.coordinator_id} initialized")
@@ -257,10 +319,10 @@ class DistributedTransactionCoordinator:
             self.log_directory.mkdir(parents=True, exist_ok=True)
             
             # Load transaction log for recovery
-            await self._load_transaction_log()
+            txn_events = await self._load_transaction_log()
             
             # Perform recovery if needed
-            await self._perform_recovery()
+            await self._perform_recovery(txn_events)
             
             # Start recovery task
             self._recovery_task = asyncio.create_task(self._recovery_loop())
@@ -269,7 +331,7 @@ class DistributedTransactionCoordinator:
             self.metrics.uptime = time.time() - self._started_at
             
             logger.info("Distributed transaction coordinator initialized successfully")
-            
+        
         except Exception as e:
             logger.error(f"Coordinator initialization failed: {e}")
             raise CoordinatorError(f"Initialization failed: {e}")
@@ -350,8 +412,7 @@ class DistributedTransactionCoordinator:
             
             if not prepare_success:
                 # Abort transaction
-                await self._abort_phase(global_txn)
-                self.metrics.aborted_transactions += 1
+                await self._abort_transaction_after_failure(global_txn)
                 return False
             
             # Phase 2: Commit
@@ -387,11 +448,10 @@ class DistributedTransactionCoordinator:
                 
                 logger.error(f"Global transaction {global_txn_id} in uncertain state")
                 return False
-            
+        
         except Exception as e:
             logger.error(f"2PC commit failed for transaction {global_txn_id}: {e}")
-            await self._abort_phase(global_txn)
-            self.metrics.aborted_transactions += 1
+            await self._abort_transaction_after_failure(global_txn)
             return False
     
     async def abort_global_transaction(self, global_txn_id: str) -> bool:
@@ -402,6 +462,11 @@ class DistributedTransactionCoordinator:
         
         global_txn = self.global_transactions[global_txn_id]
         
+        if self._commit_decided(global_txn):
+            raise DistributedTransactionError(
+                f"Transaction {global_txn_id} cannot be aborted after its commit decision: {global_txn.state}"
+            )
+        
         logger.info(f"Aborting global transaction {global_txn_id}")
         
         try:
@@ -418,57 +483,78 @@ class DistributedTransactionCoordinator:
             else:
                 logger.error(f"Failed to abort global transaction {global_txn_id}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Abort failed for transaction {global_txn_id}: {e}")
             return False
     
+    async def _abort_transaction_after_failure(self, global_txn: GlobalTransaction):
+        """Abort a transaction whose commit failed before the decision was logged"""
+        if self._commit_decided(global_txn):
+            # Participants may already have committed; the decision stands and is redelivered
+            logger.error(f"Not aborting {global_txn.global_txn_id} after its commit decision was logged")
+            return
+        
+        self.metrics.aborted_transactions += 1
+        try:
+            if await self._abort_phase(global_txn):
+                global_txn.state = GlobalTransactionState.ABORTED
+                global_txn.completed_at = time.time()
+                await self._log_transaction_event(global_txn.global_txn_id, "ABORTED", {})
+        except Exception as e:
+            logger.error(f"Abort after failed commit of {global_txn.global_txn_id} failed: {e}")
+    
     async def _prepare_phase(self, global_txn: GlobalTransaction) -> bool:
-        """Phase 1 of 2PC: Prepare"""
+        """Phase 1 of 2PC: Prepare, deciding as votes arrive"""
         global_txn.state = GlobalTransactionState.PREPARING
         
         await self._log_transaction_event(global_txn.global_txn_id, "PREPARE_START", {})
         
-        prepare_tasks = []
+        prepare_tasks = {}
         for participant_id, participant_info in global_txn.participants.items():
             participant = self.participants[participant_id]
             task = asyncio.create_task(
                 self._prepare_participant(participant, global_txn.global_txn_id, participant_info.timeout)
             )
-            prepare_tasks.append((participant_id, task))
+            prepare_tasks[task] = participant_id
         
-        # Wait for all prepare responses
-        prepare_results = {}
-        for participant_id, task in prepare_tasks:
-            try:
-                result = await asyncio.wait_for(task, timeout=global_txn.participants[participant_id].timeout)
-                prepare_results[participant_id] = result
-            except asyncio.TimeoutError:
-                logger.error(f"Prepare timeout for participant {participant_id}")
-                prepare_results[participant_id] = False
-                self.metrics.participant_timeouts += 1
-            except Exception as e:
-                logger.error(f"Prepare failed for participant {participant_id}: {e}")
-                prepare_results[participant_id] = False
+        # Collect votes in completion order; the first no vote or timeout decides abort
+        votes: Dict[str, PrepareVote] = {}
+        pending = set(prepare_tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                votes[prepare_tasks[task]] = task.result()
+            if any(vote == PrepareVote.ABORT for vote in votes.values()):
+                break
+        
+        if pending:
+            self.metrics.early_aborts += 1
+            self.metrics.cancelled_prepares += len(pending)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
         
-        # Check if all participants prepared successfully
-        all_prepared = all(prepare_results.values())
+        global_txn.read_only_participants = {pid for pid, vote in votes.items() if vote == PrepareVote.READ_ONLY}
+        self.metrics.read_only_votes += len(global_txn.read_only_participants)
         
-        if all_prepared:
+        if not pending and all(vote != PrepareVote.ABORT for vote in votes.values()):
             global_txn.state = GlobalTransactionState.PREPARED
             global_txn.prepared_at = time.time()
             
             await self._log_transaction_event(global_txn.global_txn_id, "PREPARED", {
-                "participants": list(prepare_results.keys())
+                "participants": self._phase2_participants(global_txn),
+                "read_only_participants": sorted(global_txn.read_only_participants)
             })
             
             logger.info(f"All participants prepared for transaction {global_txn.global_txn_id}")
             return True
         else:
-            failed_participants = [pid for pid, result in prepare_results.items() if not result]
+            failed_participants = [pid for pid, vote in votes.items() if vote == PrepareVote.ABORT]
             
             await self._log_transaction_event(global_txn.global_txn_id, "PREPARE_FAILED", {
-                "failed_participants": failed_participants
+                "failed_participants": failed_participants,
+                "cancelled_participants": sorted(prepare_tasks[task] for task in pending)
             })
             
             logger.error(f"Prepare failed for transaction {global_txn.global_txn_id}, failed participants: {failed_participants}")
@@ -480,27 +566,8 @@ class DistributedTransactionCoordinator:
         
         await self._log_transaction_event(global_txn.global_txn_id, "COMMIT_START", {})
         
-        commit_tasks = []
-        for participant_id in global_txn.participants:
-            participant = self.participants[participant_id]
-            task = asyncio.create_task(
-                self._commit_participant(participant, global_txn.global_txn_id)
-            )
-            commit_tasks.append((participant_id, task))
-        
-        # Wait for all commit responses
-        commit_results = {}
-        for participant_id, task in commit_tasks:
-            try:
-                result = await asyncio.wait_for(task, timeout=self.commit_timeout)
-                commit_results[participant_id] = result
-            except asyncio.TimeoutError:
-                logger.error(f"Commit timeout for participant {participant_id}")
-                commit_results[participant_id] = False
-                self.metrics.participant_timeouts += 1
-            except Exception as e:
-                logger.error(f"Commit failed for participant {participant_id}: {e}")
-                commit_results[participant_id] = False
+        # Read-only participants already finished in phase 1
+        commit_results = await self._fan_out(global_txn, "commit", self._phase2_participants(global_txn))
         
         # All commits should succeed (participants are already prepared)
         all_committed = all(commit_results.values())
@@ -510,6 +577,7 @@ class DistributedTransactionCoordinator:
             return True
         else:
             failed_participants = [pid for pid, result in commit_results.items() if not result]
+            self._queue_delivery(global_txn, "commit", failed_participants)
             logger.error(f"Commit failed for some participants in transaction {global_txn.global_txn_id}: {failed_participants}")
             return False
     
@@ -519,23 +587,7 @@ class DistributedTransactionCoordinator:
         
         await self._log_transaction_event(global_txn.global_txn_id, "ABORT_START", {})
         
-        abort_tasks = []
-        for participant_id in global_txn.participants:
-            participant = self.participants[participant_id]
-            task = asyncio.create_task(
-                self._abort_participant(participant, global_txn.global_txn_id)
-            )
-            abort_tasks.append((participant_id, task))
-        
-        # Wait for all abort responses
-        abort_results = {}
-        for participant_id, task in abort_tasks:
-            try:
-                result = await task
-                abort_results[participant_id] = result
-            except Exception as e:
-                logger.error(f"Abort failed for participant {participant_id}: {e}")
-                abort_results[participant_id] = False
+        abort_results = await self._fan_out(global_txn, "abort", self._phase2_participants(global_txn))
         
         all_aborted = all(abort_results.values())
         
@@ -543,17 +595,128 @@ class DistributedTransactionCoordinator:
             logger.info(f"All participants aborted for transaction {global_txn.global_txn_id}")
         else:
             failed_participants = [pid for pid, result in abort_results.items() if not result]
+            self._queue_delivery(global_txn, "abort", failed_participants)
             logger.error(f"Abort failed for some participants in transaction {global_txn.global_txn_id}: {failed_participants}")
         
         return all_aborted
     
-    async def _prepare_participant(self, participant: DistributedTransactionParticipant, global_txn_id: str, timeout: float) -> bool:
-        """Send prepare to participant"""
+    def _commit_decided(self, global_txn: GlobalTransaction) -> bool:
+        """Whether the commit decision is logged (phase 2 started or a commit is still owed)"""
+        if global_txn.state in (GlobalTransactionState.COMMITTING, GlobalTransactionState.UNCERTAIN,
+                                GlobalTransactionState.COMMITTED):
+            return True
+        pending = self._retry_queue.get(global_txn.global_txn_id)
+        return pending is not None and pending.action == "commit"
+    
+    def _phase2_participants(self, global_txn: GlobalTransaction) -> List[str]:
+        """Participants that still need the commit/abort decision"""
+        return [pid for pid in global_txn.participants if pid not in global_txn.read_only_participants]
+    
+    async def _fan_out(self, global_txn: GlobalTransaction, action: str, participant_ids: List[str]) -> Dict[str, bool]:
+        """
+        Send a phase 2 decision with bounded concurrency
+        
+        Each participant gets one attempt; the caller queues the ones that
+        fail or time out for the background retry loop.
+        
+        Returns:
+            Delivery result by participant id
+        """
+        semaphore = asyncio.Semaphore(self.phase2_concurrency)
+        
+        async def deliver(participant_id: str) -> bool:
+            async with semaphore:
+                if await self._send_decision(participant_id, action, global_txn.global_txn_id):
+                    global_txn.participants[participant_id].last_contact = time.time()
+                    return True
+            return False
+        
+        results = await asyncio.gather(*(deliver(pid) for pid in participant_ids))
+        return dict(zip(participant_ids, results))
+    
+    async def _send_decision(self, participant_id: str, action: str, global_txn_id: str) -> bool:
+        """Deliver one commit/abort message, bounded by the commit timeout"""
+        participant = self.participants[participant_id]
+        send = self._commit_participant if action == "commit" else self._abort_participant
         try:
-            return await participant.prepare(global_txn_id, {})
+            return await asyncio.wait_for(send(participant, global_txn_id), timeout=self.commit_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{action.capitalize()} timeout for participant {participant_id}")
+            self.metrics.participant_timeouts += 1
+            return False
+    
+    def _queue_delivery(self, global_txn: GlobalTransaction, action: str, participant_ids: List[str]):
+        """Queue a decision for participants that stayed unreachable"""
+        pending = self._retry_queue.get(global_txn.global_txn_id)
+        if pending is not None:
+            if pending.action != action:
+                # A queued decision is never replaced by the opposite one (some participants already applied it)
+                logger.error(f"Not queueing {action} for {global_txn.global_txn_id} over a pending {pending.action}")
+                return
+            pending.participant_ids.update(participant_ids)
+            return
+        
+        self._retry_queue[global_txn.global_txn_id] = PendingDelivery(
+            global_txn_id=global_txn.global_txn_id,
+            action=action,
+            participant_ids=set(participant_ids),
+            next_attempt_at=time.time() + self.retry_base_delay
+        )
+        self.metrics.queued_deliveries += 1
+    
+    async def retry_pending_deliveries(self) -> int:
+        """
+        Redeliver queued decisions that are due
+        
+        Returns:
+            Number of transactions whose decision reached every participant
+        """
+        resolved = 0
+        now = time.time()
+        for pending in [p for p in self._retry_queue.values() if p.next_attempt_at <= now]:
+            global_txn = self.global_transactions[pending.global_txn_id]
+            participant_ids = sorted(pending.participant_ids)
+            results = await asyncio.gather(*(
+                self._send_decision(pid, pending.action, pending.global_txn_id) for pid in participant_ids
+            ))
+            self.metrics.phase2_retries += len(results)
+            pending.participant_ids = {pid for pid, ok in zip(participant_ids, results) if not ok}
+            
+            if pending.participant_ids:
+                pending.attempts += 1
+                pending.next_attempt_at = time.time() + self.retry_base_delay * 2 ** min(pending.attempts, 10)
+                continue
+            
+            del self._retry_queue[pending.global_txn_id]
+            resolved += 1
+            global_txn.completed_at = time.time()
+            if pending.action == "commit":
+                if global_txn.state == GlobalTransactionState.UNCERTAIN:
+                    self.metrics.uncertain_transactions -= 1
+                global_txn.state = GlobalTransactionState.COMMITTED
+                await self._log_transaction_event(pending.global_txn_id, "COMMITTED", {"redelivered": True})
+            else:
+                global_txn.state = GlobalTransactionState.ABORTED
+                await self._log_transaction_event(pending.global_txn_id, "ABORTED", {"redelivered": True})
+            logger.info(f"Redelivered {pending.action} for transaction {pending.global_txn_id}")
+        
+        return resolved
+    
+    async def _prepare_participant(self, participant: DistributedTransactionParticipant, global_txn_id: str, timeout: float) -> PrepareVote:
+        """Send prepare to participant; a timeout or error is a no vote"""
+        try:
+            vote = await asyncio.wait_for(participant.prepare(global_txn_id, {}), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Prepare timeout for participant {participant.participant_id}")
+            self.metrics.participant_timeouts += 1
+            return PrepareVote.ABORT
         except Exception as e:
             logger.error(f"Prepare participant {participant.participant_id} failed: {e}")
-            return False
+            return PrepareVote.ABORT
+        
+        if isinstance(vote, PrepareVote):
+            return vote
+        return PrepareVote.COMMIT if vote else PrepareVote.ABORT
     
     async def _commit_participant(self, participant: DistributedTransactionParticipant, global_txn_id: str) -> bool:
         """Send commit to participant"""
@@ -577,7 +740,7 @@ class DistributedTransactionCoordinator:
         logger.info(f"Registered participant {participant.participant_id} of type {participant.participant_type}")
     
     async def _log_transaction_event(self, global_txn_id: str, event_type: str, data: Dict[str, Any]):
-        """Log transaction event for recovery"""
+        """Log transaction event for recovery, returning once it is durable"""
         log_entry = {
             "timestamp": time.time(),
             "global_txn_id": global_txn_id,
@@ -586,50 +749,89 @@ class DistributedTransactionCoordinator:
             "data": data
         }
         
-        self.transaction_log.append(log_entry)
+        # Track in-flight state for checkpoints; completed transactions are compacted away
+        if event_type in ("COMMITTED", "ABORTED"):
+            self._in_flight.pop(global_txn_id, None)
+        else:
+            previous = self._in_flight.get(global_txn_id, {})
+            self._in_flight[global_txn_id] = {
+                "event_type": event_type,
+                "timestamp": log_entry["timestamp"],
+                "participants": data.get("participants", previous.get("participants", []))
+            }
+        
+        # Group commit: concurrent transactions share one write+fsync
+        await self.wal.append(log_entry)
         
-        # Persist to file
-        log_file = self.log_directory / f"dtc_log_{self.coordinator_id}.jsonl"
-        with open(log_file, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self._records_since_checkpoint += 1
+        if (self._records_since_checkpoint >= self.checkpoint_interval and
+                (self._checkpoint_task is None or self._checkpoint_task.done())):
+            self._checkpoint_task = asyncio.create_task(self.checkpoint())
+    
+    async def checkpoint(self):
+        """Checkpoint in-flight transaction state so recovery replays only later records"""
+        self._records_since_checkpoint = 0
+        await self.wal.checkpoint({
+            "in_flight": dict(self._in_flight),
+            "legacy_log_imported": True
+        })
+        logger.debug(f"Checkpointed {len(self._in_flight)} in-flight transactions")
     
-    async def _load_transaction_log(self):
-        """Load transaction log from file"""
-        log_file = self.log_directory / f"dtc_log_{self.coordinator_id}.jsonl"
+    async def _load_transaction_log(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load the last checkpoint and the log tail after it
+        
+        Returns:
+            Recovery events grouped by transaction id
+        """
+        recovery = await self.wal.open()
+        txn_events: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # Checkpointed in-flight transactions start from their last logged event
+        for txn_id, info in recovery.checkpoint_state.get("in_flight", {}).items():
+            txn_events[txn_id] = [{
+                "timestamp": info["timestamp"],
+                "global_txn_id": txn_id,
+                "coordinator_id": self.coordinator_id,
+                "event_type": info["event_type"],
+                "data": {"participants": info.get("participants", [])}
+            }]
         
-        if log_file.exists():
+        records = recovery.records
+        
+        # Logs written before the WAL existed are imported once, then covered by checkpoints
+        legacy_log = self.log_directory / f"dtc_log_{self.coordinator_id}.jsonl"
+        if not recovery.checkpoint_state.get("legacy_log_imported") and legacy_log.exists():
             try:
-                with open(log_file, "r") as f:
-                    for line in f:
-                        if line.strip():
-                            log_entry = json.loads(line.strip())
-                            self.transaction_log.append(log_entry)
-                
-                logger.info(f"Loaded {len(self.transaction_log)} transaction log entries")
-                
+                with open(legacy_log, "r") as f:
+                    legacy_records = [json.loads(line) for line in f if line.strip()]
+                records = legacy_records + records
+                logger.info(f"Imported {len(legacy_records)} legacy transaction log entries")
             except Exception as e:
-                logger.error(f"Failed to load transaction log: {e}")
+                logger.error(f"Failed to load legacy transaction log: {e}")
+        
+        for entry in records:
+            txn_events.setdefault(entry["global_txn_id"], []).append(entry)
+        
+        self.metrics.recovered_log_records = len(records)
+        logger.info(f"Loaded {len(txn_events)} transactions from checkpoint and {len(records)} log records")
+        return txn_events
     
-    async def _perform_recovery(self):
-        """Perform recovery from transaction log"""
-        if not self.transaction_log:
+    async def _perform_recovery(self, txn_events: Dict[str, List[Dict[str, Any]]]):
+        """Perform recovery from the checkpoint and log tail"""
+        if not txn_events:
             return
         
         logger.info("Starting coordinator recovery")
         self.state = DTCState.RECOVERING
         
-        # Group log entries by transaction
-        txn_events = {}
-        for entry in self.transaction_log:
-            txn_id = entry["global_txn_id"]
-            if txn_id not in txn_events:
-                txn_events[txn_id] = []
-            txn_events[txn_id].append(entry)
-        
         # Process each transaction for recovery
         for txn_id, events in txn_events.items():
             await self._recover_transaction(txn_id, events)
         
+        # Compact: the next recovery starts from what is still unresolved
+        await self.checkpoint()
+        
         self.metrics.coordinator_recoveries += 1
         logger.info("Coordinator recovery completed")
     
@@ -642,20 +844,32 @@ class DistributedTransactionCoordinator:
         
         # Determine final state
         final_event = events[-1]["event_type"]
+        participants = next(
+            (e["data"]["participants"] for e in reversed(events) if e.get("data", {}).get("participants")), []
+        )
         
         if final_event == "COMMITTED":
             # Transaction committed, no action needed
             logger.debug(f"Transaction {txn_id} already committed")
+            self._in_flight.pop(txn_id, None)
         elif final_event == "ABORTED":
             # Transaction aborted, no action needed
             logger.debug(f"Transaction {txn_id} already aborted")
-        elif final_event in ("PREPARED", "COMMIT_START"):
+            self._in_flight.pop(txn_id, None)
+        elif final_event in ("PREPARED", "COMMIT_START", "UNCERTAIN"):
             # Transaction was prepared but commit outcome unknown
             # In a real implementation, we would query participants
             logger.warning(f"Transaction {txn_id} in uncertain state, manual resolution may be required")
+            self._in_flight[txn_id] = {
+                "event_type": final_event,
+                "timestamp": events[-1]["timestamp"],
+                "participants": participants
+            }
         else:
-            # Transaction was in progress, abort it
+            # Transaction was in progress, abort it (presumed abort: nothing was decided)
             logger.info(f"Aborting incomplete transaction {txn_id}")
+            self._in_flight.pop(txn_id, None)
+            await self._log_transaction_event(txn_id, "ABORTED", {"reason": "recovery"})
     
     async def _recovery_loop(self):
         """Background recovery loop"""
@@ -677,6 +891,9 @@ class DistributedTransactionCoordinator:
                     logger.warning(f"Aborting timed out transaction {txn_id}")
                     await self.abort_global_transaction(txn_id)
                 
+                # Redeliver decisions to participants that were unreachable
+                await self.retry_pending_deliveries()
+            
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -699,8 +916,16 @@ class DistributedTransactionCoordinator:
             "average_commit_time": self.metrics.average_commit_time,
             "average_prepare_time": self.metrics.average_prepare_time,
             "participant_timeouts": self.metrics.participant_timeouts,
+            "early_aborts": self.metrics.early_aborts,
+            "cancelled_prepares": self.metrics.cancelled_prepares,
+            "read_only_votes": self.metrics.read_only_votes,
+            "phase2_retries": self.metrics.phase2_retries,
+            "pending_deliveries": len(self._retry_queue),
             "coordinator_recoveries": self.metrics.coordinator_recoveries,
+            "recovered_log_records": self.metrics.recovered_log_records,
+            "in_flight_transactions": len(self._in_flight),
             "registered_participants": len(self.participants),
+            "wal": self.wal.get_statistics(),
             "uptime": self.metrics.uptime
         }
     
@@ -727,6 +952,15 @@ class DistributedTransactionCoordinator:
         for txn_id in active_transactions:
             await self.abort_global_transaction(txn_id)
         
+        # Checkpoint so the next start replays nothing, then flush and close the log
+        try:
+            if self._checkpoint_task is not None:
+                await self._checkpoint_task
+            await self.checkpoint()
+        except Exception as e:
+            logger.error(f"Shutdown checkpoint failed: {e}")
+        await self.wal.close()
+        
         logger.info("Distributed transaction coordinator shutdown complete")
 
 
@@ -781,7 +1015,7 @@ if __name__ == "__main__":
             # Test shutdown
             await coordinator.shutdown()
             print("✅ Coordinator shutdown successful")
-            
+        
         except Exception as e:
             print(f"❌ Distributed coordinator test failed: {e}")
             import traceback
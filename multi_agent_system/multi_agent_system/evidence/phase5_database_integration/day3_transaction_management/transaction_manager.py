@@ -8,11 +8,12 @@ import time
 import logging
 import uuid
 import json
-from typing import Dict, Any, Optional, List, Callable, Union
+from typing import Dict, Any, Optional, List, Callable, Union, Set, FrozenSet, Deque
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 import weakref
+from collections import deque
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
@@ -225,6 +226,430 @@ class DatabaseParticipant(TransactionParticipant):
         await asyncio.sleep(0.01)  # Simulate database operation
 
 
+class LockMode(Enum):
+    """Lock modes for multi-granularity locking"""
+    INTENT_SHARED = "intent_shared"
+    INTENT_EXCLUSIVE = "intent_exclusive"
+    SHARED = "shared"
+    SHARED_INTENT_EXCLUSIVE = "shared_intent_exclusive"
+    EXCLUSIVE = "exclusive"
+
+
+# Requested mode -> held modes it can coexist with
+LOCK_COMPATIBILITY: Dict[LockMode, FrozenSet[LockMode]] = {
+    LockMode.INTENT_SHARED: frozenset({LockMode.INTENT_SHARED, LockMode.INTENT_EXCLUSIVE,
+                                       LockMode.SHARED, LockMode.SHARED_INTENT_EXCLUSIVE}),
+    LockMode.INTENT_EXCLUSIVE: frozenset({LockMode.INTENT_SHARED, LockMode.INTENT_EXCLUSIVE}),
+    LockMode.SHARED: frozenset({LockMode.INTENT_SHARED, LockMode.SHARED}),
+    LockMode.SHARED_INTENT_EXCLUSIVE: frozenset({LockMode.INTENT_SHARED}),
+    LockMode.EXCLUSIVE: frozenset()
+}
+
+# Held mode -> requested modes it already grants
+_LOCK_COVERS: Dict[LockMode, FrozenSet[LockMode]] = {
+    LockMode.INTENT_SHARED: frozenset({LockMode.INTENT_SHARED}),
+    LockMode.INTENT_EXCLUSIVE: frozenset({LockMode.INTENT_SHARED, LockMode.INTENT_EXCLUSIVE}),
+    LockMode.SHARED: frozenset({LockMode.INTENT_SHARED, LockMode.SHARED}),
+    LockMode.SHARED_INTENT_EXCLUSIVE: frozenset({LockMode.INTENT_SHARED, LockMode.INTENT_EXCLUSIVE,
+                                                 LockMode.SHARED, LockMode.SHARED_INTENT_EXCLUSIVE}),
+    LockMode.EXCLUSIVE: frozenset(LockMode)
+}
+
+
+def combine_lock_modes(held: Optional[LockMode], requested: LockMode) -> LockMode:
+    """Weakest mode covering both a held and a requested mode (lock conversion)"""
+    if held is None or held in _LOCK_COVERS[requested]:
+        return requested
+    if requested in _LOCK_COVERS[held]:
+        return held
+    return LockMode.SHARED_INTENT_EXCLUSIVE  # SHARED + INTENT_EXCLUSIVE
+
+
+@dataclass
+class LockRequest:
+    """Queued lock request; future is set for callers that wait for the grant"""
+    transaction_id: str
+    mode: LockMode
+    future: Optional[asyncio.Future] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    queued: bool = True  # Cleared when granted or withdrawn
+    error: Optional[Exception] = None  # Set when withdrawn as a deadlock victim before waiting
+
+
+@dataclass
+class ResourceLock:
+    """Holders and FIFO wait queue of one resource"""
+    holders: Dict[str, LockMode] = field(default_factory=dict)
+    mode_counts: Dict[LockMode, int] = field(default_factory=dict)
+    queue: Deque[LockRequest] = field(default_factory=deque)
+    
+    def compatible(self, mode: LockMode, transaction_id: str) -> bool:
+        """Check a request against the other holders in O(number of modes)"""
+        own = self.holders.get(transaction_id)
+        allowed = LOCK_COMPATIBILITY[combine_lock_modes(own, mode)]
+        for held_mode, count in self.mode_counts.items():
+            if held_mode is own:
+                count -= 1
+            if count > 0 and held_mode not in allowed:
+                return False
+        return True
+    
+    def blocking_holders(self, mode: LockMode, transaction_id: str) -> Set[str]:
+        """Holders whose mode conflicts with a request"""
+        allowed = LOCK_COMPATIBILITY[combine_lock_modes(self.holders.get(transaction_id), mode)]
+        return {holder for holder, held_mode in self.holders.items()
+                if holder != transaction_id and held_mode not in allowed}
+    
+    def grant(self, transaction_id: str, mode: LockMode) -> LockMode:
+        own = self.holders.get(transaction_id)
+        granted = combine_lock_modes(own, mode)
+        if own is not None:
+            self.mode_counts[own] -= 1
+        self.holders[transaction_id] = granted
+        self.mode_counts[granted] = self.mode_counts.get(granted, 0) + 1
+        return granted
+    
+    def remove_holder(self, transaction_id: str):
+        mode = self.holders.pop(transaction_id)
+        self.mode_counts[mode] -= 1
+
+
+class LockManager:
+    """
+    Multi-granularity lock manager with FIFO hand-off and deadlock detection
+    
+    Compatible requests are granted together (concurrent readers); others
+    wait in a per-resource FIFO deque and are handed the lock by resolving
+    their future when it frees up, with conversions (upgrades) queued first.
+    Each transaction's lock set makes release O(locks held).
+    
+    The wait-for graph is maintained incrementally: when a resource's
+    holders or queue change, only its waiters' edges are recomputed (each
+    waiter points at conflicting holders and the nearest conflicting request
+    ahead of it), and cycle search starts only from waiters that gained an
+    edge. Victims are chosen by victim_policy: "requester" (the transaction
+    that closed the cycle), "youngest" or "fewest_locks".
+    """
+    
+    VICTIM_POLICIES = ("requester", "youngest", "fewest_locks")
+    
+    def __init__(self, deadlock_detection: bool = True, victim_policy: str = "requester"):
+        if victim_policy not in self.VICTIM_POLICIES:
+            raise ValueError(f"Unknown deadlock victim policy: {victim_policy}")
+        
+        self.deadlock_detection = deadlock_detection
+        self.victim_policy = victim_policy
+        
+        self.resources: Dict[str, ResourceLock] = {}
+        self.transaction_locks: Dict[str, Dict[str, LockMode]] = {}  # transaction -> resource -> mode
+        self.pending_requests: Dict[str, Dict[str, LockRequest]] = {}  # transaction -> resource -> request
+        self.wait_for: Dict[str, Dict[str, Set[str]]] = {}  # waiter -> resource -> blocking transactions
+        self._first_seen: Dict[str, float] = {}
+        
+        # Statistics
+        self.grants = 0
+        self.waits = 0
+        self.total_wait_time = 0.0
+        self.deadlocks_detected = 0
+        self.lock_timeouts = 0
+        self.max_concurrent_holders = 0
+    
+    async def acquire(
+        self,
+        resource_id: str,
+        transaction_id: str,
+        mode: LockMode = LockMode.EXCLUSIVE,
+        wait: bool = True,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Acquire a lock, converting an already held mode if needed
+        
+        Args:
+            resource_id: Resource to lock
+            transaction_id: Requesting transaction
+            mode: Requested lock mode
+            wait: Wait for the grant; otherwise a conflicting request stays
+                queued and is granted on hand-off, and False is returned
+            timeout: Seconds to wait before TransactionTimeoutError
+        
+        Returns:
+            True once granted, False if queued without waiting
+        
+        Raises:
+            TransactionDeadlockError: This transaction was chosen as a deadlock victim
+        """
+        lock = self.resources.get(resource_id)
+        if lock is None:
+            lock = self.resources[resource_id] = ResourceLock()
+        self._first_seen.setdefault(transaction_id, time.monotonic())
+        
+        held = lock.holders.get(transaction_id)
+        if held is not None and mode in _LOCK_COVERS[held]:
+            return True  # Already owns lock
+        
+        request = self.pending_requests.get(transaction_id, {}).get(resource_id)
+        if request is None:
+            # Conversions only wait for other holders; new requests also queue behind waiters (no barging)
+            if (held is not None or not lock.queue) and lock.compatible(mode, transaction_id):
+                self._grant(lock, resource_id, transaction_id, mode)
+                return True
+            
+            request = LockRequest(transaction_id, mode)
+            if held is not None:
+                lock.queue.appendleft(request)
+            else:
+                lock.queue.append(request)
+            self.pending_requests.setdefault(transaction_id, {})[resource_id] = request
+            self.waits += 1
+            logger.debug(f"Transaction {transaction_id} waiting for {mode.value} lock on {resource_id}")
+            
+            self._on_resource_changed(resource_id, lock, requester=transaction_id)
+            
+            if not request.queued:
+                # Resolved while breaking a deadlock elsewhere: granted, or withdrawn as a victim
+                held = lock.holders.get(transaction_id)
+                if held is not None and mode in _LOCK_COVERS[held]:
+                    return True
+                raise request.error or TransactionDeadlockError(
+                    f"Lock request of {transaction_id} on {resource_id} withdrawn to break a deadlock"
+                )
+        
+        if not wait:
+            return False
+        
+        if request.future is None:
+            request.future = asyncio.get_running_loop().create_future()
+        try:
+            if timeout is None:
+                await request.future
+            else:
+                await asyncio.wait_for(request.future, timeout)
+        except asyncio.TimeoutError:
+            self.lock_timeouts += 1
+            self._cancel_request(resource_id, request)
+            raise TransactionTimeoutError(f"Lock wait on {resource_id} timed out after {timeout}s")
+        except asyncio.CancelledError:
+            self._cancel_request(resource_id, request)
+            raise
+        return True
+    
+    def release(self, resource_id: str, transaction_id: str) -> bool:
+        """Release one lock and hand it to compatible waiters"""
+        lock = self.resources.get(resource_id)
+        if lock is None or transaction_id not in lock.holders:
+            return False
+        
+        lock.remove_holder(transaction_id)
+        held = self.transaction_locks.get(transaction_id)
+        if held is not None:
+            held.pop(resource_id, None)
+            if not held:
+                del self.transaction_locks[transaction_id]
+        
+        self._on_resource_changed(resource_id, lock)
+        logger.debug(f"Transaction {transaction_id} released lock on {resource_id}")
+        return True
+    
+    def release_all(self, transaction_id: str):
+        """Release every lock and queued request of a transaction in O(locks held)"""
+        for resource_id, request in list(self.pending_requests.get(transaction_id, {}).items()):
+            self._cancel_request(resource_id, request)
+        for resource_id in list(self.transaction_locks.get(transaction_id, {})):
+            self.release(resource_id, transaction_id)
+        self._first_seen.pop(transaction_id, None)
+    
+    def locks_held(self, transaction_id: str) -> Dict[str, LockMode]:
+        """Get the locks a transaction holds"""
+        return self.transaction_locks.get(transaction_id, {})
+    
+    def _grant(self, lock: ResourceLock, resource_id: str, transaction_id: str, mode: LockMode):
+        granted = lock.grant(transaction_id, mode)
+        self.transaction_locks.setdefault(transaction_id, {})[resource_id] = granted
+        self.grants += 1
+        if len(lock.holders) > self.max_concurrent_holders:
+            self.max_concurrent_holders = len(lock.holders)
+        logger.debug(f"Transaction {transaction_id} acquired {granted.value} lock on {resource_id}")
+    
+    def _grant_waiters(self, resource_id: str, lock: ResourceLock):
+        """Hand the lock to the compatible prefix of the FIFO queue"""
+        while lock.queue:
+            request = lock.queue[0]
+            if request.future is not None and request.future.done():
+                # Waiter gave up (cancelled) before being granted
+                lock.queue.popleft()
+                request.queued = False
+                self._forget_request(request.transaction_id, resource_id)
+                continue
+            if not lock.compatible(request.mode, request.transaction_id):
+                break
+            
+            lock.queue.popleft()
+            request.queued = False
+            self._forget_request(request.transaction_id, resource_id)
+            self._grant(lock, resource_id, request.transaction_id, request.mode)
+            self.total_wait_time += time.perf_counter() - request.enqueued_at
+            if request.future is not None:
+                request.future.set_result(True)
+    
+    def _forget_request(self, transaction_id: str, resource_id: str):
+        requests = self.pending_requests.get(transaction_id)
+        if requests is not None:
+            requests.pop(resource_id, None)
+            if not requests:
+                del self.pending_requests[transaction_id]
+        edges = self.wait_for.get(transaction_id)
+        if edges is not None:
+            edges.pop(resource_id, None)
+            if not edges:
+                del self.wait_for[transaction_id]
+    
+    def _cancel_request(self, resource_id: str, request: LockRequest):
+        """Withdraw a queued request (timeout, cancellation, abort or deadlock victim)"""
+        lock = self.resources.get(resource_id)
+        if self.pending_requests.get(request.transaction_id, {}).get(resource_id) is not request:
+            return  # Already granted or withdrawn
+        
+        lock.queue.remove(request)
+        request.queued = False
+        self._forget_request(request.transaction_id, resource_id)
+        if request.future is not None and not request.future.done():
+            request.future.cancel()
+        self._on_resource_changed(resource_id, lock)
+    
+    def _on_resource_changed(self, resource_id: str, lock: ResourceLock, requester: Optional[str] = None):
+        """Grant what became grantable, refresh this resource's wait-for edges and check new edges for cycles"""
+        self._grant_waiters(resource_id, lock)
+        
+        if not lock.holders and not lock.queue:
+            del self.resources[resource_id]
+            return
+        
+        gained_edges = self._update_wait_edges(resource_id, lock)
+        if not self.deadlock_detection:
+            return
+        
+        # The requester is checked first so that it can be the victim it closed the cycle for
+        if requester in gained_edges:
+            gained_edges.remove(requester)
+            gained_edges.insert(0, requester)
+        for waiter in gained_edges:
+            if waiter in self.wait_for:
+                self._resolve_deadlocks(waiter, raise_for_waiter=(waiter == requester))
+    
+    def _update_wait_edges(self, resource_id: str, lock: ResourceLock) -> List[str]:
+        """Recompute the wait-for edges of one resource's waiters; returns waiters that gained edges"""
+        gained = []
+        nearest_ahead: Dict[LockMode, str] = {}  # mode -> latest queued transaction requesting it
+        for request in lock.queue:
+            waiter = request.transaction_id
+            blockers = lock.blocking_holders(request.mode, waiter)
+            
+            # Nearest conflicting request ahead; those further ahead are reachable through it
+            allowed = LOCK_COMPATIBILITY[request.mode]
+            ahead = [txn for queued_mode, txn in nearest_ahead.items() if queued_mode not in allowed]
+            blockers.update(txn for txn in ahead if txn != waiter)
+            nearest_ahead[request.mode] = waiter
+            
+            edges = self.wait_for.setdefault(waiter, {})
+            previous = edges.get(resource_id, set())
+            if not blockers <= previous:
+                gained.append(waiter)
+            if blockers:
+                edges[resource_id] = blockers
+            else:
+                edges.pop(resource_id, None)
+                if not edges:
+                    del self.wait_for[waiter]
+        return gained
+    
+    def _find_cycle(self, start: str) -> Optional[List[str]]:
+        """Depth-first search from start along wait-for edges for a path back to start"""
+        path = [start]
+        stack = [iter(self._blockers(start))]
+        visited = {start}
+        while stack:
+            for blocker in stack[-1]:
+                if blocker == start:
+                    return list(path)
+                if blocker not in visited:
+                    visited.add(blocker)
+                    path.append(blocker)
+                    stack.append(iter(self._blockers(blocker)))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+        return None
+    
+    def _blockers(self, transaction_id: str) -> Set[str]:
+        edges = self.wait_for.get(transaction_id)
+        if not edges:
+            return set()
+        return set().union(*edges.values())
+    
+    def _choose_victim(self, cycle: List[str], waiter: str) -> str:
+        if self.victim_policy == "youngest":
+            return max(cycle, key=lambda txn: self._first_seen.get(txn, 0.0))
+        if self.victim_policy == "fewest_locks":
+            return min(cycle, key=lambda txn: len(self.transaction_locks.get(txn, {})))
+        return waiter
+    
+    def _resolve_deadlocks(self, waiter: str, raise_for_waiter: bool):
+        """Break every cycle through waiter by withdrawing a victim's requests"""
+        while True:
+            cycle = self._find_cycle(waiter)
+            if cycle is None:
+                return
+            
+            self.deadlocks_detected += 1
+            victim = self._choose_victim(cycle, waiter)
+            error = TransactionDeadlockError(
+                f"Deadlock detected: {' -> '.join(cycle + [cycle[0]])}; aborting {victim}"
+            )
+            logger.warning(str(error))
+            
+            for resource_id, request in list(self.pending_requests.get(victim, {}).items()):
+                if request.future is None:
+                    request.error = error
+                elif not request.future.done() and not (raise_for_waiter and victim == waiter):
+                    request.future.set_exception(error)
+                self._cancel_request(resource_id, request)
+            
+            if victim == waiter:
+                if raise_for_waiter:
+                    raise error
+                return
+    
+    def clear(self):
+        """Drop all locks, cancelling waiters"""
+        for requests in self.pending_requests.values():
+            for request in requests.values():
+                if request.future is not None and not request.future.done():
+                    request.future.cancel()
+        self.resources.clear()
+        self.transaction_locks.clear()
+        self.pending_requests.clear()
+        self.wait_for.clear()
+        self._first_seen.clear()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get lock manager statistics"""
+        return {
+            "locked_resources": len(self.resources),
+            "held_locks": sum(len(locks) for locks in self.transaction_locks.values()),
+            "pending_requests": sum(len(requests) for requests in self.pending_requests.values()),
+            "waiting_transactions": len(self.wait_for),
+            "grants": self.grants,
+            "waits": self.waits,
+            "average_wait_ms": self.total_wait_time / max(self.waits, 1) * 1000,
+            "deadlocks_detected": self.deadlocks_detected,
+            "lock_timeouts": self.lock_timeouts,
+            "max_concurrent_holders": self.max_concurrent_holders,
+            "victim_policy": self.victim_policy
+        }
+
+
 class Transaction:
     """Individual transaction implementation"""
     
@@ -236,9 +661,16 @@ class Transaction:
         self.operations: List[TransactionOperation] = []
         self.participants: List[TransactionParticipant] = []
         self.savepoints: Dict[str, int] = {}
-        self.locks_held: List[str] = []
         self._start_time: Optional[float] = None
     
+    @property
+    def locks_held(self) -> List[str]:
+        """Resources this transaction holds locks on"""
+        manager = self.manager()
+        if manager is None:
+            return []
+        return list(manager.lock_manager.locks_held(self.transaction_id))
+    
     async def begin(self):
         """Begin transaction"""
         if self.state != TransactionState.PENDING:
@@ -345,6 +777,11 @@ class Transaction:
             if all(commit_results):
                 self.state = TransactionState.COMMITTED
                 self.metadata.completed_at = time.time()
+                
+                # Strict two-phase locking: locks are held until commit
+                manager = self.manager()
+                if manager:
+                    await manager.release_all_locks(self.transaction_id)
                 logger.info(f"Transaction {self.transaction_id} committed successfully")
                 return True
             else:
@@ -377,8 +814,7 @@ class Transaction:
             # Release locks
             manager = self.manager()
             if manager:
-                for lock in self.locks_held:
-                    await manager.release_lock(lock, self.transaction_id)
+                await manager.release_all_locks(self.transaction_id)
             
             logger.info(f"Transaction {self.transaction_id} aborted")
             return all(abort_results)
@@ -407,21 +843,27 @@ class TransactionManager:
         self.max_concurrent_transactions = config.get("max_concurrent_transactions", 100)
         self.deadlock_detection_enabled = config.get("deadlock_detection", True)
         self.distributed_transactions_enabled = config.get("distributed_transactions", True)
+        self.lock_timeout = config.get("lock_timeout")
         
         # State
         self.active_transactions: Dict[str, Transaction] = {}
         self.transaction_history: List[TransactionResult] = []
-        self.locks: Dict[str, str] = {}  # resource_id -> transaction_id
-        self.lock_queue: Dict[str, List[str]] = {}  # resource_id -> waiting_transaction_ids
+        self.lock_manager = LockManager(
+            deadlock_detection=self.deadlock_detection_enabled,
+            victim_policy=config.get("deadlock_victim_policy", "requester")
+        )
         
         # Statistics
         self.total_transactions = 0
         self.committed_transactions = 0
         self.aborted_transactions = 0
-        self.deadlocks_detected = 0
         
         logger.info("TransactionManager initialized with ACID compliance")
     
+    @property
+    def deadlocks_detected(self) -> int:
+        return self.lock_manager.deadlocks_detected
+    
     async def create_transaction(
         self,
         isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED,
@@ -499,82 +941,41 @@ class TransactionManager:
             
             self.transaction_history.append(result)
     
-    async def acquire_lock(self, resource_id: str, transaction_id: str, lock_type: str = "exclusive") -> bool:
-        """Acquire lock on resource"""
-        if resource_id in self.locks:
-            current_holder = self.locks[resource_id]
-            if current_holder == transaction_id:
-                return True  # Already owns lock
-            
-            # Deadlock detection
-            if self.deadlock_detection_enabled:
-                if await self._detect_deadlock(transaction_id, current_holder):
-                    self.deadlocks_detected += 1
-                    raise TransactionDeadlockError(f"Deadlock detected: {transaction_id} -> {current_holder}")
-            
-            # Add to wait queue
-            if resource_id not in self.lock_queue:
-                self.lock_queue[resource_id] = []
-            self.lock_queue[resource_id].append(transaction_id)
-            
-            logger.debug(f"Transaction {transaction_id} waiting for lock on {resource_id}")
-            return False
-        
-        # Acquire lock
-        self.locks[resource_id] = transaction_id
+    async def acquire_lock(
+        self,
+        resource_id: str,
+        transaction_id: str,
+        lock_type: Union[str, LockMode] = "exclusive",
+        wait: bool = False,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Acquire lock on resource
         
-        # Update transaction locks
-        if transaction_id in self.active_transactions:
-            self.active_transactions[transaction_id].locks_held.append(resource_id)
+        Args:
+            resource_id: Resource to lock
+            transaction_id: Requesting transaction
+            lock_type: LockMode or its value ("shared", "exclusive", "intent_shared", ...)
+            wait: Wait until granted; otherwise return False and stay queued
+            timeout: Lock wait timeout in seconds (defaults to config "lock_timeout")
         
-        logger.debug(f"Transaction {transaction_id} acquired lock on {resource_id}")
-        return True
+        Returns:
+            True if the lock is held
+        """
+        mode = lock_type if isinstance(lock_type, LockMode) else LockMode(lock_type)
+        return await self.lock_manager.acquire(
+            resource_id, transaction_id, mode,
+            wait=wait,
+            timeout=timeout if timeout is not None else self.lock_timeout
+        )
     
     async def release_lock(self, resource_id: str, transaction_id: str):
         """Release lock on resource"""
-        if resource_id in self.locks and self.locks[resource_id] == transaction_id:
-            del self.locks[resource_id]
-            
-            # Process wait queue
-            if resource_id in self.lock_queue and self.lock_queue[resource_id]:
-                next_transaction = self.lock_queue[resource_id].pop(0)
-                self.locks[resource_id] = next_transaction
-                
-                # Update next transaction locks
-                if next_transaction in self.active_transactions:
-                    self.active_transactions[next_transaction].locks_held.append(resource_id)
-                
-                logger.debug(f"Lock on {resource_id} transferred to {next_transaction}")
-            
-            # Update current transaction locks
-            if transaction_id in self.active_transactions:
-                transaction = self.active_transactions[transaction_id]
-                if resource_id in transaction.locks_held:
-                    transaction.locks_held.remove(resource_id)
-            
-            logger.debug(f"Transaction {transaction_id} released lock on {resource_id}")
+        self.lock_manager.release(resource_id, transaction_id)
     
-    async def _detect_deadlock(self, requesting_tx: str, holding_tx: str) -> bool:
-        """Detect potential deadlock using wait-for graph"""
-        visited = set()
-        
-        def has_cycle(tx_id: str) -> bool:
-            if tx_id in visited:
-                return True
-            
-            visited.add(tx_id)
-            
-            # Check what this transaction is waiting for
-            for resource, waiters in self.lock_queue.items():
-                if tx_id in waiters:
-                    current_holder = self.locks.get(resource)
-                    if current_holder and has_cycle(current_holder):
-                        return True
-            
-            visited.remove(tx_id)
-            return False
-        
-        return has_cycle(requesting_tx)
+    async def release_all_locks(self, transaction_id: str):
+        """Release all locks and pending lock requests of a transaction"""
+        self.lock_manager.release_all(transaction_id)
     
     async def force_abort_transaction(self, transaction_id: str, reason: str = "Forced abort"):
         """Force abort transaction (for deadlock resolution, etc.)"""
@@ -593,8 +994,9 @@ class TransactionManager:
             "active_transactions": len(self.active_transactions),
             "commit_rate": self.committed_transactions / max(self.total_transactions, 1),
             "deadlocks_detected": self.deadlocks_detected,
-            "active_locks": len(self.locks),
-            "pending_lock_requests": sum(len(queue) for queue in self.lock_queue.values())
+            "active_locks": len(self.lock_manager.resources),
+            "pending_lock_requests": sum(len(requests) for requests in self.lock_manager.pending_requests.values()),
+            "lock_manager": self.lock_manager.get_statistics()
         }
     
     async def cleanup(self):
@@ -607,8 +1009,7 @@ class TransactionManager:
         
         # Clear state
         self.active_transactions.clear()
-        self.locks.clear()
-        self.lock_queue.clear()
+        self.lock_manager.clear()
 
 
 # Test harness
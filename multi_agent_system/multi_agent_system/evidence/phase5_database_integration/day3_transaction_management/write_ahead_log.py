@@ -0,0 +1,410 @@
+"""
+V5.0 Write-Ahead Log
+Segmented, group-committed JSONL log with checkpoints for transaction recovery
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class WALError(Exception):
+    """Raised when the write-ahead log cannot make a record durable"""
+    pass
+
+
+@dataclass
+class WALConfiguration:
+    """Write-ahead log configuration"""
+    directory: Union[str, Path]
+    name: str
+    segment_max_bytes: int = 16 * 1024 * 1024  # Rotate to a new segment past this size
+    max_batch_records: int = 1024  # Records per write+fsync
+    group_commit_delay: float = 0.0  # Extra wait for more records before each flush
+    fsync: bool = True
+
+
+@dataclass
+class WALMetrics:
+    """Write-ahead log metrics"""
+    records_written: int = 0
+    batches_written: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    total_sync_time: float = 0.0
+    max_batch_size: int = 0
+    segments_created: int = 0
+    segments_removed: int = 0
+    checkpoints: int = 0
+    torn_records_discarded: int = 0
+    
+    @property
+    def average_batch_size(self) -> float:
+        return self.records_written / self.batches_written if self.batches_written else 0.0
+
+
+@dataclass
+class WALRecovery:
+    """State recovered when opening a log: the last checkpoint plus the records after it"""
+    checkpoint_state: Dict[str, Any] = field(default_factory=dict)
+    checkpoint_lsn: int = 0
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    torn_records: int = 0
+
+
+class WriteAheadLog:
+    """
+    Append-only log with group commit, segment rotation and checkpoints
+    
+    append() queues a record and resolves once it is on disk. A single
+    background writer drains every queued record into one write+fsync on a
+    dedicated thread, so concurrent transactions share each fsync and the
+    event loop never blocks on disk. Segments ({name}.{seq}.wal) rotate by
+    size; checkpoint() starts a fresh segment, atomically records the
+    caller's state next to it and deletes older segments, so recovery reads
+    the checkpoint plus only the segments written since.
+    """
+    
+    def __init__(self, config: WALConfiguration):
+        self.config = config
+        self.directory = Path(config.directory)
+        self.metrics = WALMetrics()
+        
+        self.next_lsn = 1
+        self.durable_lsn = 0
+        
+        self._file = None  # Persistent append handle on the current segment
+        self._segment_seq = 0
+        self._segment_size = 0
+        
+        # (lsn, payload, is_checkpoint, future) in append order
+        self._pending: List[Tuple[int, bytes, bool, asyncio.Future]] = []
+        self._wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._open = False
+        self._closing = False
+        self._failure: Optional[BaseException] = None
+    
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.directory / f"{self.config.name}.checkpoint.json"
+    
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{self.config.name}.{seq:08d}.wal"
+    
+    def _list_segments(self) -> List[int]:
+        """Sequence numbers of the segments on disk, oldest first"""
+        prefix = f"{self.config.name}."
+        sequences = []
+        for path in self.directory.glob(f"{self.config.name}.*.wal"):
+            number = path.name[len(prefix):-len(".wal")]
+            if number.isdigit():
+                sequences.append(int(number))
+        return sorted(sequences)
+    
+    async def open(self) -> WALRecovery:
+        """
+        Recover the log from disk and start the group-commit writer
+        
+        Returns:
+            The last checkpoint's state and the records appended after it
+        """
+        if self._open:
+            raise WALError("Write-ahead log already open")
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"wal-{self.config.name}")
+        loop = asyncio.get_running_loop()
+        try:
+            recovery = await loop.run_in_executor(self._executor, self._recover_from_disk)
+        except Exception:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+        
+        self._open = True
+        self._closing = False
+        self._failure = None
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        
+        logger.info(
+            f"WAL {self.config.name} opened at segment {self._segment_seq}: "
+            f"{len(recovery.records)} records since checkpoint LSN {recovery.checkpoint_lsn}"
+        )
+        return recovery
+    
+    def _recover_from_disk(self) -> WALRecovery:
+        """
+        Read the checkpoint and tail segments, truncating a torn final record
+        
+        Only the end of the last segment can be torn by a crash mid-write;
+        damage anywhere else would drop records that were already
+        acknowledged, so it raises WALError instead.
+        """
+        recovery = WALRecovery()
+        checkpoint_segment = 0
+        
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+            recovery.checkpoint_state = checkpoint.get("state", {})
+            recovery.checkpoint_lsn = checkpoint.get("lsn", 0)
+            checkpoint_segment = checkpoint.get("segment", 0)
+        
+        segments = [seq for seq in self._list_segments() if seq >= checkpoint_segment]
+        last_lsn = recovery.checkpoint_lsn
+        
+        for position, seq in enumerate(segments):
+            path = self._segment_path(seq)
+            last_segment = position == len(segments) - 1
+            with open(path, "rb") as f:
+                data = f.read()
+            
+            valid_end = 0
+            lines = data.split(b"\n")[:-1]  # The part after the last newline is incomplete
+            for index, line in enumerate(lines):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if not last_segment or index != len(lines) - 1:
+                        raise WALError(f"WAL segment {path.name} is corrupt at byte {valid_end}, "
+                                       f"before records that were already acknowledged")
+                    break  # Torn final record: nothing after it was acknowledged
+                valid_end += len(line) + 1
+                if record.get("lsn", 0) > recovery.checkpoint_lsn:
+                    recovery.records.append(record)
+                    last_lsn = max(last_lsn, record["lsn"])
+            
+            if valid_end < len(data):
+                if not last_segment:
+                    raise WALError(f"WAL segment {path.name} ends in a partial record but is not the last segment")
+                recovery.torn_records += 1
+                logger.warning(f"WAL segment {path.name} has a torn tail at byte {valid_end}, truncating")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_end)
+                    f.flush()
+                    os.fsync(f.fileno())
+        
+        self.metrics.torn_records_discarded += recovery.torn_records
+        self.next_lsn = last_lsn + 1
+        self.durable_lsn = last_lsn
+        
+        if segments:
+            self._segment_seq = segments[-1]
+        else:
+            self._segment_seq = max(checkpoint_segment, 1)
+            self.metrics.segments_created += 1
+        self._file = open(self._segment_path(self._segment_seq), "ab")
+        self._segment_size = self._file.tell()
+        self._sync_directory()
+        return recovery
+    
+    def append_nowait(self, record: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a record for the next group commit
+        
+        Returns:
+            Future resolving to the record's LSN once it is durable
+        """
+        if not self._open or self._closing:
+            raise WALError("Write-ahead log is not open")
+        if self._failure is not None:
+            raise WALError(f"Write-ahead log failed: {self._failure}")
+        
+        lsn = self.next_lsn
+        self.next_lsn += 1
+        payload = json.dumps({"lsn": lsn, **record}, separators=(",", ":")).encode() + b"\n"
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((lsn, payload, False, future))
+        self._wakeup.set()
+        return future
+    
+    async def append(self, record: Dict[str, Any]) -> int:
+        """Append a record and wait until it is durable; returns its LSN"""
+        return await self.append_nowait(record)
+    
+    async def checkpoint(self, state: Dict[str, Any]) -> int:
+        """
+        Record a checkpoint and drop the segments it supersedes
+        
+        The state is serialized immediately, so it must describe everything
+        appended so far; recovery returns it together with the records
+        appended after this call.
+        
+        Returns:
+            LSN covered by the checkpoint
+        """
+        if not self._open or self._closing:
+            raise WALError("Write-ahead log is not open")
+        if self._failure is not None:
+            raise WALError(f"Write-ahead log failed: {self._failure}")
+        
+        lsn = self.next_lsn - 1
+        payload = json.dumps(state, separators=(",", ":")).encode()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((lsn, payload, True, future))
+        self._wakeup.set()
+        return await future
+    
+    async def _writer_loop(self):
+        """Drain queued records into batched write+fsync calls"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            await self._wakeup.wait()
+            if self.config.group_commit_delay > 0 and not self._closing:
+                await asyncio.sleep(self.config.group_commit_delay)
+            self._wakeup.clear()
+            
+            batch = self._pending[:self.config.max_batch_records]
+            del self._pending[:len(batch)]
+            if self._pending:
+                self._wakeup.set()
+            
+            if batch:
+                try:
+                    await loop.run_in_executor(self._executor, self._write_batch, batch)
+                except Exception as e:
+                    # Fail-stop: a failed fsync leaves the file contents unknown
+                    self._failure = e
+                    logger.error(f"WAL {self.config.name} write failed: {e}")
+                    for _, _, _, future in batch + self._pending:
+                        if not future.done():
+                            future.set_exception(WALError(f"Write-ahead log failed: {e}"))
+                    self._pending.clear()
+                    return
+                
+                for lsn, _, _, future in batch:
+                    if not future.done():
+                        future.set_result(lsn)
+            
+            if self._closing and not self._pending:
+                return
+    
+    def _write_batch(self, batch: List[Tuple[int, bytes, bool, asyncio.Future]]):
+        """Write a batch in append order (runs on the WAL thread)"""
+        buffer = []
+        last_lsn = self.durable_lsn
+        for lsn, payload, is_checkpoint, _ in batch:
+            if is_checkpoint:
+                self._flush(buffer, last_lsn)
+                buffer = []
+                self._write_checkpoint(lsn, payload)
+            else:
+                buffer.append(payload)
+                last_lsn = lsn
+        self._flush(buffer, last_lsn)
+    
+    def _flush(self, buffer: List[bytes], last_lsn: int):
+        """Write and fsync buffered records as one group commit"""
+        if not buffer:
+            return
+        
+        data = b"".join(buffer)
+        start_time = time.perf_counter()
+        self._file.write(data)
+        self._file.flush()
+        if self.config.fsync:
+            os.fsync(self._file.fileno())
+            self.metrics.fsyncs += 1
+        self.metrics.total_sync_time += time.perf_counter() - start_time
+        
+        self.durable_lsn = last_lsn
+        self.metrics.records_written += len(buffer)
+        self.metrics.batches_written += 1
+        self.metrics.bytes_written += len(data)
+        self.metrics.max_batch_size = max(self.metrics.max_batch_size, len(buffer))
+        
+        self._segment_size += len(data)
+        if self._segment_size >= self.config.segment_max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        """Close the current segment and start the next one"""
+        self._file.close()
+        self._segment_seq += 1
+        self._file = open(self._segment_path(self._segment_seq), "ab")
+        self._segment_size = 0
+        self.metrics.segments_created += 1
+        self._sync_directory()
+    
+    def _write_checkpoint(self, lsn: int, state_payload: bytes):
+        """Start a fresh segment, atomically replace the checkpoint and remove older segments"""
+        if self._segment_size > 0:
+            self._rotate()
+        
+        temporary_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(temporary_path, "wb") as f:
+            f.write(b'{"lsn":%d,"segment":%d,"state":' % (lsn, self._segment_seq) + state_payload + b"}")
+            f.flush()
+            if self.config.fsync:
+                os.fsync(f.fileno())
+        os.replace(temporary_path, self.checkpoint_path)
+        self._sync_directory()
+        self.metrics.checkpoints += 1
+        
+        # Compaction: everything before the checkpoint segment is summarized by its state
+        for seq in self._list_segments():
+            if seq < self._segment_seq:
+                self._segment_path(seq).unlink()
+                self.metrics.segments_removed += 1
+    
+    def _sync_directory(self):
+        """Make file creation, rename and removal durable"""
+        if not self.config.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+    
+    async def close(self):
+        """Flush queued records, stop the writer and close the segment"""
+        if not self._open:
+            return
+        
+        self._closing = True
+        self._wakeup.set()
+        if self._writer_task is not None:
+            await self._writer_task
+            self._writer_task = None
+        
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._executor.shutdown(wait=True)
+        self._open = False
+        
+        logger.info(f"WAL {self.config.name} closed at LSN {self.durable_lsn}")
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get write-ahead log statistics"""
+        return {
+            "segment": self._segment_seq,
+            "segment_size": self._segment_size,
+            "next_lsn": self.next_lsn,
+            "durable_lsn": self.durable_lsn,
+            "pending_records": len(self._pending),
+            "records_written": self.metrics.records_written,
+            "batches_written": self.metrics.batches_written,
+            "average_batch_size": self.metrics.average_batch_size,
+            "max_batch_size": self.metrics.max_batch_size,
+            "fsyncs": self.metrics.fsyncs,
+            "average_sync_ms": self.metrics.total_sync_time / max(self.metrics.batches_written, 1) * 1000,
+            "bytes_written": self.metrics.bytes_written,
+            "segments_created": self.metrics.segments_created,
+            "segments_removed": self.metrics.segments_removed,
+            "checkpoints": self.metrics.checkpoints,
+            "torn_records_discarded": self.metrics.torn_records_discarded
+        }
@@ -7,10 +7,14 @@ import asyncio
 import time
 import logging
 import uuid
+import re
+import sqlite3
 from typing import Dict, Any, Optional, List, Union, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
 import json
 
 logger = logging.getLogger(__name__)
@@ -48,6 +52,7 @@ class DatabaseConfiguration:
     query_timeout: float = 60.0
     ssl_enabled: bool = False
     ssl_params: Optional[Dict[str, Any]] = None
+    statement_cache_size: int = 256  # Prepared statements kept per connection (0 disables)
 
 
 @dataclass
@@ -73,8 +78,134 @@ class TransactionContext:
     timeout: float = 300.0
 
 
+@dataclass
+class PreparedStatement:
+    """Statement prepared once per connection and reused for every call with the same SQL"""
+    sql: str  # Normalized SQL used as the cache key
+    driver_sql: str  # SQL with placeholders converted to the driver's style
+    parameter_names: Tuple[str, ...] = ()  # Parameter order for positional placeholders
+    handle: Any = None  # Driver statement handle, None when the driver has no prepare step
+    use_count: int = 0
+
+
+# String literals are matched first so placeholders inside them are left alone
+_PYFORMAT_PLACEHOLDER = re.compile(r"('(?:[^']|'')*')|%\((\w+)\)s")
+_INSERT_VALUES = re.compile(
+    r"^(INSERT\s+(?:OR\s+\w+\s+)?(?:IGNORE\s+)?INTO\s+([\w.\"`]+)\s*(?:\([^)]*\))?)\s*VALUES\s*(\((?:[^()']|'(?:[^']|'')*'|\([^()]*\))*\))\s*(.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+_SQL_WHITESPACE = re.compile(r"('(?:[^']|'')*')|\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace outside string literals"""
+    return _SQL_WHITESPACE.sub(lambda match: match.group(1) or ' ', query).strip()
+
+
+@lru_cache(maxsize=1024)
+def convert_pyformat_to_numbered(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """Convert %(name)s placeholders to $1, $2, ... in order of first appearance"""
+    names: List[str] = []
+    
+    def number(match):
+        name = match.group(2)
+        if name is None:
+            return match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+    
+    return _PYFORMAT_PLACEHOLDER.sub(number, query), tuple(names)
+
+
+@lru_cache(maxsize=1024)
+def convert_pyformat_to_named(query: str) -> str:
+    """Convert %(name)s placeholders to :name"""
+    return _PYFORMAT_PLACEHOLDER.sub(lambda match: match.group(1) or f":{match.group(2)}", query)
+
+
+@dataclass
+class BulkInsertTemplate:
+    """Single-row INSERT split around its placeholders so it can be repeated per row"""
+    head: str  # INSERT INTO table (columns)
+    row_parts: Tuple[str, ...]  # SQL between placeholders of one VALUES tuple
+    parameter_names: Tuple[str, ...]
+    tail: str  # Trailing clause, e.g. ON CONFLICT ...
+    table: str
+    statements: Dict[int, str] = field(default_factory=dict)  # Row count -> multi-row SQL
+
+
+class PreparedStatementCache:
+    """Bounded LRU cache of prepared statements keyed by normalized SQL"""
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.statements: OrderedDict[str, PreparedStatement] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def __len__(self) -> int:
+        return len(self.statements)
+    
+    def get(self, sql: str) -> Optional[PreparedStatement]:
+        """Get a prepared statement, marking it most recently used"""
+        statement = self.statements.get(sql)
+        if statement is None:
+            self.misses += 1
+            return None
+        self.statements.move_to_end(sql)
+        self.hits += 1
+        return statement
+    
+    def put(self, statement: PreparedStatement) -> Optional[PreparedStatement]:
+        """
+        Store a prepared statement
+        
+        Returns:
+            The least recently used statement if one was evicted to make room
+        """
+        if self.max_size <= 0:
+            return None
+        self.statements[statement.sql] = statement
+        if len(self.statements) > self.max_size:
+            self.evictions += 1
+            return self.statements.popitem(last=False)[1]
+        return None
+    
+    def clear(self) -> List[PreparedStatement]:
+        """Drop all statements, returning them so their handles can be released"""
+        statements = list(self.statements.values())
+        self.statements.clear()
+        if statements:
+            self.invalidations += 1
+        return statements
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.statements),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / max(lookups, 1),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
 class DatabaseAdapter(ABC):
-    """Abstract base class for database adapters"""
+    """
+    Abstract base class for database adapters
+    
+    Each adapter owns one connection and a PreparedStatementCache for it:
+    a statement is prepared (and its placeholders converted) the first time
+    its normalized SQL is seen and reused afterwards. The cache is cleared on
+    reconnect and on schema change events (see on_schema_change).
+    """
     
     def __init__(self, config: DatabaseConfiguration):
         self.config = config
@@ -91,6 +222,7 @@ class DatabaseAdapter(ABC):
         }
         self.connection_id = str(uuid.uuid4())
         self.created_at = time.time()
+        self.statement_cache = PreparedStatementCache(config.statement_cache_size)
         
     @abstractmethod
     async def connect(self) -> bool:
@@ -157,6 +289,325 @@ class DatabaseAdapter(ABC):
         """Check database connection health"""
         pass
     
+    def _convert_placeholders(self, query: str) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Convert %(name)s placeholders to the driver's style
+        
+        Returns:
+            Tuple of (driver SQL, parameter names for positional binding or empty)
+        """
+        return query, ()
+    
+    def _bind_parameters(self, statement: PreparedStatement, parameters: Optional[Dict[str, Any]]) -> Any:
+        """Arrange parameters for a prepared statement"""
+        if not statement.parameter_names:
+            return parameters or {}
+        try:
+            return [parameters[name] for name in statement.parameter_names]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Missing query parameter: {e}")
+    
+    async def _prepare_statement(self, query: str) -> PreparedStatement:
+        """Get the cached prepared statement for a query, preparing it on first use"""
+        sql = normalize_sql(query)
+        statement = self.statement_cache.get(sql)
+        if statement is None:
+            driver_sql, parameter_names = self._convert_placeholders(sql)
+            statement = PreparedStatement(sql=sql, driver_sql=driver_sql, parameter_names=parameter_names)
+            
+            # Drivers with an explicit prepare step get a server-side statement handle
+            prepare = getattr(self.connection, "prepare", None)
+            if prepare is not None and self.statement_cache.max_size > 0:
+                statement.handle = await prepare(driver_sql)
+            
+            # A concurrent caller may have prepared the same SQL while we awaited
+            existing = self.statement_cache.statements.get(sql)
+            if existing is not None:
+                await self._release_statements([statement])
+                statement = existing
+            else:
+                evicted = self.statement_cache.put(statement)
+                if evicted is not None:
+                    await self._release_statements([evicted])
+        
+        statement.use_count += 1
+        return statement
+    
+    async def _execute_statement(
+        self,
+        statement: PreparedStatement,
+        parameters: Optional[Dict[str, Any]],
+        transaction_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Execute a prepared statement through the connection"""
+        bound = self._bind_parameters(statement, parameters)
+        if statement.handle is not None:
+            return await self.connection.execute_prepared(statement.handle, bound, transaction_id)
+        return await self.connection.execute(statement.driver_sql, bound, transaction_id)
+    
+    async def _release_statements(self, statements: List[PreparedStatement]):
+        """Deallocate server-side handles of statements dropped from the cache"""
+        deallocate = getattr(self.connection, "deallocate", None)
+        if deallocate is None:
+            return
+        for statement in statements:
+            if statement.handle is not None:
+                await deallocate(statement.handle)
+    
+    async def invalidate_statement_cache(self) -> int:
+        """
+        Drop all prepared statements for this connection
+        
+        Returns:
+            Number of statements invalidated
+        """
+        statements = self.statement_cache.clear()
+        if self.connection is not None:
+            await self._release_statements(statements)
+        if statements:
+            logger.debug(f"Invalidated {len(statements)} prepared statements on {self.connection_id}")
+        return len(statements)
+    
+    async def on_schema_change(self, event: Any = None):
+        """Schema change listener (e.g. MigrationManager.add_schema_change_listener)"""
+        await self.invalidate_statement_cache()
+    
+    # Bulk ingestion
+    
+    max_bind_parameters = 32767  # Dialect limit on bind parameters per statement
+    supports_copy = False  # Whether the driver can stream records COPY-style
+    
+    def _positional_placeholder(self, index: int) -> str:
+        """Positional placeholder for the 1-based parameter index"""
+        return f"${index}"
+    
+    def _parse_bulk_template(self, query: str) -> Optional[BulkInsertTemplate]:
+        """Parse a single-row INSERT ... VALUES (...) statement, or None if it is not one"""
+        match = _INSERT_VALUES.match(normalize_sql(query))
+        if match is None:
+            return None
+        head, table, row, tail = match.groups()
+        parts: List[str] = []
+        names: List[str] = []
+        position = 0
+        for placeholder in _PYFORMAT_PLACEHOLDER.finditer(row):
+            if placeholder.group(2) is None:
+                continue  # String literal
+            parts.append(row[position:placeholder.start()])
+            names.append(placeholder.group(2))
+            position = placeholder.end()
+        parts.append(row[position:])
+        return BulkInsertTemplate(
+            head=head,
+            row_parts=tuple(parts),
+            parameter_names=tuple(names),
+            tail=tail,
+            table=table
+        )
+    
+    def _open_transaction_id(self) -> Optional[str]:
+        """Most recently begun transaction still open on this connection, if any"""
+        return next(reversed(self.active_transactions), None)
+    
+    def _bulk_statement(self, template: BulkInsertTemplate, row_count: int) -> str:
+        """Multi-row INSERT for row_count rows with positional placeholders (cached per size)"""
+        sql = template.statements.get(row_count)
+        if sql is None:
+            width = len(template.parameter_names)
+            rows = []
+            for row_index in range(row_count):
+                row = [template.row_parts[0]]
+                for position, literal in enumerate(template.row_parts[1:]):
+                    row.append(self._positional_placeholder(row_index * width + position + 1))
+                    row.append(literal)
+                rows.append("".join(row))
+            sql = f"{template.head} VALUES {', '.join(rows)}{' ' + template.tail if template.tail else ''}"
+            template.statements[row_count] = sql
+        return sql
+    
+    def _bulk_batch_rows(self, template: BulkInsertTemplate, batch_size: Optional[int]) -> int:
+        """Rows per batch, capped by the dialect's bind parameter limit"""
+        width = max(len(template.parameter_names), 1)
+        limit = max(self.max_bind_parameters // width, 1)
+        return max(1, min(batch_size or 1000, limit))
+    
+    async def _iterate_batches(self, rows: Any, batch_rows: int):
+        """Group a sync or async iterable of rows into lists of batch_rows"""
+        batch = []
+        if hasattr(rows, "__aiter__"):
+            async for row in rows:
+                batch.append(row)
+                if len(batch) == batch_rows:
+                    yield batch
+                    batch = []
+        else:
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_rows:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+    
+    async def _write_batch(self, template: BulkInsertTemplate, batch: List[Any], use_copy: bool, transaction_id: str) -> int:
+        """Write one batch in a single statement (or COPY); returns driver-reported rows affected"""
+        names = template.parameter_names
+        if use_copy:
+            records = [tuple(row[name] for name in names) if isinstance(row, dict) else tuple(row)
+                       for row in batch]
+            status = await self.connection.copy_records_to_table(
+                template.table, records=records, columns=list(names)
+            )
+            return int(str(status).split()[-1]) if status else len(records)
+        
+        values = []
+        for row in batch:
+            if isinstance(row, dict):
+                values.extend([row[name] for name in names])
+            else:
+                values.extend(row)
+        result = await self.connection.execute(self._bulk_statement(template, len(batch)), values, transaction_id)
+        return result.get("rows_affected", 0)
+    
+    async def execute_bulk(
+        self,
+        query: str,
+        rows: Any,
+        batch_size: Optional[int] = None,
+        transaction_id: Optional[str] = None,
+        max_batch_retries: int = 1,
+        skip_failed_rows: bool = False,
+        use_copy: bool = True
+    ) -> QueryResult:
+        """
+        Bulk-insert rows using multi-row INSERT batches (or COPY where supported)
+        
+        Args:
+            query: Single-row template, e.g. INSERT INTO t (a, b) VALUES (%(a)s, %(b)s)
+            rows: Iterable or async iterable of parameter dicts (or sequences in placeholder order)
+            batch_size: Rows per statement, capped by the dialect's bind parameter limit
+            transaction_id: Existing transaction to write in; otherwise the transaction
+                already open on this connection is joined, or one is started
+            max_batch_retries: Times a failed batch is retried from its savepoint
+            skip_failed_rows: After retries, retry the batch row by row and skip failing rows
+                instead of rolling back the whole load
+            use_copy: Stream batches with COPY when the driver supports it
+            
+        Returns:
+            QueryResult whose rows_affected is the number of rows written
+        """
+        start_time = time.time()
+        query_id = str(uuid.uuid4())
+        own_transaction = None
+        rows_written = 0
+        driver_rows = 0
+        batches = 0
+        retries = 0
+        failed_rows = 0
+        
+        try:
+            if self.state != DatabaseState.CONNECTED:
+                raise RuntimeError("Database not connected")
+            
+            template = self._parse_bulk_template(query)
+            if template is None:
+                raise ValueError("Bulk writes require a single-row INSERT ... VALUES (...) statement")
+            
+            copy = (use_copy and self.supports_copy and not template.tail and
+                    hasattr(self.connection, "copy_records_to_table") and
+                    all(part.strip(" ,()") == "" for part in template.row_parts))
+            batch_rows = self._bulk_batch_rows(template, batch_size)
+            
+            if transaction_id is None:
+                transaction_id = self._open_transaction_id()
+            if transaction_id is None:
+                own_transaction = transaction_id = await self.begin_transaction()
+            
+            async for batch in self._iterate_batches(rows, batch_rows):
+                savepoint = f"bulk_batch_{batches}"
+                batches += 1
+                await self.connection.execute(f"SAVEPOINT {savepoint}", None, transaction_id)
+                
+                for attempt in range(max_batch_retries + 1):
+                    try:
+                        driver_rows += await self._write_batch(template, batch, copy, transaction_id)
+                        rows_written += len(batch)
+                        break
+                    except Exception as batch_error:
+                        await self.connection.execute(f"ROLLBACK TO SAVEPOINT {savepoint}", None, transaction_id)
+                        if attempt < max_batch_retries:
+                            retries += 1
+                            continue
+                        if not skip_failed_rows:
+                            raise
+                        
+                        # Isolate the failing rows, each behind its own savepoint
+                        logger.warning(f"Bulk batch {savepoint} failed ({batch_error}), retrying row by row")
+                        for row in batch:
+                            await self.connection.execute("SAVEPOINT bulk_row", None, transaction_id)
+                            try:
+                                driver_rows += await self._write_batch(template, [row], False, transaction_id)
+                                rows_written += 1
+                            except Exception:
+                                await self.connection.execute("ROLLBACK TO SAVEPOINT bulk_row", None, transaction_id)
+                                failed_rows += 1
+                            await self.connection.execute("RELEASE SAVEPOINT bulk_row", None, transaction_id)
+                
+                await self.connection.execute(f"RELEASE SAVEPOINT {savepoint}", None, transaction_id)
+            
+            if own_transaction and not await self.commit_transaction(own_transaction):
+                raise RuntimeError("Bulk write commit failed")
+            
+            execution_time = time.time() - start_time
+            self.update_query_statistics(execution_time, True)
+            
+            return QueryResult(
+                success=True,
+                rows_affected=rows_written,
+                execution_time=execution_time,
+                query_id=query_id,
+                metadata={
+                    "driver": self.driver_name,
+                    "bulk": True,
+                    "copy": copy,
+                    "batches": batches,
+                    "batch_rows": batch_rows,
+                    "batch_retries": retries,
+                    "failed_rows": failed_rows,
+                    "driver_rows_affected": driver_rows,
+                    "rows_per_second": rows_written / execution_time if execution_time > 0 else 0.0
+                }
+            )
+            
+        except Exception as e:
+            if own_transaction:
+                await self.rollback_transaction(own_transaction)
+            
+            execution_time = time.time() - start_time
+            self.update_query_statistics(execution_time, False)
+            
+            logger.error(f"Bulk write failed after {batches} batches: {e}")
+            return QueryResult(
+                success=False,
+                rows_affected=0,
+                execution_time=execution_time,
+                query_id=query_id,
+                error_message=str(e),
+                metadata={"driver": self.driver_name, "bulk": True, "batches": batches}
+            )
+    
+    async def bulk_insert(
+        self,
+        table: str,
+        columns: List[str],
+        rows: Any,
+        **options
+    ) -> QueryResult:
+        """Bulk-insert rows (dicts keyed by column, or sequences in column order) into a table"""
+        placeholders = ", ".join(f"%({column})s" for column in columns)
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        return await self.execute_bulk(query, rows, **options)
+    
     def update_query_statistics(self, execution_time: float, success: bool):
         """Update query execution statistics"""
         self.query_statistics["total_queries"] += 1
@@ -181,6 +632,7 @@ class DatabaseAdapter(ABC):
             "uptime": time.time() - self.created_at,
             "active_transactions": len(self.active_transactions),
             "query_statistics": self.query_statistics.copy(),
+            "statement_cache": self.statement_cache.get_statistics(),
             "success_rate": (
                 self.query_statistics["successful_queries"] / 
                 max(self.query_statistics["total_queries"], 1)
@@ -191,6 +643,9 @@ class DatabaseAdapter(ABC):
 class PostgreSQLAdapter(DatabaseAdapter):
     """PostgreSQL database adapter implementation"""
     
+    max_bind_parameters = 32767
+    supports_copy = True  # asyncpg copy_records_to_table
+    
     def __init__(self, config: DatabaseConfiguration):
         super().__init__(config)
         self.driver_name = "asyncpg"
@@ -231,6 +686,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
             if self.connection:
                 await self.connection.close()
                 self.connection = None
+            self.statement_cache.clear()
             
             self.state = DatabaseState.DISCONNECTED
             logger.info(f"Disconnected from PostgreSQL: {self.connection_id}")
@@ -254,11 +710,9 @@ class PostgreSQLAdapter(DatabaseAdapter):
             if self.state != DatabaseState.CONNECTED:
                 raise RuntimeError("Database not connected")
             
-            # Convert named parameters to PostgreSQL format
-            pg_query, pg_params = self._convert_parameters(query, parameters)
-            
-            # Execute query through connection
-            result = await self.connection.execute(pg_query, pg_params, transaction_id)
+            # Prepared once per connection, with placeholders converted to $1, $2, ...
+            statement = await self._prepare_statement(query)
+            result = await self._execute_statement(statement, parameters, transaction_id)
             
             execution_time = time.time() - start_time
             self.update_query_statistics(execution_time, True)
@@ -292,6 +746,10 @@ class PostgreSQLAdapter(DatabaseAdapter):
         transaction_id: Optional[str] = None
     ) -> QueryResult:
         """Execute PostgreSQL query with multiple parameter sets"""
+        # Single-row INSERTs are written as multi-row batches inside the open (or a new) transaction
+        if len(parameter_list) > 1 and self._parse_bulk_template(query) is not None:
+            return await self.execute_bulk(query, parameter_list, transaction_id=transaction_id)
+        
         start_time = time.time()
         query_id = str(uuid.uuid4())
         
@@ -301,10 +759,10 @@ class PostgreSQLAdapter(DatabaseAdapter):
             
             total_affected = 0
             
-            # Execute each parameter set
+            # Execute each parameter set against one prepared statement
+            statement = await self._prepare_statement(query)
             for parameters in parameter_list:
-                pg_query, pg_params = self._convert_parameters(query, parameters)
-                result = await self.connection.execute(pg_query, pg_params, transaction_id)
+                result = await self._execute_statement(statement, parameters, transaction_id)
                 total_affected += result.get("rows_affected", 0)
             
             execution_time = time.time() - start_time
@@ -455,29 +913,24 @@ class PostgreSQLAdapter(DatabaseAdapter):
             logger.error(f"PostgreSQL health check failed: {e}")
             return False
     
+    def _convert_placeholders(self, query: str) -> Tuple[str, Tuple[str, ...]]:
+        """Convert %(name)s placeholders to PostgreSQL $1, $2, ... (cached per query)"""
+        return convert_pyformat_to_numbered(query)
+    
     def _convert_parameters(self, query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
         """Convert named parameters to PostgreSQL positional parameters"""
         if not parameters:
             return query, []
         
-        # Convert %(name)s to $1, $2, etc.
-        pg_query = query
-        pg_params = []
-        param_index = 1
-        
-        for key, value in parameters.items():
-            placeholder = f"%({key})s"
-            if placeholder in pg_query:
-                pg_query = pg_query.replace(placeholder, f"${param_index}")
-                pg_params.append(value)
-                param_index += 1
-        
-        return pg_query, pg_params
+        pg_query, names = convert_pyformat_to_numbered(query)
+        return pg_query, [parameters[name] for name in names]
 
 
 class MySQLAdapter(DatabaseAdapter):
     """MySQL database adapter implementation"""
     
+    max_bind_parameters = 65535
+    
     def __init__(self, config: DatabaseConfiguration):
         super().__init__(config)
         self.driver_name = "aiomysql"
@@ -518,6 +971,7 @@ class MySQLAdapter(DatabaseAdapter):
             if self.connection:
                 await self.connection.close()
                 self.connection = None
+            self.statement_cache.clear()
             
             self.state = DatabaseState.DISCONNECTED
             logger.info(f"Disconnected from MySQL: {self.connection_id}")
@@ -541,11 +995,9 @@ class MySQLAdapter(DatabaseAdapter):
             if self.state != DatabaseState.CONNECTED:
                 raise RuntimeError("Database not connected")
             
-            # Convert named parameters to MySQL format
-            mysql_query, mysql_params = self._convert_parameters(query, parameters)
-            
-            # Execute query through connection
-            result = await self.connection.execute(mysql_query, mysql_params, transaction_id)
+            # Prepared once per connection (MySQL accepts %(name)s natively)
+            statement = await self._prepare_statement(query)
+            result = await self._execute_statement(statement, parameters, transaction_id)
             
             execution_time = time.time() - start_time
             self.update_query_statistics(execution_time, True)
@@ -579,6 +1031,10 @@ class MySQLAdapter(DatabaseAdapter):
         transaction_id: Optional[str] = None
     ) -> QueryResult:
         """Execute MySQL query with multiple parameter sets"""
+        # Single-row INSERTs are written as multi-row batches inside the open (or a new) transaction
+        if len(parameter_list) > 1 and self._parse_bulk_template(query) is not None:
+            return await self.execute_bulk(query, parameter_list, transaction_id=transaction_id)
+        
         start_time = time.time()
         query_id = str(uuid.uuid4())
         
@@ -588,10 +1044,10 @@ class MySQLAdapter(DatabaseAdapter):
             
             total_affected = 0
             
-            # Execute each parameter set
+            # Execute each parameter set against one prepared statement
+            statement = await self._prepare_statement(query)
             for parameters in parameter_list:
-                mysql_query, mysql_params = self._convert_parameters(query, parameters)
-                result = await self.connection.execute(mysql_query, mysql_params, transaction_id)
+                result = await self._execute_statement(statement, parameters, transaction_id)
                 total_affected += result.get("rows_affected", 0)
             
             execution_time = time.time() - start_time
@@ -746,6 +1202,9 @@ class MySQLAdapter(DatabaseAdapter):
             logger.error(f"MySQL health check failed: {e}")
             return False
     
+    def _positional_placeholder(self, index: int) -> str:
+        return "%s"
+    
     def _convert_parameters(self, query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
         """Convert named parameters to MySQL format"""
         if not parameters:
@@ -758,6 +1217,9 @@ class MySQLAdapter(DatabaseAdapter):
 class SQLiteAdapter(DatabaseAdapter):
     """SQLite database adapter implementation"""
     
+    # SQLITE_MAX_VARIABLE_NUMBER defaults to 999 before SQLite 3.32.0
+    max_bind_parameters = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    
     def __init__(self, config: DatabaseConfiguration):
         super().__init__(config)
         self.driver_name = "aiosqlite"
@@ -768,13 +1230,15 @@ class SQLiteAdapter(DatabaseAdapter):
             self.state = DatabaseState.CONNECTING
             logger.info(f"Connecting to SQLite database: {self.config.database}")
             
-            # Simulate aiosqlite connection
             database_path = self.config.database or ":memory:"
             
-            # Simulate connection establishment
-            await asyncio.sleep(0.05)  # SQLite is faster
-            
-            self.connection = SQLiteConnection(database_path)
+            if (self.config.connection_params or {}).get("native"):
+                # Real sqlite3 connection, its statement cache sized to ours
+                self.connection = SQLiteNativeConnection(database_path, self.config.statement_cache_size)
+            else:
+                # Simulate aiosqlite connection
+                await asyncio.sleep(0.05)  # SQLite is faster
+                self.connection = SQLiteConnection(database_path)
             self.state = DatabaseState.CONNECTED
             
             logger.info(f"Successfully connected to SQLite: {self.connection_id}")
@@ -791,6 +1255,7 @@ class SQLiteAdapter(DatabaseAdapter):
             if self.connection:
                 await self.connection.close()
                 self.connection = None
+            self.statement_cache.clear()
             
             self.state = DatabaseState.DISCONNECTED
             logger.info(f"Disconnected from SQLite: {self.connection_id}")
@@ -814,8 +1279,9 @@ class SQLiteAdapter(DatabaseAdapter):
             if self.state != DatabaseState.CONNECTED:
                 raise RuntimeError("Database not connected")
             
-            # Execute query through connection
-            result = await self.connection.execute(query, parameters, transaction_id)
+            # Placeholders converted once per statement; sqlite3 reuses its compiled statement
+            statement = await self._prepare_statement(query)
+            result = await self._execute_statement(statement, parameters, transaction_id)
             
             execution_time = time.time() - start_time
             self.update_query_statistics(execution_time, True)
@@ -849,6 +1315,10 @@ class SQLiteAdapter(DatabaseAdapter):
         transaction_id: Optional[str] = None
     ) -> QueryResult:
         """Execute SQLite query with multiple parameter sets"""
+        # Single-row INSERTs are written as multi-row batches inside the open (or a new) transaction
+        if len(parameter_list) > 1 and self._parse_bulk_template(query) is not None:
+            return await self.execute_bulk(query, parameter_list, transaction_id=transaction_id)
+        
         start_time = time.time()
         query_id = str(uuid.uuid4())
         
@@ -858,9 +1328,10 @@ class SQLiteAdapter(DatabaseAdapter):
             
             total_affected = 0
             
-            # Execute each parameter set
+            # Execute each parameter set against one prepared statement
+            statement = await self._prepare_statement(query)
             for parameters in parameter_list:
-                result = await self.connection.execute(query, parameters, transaction_id)
+                result = await self._execute_statement(statement, parameters, transaction_id)
                 total_affected += result.get("rows_affected", 0)
             
             execution_time = time.time() - start_time
@@ -1006,12 +1477,22 @@ class SQLiteAdapter(DatabaseAdapter):
         except Exception as e:
             logger.error(f"SQLite health check failed: {e}")
             return False
+    
+    def _convert_placeholders(self, query: str) -> Tuple[str, Tuple[str, ...]]:
+        """Convert %(name)s placeholders to sqlite3 :name (cached per query)"""
+        return convert_pyformat_to_named(query), ()
+    
+    def _positional_placeholder(self, index: int) -> str:
+        return "?"
 
 
 # Mock connection classes for testing
 class PostgreSQLConnection:
     def __init__(self, params):
         self.params = params
+        self.prepared: Dict[str, str] = {}  # handle -> SQL
+        self.prepare_count = 0
+        self.copied_records = 0
         
     async def execute(self, query, params, transaction_id):
         await asyncio.sleep(0.001)  # Simulate execution time
@@ -1021,6 +1502,23 @@ class PostgreSQLConnection:
             "rows": [{"result": 1}] if "SELECT" in query else [],
             "plan": "Mock execution plan"
         }
+    
+    async def prepare(self, query):
+        self.prepare_count += 1
+        handle = f"stmt_{self.prepare_count}"
+        self.prepared[handle] = query
+        return handle
+    
+    async def execute_prepared(self, handle, params, transaction_id):
+        return await self.execute(self.prepared[handle], params, transaction_id)
+    
+    async def deallocate(self, handle):
+        self.prepared.pop(handle, None)
+    
+    async def copy_records_to_table(self, table_name, *, records, columns=None):
+        await asyncio.sleep(0.001)  # Simulate one streamed COPY
+        self.copied_records += len(records)
+        return f"COPY {len(records)}"
         
     async def close(self):
         pass
@@ -1029,6 +1527,8 @@ class PostgreSQLConnection:
 class MySQLConnection:
     def __init__(self, params):
         self.params = params
+        self.prepared: Dict[str, str] = {}  # handle -> SQL
+        self.prepare_count = 0
         
     async def execute(self, query, params, transaction_id):
         await asyncio.sleep(0.001)  # Simulate execution time
@@ -1037,6 +1537,18 @@ class MySQLConnection:
             "rows_affected": 1,
             "rows": [{"result": 1}] if "SELECT" in query else []
         }
+    
+    async def prepare(self, query):
+        self.prepare_count += 1
+        handle = f"stmt_{self.prepare_count}"
+        self.prepared[handle] = query
+        return handle
+    
+    async def execute_prepared(self, handle, params, transaction_id):
+        return await self.execute(self.prepared[handle], params, transaction_id)
+    
+    async def deallocate(self, handle):
+        self.prepared.pop(handle, None)
         
     async def close(self):
         pass
@@ -1058,6 +1570,32 @@ class SQLiteConnection:
         pass
 
 
+class SQLiteNativeConnection:
+    """sqlite3-backed connection; sqlite3 caches compiled statements by SQL text"""
+    
+    def __init__(self, database_path, cached_statements=256):
+        self.database_path = database_path
+        self._connection = sqlite3.connect(
+            database_path,
+            check_same_thread=False,
+            isolation_level=None,  # Transactions are explicit BEGIN/COMMIT
+            cached_statements=cached_statements
+        )
+    
+    async def execute(self, query, params, transaction_id):
+        cursor = self._connection.execute(query, params or {})
+        columns = [column[0] for column in cursor.description] if cursor.description else []
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()] if columns else []
+        return {
+            "success": True,
+            "rows_affected": max(cursor.rowcount, 0),
+            "rows": rows
+        }
+    
+    async def close(self):
+        self._connection.close()
+
+
 # Test harness
 if __name__ == "__main__":
     async def test_database_adapters():
@@ -9,7 +9,7 @@ import logging
 import yaml
 import json
 from typing import Dict, Any, Optional, List, Union, Type
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 
@@ -17,6 +17,7 @@ from database_adapters import (
     DatabaseAdapter, DatabaseConfiguration, DatabaseType,
     PostgreSQLAdapter, MySQLAdapter, SQLiteAdapter
 )
+from performance_optimizer import QueryAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -45,11 +46,37 @@ class DatabaseClusterConfiguration:
     cluster_name: str
     primary_config: DatabaseConfiguration
     replica_configs: List[DatabaseConfiguration]
-    load_balancing_strategy: str = "round_robin"  # round_robin, least_connections, weighted
+    load_balancing_strategy: str = "round_robin"  # round_robin, least_connections, weighted, ewma_latency
     failover_enabled: bool = True
     health_check_interval: float = 30.0
     max_retries: int = 3
     retry_delay: float = 1.0
+    replica_weights: List[float] = field(default_factory=list)  # For weighted; defaults to 1.0 each
+    ewma_alpha: float = 0.2  # Smoothing for per-replica latency
+    max_replica_lag: float = 30.0  # Replicas lagging further are skipped for all reads
+    read_your_writes_window: float = 5.0  # Staleness bound: session reads stick to caught-up nodes this long
+    circuit_breaker_threshold: int = 3  # Consecutive errors that eject a replica
+    circuit_breaker_cooldown: float = 10.0  # Seconds before an ejected replica gets a probe request
+    lag_query: Optional[str] = None  # Run on each replica by the health loop; first column is lag in seconds
+
+
+@dataclass
+class ReplicaState:
+    """Routing state for one replica"""
+    adapter: DatabaseAdapter
+    index: int
+    weight: float = 1.0
+    active_requests: int = 0
+    ewma_latency: Optional[float] = None
+    total_requests: int = 0
+    total_failures: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0  # Circuit open until this monotonic time (0 = closed)
+    probing: bool = False  # Half-open probe in flight
+    ejections: int = 0
+    replication_lag: Optional[float] = None  # Seconds behind primary, when known
+    applied_until: float = 0.0  # Monotonic time up to which primary writes are applied
+    current_weight: float = 0.0  # Smooth weighted round-robin state
 
 
 @dataclass
@@ -331,7 +358,13 @@ class DatabaseFactory:
                 failover_enabled=config_dict.get('failover_enabled', True),
                 health_check_interval=config_dict.get('health_check_interval', 30.0),
                 max_retries=config_dict.get('max_retries', 3),
-                retry_delay=config_dict.get('retry_delay', 1.0)
+                retry_delay=config_dict.get('retry_delay', 1.0),
+                replica_weights=config_dict.get('replica_weights', []),
+                max_replica_lag=config_dict.get('max_replica_lag', 30.0),
+                read_your_writes_window=config_dict.get('read_your_writes_window', 5.0),
+                circuit_breaker_threshold=config_dict.get('circuit_breaker_threshold', 3),
+                circuit_breaker_cooldown=config_dict.get('circuit_breaker_cooldown', 10.0),
+                lag_query=config_dict.get('lag_query')
             )
             
             self.registry.register_cluster(name, cluster_config)
@@ -402,10 +435,19 @@ class DatabaseFactory:
 
 
 class ClusterDatabaseAdapter(DatabaseAdapter):
-    """Database adapter for clustered database configurations"""
+    """
+    Database adapter for clustered database configurations
+    
+    Writes and transactional queries go to the primary. Read-only queries,
+    classified by fingerprint, go to a replica picked by the configured
+    strategy among replicas that are healthy, within max_replica_lag and not
+    ejected by the circuit breaker. A session that has just written only
+    reads from replicas that have applied its write, for up to
+    read_your_writes_window seconds, and from the primary otherwise.
+    """
     
     def __init__(
-        self, 
+        self,
         cluster_config: DatabaseClusterConfiguration,
         primary_adapter: DatabaseAdapter,
         replica_adapters: List[DatabaseAdapter]
@@ -419,13 +461,36 @@ class ClusterDatabaseAdapter(DatabaseAdapter):
         self.current_replica_index = 0
         self.failed_adapters: set = set()
         
+        weights = cluster_config.replica_weights
+        self.replica_states: List[ReplicaState] = [
+            ReplicaState(adapter=replica, index=i, weight=weights[i] if i < len(weights) else 1.0)
+            for i, replica in enumerate(replica_adapters)
+        ]
+        self._states_by_adapter: Dict[int, ReplicaState] = {id(state.adapter): state for state in self.replica_states}
+        
+        # Read/write classification is cached per query fingerprint
+        self.query_analyzer = QueryAnalyzer()
+        
+        # session_id -> monotonic time of the session's last write
+        self._session_writes: Dict[str, float] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        
+        self.routing_statistics = {
+            "replica_reads": 0,
+            "primary_reads": 0,
+            "writes": 0,
+            "sticky_reads": 0,
+            "replica_failures": 0,
+            "ejections": 0
+        }
+        
         logger.info(f"Cluster adapter created: {cluster_config.cluster_name}")
     
     async def initialize(self):
         """Initialize cluster adapter"""
         # Start health monitoring
         if self.cluster_config.health_check_interval > 0:
-            asyncio.create_task(self._health_monitoring_loop())
+            self._health_task = asyncio.create_task(self._health_monitoring_loop())
     
     async def connect(self) -> bool:
         """Connect - already handled by individual adapters"""
@@ -435,6 +500,10 @@ class ClusterDatabaseAdapter(DatabaseAdapter):
         """Disconnect all adapters in cluster"""
         success = True
         
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        
         # Disconnect primary
         if not await self.primary_adapter.disconnect():
             success = False
@@ -447,39 +516,62 @@ class ClusterDatabaseAdapter(DatabaseAdapter):
         return success
     
     async def execute_query(
-        self, 
-        query: str, 
+        self,
+        query: str,
         parameters: Optional[Dict[str, Any]] = None,
-        transaction_id: Optional[str] = None
+        transaction_id: Optional[str] = None,
+        session_id: Optional[str] = None
     ):
-        """Execute query with load balancing for reads"""
-        
-        # Determine if query is read-only
-        is_read_query = self._is_read_query(query)
-        
-        if is_read_query and self.replica_adapters:
-            # Use replica for read queries
-            adapter = self._get_next_replica()
-            if adapter:
-                try:
-                    return await adapter.execute_query(query, parameters, transaction_id)
-                except Exception as e:
-                    logger.warning(f"Replica query failed, falling back to primary: {e}")
-        
-        # Use primary for write queries or when replicas fail
-        return await self.primary_adapter.execute_query(query, parameters, transaction_id)
+        """
+        Execute query with load balancing for reads
+        
+        Args:
+            query: SQL query
+            parameters: Query parameters
+            transaction_id: Transactions run entirely on the primary
+            session_id: Enables read-your-writes for this caller's reads
+        """
+        if transaction_id is None and self.replica_adapters and self._is_read_query(query):
+            state = self._select_replica(session_id)
+            if state is not None:
+                result = await self._execute_on_replica(state, query, parameters)
+                if result is not None:
+                    self.routing_statistics["replica_reads"] += 1
+                    return result
+                
+                # Replica failed: serve from primary, and only blame the replica if the primary succeeds
+                logger.warning(f"Replica {state.index} query failed, falling back to primary")
+                result = await self.primary_adapter.execute_query(query, parameters)
+                if result.success:
+                    self._record_replica_failure(state)
+                self.routing_statistics["primary_reads"] += 1
+                return result
+            
+            self.routing_statistics["primary_reads"] += 1
+            return await self.primary_adapter.execute_query(query, parameters, transaction_id)
+        
+        # Use primary for write queries, transactions or when no replica is eligible
+        self.routing_statistics["writes"] += 1
+        result = await self.primary_adapter.execute_query(query, parameters, transaction_id)
+        if session_id is not None and result.success:
+            self._record_session_write(session_id)
+        return result
     
     async def execute_many(
-        self, 
-        query: str, 
+        self,
+        query: str,
         parameter_list: List[Dict[str, Any]],
-        transaction_id: Optional[str] = None
+        transaction_id: Optional[str] = None,
+        session_id: Optional[str] = None
     ):
         """Execute batch query on primary"""
-        return await self.primary_adapter.execute_many(query, parameter_list, transaction_id)
+        result = await self.primary_adapter.execute_many(query, parameter_list, transaction_id)
+        if session_id is not None and result.success:
+            self._record_session_write(session_id)
+        return result
     
     async def begin_transaction(
-        self, 
+        self,
         isolation_level: str = "READ_COMMITTED",
         read_only: bool = False,
         timeout: float = 300.0
@@ -508,32 +600,168 @@ class ClusterDatabaseAdapter(DatabaseAdapter):
         return await self.primary_adapter.health_check()
     
     def _is_read_query(self, query: str) -> bool:
-        """Determine if query is read-only"""
-        query_upper = query.strip().upper()
-        read_keywords = ['SELECT', 'SHOW', 'DESCRIBE', 'EXPLAIN']
-        return any(query_upper.startswith(keyword) for keyword in read_keywords)
-    
-    def _get_next_replica(self) -> Optional[DatabaseAdapter]:
-        """Get next replica using load balancing strategy"""
-        if not self.replica_adapters:
+        """Determine if query is read-only (CTEs, parenthesized SELECTs; no locking or writes)"""
+        return self.query_analyzer.is_read_only(query)
+    
+    def _record_session_write(self, session_id: str):
+        """Remember when a session last wrote, pruning sessions past the staleness bound"""
+        now = time.monotonic()
+        if len(self._session_writes) >= 10000:
+            horizon = now - self.cluster_config.read_your_writes_window
+            self._session_writes = {
+                sid: written_at for sid, written_at in self._session_writes.items() if written_at > horizon
+            }
+        self._session_writes[session_id] = now
+    
+    def _is_available(self, state: ReplicaState, now: float) -> bool:
+        """Check health, lag bound and circuit breaker for a replica"""
+        if id(state.adapter) in self.failed_adapters:
+            return False
+        if state.ejected_until and (now < state.ejected_until or state.probing):
+            return False
+        if state.replication_lag is not None and state.replication_lag > self.cluster_config.max_replica_lag:
+            return False
+        return True
+    
+    def _select_replica(self, session_id: Optional[str] = None) -> Optional[ReplicaState]:
+        """Pick a replica for a read using the load balancing strategy"""
+        now = time.monotonic()
+        candidates = [state for state in self.replica_states if self._is_available(state, now)]
+        
+        # Read-your-writes: only replicas that have applied the session's last write
+        if session_id is not None and candidates:
+            written_at = self._session_writes.get(session_id)
+            if written_at is not None:
+                if now - written_at >= self.cluster_config.read_your_writes_window:
+                    del self._session_writes[session_id]
+                else:
+                    candidates = [state for state in candidates if state.applied_until >= written_at]
+                    if not candidates:
+                        self.routing_statistics["sticky_reads"] += 1
+        
+        if not candidates:
             return None
         
-        # Filter out failed adapters
-        available_replicas = [
-            replica for replica in self.replica_adapters 
-            if id(replica) not in self.failed_adapters
-        ]
+        # Rotate the scan start so ties are spread across replicas
+        offset = self.current_replica_index % len(candidates)
+        self.current_replica_index += 1
+        candidates = candidates[offset:] + candidates[:offset]
+        
+        strategy = self.cluster_config.load_balancing_strategy
+        if strategy == "least_connections":
+            state = min(candidates, key=lambda s: s.active_requests)
+        elif strategy == "weighted":
+            # Smooth weighted round-robin: picks are spread in proportion to weight
+            total_weight = 0.0
+            state = None
+            for candidate in candidates:
+                candidate.current_weight += candidate.weight
+                total_weight += candidate.weight
+                if state is None or candidate.current_weight > state.current_weight:
+                    state = candidate
+            state.current_weight -= total_weight
+        elif strategy == "ewma_latency":
+            # Expected wait: smoothed latency scaled by queue depth. An unmeasured replica
+            # gets one probe; until it answers it is not assumed to be fast
+            state = min(candidates, key=self._expected_latency)
+        else:
+            state = candidates[0]  # round_robin
+        
+        if state.ejected_until:
+            state.probing = True  # Half-open: this request decides whether the breaker closes
+        return state
+    
+    @staticmethod
+    def _expected_latency(state: ReplicaState) -> float:
+        """Score for ewma_latency routing"""
+        if state.ewma_latency is None:
+            return float('inf') if state.active_requests else 0.0
+        return state.ewma_latency * (state.active_requests + 1)
+    
+    async def _execute_on_replica(
+        self,
+        state: ReplicaState,
+        query: str,
+        parameters: Optional[Dict[str, Any]]
+    ):
+        """Run a read on a replica, updating its latency; returns None on failure"""
+        state.active_requests += 1
+        state.total_requests += 1
+        start_time = time.perf_counter()
+        try:
+            result = await state.adapter.execute_query(query, parameters)
+        except Exception as e:
+            logger.warning(f"Replica {state.index} raised: {e}")
+            result = None
+        finally:
+            state.active_requests -= 1
         
-        if not available_replicas:
+        state.probing = False
+        if result is None or not result.success:
             return None
         
-        if self.cluster_config.load_balancing_strategy == "round_robin":
-            replica = available_replicas[self.current_replica_index % len(available_replicas)]
-            self.current_replica_index += 1
-            return replica
-        
-        # Default to first available replica
-        return available_replicas[0]
+        elapsed = time.perf_counter() - start_time
+        alpha = self.cluster_config.ewma_alpha
+        state.ewma_latency = elapsed if state.ewma_latency is None else alpha * elapsed + (1 - alpha) * state.ewma_latency
+        state.consecutive_failures = 0
+        if state.ejected_until:
+            state.ejected_until = 0.0
+            logger.info(f"Replica {state.index} circuit closed")
+        return result
+    
+    def _record_replica_failure(self, state: ReplicaState):
+        """Count a replica error, ejecting it after consecutive failures"""
+        state.total_failures += 1
+        state.consecutive_failures += 1
+        self.routing_statistics["replica_failures"] += 1
+        
+        if state.consecutive_failures >= self.cluster_config.circuit_breaker_threshold:
+            state.ejected_until = time.monotonic() + self.cluster_config.circuit_breaker_cooldown
+            state.ejections += 1
+            self.routing_statistics["ejections"] += 1
+            logger.warning(
+                f"Replica {state.index} ejected for {self.cluster_config.circuit_breaker_cooldown}s "
+                f"after {state.consecutive_failures} consecutive failures"
+            )
+    
+    def report_replica_lag(self, replica: Union[int, DatabaseAdapter], lag: float):
+        """
+        Record how far a replica is behind the primary
+        
+        Args:
+            replica: Replica index or adapter
+            lag: Replication lag in seconds
+        """
+        if isinstance(replica, int):
+            state = self.replica_states[replica]
+        else:
+            state = self._states_by_adapter[id(replica)]
+        state.replication_lag = lag
+        state.applied_until = time.monotonic() - lag
+    
+    def get_cluster_statistics(self) -> Dict[str, Any]:
+        """Get routing statistics and per-replica state"""
+        now = time.monotonic()
+        return {
+            "strategy": self.cluster_config.load_balancing_strategy,
+            "routing": dict(self.routing_statistics),
+            "active_sessions": len(self._session_writes),
+            "replicas": [
+                {
+                    "index": state.index,
+                    "available": self._is_available(state, now),
+                    "ejected": bool(state.ejected_until),
+                    "weight": state.weight,
+                    "active_requests": state.active_requests,
+                    "ewma_latency_ms": state.ewma_latency * 1000 if state.ewma_latency is not None else None,
+                    "total_requests": state.total_requests,
+                    "total_failures": state.total_failures,
+                    "ejections": state.ejections,
+                    "replication_lag": state.replication_lag
+                }
+                for state in self.replica_states
+            ]
+        }
     
     async def _health_monitoring_loop(self):
         """Background health monitoring for cluster adapters"""
@@ -554,11 +782,19 @@ class ClusterDatabaseAdapter(DatabaseAdapter):
                             # Add to failed set if unhealthy
                             self.failed_adapters.add(replica_id)
                             logger.warning(f"Replica adapter {replica_id} health check failed")
-                            
+                            continue
+                        
+                        if self.cluster_config.lag_query:
+                            result = await replica.execute_query(self.cluster_config.lag_query)
+                            if result.success and result.rows:
+                                lag = next(iter(result.rows[0].values()))
+                                if lag is not None:
+                                    self.report_replica_lag(replica, float(lag))
+                    
                     except Exception as e:
                         logger.error(f"Health check error for replica: {e}")
                         self.failed_adapters.add(id(replica))
-                
+            
             except asyncio.CancelledError:
                 break
             except Exception as e:
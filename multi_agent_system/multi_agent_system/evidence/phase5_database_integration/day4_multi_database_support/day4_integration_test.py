@@ -5,17 +5,22 @@ Comprehensive testing of database adapters, factory, query translator, and perfo
 """
 
 import asyncio
+import os
+import sys
 import tempfile
 import time
 from typing import Dict, Any
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'day2_schema_validation_migration'))
+
 from database_adapters import (
     DatabaseAdapter, DatabaseConfiguration, DatabaseType,
-    PostgreSQLAdapter, MySQLAdapter, SQLiteAdapter
+    PostgreSQLAdapter, MySQLAdapter, SQLiteAdapter,
+    convert_pyformat_to_numbered, convert_pyformat_to_named
 )
 from database_factory import DatabaseFactory, FactoryConfiguration, DatabaseClusterConfiguration
-from query_translator import UniversalQueryTranslator, QueryType
-from performance_optimizer import PerformanceOptimizer, QueryOptimizationLevel, CacheStrategy
+from query_translator import UniversalQueryTranslator, QueryType, SQLiteTranslator
+from performance_optimizer import PerformanceOptimizer, QueryOptimizationLevel, CacheStrategy, QueryCache, extract_table_names
 
 
 async def test_database_adapters():
@@ -151,6 +156,207 @@ async def test_database_adapters():
     return adapters_passed == adapters_tested
 
 
+async def test_prepared_statement_cache():
+    """Test per-connection prepared statement caching and invalidation"""
+    print("\n🔧 Testing Prepared Statement Cache...")
+    
+    try:
+        from migration_manager import MigrationManager
+        
+        # Stand-in PostgreSQL connection: each shape is prepared once per connection
+        pg_adapter = PostgreSQLAdapter(DatabaseConfiguration(
+            database_type=DatabaseType.POSTGRESQL, host="localhost", statement_cache_size=2
+        ))
+        await pg_adapter.connect()
+        connection = pg_adapter.connection
+        
+        for user_id in range(20):
+            spacing = " " * (user_id % 3 + 1)
+            result = await pg_adapter.execute_query(
+                f"SELECT * FROM users{spacing}WHERE id = %(user_id)s AND org = %(org)s OR owner = %(user_id)s",
+                {"org": "acme", "user_id": user_id}
+            )
+            assert result.success, result.error_message
+        assert connection.prepare_count == 1, "Whitespace variants should share one prepared statement"
+        assert list(connection.prepared.values()) == [
+            "SELECT * FROM users WHERE id = $1 AND org = $2 OR owner = $1"
+        ], "Placeholders should be converted once in order of appearance"
+        
+        # Bounded LRU: the least recently used statement is evicted and deallocated
+        await pg_adapter.execute_query("SELECT * FROM orders WHERE id = %(id)s", {"id": 1})
+        await pg_adapter.execute_query("SELECT * FROM users WHERE id = %(user_id)s AND org = %(org)s OR owner = %(user_id)s",
+                                       {"org": "acme", "user_id": 1})
+        await pg_adapter.execute_query("SELECT * FROM products WHERE id = %(id)s", {"id": 1})
+        cached = list(pg_adapter.statement_cache.statements)
+        assert len(cached) == 2 and "SELECT * FROM orders WHERE id = %(id)s" not in cached
+        assert len(connection.prepared) == 2, "Evicted statements should be deallocated"
+        
+        # Schema migrations invalidate every prepared statement on the connection
+        temp_dir = tempfile.mkdtemp()
+        migration_manager = MigrationManager({"migrations_path": os.path.join(temp_dir, "migrations"),
+                                              "backup_enabled": False})
+        await migration_manager.initialize()
+        migration_manager.add_schema_change_listener(pg_adapter.on_schema_change)
+        await migration_manager.migrate_schema("1.0.0", "1.1.0")
+        assert len(pg_adapter.statement_cache) == 0 and connection.prepared == {}
+        
+        await pg_adapter.execute_query("SELECT * FROM products WHERE id = %(id)s", {"id": 2})
+        assert connection.prepare_count == 4, "Statements should be re-prepared after a migration"
+        stats = pg_adapter.get_adapter_statistics()["statement_cache"]
+        assert stats["evictions"] == 1 and stats["invalidations"] == 1
+        
+        # Concurrent first uses of one shape keep a single statement and release the other handle
+        prepare = connection.prepare
+        
+        async def slow_prepare(query):
+            await asyncio.sleep(0.001)
+            return await prepare(query)
+        
+        connection.prepare = slow_prepare
+        statements = await asyncio.gather(*[
+            pg_adapter._prepare_statement("SELECT * FROM accounts WHERE id = %(id)s") for _ in range(3)
+        ])
+        connection.prepare = prepare
+        assert len({id(statement) for statement in statements}) == 1
+        assert list(connection.prepared).count(statements[0].handle) == 1 and len(connection.prepared) == 2, \
+            "Losing prepares should be deallocated"
+        
+        # Placeholders inside string literals are not converted
+        assert convert_pyformat_to_numbered("SELECT '%(a)s', 'it''s %(b)s' FROM t WHERE c = %(c)s") == \
+            ("SELECT '%(a)s', 'it''s %(b)s' FROM t WHERE c = $1", ("c",))
+        assert convert_pyformat_to_named("SELECT '%(a)s' FROM t WHERE c = %(c)s") == "SELECT '%(a)s' FROM t WHERE c = :c"
+        await pg_adapter.disconnect()
+        
+        # Native SQLite: results match with the cache on and off; latency on repeated shapes
+        latencies = {}
+        for cache_size in (0, 256):
+            adapter = SQLiteAdapter(DatabaseConfiguration(
+                database_type=DatabaseType.SQLITE, database=":memory:",
+                connection_params={"native": True}, statement_cache_size=cache_size
+            ))
+            await adapter.connect()
+            await adapter.execute_query("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, org TEXT)")
+            await adapter.execute_many("INSERT INTO users (id, name, org) VALUES (%(id)s, %(name)s, %(org)s)",
+                                       [{"id": i, "name": f"user_{i}", "org": f"org_{i % 5}"} for i in range(200)])
+            
+            query = ("SELECT u.id, u.name FROM users u WHERE u.org = %(org)s AND u.id > %(min_id)s "
+                     "AND u.name LIKE %(pattern)s ORDER BY u.id LIMIT 5")
+            result = await adapter.execute_query(query, {"org": "org_3", "min_id": 10, "pattern": "user_%"})
+            assert [row["id"] for row in result.rows] == [13, 18, 23, 28, 33]
+            
+            iterations = 2000
+            start = time.perf_counter()
+            for i in range(iterations):
+                await adapter.execute_query(query, {"org": f"org_{i % 5}", "min_id": i % 100, "pattern": "user_%"})
+            latencies[cache_size] = (time.perf_counter() - start) / iterations * 1e6
+            await adapter.disconnect()
+        
+        print(f"    SQLite repeated shape: {latencies[0]:.1f}µs uncached vs {latencies[256]:.1f}µs cached per query")
+        assert latencies[256] < latencies[0], "Cached statements should be faster on repeated shapes"
+        print("  ✅ Prepared Statement Cache: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Prepared Statement Cache failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+async def test_bulk_writes():
+    """Test multi-row bulk inserts against native SQLite and COPY streaming"""
+    print("\n🔧 Testing Bulk Writes...")
+    
+    try:
+        row_count = 5000
+        
+        async def generate_rows():
+            for i in range(row_count):
+                yield {"id": i, "name": f"user_{i}", "score": i * 0.5}
+        
+        async def native_sqlite_adapter():
+            adapter = SQLiteAdapter(DatabaseConfiguration(
+                database_type=DatabaseType.SQLITE, database=":memory:", connection_params={"native": True}
+            ))
+            await adapter.connect()
+            await adapter.execute_query("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score REAL)")
+            return adapter
+        
+        async def table_contents(adapter):
+            result = await adapter.execute_query("SELECT id, name, score FROM users ORDER BY id")
+            return [(row["id"], row["name"], row["score"]) for row in result.rows]
+        
+        # Row-at-a-time baseline
+        adapter = await native_sqlite_adapter()
+        insert = "INSERT INTO users (id, name, score) VALUES (%(id)s, %(name)s, %(score)s)"
+        start = time.perf_counter()
+        async for row in generate_rows():
+            await adapter.execute_query(insert, row)
+        baseline_rate = row_count / (time.perf_counter() - start)
+        expected = await table_contents(adapter)
+        await adapter.disconnect()
+        print(f"    row-at-a-time: {baseline_rate:,.0f} rows/sec")
+        
+        # Streamed bulk writes at several batch sizes give identical tables
+        for batch_size in (10, 100, 1000, 50000):
+            adapter = await native_sqlite_adapter()
+            start = time.perf_counter()
+            result = await adapter.bulk_insert("users", ["id", "name", "score"], generate_rows(), batch_size=batch_size)
+            rate = row_count / (time.perf_counter() - start)
+            assert result.success, result.error_message
+            assert result.rows_affected == row_count
+            assert result.metadata["driver_rows_affected"] == row_count
+            assert await table_contents(adapter) == expected, "Bulk results should match row-at-a-time inserts"
+            print(f"    batch size {batch_size:5d} ({result.metadata['batch_rows']} rows/statement): "
+                  f"{rate:,.0f} rows/sec in {result.metadata['batches']} batches")
+            await adapter.disconnect()
+        
+        # Batches never exceed the dialect's bind parameter limit
+        assert result.metadata["batch_rows"] == SQLiteAdapter.max_bind_parameters // 3
+        
+        # execute_many on a single-row INSERT takes the bulk path
+        adapter = await native_sqlite_adapter()
+        result = await adapter.execute_many(insert, [{"id": i, "name": "n", "score": 0.0} for i in range(50)])
+        assert result.success and result.metadata["bulk"] and result.metadata["batches"] == 1
+        
+        # A failing row rolls back the whole load by default...
+        duplicate_rows = [{"id": i, "name": "dup", "score": 1.0} for i in range(45, 60)]
+        result = await adapter.execute_bulk(insert, duplicate_rows, batch_size=5)
+        assert not result.success
+        assert len(await table_contents(adapter)) == 50, "Failed bulk load should be rolled back"
+        
+        # ...or only that row is skipped, using savepoint-based partial retry
+        result = await adapter.execute_bulk(insert, duplicate_rows, batch_size=5, skip_failed_rows=True)
+        assert result.success and result.rows_affected == 10 and result.metadata["failed_rows"] == 5
+        assert len(await table_contents(adapter)) == 60
+        
+        # Inside a caller's open transaction the load joins it instead of committing on its own
+        transaction_id = await adapter.begin_transaction()
+        result = await adapter.execute_many(insert, [{"id": i, "name": "n", "score": 0.0} for i in range(60, 70)])
+        assert result.success, result.error_message
+        assert transaction_id in adapter.active_transactions
+        await adapter.rollback_transaction(transaction_id)
+        assert len(await table_contents(adapter)) == 60, "Rolling back the caller's transaction should undo the load"
+        await adapter.disconnect()
+        
+        # PostgreSQL streams plain INSERT templates through COPY
+        pg_adapter = PostgreSQLAdapter(DatabaseConfiguration(database_type=DatabaseType.POSTGRESQL, host="localhost"))
+        await pg_adapter.connect()
+        result = await pg_adapter.bulk_insert("users", ["id", "name", "score"], generate_rows(), batch_size=2000)
+        assert result.success and result.metadata["copy"] and result.metadata["batches"] == 3
+        assert pg_adapter.connection.copied_records == row_count
+        await pg_adapter.disconnect()
+        
+        print("  ✅ Bulk Writes: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Bulk Writes failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 async def test_database_factory():
     """Test database factory functionality"""
     print("\n🔧 Testing Database Factory...")
@@ -242,6 +448,140 @@ async def test_database_factory():
         return False
 
 
+async def test_replica_routing():
+    """Test read/write classification, balancing strategies, read-your-writes and circuit breaking"""
+    print("\n🔧 Testing Replica Routing...")
+    
+    try:
+        import sqlite3
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # SQLite files stand in for a primary and two replicas
+            paths = [os.path.join(temp_dir, name) for name in ("primary.db", "replica_0.db", "replica_1.db")]
+            for path in paths:
+                seed = sqlite3.connect(path)
+                seed.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+                seed.executemany("INSERT INTO users VALUES (?, ?)", [(n, f"user_{n}") for n in range(50)])
+                seed.commit()
+                seed.close()
+            
+            configs = [
+                DatabaseConfiguration(database_type=DatabaseType.SQLITE, database=path, connection_params={"native": True})
+                for path in paths
+            ]
+            factory = DatabaseFactory(FactoryConfiguration(default_database_type=DatabaseType.SQLITE))
+            factory.registry.register_cluster("sqlite_cluster", DatabaseClusterConfiguration(
+                cluster_name="sqlite_cluster",
+                primary_config=configs[0],
+                replica_configs=configs[1:],
+                health_check_interval=0,
+                replica_weights=[3.0, 1.0],
+                read_your_writes_window=0.2,
+                circuit_breaker_threshold=3,
+                circuit_breaker_cooldown=0.05
+            ))
+            cluster = await factory.create_cluster_adapter("sqlite_cluster")
+            replicas = cluster.replica_states
+            
+            # Classification sees through CTEs and parentheses, and keeps locking reads on the primary
+            assert cluster._is_read_query("WITH recent AS (SELECT * FROM users) SELECT * FROM recent")
+            assert cluster._is_read_query("(SELECT id FROM users) UNION (SELECT 1)")
+            assert not cluster._is_read_query("SELECT * FROM users WHERE id = 1 FOR UPDATE")
+            assert not cluster._is_read_query("WITH gone AS (DELETE FROM users RETURNING id) SELECT * FROM gone")
+            
+            # Weighted: picks follow the 3:1 weights
+            cluster.cluster_config.load_balancing_strategy = "weighted"
+            for n in range(40):
+                assert (await cluster.execute_query("SELECT * FROM users WHERE id = :id", {"id": n})).success
+            assert (replicas[0].total_requests, replicas[1].total_requests) == (30, 10)
+            
+            # Read-your-writes: a session's fresh write is read from the primary until a replica catches up
+            cluster.cluster_config.load_balancing_strategy = "round_robin"
+            await cluster.execute_query("INSERT INTO users VALUES (100, 'new_user')", session_id="s1")
+            lookup = "SELECT * FROM users WHERE id = 100"
+            assert len((await cluster.execute_query(lookup, session_id="s1")).rows) == 1, "Session should read its write"
+            assert len((await cluster.execute_query(lookup)).rows) == 0, "Other reads may be served stale by a replica"
+            
+            replica_copy = sqlite3.connect(paths[1])
+            replica_copy.execute("INSERT INTO users VALUES (100, 'new_user')")
+            replica_copy.commit()
+            replica_copy.close()
+            cluster.report_replica_lag(0, 0.0)
+            before = replicas[0].total_requests
+            assert len((await cluster.execute_query(lookup, session_id="s1")).rows) == 1
+            assert replicas[0].total_requests == before + 1, "Caught-up replica should serve the session"
+            
+            # Lag bound: a replica far behind is skipped for every read
+            cluster.report_replica_lag(1, 120.0)
+            before = replicas[1].total_requests
+            for _ in range(4):
+                await cluster.execute_query("SELECT COUNT(*) AS total FROM users")
+            assert replicas[1].total_requests == before
+            cluster.report_replica_lag(1, 0.0)
+            
+            # Circuit breaker: consecutive errors eject a replica, a probe after cooldown restores it
+            await replicas[0].adapter.disconnect()
+            for _ in range(8):
+                result = await cluster.execute_query("SELECT COUNT(*) AS total FROM users")
+                assert result.success, "Failed replica reads should fall back to the primary"
+            assert replicas[0].ejections == 1 and replicas[0].total_failures == 3
+            await replicas[0].adapter.connect()
+            await asyncio.sleep(0.06)
+            for _ in range(4):
+                await cluster.execute_query("SELECT COUNT(*) AS total FROM users")
+            assert replicas[0].ejected_until == 0.0 and replicas[0].consecutive_failures == 0
+            
+            # Tail latency with one slow replica
+            slow_execute = replicas[1].adapter.execute_query
+            
+            async def delayed_execute(query, parameters=None, transaction_id=None):
+                await asyncio.sleep(0.02)
+                return await slow_execute(query, parameters, transaction_id)
+            
+            replicas[1].adapter.execute_query = delayed_execute
+            
+            async def run_reads(strategy, total=400, concurrency=8):
+                cluster.cluster_config.load_balancing_strategy = strategy
+                for state in replicas:
+                    state.ewma_latency = None
+                    state.total_requests = 0
+                latencies = []
+                
+                async def worker(count):
+                    for n in range(count):
+                        start = time.perf_counter()
+                        await cluster.execute_query("SELECT * FROM users WHERE id = :id", {"id": n % 50})
+                        latencies.append(time.perf_counter() - start)
+                
+                await asyncio.gather(*(worker(total // concurrency) for _ in range(concurrency)))
+                latencies.sort()
+                return (latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.99)] * 1000,
+                        replicas[1].total_requests / total)
+            
+            tails = {}
+            for strategy in ("round_robin", "least_connections", "ewma_latency"):
+                p50, p99, slow_share = await run_reads(strategy)
+                tails[strategy] = (p99, slow_share)
+                print(f"    {strategy:17s}: p50 {p50:6.2f}ms, p99 {p99:6.2f}ms, slow replica share {slow_share:.0%}")
+            
+            assert tails["least_connections"][1] < tails["round_robin"][1]
+            assert tails["ewma_latency"][1] < 0.05, "EWMA routing should steer around the slow replica"
+            assert tails["ewma_latency"][0] < tails["round_robin"][0] / 2
+            
+            stats = cluster.get_cluster_statistics()
+            print(f"    Routing: {stats['routing']}")
+            await cluster.disconnect()
+        
+        print("  ✅ Replica Routing: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Replica Routing failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 async def test_query_translator():
     """Test query translation functionality"""
     print("\n🔧 Testing Query Translator...")
@@ -338,6 +678,64 @@ async def test_query_translator():
         return False
 
 
+async def test_query_translation_cache():
+    """Test shape-keyed translation caching with literal rebinding"""
+    print("\n🔧 Testing Query Translation Cache...")
+    
+    try:
+        translator = UniversalQueryTranslator()
+        pg_translator = translator.translators[DatabaseType.POSTGRESQL]
+        
+        # Queries differing only in literals and parameter values share one cache entry
+        for user_id in range(100):
+            result = translator.translate(
+                f"SELECT CONCAT(first_name, ' {user_id} ') FROM users WHERE id = {user_id} AND created_at < NOW()",
+                DatabaseType.POSTGRESQL,
+                {"limit": user_id}
+            )
+            assert result.success, "Translation should succeed"
+            assert result.translated_query == (
+                f"SELECT (first_name, ' {user_id} ') FROM users WHERE id = {user_id} AND created_at < CURRENT_TIMESTAMP"
+            ), f"Literals should be rebound: {result.translated_query}"
+            assert result.translated_parameters == {"limit": user_id}, "Parameters should be rebound per call"
+        
+        stats = pg_translator.get_translation_statistics()
+        assert stats["cache_misses"] == 1 and stats["cache_hits"] == 99, f"Unexpected cache counts: {stats}"
+        assert stats["cached_queries"] == 1
+        
+        # Literal contents are never rewritten by dialect rules
+        result = translator.translate("SELECT 'a + NOW()' AS note FROM t", DatabaseType.SQLITE)
+        assert result.translated_query == "SELECT 'a + NOW()' AS note FROM t", "String literals should be preserved"
+        
+        # Single-pass rewriter applies nested rules and DDL type mappings
+        result = translator.translate("SELECT CONCAT(a + b, c) FROM t", DatabaseType.SQLITE)
+        assert result.translated_query == "SELECT (a || b, c) FROM t"
+        result = translator.translate(
+            "CREATE TABLE t (id INT AUTO_INCREMENT, created DATETIME, data BLOB)", DatabaseType.POSTGRESQL
+        )
+        assert result.translated_query == "CREATE TABLE t (id INT SERIAL, created TIMESTAMP, data BYTEA)"
+        
+        # The cache is bounded and evicts least recently used shapes
+        bounded = SQLiteTranslator(DatabaseType.SQLITE, max_cache_size=4)
+        for column in range(10):
+            bounded.translate_query(f"SELECT col_{column} FROM t WHERE id = 1")
+        bounded.translate_query("SELECT col_9 FROM t WHERE id = 2")
+        bounded_stats = bounded.get_translation_statistics()
+        assert bounded_stats["cached_queries"] == 4 and bounded_stats["cache_evictions"] == 6
+        assert bounded_stats["cache_hits"] == 1
+        
+        print(f"    Hit rate: {stats['cache_hit_rate']:.1%}, "
+              f"hit {stats['average_hit_time_ms'] * 1000:.1f}µs vs miss {stats['average_miss_time_ms'] * 1000:.1f}µs")
+        print("  ✅ Query Translation Cache: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Query Translation Cache failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 async def test_performance_optimizer():
     """Test performance optimizer functionality"""
     print("\n🔧 Testing Performance Optimizer...")
@@ -480,6 +878,193 @@ async def test_performance_optimizer():
         return False
 
 
+async def test_query_cache():
+    """Test O(1) cache eviction, running memory accounting and table-tag invalidation"""
+    print("\n🔧 Testing Query Cache...")
+    
+    try:
+        from database_adapters import QueryResult
+        
+        def result(n):
+            return QueryResult(success=True, rows_affected=1, rows=[{"id": n, "name": f"user_{n}"}])
+        
+        # LRU: the least recently read entry is evicted first
+        lru = QueryCache(max_size=3, strategy=CacheStrategy.LRU)
+        for n in range(3):
+            lru.put(f"SELECT * FROM users WHERE id = {n}", result(n))
+        assert lru.get("SELECT * FROM users WHERE id = 0") is not None
+        lru.put("SELECT * FROM users WHERE id = 3", result(3))
+        assert lru.get("SELECT * FROM users WHERE id = 1") is None, "LRU should evict the least recently used entry"
+        assert lru.get("SELECT * FROM users WHERE id = 0") is not None
+        
+        # LFU: the least frequently read entry is evicted first
+        lfu = QueryCache(max_size=3, strategy=CacheStrategy.LFU)
+        for n in range(3):
+            lfu.put(f"SELECT * FROM users WHERE id = {n}", result(n))
+        for n, reads in [(0, 3), (1, 1), (2, 2)]:
+            for _ in range(reads):
+                lfu.get(f"SELECT * FROM users WHERE id = {n}")
+        lfu.put("SELECT * FROM users WHERE id = 3", result(3))
+        assert lfu.get("SELECT * FROM users WHERE id = 1") is None, "LFU should evict the least frequently used entry"
+        assert lfu.get("SELECT * FROM users WHERE id = 2") is not None
+        assert lfu.metrics.evictions == 1
+        
+        # ADAPTIVE: a scan of one-off queries does not flush entries read twice
+        adaptive = QueryCache(max_size=4, strategy=CacheStrategy.ADAPTIVE)
+        for n in range(2):
+            adaptive.put(f"SELECT * FROM users WHERE id = {n}", result(n))
+            adaptive.get(f"SELECT * FROM users WHERE id = {n}")
+        for n in range(100, 110):
+            adaptive.put(f"SELECT * FROM users WHERE id = {n}", result(n))
+        for n in range(2):
+            assert adaptive.get(f"SELECT * FROM users WHERE id = {n}") is not None, "ADAPTIVE should keep re-read entries"
+        assert len(adaptive.cache) == 4
+        
+        # Running memory counter matches the entries held
+        for cache in (lru, lfu, adaptive):
+            assert cache.metrics.memory_usage_bytes == sum(e.size_bytes for e in cache.cache.values())
+        
+        # Writes to a table invalidate only the queries that read it
+        optimizer = PerformanceOptimizer(cache_config={"max_size": 100})
+        
+        class MockAdapter:
+            connection_id = "mock_adapter"
+            
+            async def execute_query(self, query, parameters=None, transaction_id=None):
+                return result(1)
+        
+        adapter = MockAdapter()
+        await optimizer.execute_optimized_query(adapter, "SELECT * FROM users")
+        await optimizer.execute_optimized_query(adapter, "SELECT * FROM orders o JOIN users u ON o.user_id = u.id")
+        await optimizer.execute_optimized_query(adapter, "SELECT * FROM products")
+        await optimizer.execute_optimized_query(adapter, "UPDATE users SET active = false WHERE id = 1")
+        assert len(optimizer.cache.cache) == 1, "Only the products query should remain cached"
+        assert optimizer.cache.get("SELECT * FROM products") is not None
+        assert optimizer.cache.metrics.invalidations == 2
+        
+        # Every table of a comma join is tagged, and qualified names match unqualified writes
+        await optimizer.execute_optimized_query(adapter, "SELECT * FROM public.orders o, users u WHERE o.user_id = u.id")
+        assert extract_table_names("SELECT * FROM public.orders o, users u") == ("orders", "users")
+        await optimizer.execute_optimized_query(adapter, "DELETE FROM users WHERE id = 2")
+        assert optimizer.cache.get("SELECT * FROM public.orders o, users u WHERE o.user_id = u.id") is None
+        assert optimizer.cache.get("SELECT * FROM products") is not None
+        
+        # Queries whose tables cannot be parsed are not cached
+        assert extract_table_names("SELECT * FROM") is None
+        optimizer.cache.put("SELECT * FROM", result(1))
+        assert optimizer.cache.get("SELECT * FROM") is None
+        
+        # Eviction cost does not grow with cache size
+        timings = {}
+        for size in (1000, 20000):
+            cache = QueryCache(max_size=size, strategy=CacheStrategy.LFU)
+            queries = [f"SELECT * FROM users WHERE id = {n}" for n in range(size + 2000)]
+            for query in queries[:size]:
+                cache.put(query, result(1))
+            start = time.perf_counter()
+            for query in queries[size:]:
+                cache.put(query, result(1))
+            timings[size] = (time.perf_counter() - start) / 2000 * 1e6
+            print(f"    cache size {size:5d}: {timings[size]:.1f}µs per put with eviction")
+        assert timings[20000] < timings[1000] * 3, "Eviction cost should not grow with cache size"
+        
+        stats = optimizer.cache.get_cache_statistics()
+        print(f"    Evictions: {lfu.metrics.evictions}, invalidations: {stats['invalidations']}")
+        print("  ✅ Query Cache: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Query Cache failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+async def test_query_fingerprinting():
+    """Test tokenizer fingerprints, streaming workload statistics and top-N targeting"""
+    print("\n🔧 Testing Query Fingerprinting...")
+    
+    try:
+        from database_adapters import QueryResult
+        from performance_optimizer import QueryAnalyzer, StreamingHistogram, fingerprint_query
+        
+        # Literals, placeholders, IN lists and multi-row VALUES collapse to one shape
+        same_shape = [
+            "SELECT * FROM users WHERE id IN (1, 2, 3) AND name = 'alice'",
+            "select *  from USERS where id in ($1) and name=%(name)s -- lookup",
+            "SELECT * FROM users WHERE id IN (4,5,6,7,8,9) AND name = 'it''s'"
+        ]
+        assert len({fingerprint_query(q) for q in same_shape}) == 1, "Same-shape queries should share a fingerprint"
+        assert fingerprint_query("INSERT INTO t (a, b) VALUES (1, 2), (3, 4)") == \
+            fingerprint_query("INSERT INTO t (a, b) VALUES (5, 6)")
+        assert fingerprint_query("SELECT * FROM users WHERE id = 1") != \
+            fingerprint_query("SELECT * FROM orders WHERE id = 1")
+        
+        # Streaming histogram percentiles stay within bucket error
+        histogram = StreamingHistogram()
+        for n in range(1, 1001):
+            histogram.record(n / 1000.0)
+        assert abs(histogram.percentile(95) - 0.95) / 0.95 < 0.06
+        assert len(histogram.buckets) < 100, "Histogram memory should not grow with sample count"
+        
+        # Per-fingerprint aggregation and top-N by total time
+        analyzer = QueryAnalyzer()
+        for n in range(100):
+            analyzer.record_execution(f"SELECT * FROM users WHERE id = {n}", 0.001, rows_returned=1)
+        for n in range(5):
+            analyzer.record_execution(f"SELECT * FROM orders WHERE total > {n}", 0.05, rows_returned=20)
+        analyzer.record_execution("SELECT * FROM products", 0.002, rows_returned=3)
+        
+        assert len(analyzer.query_patterns) == 3
+        top = analyzer.get_top_queries(2)
+        assert top[0].query_template == "select * from orders where total > ?"
+        assert top[1].execution_count == 100 and top[1].total_rows == 100
+        assert analyzer.get_top_queries(1, order_by="calls")[0].execution_count == 100
+        report = analyzer.get_workload_report(3)
+        assert abs(sum(entry["share_of_total_time"] for entry in report) - 1.0) < 1e-9
+        assert abs(report[0]["p95_time"] - 0.05) / 0.05 < 0.06
+        
+        # Targeted optimization only rewrites the costliest shapes
+        optimizer = PerformanceOptimizer(optimization_level=QueryOptimizationLevel.AGGRESSIVE)
+        optimizer.analyzer = analyzer
+        intermediate_calls = []
+        original_intermediate = optimizer._apply_intermediate_optimizations
+        
+        def tracking_intermediate(query):
+            intermediate_calls.append(query)
+            return original_intermediate(query)
+        
+        optimizer._apply_intermediate_optimizations = tracking_intermediate
+        
+        class MockAdapter:
+            connection_id = "mock_adapter"
+            
+            async def execute_query(self, query, parameters=None, transaction_id=None):
+                return QueryResult(success=True, rows_affected=1, rows=[{"id": 1}])
+        
+        adapter = MockAdapter()
+        optimizer.optimize_adapter(adapter, target_top_n=1)
+        await adapter.execute_query("SELECT * FROM orders WHERE total > 99")
+        await adapter.execute_query("SELECT * FROM products WHERE id = 7")
+        assert len(intermediate_calls) == 1 and "orders" in intermediate_calls[0], \
+            "Only the top fingerprint should receive intermediate optimizations"
+        
+        report = optimizer.get_performance_report()
+        assert report["top_queries"][0]["fingerprint"] in optimizer.optimization_targets
+        
+        print(f"    Patterns: {len(analyzer.query_patterns)}, targets: {len(optimizer.optimization_targets)}")
+        print(f"    Top shape: {report['top_queries'][0]['query_template']} "
+              f"({report['top_queries'][0]['share_of_total_time']:.0%} of time)")
+        print("  ✅ Query Fingerprinting: All tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Query Fingerprinting failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 async def test_end_to_end_integration():
     """Test end-to-end integration of all Day 4 components"""
     print("\n🔧 Testing End-to-End Integration...")
@@ -603,9 +1188,15 @@ async def main():
     test_results = []
     
     test_results.append(await test_database_adapters())
+    test_results.append(await test_prepared_statement_cache())
+    test_results.append(await test_bulk_writes())
     test_results.append(await test_database_factory())
+    test_results.append(await test_replica_routing())
     test_results.append(await test_query_translator())
+    test_results.append(await test_query_translation_cache())
     test_results.append(await test_performance_optimizer())
+    test_results.append(await test_query_cache())
+    test_results.append(await test_query_fingerprinting())
     test_results.append(await test_end_to_end_integration())
     
     print("\n" + "=" * 80)
@@ -625,9 +1216,15 @@ async def main():
         print(f"❌ Some tests failed ({passed_tests}/{total_tests})")
         test_names = [
             "Database Adapters",
+            "Prepared Statement Cache",
+            "Bulk Writes",
             "Database Factory",
+            "Replica Routing",
             "Query Translator", 
+            "Query Translation Cache",
             "Performance Optimizer",
+            "Query Cache",
+            "Query Fingerprinting",
             "End-to-End Integration"
         ]
         for i, (name, result) in enumerate(zip(test_names, test_results)):
@@ -7,14 +7,17 @@ import asyncio
 import time
 import logging
 import hashlib
+import heapq
 import json
+import math
+import re
 import statistics
-from typing import Dict, Any, Optional, List, Union, Tuple, Set
+from typing import Dict, Any, Optional, List, Union, Tuple, Set, Deque
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 import weakref
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 
 from database_adapters import DatabaseAdapter, QueryResult
 
@@ -26,7 +29,7 @@ class CacheStrategy(Enum):
     LRU = "lru"  # Least Recently Used
     LFU = "lfu"  # Least Frequently Used
     TTL = "ttl"  # Time To Live
-    ADAPTIVE = "adaptive"  # Adaptive based on query patterns
+    ADAPTIVE = "adaptive"  # Segmented LRU: entries hit again are protected from one-off scans
 
 
 class QueryOptimizationLevel(Enum):
@@ -47,6 +50,7 @@ class CacheEntry:
     access_count: int = 0
     ttl: Optional[float] = None
     size_bytes: int = 0
+    tables: Tuple[str, ...] = ()  # Tables the cached result depends on
     
     def is_expired(self) -> bool:
         """Check if cache entry is expired"""
@@ -60,10 +64,153 @@ class CacheEntry:
         self.access_count += 1
 
 
+class StreamingHistogram:
+    """
+    Constant-memory histogram with logarithmic buckets
+    
+    Values are counted in buckets growing by `growth` from `min_value`, so
+    percentiles carry about (growth - 1) / 2 relative error and memory is
+    bounded by the range of values seen, not their count.
+    """
+    
+    __slots__ = ("growth", "min_value", "_log_growth", "buckets", "zero_count", "count", "total", "min", "max")
+    
+    def __init__(self, growth: float = 1.1, min_value: float = 1e-6):
+        self.growth = growth
+        self.min_value = min_value
+        self._log_growth = math.log(growth)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0  # Values below min_value
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def record(self, value: float):
+        """Record one value in O(1)"""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < self.min_value:
+            self.zero_count += 1
+            return
+        index = int(math.log(value / self.min_value) / self._log_growth)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+    
+    def percentile(self, percent: float) -> float:
+        """Approximate value at the given percentile (0-100)"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = self.zero_count
+        if seen >= target:
+            return self.min
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                midpoint = self.min_value * self.growth ** index * (1 + self.growth) / 2
+                return min(max(midpoint, self.min), self.max)
+        return self.max
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+# One token per match: whitespace, comment, literal, quoted identifier, placeholder, word or symbol
+_SQL_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<quoted>"(?:[^"]|"")*"|`[^`]*`)
+  | (?P<param>%\(\w+\)s|%s|\$\d+|\?|:\w+)
+  | (?P<number>\b0x[0-9a-fA-F]+\b|\b\d+(?:\.\d*)?(?:[eE][-+]?\d+)?\b|\.\d+\b)
+  | (?P<word>[A-Za-z_][\w$]*)
+  | (?P<symbol>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Normalize a query to its shape in a single tokenizer pass
+    
+    Literals and placeholders become ?, parenthesized lists of them (IN
+    lists, VALUES rows) collapse to (?+), repeated VALUES rows collapse to
+    one, comments are dropped and words are lower-cased.
+    """
+    out: List[str] = []
+    for match in _SQL_TOKEN.finditer(query):
+        kind = match.lastgroup
+        if kind == "space" or kind == "comment":
+            continue
+        if kind == "string" or kind == "number" or kind == "param":
+            out.append("?")
+        elif kind == "word":
+            out.append(match.group().lower())
+        elif kind == "symbol" and match.group() == ")":
+            # Collapse "( ? , ? , ... )" into "(?+)"
+            position = len(out) - 1
+            expect_value = True
+            while position >= 0 and out[position] == ("?" if expect_value else ","):
+                position -= 1
+                expect_value = not expect_value
+            if not expect_value and position >= 0 and out[position] == "(":
+                del out[position:]
+                out.append("(?+)")
+                # Collapse "(?+) , (?+)" (multi-row VALUES) into one row
+                while len(out) >= 3 and out[-3] == "(?+)" and out[-2] == ",":
+                    del out[-2:]
+            else:
+                out.append(")")
+        else:
+            out.append(match.group())
+    return " ".join(out)
+
+
+# Statements that can be served by a read replica
+_READ_STATEMENTS = frozenset({"select", "with", "show", "describe", "desc", "explain", "values"})
+
+# Tokens that make a statement write or lock (also as functions when listed in _WRITE_FUNCTIONS)
+_WRITE_KEYWORDS = frozenset({
+    "insert", "update", "delete", "merge", "replace", "upsert", "create", "alter", "drop",
+    "truncate", "grant", "revoke", "into", "lock", "call", "copy", "nextval", "setval"
+})
+_WRITE_FUNCTIONS = frozenset({"nextval", "setval"})
+
+
+def is_read_only_template(template: str) -> bool:
+    """
+    Classify a fingerprint template as safe to run on a read replica
+    
+    The statement must start (after any opening parentheses) with a read
+    keyword and contain no write or locking clause anywhere, which covers
+    data-modifying CTEs, SELECT ... INTO and SELECT ... FOR UPDATE/SHARE.
+    """
+    tokens = template.split()
+    position = 0
+    while position < len(tokens) and tokens[position] == "(":
+        position += 1
+    if position == len(tokens) or tokens[position] not in _READ_STATEMENTS:
+        return False
+    
+    for index, token in enumerate(tokens):
+        next_token = tokens[index + 1] if index + 1 < len(tokens) else ""
+        if token in _WRITE_KEYWORDS:
+            # REPLACE(...), INSERT(...) and friends are string functions, not writes
+            if next_token != "(" or token in _WRITE_FUNCTIONS:
+                return False
+        elif token == "for" and next_token in ("share", "key"):
+            return False
+    return True
+
+
 @dataclass
 class QueryPattern:
     """Query execution pattern analysis"""
-    query_hash: str
+    query_hash: str  # Fingerprint
     query_template: str
     execution_count: int = 0
     total_execution_time: float = 0.0
@@ -74,6 +221,13 @@ class QueryPattern:
     parameter_patterns: Dict[str, Set[Any]] = field(default_factory=lambda: defaultdict(set))
     cache_hit_rate: float = 0.0
     optimization_applied: bool = False
+    total_rows: int = 0
+    latency_histogram: StreamingHistogram = field(default_factory=StreamingHistogram)
+    rows_histogram: StreamingHistogram = field(default_factory=lambda: StreamingHistogram(min_value=1.0))
+    
+    @property
+    def p95_execution_time(self) -> float:
+        return self.latency_histogram.percentile(95.0)
 
 
 @dataclass
@@ -89,26 +243,145 @@ class PerformanceMetrics:
     slow_queries: int = 0
     optimized_queries: int = 0
     memory_usage_bytes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+def _estimate_object_size(value: Any) -> int:
+    """Approximate serialized size of a value without serializing it"""
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (bool, type(None))):
+        return 5
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + _estimate_object_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 2 + sum(_estimate_object_size(item) + 1 for item in value)
+    return len(str(value))
+
+
+_IDENTIFIER = r'(?:"[^"]+"|`[^`]+`|\[[^\]]+\]|[A-Za-z_][\w$]*)'
+_TABLE_TOKEN = re.compile(
+    r"(?P<skip>'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/)"
+    rf"|(?P<name>{_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})*)"
+    r"|(?P<symbol>[(),;])"
+    r"|(?P<other>\S)",
+    re.DOTALL
+)
+# Keywords followed by a table reference; FROM and UPDATE take comma-separated lists
+_TABLE_KEYWORDS = {'FROM', 'JOIN', 'INTO', 'UPDATE', 'TABLE', 'TRUNCATE'}
+_TABLE_LIST_KEYWORDS = {'FROM', 'UPDATE'}
+_TABLE_PREFIX_WORDS = {'ONLY', 'LATERAL', 'IF', 'NOT', 'EXISTS', 'TABLE'}
+# Keywords that end a FROM/UPDATE table list
+_CLAUSE_KEYWORDS = {
+    'WHERE', 'GROUP', 'ORDER', 'HAVING', 'LIMIT', 'OFFSET', 'UNION', 'INTERSECT', 'EXCEPT',
+    'SET', 'VALUES', 'WINDOW', 'FETCH', 'FOR', 'RETURNING', 'SELECT'
+}
+
+
+def normalize_table_name(name: str) -> str:
+    """Reduce a possibly schema-qualified, quoted table name to its bare lower-case name"""
+    last_part = re.split(r'\s*\.\s*(?=["`\[A-Za-z_])', name.strip())[-1]
+    return last_part.strip('"`[]').lower()
+
+
+def extract_table_names(query: str) -> Optional[Tuple[str, ...]]:
+    """
+    Extract the tables a query reads or writes
+    
+    Every FROM/JOIN list entry (including comma joins) and every INTO,
+    UPDATE, TABLE and TRUNCATE target is collected. Qualified names are
+    reduced to the bare table name so reads and writes of public.users and
+    users share one tag.
+    
+    Returns:
+        Sorted bare table names, or None if the query could not be parsed
+    """
+    tables: Set[str] = set()
+    depth = 0
+    list_depths: Set[int] = set()  # Paren depths with an open FROM/UPDATE list
+    expecting_table = False
+    
+    for match in _TABLE_TOKEN.finditer(query):
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        token = match.group()
+        word = token.upper() if kind == 'name' else None
+        
+        if expecting_table:
+            if word in _TABLE_PREFIX_WORDS:
+                continue
+            if kind == 'name':
+                tables.add(normalize_table_name(token))
+                expecting_table = False
+                continue
+            if token == '(':
+                expecting_table = False  # Derived table: its own FROM is parsed inside
+            else:
+                return None
+        
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            list_depths.discard(depth)
+            depth -= 1
+        elif token == ',' and depth in list_depths:
+            expecting_table = True
+        elif word in _TABLE_KEYWORDS:
+            if word in _TABLE_LIST_KEYWORDS:
+                list_depths.add(depth)
+            expecting_table = True
+        elif word in _CLAUSE_KEYWORDS:
+            list_depths.discard(depth)
+    
+    if expecting_table:
+        return None
+    return tuple(sorted(tables))
 
 
 class QueryCache:
-    """Advanced query result caching system"""
+    """
+    Advanced query result caching system
+    
+    All operations are O(1): entries live in an OrderedDict kept in recency
+    order (LRU), in a second OrderedDict kept in insertion order (TTL), in
+    per-frequency buckets (LFU, least recently used first within a bucket),
+    or in probation/protected recency segments (ADAPTIVE: new entries start
+    on probation and move to the protected segment on their second hit, so
+    a burst of one-off queries only evicts other one-off results). Memory
+    usage is a running counter, and each entry is tagged with the tables its
+    query reads so writes can invalidate only dependent results.
+    """
     
     def __init__(
         self, 
         max_size: int = 1000,
         max_memory_mb: int = 100,
         default_ttl: Optional[float] = 3600.0,
-        strategy: CacheStrategy = CacheStrategy.LRU
+        strategy: CacheStrategy = CacheStrategy.LRU,
+        size_sample_rows: int = 8
     ):
         self.max_size = max_size
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.default_ttl = default_ttl
         self.strategy = strategy
+        self.size_sample_rows = size_sample_rows
         
-        # Cache storage
+        # Cache storage (recency order: least recently used first)
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self.access_frequency: Dict[str, int] = defaultdict(int)
+        self._insertion_order: OrderedDict[str, None] = OrderedDict()
+        self._frequency_buckets: Dict[int, OrderedDict] = {}
+        self._min_frequency = 0
+        self._probation: OrderedDict[str, None] = OrderedDict()
+        self._protected: OrderedDict[str, None] = OrderedDict()
+        self.protected_capacity = max(1, int(max_size * 0.8))
+        self._table_index: Dict[str, Set[str]] = defaultdict(set)
         
         # Statistics
         self.metrics = PerformanceMetrics()
@@ -128,116 +401,129 @@ class QueryCache:
         return hashlib.sha256(key_data.encode()).hexdigest()
     
     def _estimate_size(self, result: QueryResult) -> int:
-        """Estimate memory size of query result"""
-        size = 0
+        """Estimate memory size of query result from a sample of its rows"""
+        size = 200  # Approximate overhead for QueryResult object
         
-        # Estimate size of rows data
-        if result.rows:
-            # Rough estimation based on JSON serialization
-            size += len(json.dumps(result.rows).encode())
+        rows = result.rows
+        if rows:
+            sample = rows[:self.size_sample_rows]
+            sample_size = sum(_estimate_object_size(row) for row in sample)
+            size += sample_size * len(rows) // len(sample)
         
-        # Add metadata size
         if result.metadata:
-            size += len(json.dumps(result.metadata).encode())
-        
-        # Add fixed overhead
-        size += 200  # Approximate overhead for QueryResult object
+            size += _estimate_object_size(result.metadata)
         
         return size
     
-    def _evict_entries(self, required_space: int = 0):
-        """Evict cache entries based on strategy"""
-        current_memory = sum(entry.size_bytes for entry in self.cache.values())
-        
-        # Check if eviction is needed
-        if (len(self.cache) < self.max_size and 
-            current_memory + required_space <= self.max_memory_bytes):
+    def _add_to_frequency_bucket(self, key: str, frequency: int):
+        bucket = self._frequency_buckets.get(frequency)
+        if bucket is None:
+            bucket = self._frequency_buckets[frequency] = OrderedDict()
+        bucket[key] = None
+    
+    def _remove_from_frequency_bucket(self, key: str, frequency: int):
+        bucket = self._frequency_buckets.get(frequency)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._frequency_buckets[frequency]
+                if self._min_frequency == frequency:
+                    self._min_frequency = frequency + 1
+    
+    def _remove_entry(self, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and all of its bookkeeping"""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return None
+        
+        self._insertion_order.pop(key, None)
+        if self.strategy == CacheStrategy.LFU:
+            self._remove_from_frequency_bucket(key, entry.access_count)
+        elif self.strategy == CacheStrategy.ADAPTIVE:
+            self._probation.pop(key, None)
+            self._protected.pop(key, None)
+        for table in entry.tables:
+            dependents = self._table_index.get(table)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._table_index[table]
+        
+        self.metrics.memory_usage_bytes -= entry.size_bytes
+        return entry
+    
+    def _promote(self, key: str):
+        """Move a hit entry to the protected segment, demoting its oldest entry if full"""
+        if key in self._protected:
+            self._protected.move_to_end(key)
             return
         
-        entries_to_remove = []
-        
-        if self.strategy == CacheStrategy.LRU:
-            # Remove least recently used entries
-            sorted_entries = sorted(
-                self.cache.items(),
-                key=lambda x: x[1].last_accessed
-            )
-            
-        elif self.strategy == CacheStrategy.LFU:
-            # Remove least frequently used entries
-            sorted_entries = sorted(
-                self.cache.items(),
-                key=lambda x: x[1].access_count
-            )
-            
-        elif self.strategy == CacheStrategy.TTL:
-            # Remove expired entries first, then oldest
-            expired_entries = [
-                (key, entry) for key, entry in self.cache.items()
-                if entry.is_expired()
-            ]
-            
-            if expired_entries:
-                sorted_entries = expired_entries
-            else:
-                sorted_entries = sorted(
-                    self.cache.items(),
-                    key=lambda x: x[1].created_at
-                )
-                
-        else:  # ADAPTIVE
-            # Adaptive strategy based on access patterns and age
-            def adaptive_score(entry):
-                age_factor = time.time() - entry.created_at
-                access_factor = 1.0 / max(entry.access_count, 1)
-                recency_factor = time.time() - entry.last_accessed
-                return age_factor + access_factor + recency_factor
-            
-            sorted_entries = sorted(
-                self.cache.items(),
-                key=lambda x: adaptive_score(x[1])
-            )
-        
-        # Remove entries until we have enough space
+        self._probation.pop(key, None)
+        self._protected[key] = None
+        if len(self._protected) > self.protected_capacity:
+            demoted, _ = self._protected.popitem(last=False)
+            self._probation[demoted] = None
+    
+    def _select_victim(self) -> Optional[str]:
+        """Pick the next entry to evict according to the strategy"""
+        if not self.cache:
+            return None
+        
+        if self.strategy == CacheStrategy.LFU:
+            bucket = self._frequency_buckets.get(self._min_frequency)
+            if bucket is None:
+                # Minimum went stale after an out-of-order removal
+                self._min_frequency = min(self._frequency_buckets)
+                bucket = self._frequency_buckets[self._min_frequency]
+            return next(iter(bucket))
+        
+        if self.strategy == CacheStrategy.TTL:
+            return next(iter(self._insertion_order))
+        
+        if self.strategy == CacheStrategy.ADAPTIVE:
+            return next(iter(self._probation or self._protected))
+        
+        return next(iter(self.cache))
+    
+    def _evict_entries(self, required_space: int = 0):
+        """Evict entries one at a time until the new entry fits"""
+        evicted = 0
         freed_memory = 0
-        for key, entry in sorted_entries:
-            if (len(self.cache) <= self.max_size // 2 and 
-                current_memory - freed_memory + required_space <= self.max_memory_bytes):
-                break
-            
-            entries_to_remove.append(key)
-            freed_memory += entry.size_bytes
         
-        # Remove selected entries
-        for key in entries_to_remove:
-            if key in self.cache:
-                del self.cache[key]
-                self.access_frequency.pop(key, None)
+        while self.cache and (len(self.cache) >= self.max_size or
+                              self.metrics.memory_usage_bytes + required_space > self.max_memory_bytes):
+            entry = self._remove_entry(self._select_victim())
+            evicted += 1
+            freed_memory += entry.size_bytes
         
-        if entries_to_remove:
-            logger.debug(f"Cache evicted {len(entries_to_remove)} entries, freed {freed_memory} bytes")
+        if evicted:
+            self.metrics.evictions += evicted
+            logger.debug(f"Cache evicted {evicted} entries, freed {freed_memory} bytes")
     
     def get(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[QueryResult]:
         """Get cached query result"""
         cache_key = self._generate_cache_key(query, parameters)
+        entry = self.cache.get(cache_key)
         
-        if cache_key in self.cache:
-            entry = self.cache[cache_key]
-            
+        if entry is not None:
             # Check expiration
             if entry.is_expired():
-                del self.cache[cache_key]
-                self.access_frequency.pop(cache_key, None)
+                self._remove_entry(cache_key)
+                self.metrics.expirations += 1
                 self.metrics.cache_misses += 1
                 return None
             
             # Update access metadata
-            entry.touch()
-            self.access_frequency[cache_key] += 1
-            
-            # Move to end for LRU
-            if self.strategy == CacheStrategy.LRU:
-                self.cache.move_to_end(cache_key)
+            if self.strategy == CacheStrategy.LFU:
+                self._remove_from_frequency_bucket(cache_key, entry.access_count)
+                entry.touch()
+                self._add_to_frequency_bucket(cache_key, entry.access_count)
+            elif self.strategy == CacheStrategy.ADAPTIVE:
+                entry.touch()
+                self._promote(cache_key)
+            else:
+                entry.touch()
+            self.cache.move_to_end(cache_key)
             
             self.metrics.cache_hits += 1
             self.metrics.cached_queries += 1
@@ -253,32 +539,62 @@ class QueryCache:
         query: str, 
         result: QueryResult, 
         parameters: Optional[Dict[str, Any]] = None,
-        ttl: Optional[float] = None
+        ttl: Optional[float] = None,
+        tables: Optional[Tuple[str, ...]] = None
     ):
-        """Cache query result"""
+        """
+        Cache query result
+        
+        Args:
+            query: Query text
+            result: Result to cache
+            parameters: Query parameters
+            ttl: Time to live in seconds (defaults to the cache default)
+            tables: Tables the result depends on (extracted from the query if omitted)
+        """
+        if tables is None:
+            tables = extract_table_names(query)
+            if tables is None:
+                # Without its table tags a write could never invalidate this entry
+                logger.debug(f"Not caching query with unparseable table references: {query[:50]}")
+                return
+        
         cache_key = self._generate_cache_key(query, parameters)
         entry_size = self._estimate_size(result)
+        if entry_size > self.max_memory_bytes:
+            logger.debug(f"Result too large to cache: {query[:50]} ({entry_size} bytes)")
+            return
         
-        # Evict entries if necessary
+        # Replace any existing entry, then evict if necessary
+        self._remove_entry(cache_key)
         self._evict_entries(entry_size)
         
         # Create cache entry
+        now = time.time()
         entry = CacheEntry(
             key=cache_key,
             value=result,
-            created_at=time.time(),
-            last_accessed=time.time(),
+            created_at=now,
+            last_accessed=now,
             access_count=1,
             ttl=ttl or self.default_ttl,
-            size_bytes=entry_size
+            size_bytes=entry_size,
+            tables=tuple(normalize_table_name(table) for table in tables)
         )
         
         # Store in cache
         self.cache[cache_key] = entry
-        self.access_frequency[cache_key] = 1
+        self._insertion_order[cache_key] = None
+        if self.strategy == CacheStrategy.LFU:
+            self._add_to_frequency_bucket(cache_key, 1)
+            self._min_frequency = 1
+        elif self.strategy == CacheStrategy.ADAPTIVE:
+            self._probation[cache_key] = None
+        for table in entry.tables:
+            self._table_index[table].add(cache_key)
         
         # Update memory usage
-        self.metrics.memory_usage_bytes = sum(entry.size_bytes for entry in self.cache.values())
+        self.metrics.memory_usage_bytes += entry_size
         
         logger.debug(f"Cached query result: {query[:50]} ({entry_size} bytes)")
     
@@ -287,7 +603,13 @@ class QueryCache:
         if pattern is None:
             # Clear all
             self.cache.clear()
-            self.access_frequency.clear()
+            self._insertion_order.clear()
+            self._frequency_buckets.clear()
+            self._probation.clear()
+            self._protected.clear()
+            self._table_index.clear()
+            self._min_frequency = 0
+            self.metrics.memory_usage_bytes = 0
             logger.info("Cache cleared completely")
         else:
             # Clear entries matching pattern
@@ -297,13 +619,35 @@ class QueryCache:
             ]
             
             for key in keys_to_remove:
-                del self.cache[key]
-                self.access_frequency.pop(key, None)
+                self._remove_entry(key)
+            self.metrics.invalidations += len(keys_to_remove)
             
             logger.info(f"Invalidated {len(keys_to_remove)} cache entries matching pattern: {pattern}")
+    
+    def invalidate_tables(self, tables: Union[str, List[str], Tuple[str, ...]]) -> int:
+        """
+        Invalidate only the entries that depend on the given tables
         
-        # Update memory usage
-        self.metrics.memory_usage_bytes = sum(entry.size_bytes for entry in self.cache.values())
+        Args:
+            tables: Table name or names that were written
+            
+        Returns:
+            Number of entries invalidated
+        """
+        if isinstance(tables, str):
+            tables = (tables,)
+        
+        keys_to_remove = set()
+        for table in tables:
+            keys_to_remove.update(self._table_index.get(normalize_table_name(table), ()))
+        
+        for key in keys_to_remove:
+            self._remove_entry(key)
+        self.metrics.invalidations += len(keys_to_remove)
+        
+        if keys_to_remove:
+            logger.debug(f"Invalidated {len(keys_to_remove)} cache entries for tables: {', '.join(tables)}")
+        return len(keys_to_remove)
     
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
@@ -314,66 +658,99 @@ class QueryCache:
             "cache_size": len(self.cache),
             "max_size": self.max_size,
             "memory_usage_mb": self.metrics.memory_usage_bytes / (1024 * 1024),
+            "memory_usage_bytes": self.metrics.memory_usage_bytes,
             "max_memory_mb": self.max_memory_bytes / (1024 * 1024),
             "cache_hits": self.metrics.cache_hits,
             "cache_misses": self.metrics.cache_misses,
+            "evictions": self.metrics.evictions,
+            "expirations": self.metrics.expirations,
+            "invalidations": self.metrics.invalidations,
             "hit_rate": hit_rate,
             "strategy": self.strategy.value,
-            "total_requests": total_requests
+            "total_requests": total_requests,
+            "tracked_tables": len(self._table_index)
         }
 
 
 class QueryAnalyzer:
-    """Analyzes query patterns and performance"""
+    """
+    Analyzes query patterns and performance
+    
+    Queries are grouped by fingerprint: a single tokenizer pass replaces
+    literals and placeholders with ?, collapses IN/VALUES lists to (?+) and
+    normalizes case and whitespace, and the result is hashed. Each
+    fingerprint aggregates calls, latency and rows returned in
+    constant-memory histograms.
+    """
     
-    def __init__(self, slow_query_threshold: float = 1.0):
+    def __init__(self, slow_query_threshold: float = 1.0, fingerprint_cache_size: int = 4096):
         self.slow_query_threshold = slow_query_threshold
         self.query_patterns: Dict[str, QueryPattern] = {}
-        self.execution_history: List[Tuple[str, float, bool]] = []  # (query_hash, execution_time, cached)
-        
+        self.execution_history: Deque[Tuple[str, float, bool]] = deque(maxlen=1000)  # (query_hash, execution_time, cached)
+        self.total_executions = 0
+        
+        # Raw query text -> (fingerprint, template), so repeated text skips tokenizing
+        self.fingerprint_cache_size = fingerprint_cache_size
+        self._fingerprint_cache: OrderedDict[str, Tuple[str, str]] = OrderedDict()
+        self._read_only: Dict[str, bool] = {}  # fingerprint -> replica-safe
+        
+    def fingerprint(self, query: str) -> Tuple[str, str]:
+        """
+        Get the fingerprint of a query
+        
+        Returns:
+            Tuple of (fingerprint hash, normalized template)
+        """
+        cached = self._fingerprint_cache.get(query)
+        if cached is not None:
+            self._fingerprint_cache.move_to_end(query)
+            return cached
+        
+        template = fingerprint_query(query)
+        result = (hashlib.md5(template.encode()).hexdigest(), template)
+        
+        self._fingerprint_cache[query] = result
+        if len(self._fingerprint_cache) > self.fingerprint_cache_size:
+            self._fingerprint_cache.popitem(last=False)
+        return result
+    
+    def is_read_only(self, query: str) -> bool:
+        """Check whether a query can be routed to a read replica (cached per fingerprint)"""
+        query_hash, template = self.fingerprint(query)
+        read_only = self._read_only.get(query_hash)
+        if read_only is None:
+            if len(self._read_only) >= self.fingerprint_cache_size:
+                self._read_only.clear()
+            read_only = self._read_only[query_hash] = is_read_only_template(template)
+        return read_only
+    
     def _normalize_query(self, query: str) -> str:
         """Normalize query to detect patterns"""
-        # Remove parameter values and replace with placeholders
-        normalized = query
-        
-        # Replace numeric literals
-        import re
-        normalized = re.sub(r'\b\d+\b', '?', normalized)
-        
-        # Replace string literals
-        normalized = re.sub(r"'[^']*'", "'?'", normalized)
-        normalized = re.sub(r'"[^"]*"', '"?"', normalized)
-        
-        # Normalize whitespace
-        normalized = ' '.join(normalized.split())
-        
-        return normalized.lower()
+        return self.fingerprint(query)[1]
     
     def _generate_query_hash(self, query: str) -> str:
         """Generate hash for query pattern"""
-        normalized = self._normalize_query(query)
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return self.fingerprint(query)[0]
     
     def record_execution(
         self, 
         query: str, 
         execution_time: float, 
         parameters: Optional[Dict[str, Any]] = None,
-        cached: bool = False
+        cached: bool = False,
+        rows_returned: Optional[int] = None
     ):
         """Record query execution for analysis"""
-        query_hash = self._generate_query_hash(query)
-        normalized_query = self._normalize_query(query)
+        query_hash, normalized_query = self.fingerprint(query)
         
         # Get or create pattern
-        if query_hash not in self.query_patterns:
-            self.query_patterns[query_hash] = QueryPattern(
+        pattern = self.query_patterns.get(query_hash)
+        if pattern is None:
+            pattern = self.query_patterns[query_hash] = QueryPattern(
                 query_hash=query_hash,
                 query_template=normalized_query
             )
         
-        pattern = self.query_patterns[query_hash]
-        
         # Update pattern statistics
         pattern.execution_count += 1
         pattern.total_execution_time += execution_time
@@ -381,6 +758,10 @@ class QueryAnalyzer:
         pattern.min_execution_time = min(pattern.min_execution_time, execution_time)
         pattern.max_execution_time = max(pattern.max_execution_time, execution_time)
         pattern.last_execution = time.time()
+        pattern.latency_histogram.record(execution_time)
+        if rows_returned is not None:
+            pattern.total_rows += rows_returned
+            pattern.rows_histogram.record(rows_returned)
         
         # Record parameter patterns
         if parameters:
@@ -393,12 +774,47 @@ class QueryAnalyzer:
         else:
             pattern.cache_hit_rate = (pattern.cache_hit_rate * (pattern.execution_count - 1)) / pattern.execution_count
         
-        # Add to execution history
+        # Add to execution history (bounded)
         self.execution_history.append((query_hash, execution_time, cached))
-        
-        # Keep only recent history
-        if len(self.execution_history) > 1000:
-            self.execution_history = self.execution_history[-1000:]
+        self.total_executions += 1
+    
+    def get_top_queries(self, limit: int = 10, order_by: str = "total_time") -> List[QueryPattern]:
+        """
+        Get the query shapes that dominate load
+        
+        Args:
+            limit: Number of patterns to return
+            order_by: total_time, calls, mean_time, p95_time or rows
+        """
+        keys = {
+            "total_time": lambda p: p.total_execution_time,
+            "calls": lambda p: p.execution_count,
+            "mean_time": lambda p: p.average_execution_time,
+            "p95_time": lambda p: p.p95_execution_time,
+            "rows": lambda p: p.total_rows
+        }
+        if order_by not in keys:
+            raise ValueError(f"Unknown order_by: {order_by}")
+        return heapq.nlargest(limit, self.query_patterns.values(), key=keys[order_by])
+    
+    def get_workload_report(self, limit: int = 10, order_by: str = "total_time") -> List[Dict[str, Any]]:
+        """Get a top-N report of query shapes"""
+        total_time = sum(p.total_execution_time for p in self.query_patterns.values())
+        return [
+            {
+                "fingerprint": pattern.query_hash,
+                "query_template": pattern.query_template[:200],
+                "calls": pattern.execution_count,
+                "total_time": pattern.total_execution_time,
+                "share_of_total_time": pattern.total_execution_time / total_time if total_time else 0.0,
+                "mean_time": pattern.average_execution_time,
+                "p95_time": pattern.p95_execution_time,
+                "total_rows": pattern.total_rows,
+                "mean_rows": pattern.rows_histogram.mean,
+                "cache_hit_rate": pattern.cache_hit_rate
+            }
+            for pattern in self.get_top_queries(limit, order_by)
+        ]
     
     def get_slow_queries(self) -> List[QueryPattern]:
         """Get queries that exceed slow query threshold"""
@@ -466,7 +882,9 @@ class PerformanceOptimizer:
         self,
         cache_config: Optional[Dict[str, Any]] = None,
         optimization_level: QueryOptimizationLevel = QueryOptimizationLevel.INTERMEDIATE,
-        slow_query_threshold: float = 1.0
+        slow_query_threshold: float = 1.0,
+        target_top_n: Optional[int] = None,
+        target_refresh_interval: int = 100
     ):
         # Initialize cache
         cache_config = cache_config or {}
@@ -483,6 +901,13 @@ class PerformanceOptimizer:
         self.optimization_level = optimization_level
         self.optimized_adapters: Set[weakref.ref] = set()
         
+        # Targeted optimization: beyond basic cleanup, only the top-N fingerprints
+        # by total time are rewritten (None applies every level to every query)
+        self.target_top_n = target_top_n
+        self.target_refresh_interval = target_refresh_interval
+        self.optimization_targets: Set[str] = set()
+        self._targets_refreshed_at = 0
+        
         # Performance tracking
         self.total_optimization_time_saved = 0.0
         self.optimizations_applied = 0
@@ -507,7 +932,10 @@ class PerformanceOptimizer:
             if cached_result is not None:
                 # Record cache hit
                 execution_time = time.time() - start_time
-                self.analyzer.record_execution(query, execution_time, parameters, cached=True)
+                self.analyzer.record_execution(
+                    query, execution_time, parameters, cached=True,
+                    rows_returned=len(cached_result.rows or [])
+                )
                 
                 logger.debug(f"Query served from cache: {query[:50]}")
                 return cached_result
@@ -521,11 +949,16 @@ class PerformanceOptimizer:
             execution_time = time.time() - start_time
             
             # Record execution
-            self.analyzer.record_execution(query, execution_time, parameters, cached=False)
+            self.analyzer.record_execution(
+                query, execution_time, parameters, cached=False,
+                rows_returned=len(result.rows or []) if result.success else None
+            )
             
             # Cache result if successful and cacheable
             if result.success and (self._is_cacheable_query(query) or force_cache):
                 self.cache.put(query, result, parameters, cache_ttl)
+            elif result.success and self._is_write_query(query):
+                self._invalidate_written_tables(query)
             
             # Update performance metrics
             if optimized_query != query:
@@ -554,6 +987,12 @@ class PerformanceOptimizer:
         
         return True
     
+    def _is_write_query(self, query: str) -> bool:
+        """Determine if a query modifies data or schema, invalidating dependent cache entries"""
+        first_word = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        return first_word in ('INSERT', 'UPDATE', 'DELETE', 'MERGE', 'REPLACE',
+                              'TRUNCATE', 'ALTER', 'DROP', 'CREATE')
+    
     def _optimize_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> str:
         """Apply query optimizations based on optimization level"""
         
@@ -566,6 +1005,9 @@ class PerformanceOptimizer:
             # Basic optimizations
             optimized = self._apply_basic_optimizations(optimized)
         
+        if not self._is_optimization_target(query):
+            return optimized
+        
         if self.optimization_level in (QueryOptimizationLevel.INTERMEDIATE, QueryOptimizationLevel.AGGRESSIVE):
             # Intermediate optimizations
             optimized = self._apply_intermediate_optimizations(optimized)
@@ -576,6 +1018,33 @@ class PerformanceOptimizer:
         
         return optimized
     
+    def _is_optimization_target(self, query: str) -> bool:
+        """Check whether a query's shape is among the costliest fingerprints"""
+        if self.target_top_n is None:
+            return True
+        
+        if (not self.optimization_targets or
+                self.analyzer.total_executions - self._targets_refreshed_at >= self.target_refresh_interval):
+            self.refresh_optimization_targets()
+        
+        return self.analyzer.fingerprint(query)[0] in self.optimization_targets
+    
+    def refresh_optimization_targets(self) -> List[QueryPattern]:
+        """
+        Re-select the top-N fingerprints by total time as optimization targets
+        
+        Returns:
+            The targeted query patterns
+        """
+        top_queries = self.analyzer.get_top_queries(self.target_top_n or 10)
+        self.optimization_targets = {pattern.query_hash for pattern in top_queries}
+        self._targets_refreshed_at = self.analyzer.total_executions
+        
+        for pattern in self.analyzer.query_patterns.values():
+            pattern.optimization_applied = pattern.query_hash in self.optimization_targets
+        
+        return top_queries
+    
     def _apply_basic_optimizations(self, query: str) -> str:
         """Apply basic query optimizations"""
         import re
@@ -619,8 +1088,18 @@ class PerformanceOptimizer:
         
         return optimized
     
-    def optimize_adapter(self, adapter: DatabaseAdapter):
-        """Apply performance optimizations to database adapter"""
+    def optimize_adapter(self, adapter: DatabaseAdapter, target_top_n: Optional[int] = None):
+        """
+        Apply performance optimizations to database adapter
+        
+        Args:
+            adapter: Adapter whose execute_query is wrapped
+            target_top_n: Restrict intermediate/aggressive optimizations to the
+                N costliest query shapes (keeps the current setting when None)
+        """
+        if target_top_n is not None:
+            self.target_top_n = target_top_n
+            self.refresh_optimization_targets()
         
         # Store weak reference to avoid circular references
         adapter_ref = weakref.ref(adapter)
@@ -656,7 +1135,10 @@ class PerformanceOptimizer:
             if cached_result is not None:
                 # Record cache hit
                 execution_time = time.time() - start_time
-                self.analyzer.record_execution(query, execution_time, parameters, cached=True)
+                self.analyzer.record_execution(
+                    query, execution_time, parameters, cached=True,
+                    rows_returned=len(cached_result.rows or [])
+                )
                 
                 logger.debug(f"Query served from cache: {query[:50]}")
                 return cached_result
@@ -670,11 +1152,16 @@ class PerformanceOptimizer:
             execution_time = time.time() - start_time
             
             # Record execution
-            self.analyzer.record_execution(query, execution_time, parameters, cached=False)
+            self.analyzer.record_execution(
+                query, execution_time, parameters, cached=False,
+                rows_returned=len(result.rows or []) if result.success else None
+            )
             
             # Cache result if successful and cacheable
             if result.success and self._is_cacheable_query(query):
                 self.cache.put(query, result, parameters)
+            elif result.success and self._is_write_query(query):
+                self._invalidate_written_tables(query)
             
             # Update performance metrics
             if optimized_query != query:
@@ -687,9 +1174,20 @@ class PerformanceOptimizer:
             self.analyzer.record_execution(query, execution_time, parameters, cached=False)
             raise
     
-    def invalidate_cache(self, pattern: Optional[str] = None):
-        """Invalidate cache entries"""
-        self.cache.invalidate(pattern)
+    def _invalidate_written_tables(self, query: str):
+        """Invalidate results depending on the tables a write touched, or everything if unknown"""
+        tables = extract_table_names(query)
+        if tables is None:
+            self.cache.invalidate()
+        else:
+            self.cache.invalidate_tables(tables)
+    
+    def invalidate_cache(self, pattern: Optional[str] = None, tables: Optional[List[str]] = None):
+        """Invalidate cache entries, optionally only those depending on the given tables"""
+        if tables is not None:
+            self.cache.invalidate_tables(tables)
+        else:
+            self.cache.invalidate(pattern)
     
     def get_performance_report(self) -> Dict[str, Any]:
         """Get comprehensive performance report"""
@@ -706,8 +1204,11 @@ class PerformanceOptimizer:
                 "optimizations_applied": self.optimizations_applied,
                 "optimization_level": self.optimization_level.value,
                 "optimized_adapters": len(self.optimized_adapters),
-                "estimated_time_saved_seconds": time_saved
+                "estimated_time_saved_seconds": time_saved,
+                "target_top_n": self.target_top_n,
+                "optimization_targets": len(self.optimization_targets)
             },
+            "top_queries": self.analyzer.get_workload_report(10),
             "slow_queries": [
                 {
                     "query_template": pattern.query_template[:100],
@@ -7,10 +7,11 @@ import re
 import time
 import logging
 import uuid
-from typing import Dict, Any, Optional, List, Union, Tuple, Set
+from typing import Dict, Any, Optional, List, Union, Tuple, Set, Callable
 from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 from database_adapters import DatabaseType
 
@@ -70,15 +71,80 @@ class DatabaseDialectFeatures:
     boolean_false: str = "FALSE"
 
 
+@dataclass
+class TranslationTemplate:
+    """Cached translation of a query shape (literals abstracted)"""
+    translated_shape: str
+    query_type: QueryType
+    warnings: List[str]
+
+
+# String and numeric literals, abstracted out of a query to form its shape
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\b\d+(?:\.\d+)?\b")
+_LITERAL_MARKER = re.compile(r"\x00(\d+)\x00")
+_CAST_PATTERN = re.compile(r'CAST\s*\(\s*([^)]+)\s+AS\s+([^)]+)\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# Data types rewritten in DDL statements
+_DDL_DATA_TYPES = ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'BIGINT', 'TEXT', 'BLOB', 'DATETIME', 'TIMESTAMP')
+
+
+class DialectRewriter:
+    """
+    Ordered rewrite rules compiled into one alternation regex
+    
+    The query is scanned once; at each position the first rule that matches
+    wins. A replacement is either a string or a callable that receives the
+    match of its own rule pattern.
+    """
+    
+    def __init__(self, rules: List[Tuple[str, Union[str, Callable[[re.Match], str]]]], flags: int = re.IGNORECASE):
+        self.rules = [(re.compile(pattern, flags), replacement) for pattern, replacement in rules]
+        self._pattern = (re.compile("|".join(f"(?P<r{index}>{pattern})" for index, (pattern, _) in enumerate(rules)), flags)
+                         if rules else None)
+    
+    def _replace(self, match: re.Match) -> str:
+        rule_pattern, replacement = self.rules[int(match.lastgroup[1:])]
+        if callable(replacement):
+            return replacement(rule_pattern.fullmatch(match.group()))
+        return replacement
+    
+    def rewrite(self, text: str) -> str:
+        """Apply all rules in a single pass"""
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+
 class QueryTranslator(ABC):
-    """Abstract base class for database query translators"""
+    """
+    Abstract base class for database query translators
+    
+    Translations are cached per query shape: string and numeric literals are
+    abstracted into markers before translation and rebound afterwards, so
+    queries that differ only in literal or parameter values share one entry
+    in a bounded LRU cache.
+    """
     
-    def __init__(self, target_database: DatabaseType):
+    def __init__(self, target_database: DatabaseType, max_cache_size: int = 1024):
         self.target_database = target_database
         self.features = self._get_dialect_features()
-        self.translation_cache: Dict[str, QueryTranslationResult] = {}
+        self.max_cache_size = max_cache_size
+        self.translation_cache: OrderedDict[Tuple[str, Optional[DatabaseType]], TranslationTemplate] = OrderedDict()
         self.cache_hits = 0
         self.cache_misses = 0
+        self.cache_evictions = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+        
+        # Dialect rewrite rules, compiled once
+        type_rules = [(r'\b(?:' + '|'.join(_DDL_DATA_TYPES) + r')\b',
+                       lambda match: self.translate_data_types(match.group().upper()))]
+        self._function_rewriter = DialectRewriter(self._function_rewrite_rules())
+        self._type_rewriter = DialectRewriter(type_rules)
+        self._create_table_rewriter = DialectRewriter(
+            type_rules + [(r'AUTO_INCREMENT', self.features.auto_increment_syntax)]
+        )
         
     @abstractmethod
     def _get_dialect_features(self) -> DatabaseDialectFeatures:
@@ -107,55 +173,54 @@ class QueryTranslator(ABC):
         source_database: Optional[DatabaseType] = None
     ) -> QueryTranslationResult:
         """Main query translation method"""
-        start_time = time.time()
-        
-        # Check cache first
-        cache_key = f"{query}_{parameters}_{source_database}"
-        if cache_key in self.translation_cache:
-            self.cache_hits += 1
-            cached_result = self.translation_cache[cache_key]
-            cached_result.translation_time = time.time() - start_time
-            return cached_result
-        
-        self.cache_misses += 1
+        start_time = time.perf_counter()
         
         try:
-            # Determine query type
-            query_type = self._detect_query_type(query)
+            # Abstract literals so queries of the same shape share a cache entry
+            shape, literals = self._extract_literals(query)
+            cache_key = (shape, source_database)
             
-            # Normalize query
-            normalized_query = self._normalize_query(query)
-            
-            # Translate based on query type
-            translated_query = self._translate_by_type(normalized_query, query_type, source_database)
-            
-            # Translate parameters if needed
-            translated_params = self._translate_parameters(parameters, source_database)
-            
-            # Validate translation
-            warnings = self._validate_translation(translated_query, query_type)
-            
-            translation_time = time.time() - start_time
+            template = self.translation_cache.get(cache_key)
+            if template is not None:
+                self.translation_cache.move_to_end(cache_key)
+                hit = True
+            else:
+                hit = False
+                query_type = self._detect_query_type(shape)
+                translated_shape = self._translate_by_type(shape, query_type, source_database)
+                template = TranslationTemplate(
+                    translated_shape=translated_shape,
+                    query_type=query_type,
+                    warnings=self._validate_translation(translated_shape, query_type)
+                )
+                self._cache_template(cache_key, template)
             
+            # Rebind literals and parameters for this call
             result = QueryTranslationResult(
                 success=True,
-                translated_query=translated_query,
-                translated_parameters=translated_params,
-                warnings=warnings,
+                translated_query=self._bind_literals(template.translated_shape, literals),
+                translated_parameters=self._translate_parameters(parameters, source_database),
+                warnings=list(template.warnings),
                 original_query=query,
                 target_database=self.target_database,
-                query_type=query_type,
-                translation_time=translation_time
+                query_type=template.query_type
             )
             
-            # Cache result
-            self.translation_cache[cache_key] = result
-            
-            logger.debug(f"Query translated successfully to {self.target_database.value}")
+            translation_time = time.perf_counter() - start_time
+            result.translation_time = translation_time
+            if hit:
+                self.cache_hits += 1
+                self.hit_time += translation_time
+            else:
+                self.cache_misses += 1
+                self.miss_time += translation_time
+                logger.debug(f"Query translated successfully to {self.target_database.value}")
             return result
             
         except Exception as e:
-            translation_time = time.time() - start_time
+            translation_time = time.perf_counter() - start_time
+            self.cache_misses += 1
+            self.miss_time += translation_time
             
             logger.error(f"Query translation failed: {e}")
             return QueryTranslationResult(
@@ -196,9 +261,41 @@ class QueryTranslator(ABC):
     def _normalize_query(self, query: str) -> str:
         """Normalize query formatting"""
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', query.strip())
+        normalized = _WHITESPACE.sub(' ', query.strip())
         return normalized
     
+    def _extract_literals(self, query: str) -> Tuple[str, List[str]]:
+        """
+        Split a query into its normalized shape and its literal values
+        
+        Returns:
+            Tuple of (shape with numbered literal markers, literals in order)
+        """
+        literals: List[str] = []
+        
+        def abstract(match: re.Match) -> str:
+            literals.append(match.group())
+            return f"\x00{len(literals) - 1}\x00"
+        
+        return self._normalize_query(_LITERAL_PATTERN.sub(abstract, query)), literals
+    
+    def _bind_literals(self, shape: str, literals: List[str]) -> str:
+        """Substitute literal values back into a translated shape"""
+        if not literals:
+            return shape
+        return _LITERAL_MARKER.sub(lambda match: literals[int(match.group(1))], shape)
+    
+    def _cache_template(self, cache_key: Tuple[str, Optional[DatabaseType]], template: TranslationTemplate):
+        """Store a translated shape, evicting the least recently used one when full"""
+        self.translation_cache[cache_key] = template
+        if len(self.translation_cache) > self.max_cache_size:
+            self.translation_cache.popitem(last=False)
+            self.cache_evictions += 1
+    
+    def _function_rewrite_rules(self) -> List[Tuple[str, Union[str, Callable[[re.Match], str]]]]:
+        """Dialect-specific function and operator rewrite rules, in priority order"""
+        return []
+    
     def _translate_by_type(
         self, 
         query: str, 
@@ -281,17 +378,8 @@ class QueryTranslator(ABC):
         """Translate CREATE TABLE queries"""
         translated = query
         
-        # Translate data types
-        translated = self._translate_data_type_definitions(translated)
-        
-        # Translate auto-increment syntax
-        if 'AUTO_INCREMENT' in translated.upper():
-            if self.target_database == DatabaseType.POSTGRESQL:
-                translated = re.sub(r'AUTO_INCREMENT', 'SERIAL', translated, flags=re.IGNORECASE)
-            elif self.target_database == DatabaseType.SQLITE:
-                translated = re.sub(r'AUTO_INCREMENT', 'AUTOINCREMENT', translated, flags=re.IGNORECASE)
-        
-        return translated
+        # Translate data types and auto-increment syntax
+        return self._create_table_rewriter.rewrite(translated)
     
     def _translate_alter_table_query(self, query: str, source_database: Optional[DatabaseType]) -> str:
         """Translate ALTER TABLE queries"""
@@ -304,59 +392,21 @@ class QueryTranslator(ABC):
     
     def _translate_function_calls(self, query: str) -> str:
         """Translate function calls in query"""
-        translated = query
-        
-        # String concatenation
-        if self.target_database == DatabaseType.POSTGRESQL:
-            # PostgreSQL uses || for concatenation
-            translated = re.sub(r'CONCAT\s*\(([^)]+)\)', r'(\1)', translated, flags=re.IGNORECASE)
-            translated = re.sub(r'\s*\+\s*', ' || ', translated)
-        elif self.target_database == DatabaseType.SQLITE:
-            # SQLite uses || for concatenation
-            translated = re.sub(r'CONCAT\s*\(([^)]+)\)', r'(\1)', translated, flags=re.IGNORECASE)
-            translated = re.sub(r'\s*\+\s*', ' || ', translated)
-        
-        # Date functions
-        if self.target_database == DatabaseType.POSTGRESQL:
-            translated = re.sub(r'NOW\(\)', 'CURRENT_TIMESTAMP', translated, flags=re.IGNORECASE)
-        elif self.target_database == DatabaseType.SQLITE:
-            translated = re.sub(r'NOW\(\)', "datetime('now')", translated, flags=re.IGNORECASE)
-        
-        return translated
+        return self._function_rewriter.rewrite(query)
     
     def _translate_cast_operations(self, query: str) -> str:
         """Translate CAST operations between databases"""
-        # Find all CAST operations
-        cast_pattern = r'CAST\s*\(\s*([^)]+)\s+AS\s+([^)]+)\s*\)'
-        
         def replace_cast(match):
             expression = match.group(1).strip()
             data_type = match.group(2).strip()
             translated_type = self.translate_data_types(data_type)
             return f'CAST({expression} AS {translated_type})'
         
-        return re.sub(cast_pattern, replace_cast, query, flags=re.IGNORECASE)
+        return _CAST_PATTERN.sub(replace_cast, query)
     
     def _translate_data_type_definitions(self, query: str) -> str:
         """Translate data type definitions in DDL"""
-        translated = query
-        
-        # Common data type mappings
-        type_mappings = {
-            r'\bTINYINT\b': self.translate_data_types('TINYINT'),
-            r'\bSMALLINT\b': self.translate_data_types('SMALLINT'),
-            r'\bMEDIUMINT\b': self.translate_data_types('MEDIUMINT'),
-            r'\bBIGINT\b': self.translate_data_types('BIGINT'),
-            r'\bTEXT\b': self.translate_data_types('TEXT'),
-            r'\bBLOB\b': self.translate_data_types('BLOB'),
-            r'\bDATETIME\b': self.translate_data_types('DATETIME'),
-            r'\bTIMESTAMP\b': self.translate_data_types('TIMESTAMP')
-        }
-        
-        for pattern, replacement in type_mappings.items():
-            translated = re.sub(pattern, replacement, translated, flags=re.IGNORECASE)
-        
-        return translated
+        return self._type_rewriter.rewrite(query)
     
     def _convert_mysql_upsert_to_postgresql(self, query: str) -> str:
         """Convert MySQL ON DUPLICATE KEY UPDATE to PostgreSQL ON CONFLICT"""
@@ -418,7 +468,12 @@ class QueryTranslator(ABC):
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "cache_hit_rate": cache_hit_rate,
+            "cache_evictions": self.cache_evictions,
             "cached_queries": len(self.translation_cache),
+            "max_cache_size": self.max_cache_size,
+            "average_translation_time_ms": (self.hit_time + self.miss_time) / max(total_requests, 1) * 1000,
+            "average_hit_time_ms": self.hit_time / max(self.cache_hits, 1) * 1000,
+            "average_miss_time_ms": self.miss_time / max(self.cache_misses, 1) * 1000,
             "target_database": self.target_database.value
         }
 
@@ -444,6 +499,14 @@ class PostgreSQLTranslator(QueryTranslator):
             boolean_false="FALSE"
         )
     
+    def _function_rewrite_rules(self) -> List[Tuple[str, Union[str, Callable[[re.Match], str]]]]:
+        # PostgreSQL uses || for concatenation
+        return [
+            (r'CONCAT\s*\(([^)]+)\)', lambda match: f"({self._function_rewriter.rewrite(match.group(1))})"),
+            (r'\s*\+\s*', ' || '),
+            (r'NOW\(\)', 'CURRENT_TIMESTAMP')
+        ]
+    
     def translate_data_types(self, data_type: str) -> str:
         """Translate data types to PostgreSQL"""
         type_map = {
@@ -567,6 +630,14 @@ class SQLiteTranslator(QueryTranslator):
             boolean_false="0"
         )
     
+    def _function_rewrite_rules(self) -> List[Tuple[str, Union[str, Callable[[re.Match], str]]]]:
+        # SQLite uses || for concatenation
+        return [
+            (r'CONCAT\s*\(([^)]+)\)', lambda match: f"({self._function_rewriter.rewrite(match.group(1))})"),
+            (r'\s*\+\s*', ' || '),
+            (r'NOW\(\)', "datetime('now')")
+        ]
+    
     def translate_data_types(self, data_type: str) -> str:
         """Translate data types to SQLite"""
         type_map = {
@@ -10,9 +10,14 @@ capabilities for production systems.
 from .v5_database_performance_monitor import V5DatabasePerformanceMonitor
 from .v5_database_health_monitor import V5DatabaseHealthMonitor
 from .v5_performance_optimizer import V5PerformanceOptimizer
+from .time_series_store import TimeSeriesStore
+from .workload_benchmark import WorkloadBenchmarkDriver, WorkloadProfile
 
 __all__ = [
     'V5DatabasePerformanceMonitor',
     'V5DatabaseHealthMonitor',
-    'V5PerformanceOptimizer'
+    'V5PerformanceOptimizer',
+    'TimeSeriesStore',
+    'WorkloadBenchmarkDriver',
+    'WorkloadProfile'
 ]
\ No newline at end of file
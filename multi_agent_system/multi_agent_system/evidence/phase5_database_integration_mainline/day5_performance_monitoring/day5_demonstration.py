@@ -64,7 +64,7 @@ async def demonstrate_v5_performance_monitoring():
             
             # Group by component
             components = {}
-            for metric in monitor.performance_history[-20:]:  # Last 20 metrics
+            for metric in list(monitor.performance_history)[-20:]:  # Last 20 metrics
                 comp = metric.component
                 if comp not in components:
                     components[comp] = []
@@ -146,7 +146,7 @@ async def demonstrate_v5_health_monitoring():
             
             # Group by check name
             checks = {}
-            for check in monitor.health_history[-10:]:  # Last 10 checks
+            for check in list(monitor.health_history)[-10:]:  # Last 10 checks
                 name = check.name
                 if name not in checks:
                     checks[name] = []
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tests for the V5 time-series metric store
+Tests rollups, streaming anomaly detection, SQLite persistence and monitor integration
+"""
+import pytest
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from day5_performance_monitoring.time_series_store import TimeSeriesStore, QuantileSketch
+from day5_performance_monitoring.v5_database_performance_monitor import (
+    V5DatabasePerformanceMonitor, PerformanceMetric
+)
+
+
+class TestTimeSeriesStore:
+    """Test rollups, bounded memory and persistence"""
+    
+    def test_rollups_cascade_and_stay_bounded(self):
+        """Test 1s samples roll up into minutes and hours with bounded buffers"""
+        store = TimeSeriesStore(raw_capacity=100, tiers=((1, 120), (60, 60), (3600, 24)))
+        rng = random.Random(1)
+        values = [rng.uniform(10, 20) for _ in range(3 * 3600 * 2)]
+        for i, value in enumerate(values):
+            store.record("db.query_time", value, 1_000_000 + i * 0.5)
+        
+        assert len(store.latest("db.query_time", 1000)) == 100
+        assert len(store.rollups("db.query_time", 1)) == 121  # 120 closed + open
+        
+        # Each full minute holds 120 samples with exact count/min/max/mean
+        minute = store.rollups("db.query_time", 60)[-2]
+        offset = int((minute.start - 1_000_000) * 2)
+        minute_values = values[offset:offset + 120]
+        assert minute.count == 120
+        assert minute.min == min(minute_values) and minute.max == max(minute_values)
+        assert minute.mean == pytest.approx(sum(minute_values) / 120)
+        
+        # Coarse tiers include samples still in open finer buckets
+        hours = store.rollups("db.query_time", 3600)
+        assert sum(hour.count for hour in hours) == len(values)
+        assert sum(minute.count for minute in store.rollups("db.query_time", 60, start=hours[-1].start)) == hours[-1].count
+        
+        # Percentiles stay within the sketch's 1% relative accuracy
+        first_hour = sorted(values[:int((hours[0].start + 3600 - 1_000_000) * 2)])
+        assert hours[0].count == len(first_hour)
+        assert hours[0].percentile(0.95) == pytest.approx(first_hour[int(0.95 * (len(first_hour) - 1))], rel=0.02)
+        
+        footprint = store.memory_footprint()
+        assert footprint["raw_samples"] == 100
+        assert footprint["rollup_buckets"] <= 120 + 60 + 24
+    
+    def test_quantile_sketch_merges(self):
+        """Test merged sketches answer quantiles like one sketch over all values"""
+        rng = random.Random(2)
+        left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        values = [rng.lognormvariate(0, 1) for _ in range(5000)] + [0.0, -3.0]
+        for i, value in enumerate(values):
+            (left if i % 2 else right).add(value)
+            combined.add(value)
+        left.merge(right)
+        
+        ordered = sorted(values)
+        for q in (0.0, 0.5, 0.95, 0.99):
+            assert left.quantile(q) == combined.quantile(q)
+            assert left.quantile(q) == pytest.approx(ordered[int(q * (len(ordered) - 1))], rel=0.02)
+    
+    def test_sqlite_persistence(self):
+        """Test closed minute buckets are persisted and reloaded with their sketches"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "metrics.db"
+            store = TimeSeriesStore(persistence_path=str(db_path), tiers=((1, 10), (60, 2), (3600, 2)))
+            for i in range(600):
+                store.record("app.response_time", 0.01 + (i % 60) * 0.001, 1_000_000 + i)
+            
+            in_memory = store.rollups("app.response_time", 60)
+            assert len(in_memory) == 3  # Only two closed minutes are kept in memory
+            store.close()
+            
+            reopened = TimeSeriesStore(persistence_path=str(db_path))
+            persisted = reopened.load_persisted("app.response_time", 60)
+            assert len(persisted) == 10  # Every closed minute, including ones evicted from memory
+            assert [bucket.count for bucket in persisted[1:]] == [60] * 9
+            assert persisted[-1].mean == pytest.approx(in_memory[-2].mean)
+            assert persisted[-1].percentile(0.5) == in_memory[-2].percentile(0.5)
+            reopened.close()
+    
+    def test_flush_persists_buckets_of_quiet_metrics(self):
+        """Test flush closes buckets whose interval has ended even without newer samples"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = TimeSeriesStore(persistence_path=str(Path(temp_dir) / "metrics.db"),
+                                    tiers=((1, 10), (60, 2), (3600, 2)))
+            for i in range(30):  # Half of the minute starting at 1_000_020
+                store.record("app.queue_depth", float(i), 1_000_020 + i)
+            
+            assert store.flush(now=1_000_050) == 0  # The minute is still open
+            assert store.flush(now=1_000_020 + 60) == 1
+            persisted = store.load_persisted("app.queue_depth", 60)
+            assert [bucket.count for bucket in persisted] == [30]
+            
+            # A late sample does not reopen (and overwrite) the persisted minute
+            store.record("app.queue_depth", 99.0, 1_000_051)
+            store.flush(now=1_000_020 + 120)
+            assert [bucket.count for bucket in store.load_persisted("app.queue_depth", 60)] == [30, 1]
+            store.close()
+    
+    def test_non_finite_samples_are_counted_and_dropped(self):
+        """Test inf/NaN samples neither raise nor reach the rollups"""
+        store = TimeSeriesStore()
+        store.record("db.latency", 1.0, 1_000_000)
+        assert store.record("db.latency", float("inf"), 1_000_000.5) == []
+        assert store.record("db.latency", float("nan"), 1_000_000.6) == []
+        assert store.non_finite_samples == 2
+        assert store.rollups("db.latency", 1)[0].count == 1
+        with pytest.raises(ValueError):
+            QuantileSketch().add(float("inf"))
+    
+    def test_record_cost_is_constant(self):
+        """Test per-sample cost does not grow with history length"""
+        store = TimeSeriesStore()
+        
+        def timed(start_index, count):
+            begin = time.perf_counter()
+            for i in range(start_index, start_index + count):
+                store.record("system.cpu_usage", 25.0 + (i % 7), 1_000_000 + i * 0.1)
+            return (time.perf_counter() - begin) / count
+        
+        early = timed(0, 5000)
+        timed(5000, 200_000)
+        late = timed(205_000, 5000)
+        print(f"record(): {early * 1e6:.1f}us per sample early, {late * 1e6:.1f}us after 200k samples")
+        assert late < early * 3
+        assert store.memory_footprint()["raw_samples"] == 1000
+
+
+class TestStreamingAnomalyDetection:
+    """Test EWMA z-score spikes and CUSUM drift detection"""
+    
+    def test_spike_and_drift_detection(self):
+        """Test spikes and slow drift are flagged while stationary noise is not"""
+        rng = random.Random(3)
+        store = TimeSeriesStore()
+        
+        false_positives = sum(len(store.record("stable", 100 + rng.gauss(0, 5), i)) for i in range(10000))
+        assert false_positives <= 5
+        
+        spikes = store.record("stable", 160, 10000)
+        assert [anomaly.kind for anomaly in spikes] == ["spike"]
+        assert spikes[0].direction == "increase"
+        
+        # A ramp of 0.02 per sample (0.004 sigma) never produces a large z-score
+        drift_at = None
+        for i in range(2000):
+            anomalies = store.record("drifting", 100 + i * 0.02 + rng.gauss(0, 5), i)
+            assert all(anomaly.kind == "drift" for anomaly in anomalies)
+            if anomalies and drift_at is None:
+                drift_at = i
+                assert anomalies[0].direction == "increase"
+        assert drift_at is not None and drift_at < 1500
+
+
+class TestPerformanceMonitorIntegration:
+    """Test the performance monitor uses the time-series store"""
+    
+    @pytest.mark.asyncio
+    async def test_monitor_flags_degradations_only(self):
+        """Test latency increases and throughput drops are reported, improvements are not"""
+        monitor = V5DatabasePerformanceMonitor({"system_name": "ts_test", "performance_history_size": 50})
+        
+        def metric(name, value, component, second):
+            return PerformanceMetric(name=name, value=value, unit="", timestamp=datetime.fromtimestamp(1_000_000 + second),
+                                     component=component, metadata={})
+        
+        rng = random.Random(4)
+        for second in range(200):
+            await monitor._analyze_performance_trends([
+                metric("response_time", 0.015 + rng.gauss(0, 0.001), "application", second),
+                metric("query_throughput", 1250 + rng.gauss(0, 20), "database", second)
+            ])
+            monitor.performance_history.extend([metric("response_time", 0.015, "application", second)])
+        assert len(monitor.performance_history) == 50
+        
+        await monitor._analyze_performance_trends([
+            metric("response_time", 0.05, "application", 200),
+            metric("query_throughput", 2000, "database", 200)
+        ])
+        assert [anomaly.metric_key for anomaly in monitor.recent_anomalies] == ["application.response_time"]
+        
+        await monitor._analyze_performance_trends([metric("query_throughput", 600, "database", 201)])
+        assert monitor.recent_anomalies[-1].metric_key == "database.query_throughput"
+        assert monitor.recent_anomalies[-1].direction == "decrease"
+        
+        rollups = monitor.get_metric_rollups("application.response_time", 60)
+        assert sum(bucket["count"] for bucket in rollups) == 201
+        assert rollups[0]["p95"] is not None
+        
+        summary = await monitor.get_current_performance_summary()
+        # The summary counts every anomaly the store flagged, not just the capped degradations
+        assert summary["tracked_metrics"] == 2
+        assert summary["anomalies_detected"] == monitor.metrics_store.anomalies_detected > len(monitor.recent_anomalies)
+        await monitor.stop_monitoring()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the V5 workload benchmark driver
+Tests closed/open-loop replay on SQLite, A/B validation and optimizer integration
+"""
+import pytest
+import asyncio
+import time
+from datetime import datetime
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from day5_performance_monitoring.workload_benchmark import WorkloadBenchmarkDriver, WorkloadProfile, StoreTuning
+from day5_performance_monitoring.v5_performance_optimizer import V5PerformanceOptimizer, OptimizationAction
+
+
+def optimization(action_type, **parameters):
+    return OptimizationAction(action_type=action_type, component="store", description=action_type,
+                              parameters=parameters, expected_improvement=0.0, applied_at=datetime.now(), success=False)
+
+
+class TestWorkloadBenchmarkDriver:
+    """Test workload replay against a real SQLite database"""
+    
+    @pytest.mark.asyncio
+    async def test_closed_loop_replay(self):
+        """Test every operation runs through the store and is measured"""
+        profile = WorkloadProfile(read_ratio=0.7, operations_per_level=300, preload_rows=2000,
+                                  key_space=2000, concurrency_levels=[1, 4])
+        driver = WorkloadBenchmarkDriver(profile)
+        runs = await driver.run()
+        
+        expected_writes = sum(1 for kind, _, _ in driver._operations if kind == "write")
+        assert [run.concurrency for run in runs] == [1, 4]
+        for run in runs:
+            assert run.errors == 0 and run.operations == 300
+            assert run.latency["write"]["count"] == expected_writes
+            assert run.latency["read"]["count"] + run.latency["write"]["count"] == run.latency["all"]["count"] == 300
+            assert 0 < run.latency["all"]["p50"] <= run.latency["all"]["p95"] <= run.latency["all"]["p99"]
+            assert run.throughput > 0 and 0 < run.pool_utilization <= 1.0
+        assert runs[1].pool_utilization > runs[0].pool_utilization
+    
+    @pytest.mark.asyncio
+    async def test_open_loop_replay_keeps_arrival_rate(self):
+        """Test open-loop replay paces arrivals instead of running flat out"""
+        profile = WorkloadProfile(loop="open", arrival_rate=400, operations_per_level=200, preload_rows=500,
+                                  key_space=500, concurrency_levels=[8])
+        runs = await WorkloadBenchmarkDriver(profile).run()
+        
+        assert runs[0].errors == 0
+        assert 0.3 < runs[0].duration < 2.0  # ~0.5s of arrivals at 400/s
+        assert runs[0].throughput < 600
+    
+    @pytest.mark.asyncio
+    async def test_ab_test_keeps_only_winning_settings(self):
+        """Test a key index is validated on a lookup-heavy workload and no-op proposals are skipped"""
+        profile = WorkloadProfile(read_ratio=1.0, operations_per_level=200, preload_rows=20000,
+                                  key_space=20000, concurrency_levels=[4])
+        driver = WorkloadBenchmarkDriver(profile, StoreTuning(pool_size=4))
+        
+        comparison = await driver.ab_test(optimization("query_optimization"))
+        print(f"Key index A/B: throughput {comparison.baseline_runs[0].throughput:,.0f} -> "
+              f"{comparison.candidate_runs[0].throughput:,.0f} ops/s, "
+              f"p95 {comparison.baseline_runs[0].latency['all']['p95'] * 1000:.2f} -> "
+              f"{comparison.candidate_runs[0].latency['all']['p95'] * 1000:.2f}ms")
+        assert comparison.accepted and comparison.throughput_change > 0.5
+        assert driver.tuning.index_keys
+        
+        repeated = await driver.ab_test(optimization("query_optimization"))
+        assert not repeated.accepted and repeated.reason == "no store setting changes"
+        assert len(driver.comparisons) == 2
+
+
+class TestOptimizerWorkloadIntegration:
+    """Test the optimizer validates its proposals with the workload driver"""
+    
+    @pytest.mark.asyncio
+    async def test_run_workload_benchmark(self):
+        """Test proposals are A/B tested and only validated ones change the final tuning"""
+        optimizer = V5PerformanceOptimizer({"system_name": "workload_test"})
+        optimizer.performance_targets["max_query_latency"] = 0.0001  # Force a query proposal
+        
+        profile = WorkloadProfile(read_ratio=1.0, operations_per_level=200, preload_rows=20000,
+                                  key_space=20000, concurrency_levels=[4])
+        report = await optimizer.run_workload_benchmark(profile, StoreTuning(pool_size=4))
+        
+        query_comparisons = [c for c in report.comparisons if c.action_type == "query_optimization"]
+        assert query_comparisons and query_comparisons[0].accepted
+        assert report.final_tuning.index_keys and not report.initial_tuning.index_keys
+        assert report.final_runs[0].throughput > report.baseline_runs[0].throughput
+        
+        # Every proposal records its measured outcome
+        assert len(optimizer.applied_optimizations) == len(report.comparisons)
+        for action, comparison in zip(optimizer.applied_optimizations, report.comparisons):
+            assert action.success == comparison.accepted
+            assert action.parameters["ab_result"] == comparison.reason
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+V5 Time-Series Metric Store
+Bounded in-memory storage for performance metrics with automatic rollups
+
+Each metric keeps a fixed-size ring buffer of raw samples and rolls them up
+into 1s -> 1min -> 1h buckets (min/max/mean/count plus a mergeable percentile
+sketch). Every tier is a bounded deque, so memory and per-sample cost stay
+constant regardless of uptime. Closed rollup buckets can optionally be
+persisted to SQLite.
+"""
+import json
+import math
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+import logging
+
+
+# (resolution in seconds, closed buckets kept in memory)
+DEFAULT_ROLLUP_TIERS: Tuple[Tuple[int, int], ...] = (
+    (1, 3600),     # 1 hour of 1s buckets
+    (60, 1440),    # 1 day of 1min buckets
+    (3600, 720)    # 30 days of 1h buckets
+)
+
+
+class QuantileSketch:
+    """
+    Mergeable percentile sketch with bounded relative error.
+    
+    Values are counted in logarithmic buckets (gamma = (1+a)/(1-a)), so any
+    quantile is answered within relative_accuracy of the true value and two
+    sketches merge by adding bucket counts.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a finite value to the sketch"""
+        if not math.isfinite(value):
+            raise ValueError(f"Cannot add non-finite value {value} to a quantile sketch")
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.positive[index] = self.positive.get(index, 0) + count
+        elif value < 0:
+            index = math.ceil(math.log(-value) / self._log_gamma)
+            self.negative[index] = self.negative.get(index, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch with the same accuracy into this one"""
+        for index, count in other.positive.items():
+            self.positive[index] = self.positive.get(index, 0) + count
+        for index, count in other.negative.items():
+            self.negative[index] = self.negative.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return None
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._bucket_value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._bucket_value(index)
+        return self._bucket_value(max(self.positive)) if self.positive else 0.0
+    
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": self.positive,
+            "negative": self.negative,
+            "zero_count": self.zero_count
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.positive = {int(index): count for index, count in data["positive"].items()}
+        sketch.negative = {int(index): count for index, count in data["negative"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = sketch.zero_count + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
+
+
+@dataclass
+class RollupBucket:
+    """Aggregate of all samples in one time bucket"""
+    start: float
+    resolution: int
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+    
+    def merge(self, other: "RollupBucket") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        return self.sketch.quantile(q)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "resolution": self.resolution,
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99)
+        }
+
+
+@dataclass
+class MetricAnomaly:
+    """Anomaly reported by streaming statistics"""
+    metric_key: str
+    kind: str  # "spike" or "drift"
+    direction: str  # "increase" or "decrease"
+    value: float
+    baseline: float
+    score: float
+    timestamp: float
+
+
+class StreamingAnomalyDetector:
+    """
+    O(1) anomaly detection over a metric stream.
+    
+    An EWMA mean/variance gives a rolling z-score for each sample: a large
+    |z| is a spike. Slow drift is tracked against a much slower EWMA
+    baseline; a two-sided CUSUM accumulates the small deviations from it,
+    catching drift that never produces a single large z-score.
+    """
+    
+    def __init__(self, alpha: float = 0.05, drift_alpha: float = 0.002, z_threshold: float = 4.0,
+                 drift_slack: float = 1.0, drift_threshold: float = 20.0, warmup_samples: int = 10,
+                 min_std_ratio: float = 0.01):
+        self.alpha = alpha
+        self.drift_alpha = drift_alpha
+        self.z_threshold = z_threshold
+        self.drift_slack = drift_slack
+        self.drift_threshold = drift_threshold
+        self.warmup_samples = warmup_samples
+        self.min_std_ratio = min_std_ratio
+        self.mean = 0.0
+        self.slow_mean = 0.0
+        self.variance = 0.0
+        self.samples = 0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+    
+    @property
+    def std(self) -> float:
+        # Floor the deviation so perfectly flat series still have a usable scale
+        return max(math.sqrt(self.variance), abs(self.mean) * self.min_std_ratio, 1e-12)
+    
+    def update(self, metric_key: str, value: float, timestamp: float) -> List[MetricAnomaly]:
+        """Score a sample against the baseline, then fold it into the baseline"""
+        anomalies = []
+        self.samples += 1
+        
+        if self.samples == 1:
+            self.mean = self.slow_mean = value
+            return anomalies
+        
+        z_score = (value - self.mean) / self.std
+        baseline = self.mean
+        
+        if self.samples > self.warmup_samples:
+            direction = "increase" if z_score > 0 else "decrease"
+            if abs(z_score) >= self.z_threshold:
+                anomalies.append(MetricAnomaly(metric_key, "spike", direction, value, baseline, z_score, timestamp))
+            
+            # Spikes are left to the z-score check so they do not also register as drift
+            drift_z = max(-self.z_threshold, min(self.z_threshold, (value - self.slow_mean) / self.std))
+            self.cusum_high = max(0.0, self.cusum_high + drift_z - self.drift_slack)
+            self.cusum_low = max(0.0, self.cusum_low - drift_z - self.drift_slack)
+            if self.cusum_high >= self.drift_threshold or self.cusum_low >= self.drift_threshold:
+                score = self.cusum_high if self.cusum_high >= self.drift_threshold else -self.cusum_low
+                drift_direction = "increase" if score > 0 else "decrease"
+                anomalies.append(MetricAnomaly(metric_key, "drift", drift_direction, value, self.slow_mean, score, timestamp))
+                # Accept the new level as the baseline
+                self.slow_mean = self.mean
+                self.cusum_high = self.cusum_low = 0.0
+        
+        # Spikes are not folded into the baseline at full weight
+        weight = self.alpha if abs(z_score) < self.z_threshold or self.samples <= self.warmup_samples else self.alpha * 0.1
+        delta = value - self.mean
+        self.mean += weight * delta
+        self.variance = (1 - weight) * (self.variance + weight * delta * delta)
+        self.slow_mean += self.drift_alpha * (value - self.slow_mean)
+        
+        return anomalies
+
+
+class MetricSeries:
+    """Raw ring buffer plus rollup tiers for a single metric"""
+    
+    def __init__(self, key: str, raw_capacity: int, tiers: Tuple[Tuple[int, int], ...],
+                 detector: StreamingAnomalyDetector):
+        self.key = key
+        self.raw: deque = deque(maxlen=raw_capacity)
+        self.tiers = tiers
+        self.closed: List[deque] = [deque(maxlen=capacity) for _, capacity in tiers]
+        self.open: List[Optional[RollupBucket]] = [None] * len(tiers)
+        self.closed_until: List[float] = [-math.inf] * len(tiers)  # End of the last closed bucket per tier
+        self.detector = detector
+        self.last_value: Optional[float] = None
+    
+    def add(self, value: float, timestamp: float, on_close=None) -> None:
+        """Add a raw sample and roll it into the finest tier"""
+        self.raw.append((timestamp, value))
+        self.last_value = value
+        
+        resolution = self.tiers[0][0]
+        start = max(timestamp - timestamp % resolution, self.closed_until[0])
+        bucket = self.open[0]
+        if bucket is None or start > bucket.start:
+            if bucket is not None:
+                self._close(0, on_close)
+            bucket = self.open[0] = RollupBucket(start, resolution)
+        # Late samples land in the current bucket rather than reopening a closed one
+        bucket.add(value)
+    
+    def _close(self, level: int, on_close) -> None:
+        """Close the open bucket at a level and cascade it into the next tier"""
+        bucket = self.open[level]
+        self.open[level] = None
+        self.closed[level].append(bucket)
+        self.closed_until[level] = bucket.start + bucket.resolution
+        if on_close:
+            on_close(self.key, bucket)
+        
+        if level + 1 < len(self.tiers):
+            resolution = self.tiers[level + 1][0]
+            start = max(bucket.start - bucket.start % resolution, self.closed_until[level + 1])
+            parent = self.open[level + 1]
+            if parent is None or start > parent.start:
+                if parent is not None:
+                    self._close(level + 1, on_close)
+                parent = self.open[level + 1] = RollupBucket(start, resolution)
+            parent.merge(bucket)
+    
+    def close_due(self, now: float, on_close=None) -> None:
+        """Close open buckets whose interval ended before now, finest tier first"""
+        for level, bucket in enumerate(self.open):
+            if bucket is not None and bucket.start + bucket.resolution <= now:
+                self._close(level, on_close)
+    
+    def _open_view(self, level: int) -> List[RollupBucket]:
+        """The open bucket at a level, including samples still in open finer buckets"""
+        if level == 0:
+            return [self.open[0]] if self.open[0] is not None else []
+        
+        resolution = self.tiers[level][0]
+        views: Dict[float, RollupBucket] = {}
+        for finer in range(level, -1, -1):
+            bucket = self.open[finer]
+            if bucket is None:
+                continue
+            start = bucket.start - bucket.start % resolution
+            if start not in views:
+                views[start] = RollupBucket(start, resolution)
+            views[start].merge(bucket)
+        return [views[start] for start in sorted(views)]
+    
+    def buckets(self, resolution: int, start: Optional[float] = None, end: Optional[float] = None) -> List[RollupBucket]:
+        """Closed and open buckets at a resolution within [start, end)"""
+        level = next((i for i, (tier_resolution, _) in enumerate(self.tiers) if tier_resolution == resolution), None)
+        if level is None:
+            raise ValueError(f"No rollup tier with resolution {resolution}s")
+        
+        buckets = list(self.closed[level])
+        buckets.extend(self._open_view(level))
+        return [
+            bucket for bucket in buckets
+            if (start is None or bucket.start >= start) and (end is None or bucket.start < end)
+        ]
+
+
+class TimeSeriesStore:
+    """
+    Embedded time-series store for monitor metrics.
+    
+    Features:
+    - Fixed-size raw ring buffer per metric
+    - Automatic 1s -> 1min -> 1h rollups with min/max/mean/count and percentiles
+    - O(1) streaming anomaly detection (EWMA z-score and CUSUM drift)
+    - Optional SQLite persistence of closed rollup buckets
+    """
+    
+    def __init__(self, raw_capacity: int = 1000, tiers: Tuple[Tuple[int, int], ...] = DEFAULT_ROLLUP_TIERS,
+                 persistence_path: Optional[str] = None, persist_min_resolution: int = 60,
+                 detector_settings: Optional[Dict[str, Any]] = None):
+        self.raw_capacity = raw_capacity
+        self.tiers = tiers
+        self.persist_min_resolution = persist_min_resolution
+        self.detector_settings = detector_settings or {}
+        self.series: Dict[str, MetricSeries] = {}
+        self.samples_recorded = 0
+        self.non_finite_samples = 0
+        self.anomalies_detected = 0
+        self.logger = logging.getLogger(__name__)
+        
+        # Optional SQLite persistence; closed buckets are queued and written in one transaction per flush
+        self.persistence_path = persistence_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending_rows: List[Tuple] = []
+        if persistence_path:
+            Path(persistence_path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(persistence_path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS metric_rollups ("
+                "metric_key TEXT NOT NULL, resolution INTEGER NOT NULL, start REAL NOT NULL, "
+                "count INTEGER NOT NULL, total REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL, "
+                "sketch TEXT NOT NULL, PRIMARY KEY (metric_key, resolution, start))"
+            )
+            self._connection.commit()
+    
+    def record(self, metric_key: str, value: float, timestamp: Optional[float] = None) -> List[MetricAnomaly]:
+        """Record a sample and return any anomalies it triggers"""
+        if not math.isfinite(value):
+            # inf/NaN would poison the sketch, totals and detector baseline; count and drop it
+            self.non_finite_samples += 1
+            return []
+        
+        timestamp = time.time() if timestamp is None else timestamp
+        series = self.series.get(metric_key)
+        if series is None:
+            series = self.series[metric_key] = MetricSeries(
+                metric_key, self.raw_capacity, self.tiers, StreamingAnomalyDetector(**self.detector_settings)
+            )
+        
+        series.add(value, timestamp, self._on_bucket_closed if self._connection else None)
+        self.samples_recorded += 1
+        
+        anomalies = series.detector.update(metric_key, value, timestamp)
+        self.anomalies_detected += len(anomalies)
+        return anomalies
+    
+    def latest(self, metric_key: str, count: int = 1) -> List[Tuple[float, float]]:
+        """Most recent raw (timestamp, value) samples, oldest first"""
+        series = self.series.get(metric_key)
+        if series is None:
+            return []
+        return list(series.raw)[-count:]
+    
+    def rollups(self, metric_key: str, resolution: int = 60, start: Optional[float] = None,
+                end: Optional[float] = None) -> List[RollupBucket]:
+        """Rollup buckets for a metric at a tier resolution"""
+        series = self.series.get(metric_key)
+        if series is None:
+            return []
+        return series.buckets(resolution, start, end)
+    
+    def summarize(self, metric_key: str, window_seconds: float, resolution: Optional[int] = None,
+                  now: Optional[float] = None) -> Optional[RollupBucket]:
+        """Merge the buckets covering the last window_seconds into one aggregate"""
+        series = self.series.get(metric_key)
+        if series is None:
+            return None
+        
+        now = time.time() if now is None else now
+        if resolution is None:
+            # Coarsest tier that still gives at least a few buckets in the window
+            resolution = self.tiers[0][0]
+            for tier_resolution, _ in self.tiers:
+                if window_seconds >= tier_resolution * 4:
+                    resolution = tier_resolution
+        
+        buckets = series.buckets(resolution, start=now - window_seconds - resolution)
+        if not buckets:
+            return None
+        summary = RollupBucket(buckets[0].start, resolution)
+        for bucket in buckets:
+            summary.merge(bucket)
+        return summary
+    
+    def metric_keys(self) -> List[str]:
+        return list(self.series.keys())
+    
+    def memory_footprint(self) -> Dict[str, int]:
+        """Sample and bucket counts held in memory (bounded by the configured capacities)"""
+        return {
+            "metrics": len(self.series),
+            "raw_samples": sum(len(series.raw) for series in self.series.values()),
+            "rollup_buckets": sum(len(tier) for series in self.series.values() for tier in series.closed)
+        }
+    
+    def _on_bucket_closed(self, metric_key: str, bucket: RollupBucket) -> None:
+        if bucket.resolution >= self.persist_min_resolution:
+            self._pending_rows.append((
+                metric_key, bucket.resolution, bucket.start, bucket.count, bucket.total,
+                bucket.min, bucket.max, json.dumps(bucket.sketch.to_dict())
+            ))
+    
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        Close rollup buckets whose interval has ended and write queued closed buckets to SQLite
+        
+        Closing due buckets here persists the last buckets of metrics that
+        stopped receiving samples. Returns the number of rows written.
+        """
+        if not self._connection:
+            return 0
+        
+        now = time.time() if now is None else now
+        for series in self.series.values():
+            series.close_due(now, self._on_bucket_closed)
+        return self._write_pending_rows()
+    
+    def _write_pending_rows(self) -> int:
+        """Write queued closed buckets to SQLite in one transaction"""
+        if not self._pending_rows:
+            return 0
+        
+        rows, self._pending_rows = self._pending_rows, []
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO metric_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+    
+    def load_persisted(self, metric_key: str, resolution: int, start: Optional[float] = None,
+                       end: Optional[float] = None) -> List[RollupBucket]:
+        """Read persisted rollup buckets, including ones evicted from memory"""
+        if not self._connection:
+            return []
+        
+        self._write_pending_rows()
+        rows = self._connection.execute(
+            "SELECT start, count, total, min, max, sketch FROM metric_rollups "
+            "WHERE metric_key = ? AND resolution = ? AND start >= ? AND start < ? ORDER BY start",
+            (metric_key, resolution, -math.inf if start is None else start, math.inf if end is None else end)
+        ).fetchall()
+        return [
+            RollupBucket(row[0], resolution, row[1], row[2], row[3], row[4], QuantileSketch.from_dict(json.loads(row[5])))
+            for row in rows
+        ]
+    
+    def close(self) -> None:
+        """Flush queued buckets and close the SQLite connection"""
+        if self._connection:
+            self._write_pending_rows()
+            self._connection.close()
+            self._connection = None
@@ -6,12 +6,16 @@ Advanced performance monitoring and optimization for V5 database systems
 import asyncio
 import time
 import json
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import logging
 
+from .time_series_store import TimeSeriesStore, MetricAnomaly
+
 
 @dataclass
 class PerformanceMetric:
@@ -61,16 +65,30 @@ class V5DatabasePerformanceMonitor:
     - Automated performance tuning recommendations
     - Performance benchmarking and reporting
     - Integration with generated V5 systems
+    - Bounded time-series storage with rollups and streaming anomaly detection
     """
     
+    # Metrics where a decrease, not an increase, is a degradation
+    HIGHER_IS_BETTER = ("throughput", "efficiency", "hit_ratio", "component_health")
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.system_name = config.get("system_name", "v5_system")
         self.monitoring_interval = config.get("monitoring_interval", 30)  # seconds
-        self.performance_history = []
-        self.health_history = []
+        
+        # Recent raw history is kept in fixed-size ring buffers
+        self.performance_history = deque(maxlen=config.get("performance_history_size", 10000))
+        self.health_history = deque(maxlen=config.get("health_history_size", 1000))
         self.logger = logging.getLogger(__name__)
         
+        # Metric time series: raw ring buffers, 1s/1min/1h rollups and streaming anomaly statistics
+        self.metrics_store = TimeSeriesStore(
+            raw_capacity=config.get("raw_samples_per_metric", 1000),
+            persistence_path=config.get("metrics_db_path"),
+            detector_settings=config.get("anomaly_detection", {})
+        )
+        self.recent_anomalies = deque(maxlen=100)
+        
         # Performance thresholds
         self.thresholds = {
             "max_connection_time": 0.1,  # seconds
@@ -105,6 +123,7 @@ class V5DatabasePerformanceMonitor:
         """Stop performance monitoring"""
         self.logger.info("Stopping V5 database performance monitoring")
         self.monitoring_active = False
+        self.metrics_store.close()
     
     async def _monitor_database_health(self):
         """Monitor database health continuously"""
@@ -113,9 +132,11 @@ class V5DatabasePerformanceMonitor:
                 health_status = await self._check_database_health()
                 self.health_history.append(health_status)
                 
-                # Keep last 1000 health checks
-                if len(self.health_history) > 1000:
-                    self.health_history = self.health_history[-1000:]
+                # Health results feed the same time series as collected metrics
+                timestamp = health_status.last_check.timestamp()
+                for name, value in health_status.query_performance.items():
+                    self._record_metric(f"health.{name}", value, timestamp)
+                self._record_metric("health.error_rate", health_status.error_rate, timestamp)
                 
                 # Alert on health issues
                 if not health_status.healthy:
@@ -134,12 +155,9 @@ class V5DatabasePerformanceMonitor:
                 metrics = await self._collect_performance_metrics()
                 self.performance_history.extend(metrics)
                 
-                # Keep last 10000 metrics
-                if len(self.performance_history) > 10000:
-                    self.performance_history = self.performance_history[-10000:]
-                
                 # Check for performance issues
                 await self._analyze_performance_trends(metrics)
+                self.metrics_store.flush()
                 
                 await asyncio.sleep(self.monitoring_interval / 2)  # More frequent metrics collection
                 
@@ -468,40 +486,37 @@ class V5DatabasePerformanceMonitor:
     
     async def _analyze_performance_trends(self, metrics: List[PerformanceMetric]):
         """Analyze performance trends and detect issues"""
-        # Group metrics by component and name
-        metric_groups = {}
         for metric in metrics:
             key = f"{metric.component}.{metric.name}"
-            if key not in metric_groups:
-                metric_groups[key] = []
-            metric_groups[key].append(metric)
-        
-        # Analyze trends for each metric
-        for metric_key, metric_list in metric_groups.items():
-            if len(metric_list) >= 5:  # Need enough data points
-                await self._detect_performance_anomalies(metric_key, metric_list)
-    
-    async def _detect_performance_anomalies(self, metric_key: str, metrics: List[PerformanceMetric]):
-        """Detect performance anomalies in metric trends"""
-        values = [m.value for m in metrics[-10:]]  # Last 10 values
-        
-        if len(values) < 5:
-            return
-        
-        # Calculate trend
-        recent_avg = sum(values[-3:]) / 3
-        historical_avg = sum(values[:-3]) / (len(values) - 3)
-        
-        # Check for significant changes
-        change_ratio = recent_avg / historical_avg if historical_avg > 0 else 1.0
-        
-        if change_ratio > 1.5:  # 50% increase
-            self.logger.warning(f"Performance degradation detected in {metric_key}: "
-                              f"{change_ratio:.2f}x increase")
-        elif change_ratio < 0.7:  # 30% decrease (for metrics where lower is worse)
-            if "throughput" in metric_key or "efficiency" in metric_key:
+            await self._detect_performance_anomalies(key, metric)
+        
+    async def _detect_performance_anomalies(self, metric_key: str, metric: PerformanceMetric) -> List[MetricAnomaly]:
+        """Detect performance anomalies with the metric's streaming statistics (O(1) per sample)"""
+        return self._record_metric(metric_key, metric.value, metric.timestamp.timestamp())
+    
+    def _record_metric(self, metric_key: str, value: float, timestamp: float) -> List[MetricAnomaly]:
+        """Store a sample and log anomalies that mean degraded performance"""
+        anomalies = self.metrics_store.record(metric_key, value, timestamp)
+        
+        higher_is_better = any(marker in metric_key for marker in self.HIGHER_IS_BETTER)
+        degradations = [
+            anomaly for anomaly in anomalies
+            if (anomaly.direction == "decrease") == higher_is_better
+        ]
+        for anomaly in degradations:
+            self.recent_anomalies.append(anomaly)
+            if anomaly.kind == "spike":
                 self.logger.warning(f"Performance degradation detected in {metric_key}: "
-                                  f"{(1-change_ratio)*100:.1f}% decrease")
+                                  f"{anomaly.value:.4g} vs baseline {anomaly.baseline:.4g} (z={anomaly.score:.1f})")
+            else:
+                self.logger.warning(f"Performance drift detected in {metric_key}: "
+                                  f"sustained {anomaly.direction} from baseline {anomaly.baseline:.4g}")
+        
+        return degradations
+        
+    def get_metric_rollups(self, metric_key: str, resolution: int = 60) -> List[Dict[str, Any]]:
+        """Get min/max/mean/count/percentile rollups for a metric at 1, 60 or 3600 second resolution"""
+        return [bucket.to_dict() for bucket in self.metrics_store.rollups(metric_key, resolution)]
     
     async def _handle_health_alert(self, health_status: DatabaseHealthStatus):
         """Handle database health alerts"""
@@ -524,7 +539,7 @@ class V5DatabasePerformanceMonitor:
             latest_health = await self._check_database_health()
         
         # Get recent performance metrics
-        recent_metrics = self.performance_history[-100:] if self.performance_history else []
+        recent_metrics = list(islice(reversed(self.performance_history), 100))[::-1]
         
         # Generate optimization recommendations
         recommendations = await self._generate_optimization_recommendations(recent_metrics)
@@ -728,7 +743,9 @@ class V5DatabasePerformanceMonitor:
             "benchmarks_met": latest_report.benchmarks_met,
             "database_healthy": latest_report.database_health.healthy,
             "optimization_recommendations": len(latest_report.optimization_recommendations),
-            "last_updated": latest_report.report_timestamp.isoformat()
+            "last_updated": latest_report.report_timestamp.isoformat(),
+            "tracked_metrics": len(self.metrics_store.metric_keys()),
+            "anomalies_detected": self.metrics_store.anomalies_detected
         }
 
 
@@ -15,6 +15,7 @@ import logging
 
 from .v5_database_performance_monitor import V5DatabasePerformanceMonitor, PerformanceMetric
 from .v5_database_health_monitor import V5DatabaseHealthMonitor
+from .workload_benchmark import WorkloadBenchmarkDriver, WorkloadProfile, StoreTuning, WorkloadRunResult, WorkloadBenchmarkReport
 
 
 @dataclass
@@ -69,6 +70,7 @@ class V5PerformanceOptimizer:
     - Performance regression detection
     - Load testing and stress testing
     - Performance reporting and analytics
+    - Real workload replay through V5EnhancedStore on SQLite with A/B-validated optimizations
     """
     
     def __init__(self, config: Dict[str, Any]):
@@ -93,6 +95,9 @@ class V5PerformanceOptimizer:
         self.benchmark_history = []
         self.performance_baseline = None
         
+        # While set, applying an optimization means A/B testing it against the real workload
+        self._workload_driver: Optional[WorkloadBenchmarkDriver] = None
+        
         # Monitoring integration
         self.performance_monitor = V5DatabasePerformanceMonitor(config)
         self.health_monitor = V5DatabaseHealthMonitor(config)
@@ -181,6 +186,86 @@ class V5PerformanceOptimizer:
             self.logger.error(f"Benchmark failed: {e}")
             raise
     
+    async def run_workload_benchmark(self, profile: Optional[WorkloadProfile] = None,
+                                     tuning: Optional[StoreTuning] = None) -> WorkloadBenchmarkReport:
+        """Replay a workload through V5EnhancedStore on SQLite and validate each proposed optimization
+        
+        Args:
+            profile: Operation mix to replay (defaults to config "workload_profile")
+            tuning: Starting store settings (defaults to config "store_tuning")
+        
+        Returns:
+            Baseline and final runs, plus the A/B comparison behind each optimization
+        """
+        profile = profile or WorkloadProfile(**self.config.get("workload_profile", {}))
+        tuning = tuning or StoreTuning(**self.config.get("store_tuning", {}))
+        driver = WorkloadBenchmarkDriver(profile, tuning, work_dir=self.config.get("benchmark_work_dir"))
+        benchmark_id = f"workload_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.logger.info(f"Starting workload benchmark '{profile.name}' for {self.system_name}")
+        
+        baseline_runs = await driver.run()
+        benchmark_results = [result for run in baseline_runs for result in self._workload_benchmark_results(run)]
+        
+        # The engine proposes optimizations from measured results; each is kept only if its A/B wins
+        if self.optimization_enabled:
+            self._workload_driver = driver
+            try:
+                self.applied_optimizations.extend(await self._analyze_and_optimize(benchmark_results))
+            finally:
+                self._workload_driver = None
+        
+        final_runs = await driver.run() if driver.tuning != tuning else baseline_runs
+        
+        report = WorkloadBenchmarkReport(
+            benchmark_id=benchmark_id,
+            profile=profile,
+            baseline_runs=baseline_runs,
+            comparisons=driver.comparisons,
+            final_runs=final_runs,
+            initial_tuning=tuning,
+            final_tuning=driver.tuning,
+            timestamp=datetime.now()
+        )
+        
+        kept = sum(1 for comparison in driver.comparisons if comparison.accepted)
+        self.logger.info(f"Workload benchmark completed: {kept} of {len(driver.comparisons)} optimizations validated")
+        return report
+    
+    def _workload_benchmark_results(self, run: WorkloadRunResult) -> List[BenchmarkResult]:
+        """Express a measured workload run as results the optimization rules understand"""
+        success_rate = (run.operations - run.errors) / run.operations if run.operations else 0.0
+        timestamp = datetime.now()
+        
+        return [
+            BenchmarkResult(
+                test_name=f"store_queries_c{run.concurrency}",
+                duration=run.duration,
+                throughput=run.throughput,
+                latency=run.latency["all"]["mean"],
+                success_rate=success_rate,
+                metadata={
+                    "read_latency": run.latency["read"],
+                    "write_latency": run.latency["write"],
+                    "p95_latency": run.latency["all"]["p95"],
+                    "loop": run.loop
+                },
+                timestamp=timestamp
+            ),
+            BenchmarkResult(
+                test_name=f"connection_pool_c{run.concurrency}",
+                duration=run.duration,
+                throughput=run.throughput,
+                latency=run.pool_wait["mean"],
+                success_rate=success_rate,
+                metadata={
+                    "avg_utilization": run.pool_utilization,
+                    "p95_wait": run.pool_wait["p95"],
+                    "pool_size": run.tuning["pool_size"]
+                },
+                timestamp=timestamp
+            )
+        ]
+    
     async def _run_baseline_benchmarks(self) -> List[BenchmarkResult]:
         """Run baseline performance benchmarks"""
         self.logger.info("Running baseline performance benchmarks")
@@ -1043,32 +1128,47 @@ class V5PerformanceOptimizer:
         
         return optimizations
     
-    # Optimization implementation methods (simulated)
+    # Optimization implementation methods (simulated unless a workload driver is active)
     
     async def _apply_connection_optimization(self, optimization: OptimizationAction):
         """Apply connection optimization"""
         self.logger.info(f"Applying connection optimization: {optimization.description}")
-        await asyncio.sleep(0.1)  # Simulate optimization time
+        await self._apply_optimization(optimization, 0.1)
     
     async def _apply_query_optimization(self, optimization: OptimizationAction):
         """Apply query optimization"""
         self.logger.info(f"Applying query optimization: {optimization.description}")
-        await asyncio.sleep(0.2)  # Simulate optimization time
+        await self._apply_optimization(optimization, 0.2)
     
     async def _apply_memory_optimization(self, optimization: OptimizationAction):
         """Apply memory optimization"""
         self.logger.info(f"Applying memory optimization: {optimization.description}")
-        await asyncio.sleep(0.15)  # Simulate optimization time
+        await self._apply_optimization(optimization, 0.15)
     
     async def _apply_cpu_optimization(self, optimization: OptimizationAction):
         """Apply CPU optimization"""
         self.logger.info(f"Applying CPU optimization: {optimization.description}")
-        await asyncio.sleep(0.1)  # Simulate optimization time
+        await self._apply_optimization(optimization, 0.1)
     
     async def _apply_pool_optimization(self, optimization: OptimizationAction):
         """Apply connection pool optimization"""
         self.logger.info(f"Applying pool optimization: {optimization.description}")
-        await asyncio.sleep(0.2)  # Simulate optimization time
+        await self._apply_optimization(optimization, 0.2)
+    
+    async def _apply_optimization(self, optimization: OptimizationAction, simulated_time: float):
+        """A/B test the optimization against the active workload, or simulate applying it"""
+        if self._workload_driver is None:
+            await asyncio.sleep(simulated_time)  # Simulate optimization time
+            return
+        
+        comparison = await self._workload_driver.ab_test(optimization)
+        optimization.success = comparison.accepted
+        optimization.applied_at = datetime.now()
+        optimization.parameters.update({
+            "measured_throughput_change": comparison.throughput_change,
+            "measured_p95_change": comparison.p95_change,
+            "ab_result": comparison.reason
+        })
     
     def _calculate_overall_score(self, benchmark_results: List[BenchmarkResult]) -> float:
         """Calculate overall performance score (0-100)"""
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+V5 Workload Benchmark Driver
+Replays a configurable operation mix through V5EnhancedStore against a real SQLite database
+
+Writes go through the store's full consume() path (schema validation,
+transaction, commit) on pooled SQLite connections; reads use the same pool.
+Latencies are recorded in percentile sketches per operation type, and every
+optimization the V5PerformanceOptimizer proposes can be A/B-compared on a
+fresh database before it is kept.
+"""
+import asyncio
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, asdict, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from .time_series_store import QuantileSketch
+
+# Add Phase 5 database components to path
+phase5_path = os.path.join(os.path.dirname(__file__), '..', '..', 'phase5_database_integration', 'day1_enhanced_store_components')
+sys.path.insert(0, phase5_path)
+
+from v5_enhanced_store import V5EnhancedStore, StoreOperationError
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkloadProfile:
+    """Operation mix replayed by the benchmark driver"""
+    name: str = "mixed"
+    read_ratio: float = 0.8
+    payload_sizes: List[Tuple[int, float]] = field(default_factory=lambda: [(256, 0.7), (4096, 0.25), (65536, 0.05)])  # (bytes, weight)
+    concurrency_levels: List[int] = field(default_factory=lambda: [1, 4, 16])
+    loop: str = "closed"  # "closed": next op starts when one finishes; "open": fixed arrival rate
+    arrival_rate: float = 500.0  # operations/second for open loop
+    operations_per_level: int = 2000
+    key_space: int = 5000
+    preload_rows: int = 5000
+    seed: int = 42
+
+
+@dataclass
+class StoreTuning:
+    """SQLite store settings the optimizer can change"""
+    pool_size: int = 4
+    journal_mode: str = "DELETE"
+    synchronous: str = "FULL"
+    cache_size_kb: int = 2000
+    index_keys: bool = False
+
+
+@dataclass
+class WorkloadRunResult:
+    """Measured result of one concurrency level"""
+    profile_name: str
+    concurrency: int
+    loop: str
+    operations: int
+    errors: int
+    duration: float
+    throughput: float
+    latency: Dict[str, Dict[str, float]]  # "read"/"write"/"all" -> mean/p50/p95/p99/max
+    pool_wait: Dict[str, float]
+    pool_utilization: float
+    tuning: Dict[str, Any]
+
+
+@dataclass
+class ABComparison:
+    """Before/after comparison of one proposed optimization"""
+    action_type: str
+    description: str
+    baseline_tuning: Dict[str, Any]
+    candidate_tuning: Dict[str, Any]
+    throughput_change: float  # relative, +0.1 = 10% more throughput
+    p95_change: float  # relative, -0.1 = 10% lower p95 latency
+    accepted: bool
+    reason: str
+    baseline_runs: List[WorkloadRunResult] = field(default_factory=list)
+    candidate_runs: List[WorkloadRunResult] = field(default_factory=list)
+
+
+@dataclass
+class WorkloadBenchmarkReport:
+    """Workload benchmark with validated optimizations"""
+    benchmark_id: str
+    profile: WorkloadProfile
+    baseline_runs: List[WorkloadRunResult]
+    comparisons: List[ABComparison]
+    final_runs: List[WorkloadRunResult]
+    initial_tuning: StoreTuning
+    final_tuning: StoreTuning
+    timestamp: datetime
+
+
+class LatencyRecorder:
+    """Latency histogram (percentile sketch) with exact count, mean and max"""
+    
+    def __init__(self):
+        self.sketch = QuantileSketch(relative_accuracy=0.01)
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float) -> None:
+        self.sketch.add(seconds)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def summary(self) -> Dict[str, float]:
+        count = self.sketch.count
+        return {
+            "count": count,
+            "mean": self.total / count if count else 0.0,
+            "p50": self.sketch.quantile(0.5) or 0.0,
+            "p95": self.sketch.quantile(0.95) or 0.0,
+            "p99": self.sketch.quantile(0.99) or 0.0,
+            "max": self.max
+        }
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections, each used by one operation at a time"""
+    
+    def __init__(self, db_path: str, tuning: StoreTuning):
+        self.db_path = db_path
+        self.tuning = tuning
+        self.executor = ThreadPoolExecutor(max_workers=tuning.pool_size, thread_name_prefix="sqlite-pool")
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        self._checked_out: Dict[int, float] = {}
+        self.wait_times = LatencyRecorder()
+        self.busy_time = 0.0
+        self.pool_initialized = False
+    
+    async def initialize_pool(self):
+        for _ in range(self.tuning.pool_size):
+            connection = await self.run(self._connect)
+            self._connections.append(connection)
+            self._idle.put_nowait(connection)
+        self.pool_initialized = True
+    
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level="DEFERRED")
+        connection.execute(f"PRAGMA journal_mode={self.tuning.journal_mode}")
+        connection.execute(f"PRAGMA synchronous={self.tuning.synchronous}")
+        connection.execute(f"PRAGMA cache_size=-{self.tuning.cache_size_kb}")
+        return connection
+    
+    async def run(self, function, *args):
+        """Run a blocking SQLite call on the pool's threads"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+    
+    async def get_connection(self) -> sqlite3.Connection:
+        wait_start = time.perf_counter()
+        connection = await self._idle.get()
+        now = time.perf_counter()
+        self.wait_times.add(now - wait_start)
+        self._checked_out[id(connection)] = now
+        return connection
+    
+    async def release_connection(self, connection: sqlite3.Connection):
+        self.busy_time += time.perf_counter() - self._checked_out.pop(id(connection))
+        self._idle.put_nowait(connection)
+    
+    def reset_statistics(self):
+        self.wait_times = LatencyRecorder()
+        self.busy_time = 0.0
+    
+    async def cleanup(self):
+        for connection in self._connections:
+            await self.run(connection.close)
+        self._connections = []
+        self.executor.shutdown(wait=True)
+        self.pool_initialized = False
+
+
+class SQLiteTransaction:
+    """Transaction on one pooled SQLite connection"""
+    
+    def __init__(self, pool: SQLiteConnectionPool, connection: sqlite3.Connection):
+        self.id = f"tx_{uuid.uuid4().hex[:8]}"
+        self.pool = pool
+        self.connection = connection
+        self.committed = False
+        self.rolled_back = False
+    
+    async def commit(self):
+        await self.pool.run(self.connection.commit)
+        self.committed = True
+    
+    async def rollback(self):
+        await self.pool.run(self.connection.rollback)
+        self.rolled_back = True
+
+
+class SQLiteTransactionManager:
+    """Transaction manager handing out pooled SQLite connections"""
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+    
+    async def initialize(self):
+        pass
+    
+    @asynccontextmanager
+    async def transaction(self):
+        connection = await self.pool.get_connection()
+        tx = SQLiteTransaction(self.pool, connection)
+        try:
+            yield tx
+        finally:
+            if not tx.committed and not tx.rolled_back:
+                await tx.rollback()
+            await self.pool.release_connection(connection)
+    
+    async def cleanup(self):
+        pass
+
+
+class SQLiteBenchmarkStore(V5EnhancedStore):
+    """V5EnhancedStore backed by a real SQLite database for benchmarking"""
+    
+    def __init__(self, name: str, db_path: str, tuning: StoreTuning):
+        super().__init__(name, {"database": {"database_type": "sqlite", "connection_url": f"sqlite:///{db_path}"}})
+        self.db_path = db_path
+        self.tuning = tuning
+    
+    async def _initialize_connection_manager(self):
+        self.connection_manager = SQLiteConnectionPool(self.db_path, self.tuning)
+        await self.connection_manager.initialize_pool()
+        
+        # Records table; without the key index, reads scan the table
+        connection = await self.connection_manager.get_connection()
+        try:
+            await self.connection_manager.run(self._create_schema, connection)
+        finally:
+            await self.connection_manager.release_connection(connection)
+    
+    def _create_schema(self, connection: sqlite3.Connection):
+        connection.execute("CREATE TABLE IF NOT EXISTS records (key TEXT NOT NULL, payload BLOB, updated_at REAL)")
+        if self.tuning.index_keys:
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_records_key ON records (key)")
+        connection.commit()
+    
+    async def _initialize_transaction_manager(self):
+        self.transaction_manager = SQLiteTransactionManager(self.connection_manager)
+        await self.transaction_manager.initialize()
+    
+    async def _execute_store_operation(self, connection, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert the record on the transaction's connection"""
+        def insert():
+            cursor = connection.execute(
+                "INSERT INTO records (key, payload, updated_at) VALUES (?, ?, ?)",
+                (data["key"], data["payload"], time.time())
+            )
+            return cursor.rowcount
+        
+        affected_rows = await self.connection_manager.run(insert)
+        return {"affected_rows": affected_rows, "operation": "insert", "timestamp": time.time()}
+    
+    async def read(self, key: str) -> Optional[bytes]:
+        """Read the latest payload stored for a key"""
+        connection = await self.connection_manager.get_connection()
+        try:
+            row = await self.connection_manager.run(
+                lambda: connection.execute(
+                    "SELECT payload FROM records WHERE key = ? ORDER BY rowid DESC LIMIT 1", (key,)
+                ).fetchone()
+            )
+            return row[0] if row else None
+        finally:
+            await self.connection_manager.release_connection(connection)
+    
+    async def preload(self, rows: List[Tuple[str, bytes]]):
+        """Bulk-load initial rows outside the measured workload"""
+        connection = await self.connection_manager.get_connection()
+        try:
+            def load():
+                now = time.time()
+                connection.executemany(
+                    "INSERT INTO records (key, payload, updated_at) VALUES (?, ?, ?)",
+                    [(key, payload, now) for key, payload in rows]
+                )
+                connection.commit()
+            await self.connection_manager.run(load)
+        finally:
+            await self.connection_manager.release_connection(connection)
+
+
+# How each optimizer action type maps onto concrete store settings
+def _tuning_for_action(tuning: StoreTuning, action_type: str, parameters: Dict[str, Any]) -> StoreTuning:
+    if action_type == "connection_optimization":
+        return replace(tuning, journal_mode="WAL")  # Readers stop blocking behind writers
+    if action_type == "query_optimization":
+        return replace(tuning, index_keys=True)
+    if action_type == "memory_optimization":
+        return replace(tuning, cache_size_kb=tuning.cache_size_kb * 4)
+    if action_type == "cpu_optimization":
+        return replace(tuning, synchronous="NORMAL")  # Fewer fsyncs per commit
+    if action_type == "pool_scaling":
+        return replace(tuning, pool_size=math.ceil(tuning.pool_size * parameters.get("scale_factor", 1.25)))
+    if action_type == "pool_efficiency":
+        return replace(tuning, pool_size=max(1, math.floor(tuning.pool_size * parameters.get("scale_factor", 0.9))))
+    return tuning
+
+
+class WorkloadBenchmarkDriver:
+    """
+    Replays a workload profile through V5EnhancedStore on SQLite.
+    
+    Features:
+    - Configurable read/write ratio and payload size distribution
+    - Closed-loop (fixed concurrency) and open-loop (fixed arrival rate) replay
+    - Latency histograms per operation type, throughput and pool statistics
+    - A/B comparison of proposed optimizations on fresh databases
+    """
+    
+    def __init__(self, profile: Optional[WorkloadProfile] = None, tuning: Optional[StoreTuning] = None,
+                 work_dir: Optional[str] = None, min_improvement: float = 0.1, max_regression: float = 0.1):
+        self.profile = profile or WorkloadProfile()
+        self.tuning = tuning or StoreTuning()
+        self.work_dir = work_dir
+        self.min_improvement = min_improvement
+        self.max_regression = max_regression
+        self.comparisons: List[ABComparison] = []
+        self._operations = self._build_operations()
+        self._payloads = {size: random.Random(size).randbytes(size) for size, _ in self.profile.payload_sizes}
+    
+    def _build_operations(self) -> List[Tuple[str, str, int]]:
+        """Deterministic (kind, key, payload_size) sequence so A and B replay identical work"""
+        rng = random.Random(self.profile.seed)
+        sizes = [size for size, _ in self.profile.payload_sizes]
+        weights = [weight for _, weight in self.profile.payload_sizes]
+        operations = []
+        for _ in range(self.profile.operations_per_level):
+            kind = "read" if rng.random() < self.profile.read_ratio else "write"
+            key = f"key_{rng.randrange(self.profile.key_space)}"
+            operations.append((kind, key, rng.choices(sizes, weights)[0]))
+        return operations
+    
+    async def run(self, tuning: Optional[StoreTuning] = None) -> List[WorkloadRunResult]:
+        """Run every concurrency level of the profile with the given (or current) tuning"""
+        tuning = tuning or self.tuning
+        return [await self._run_level(concurrency, tuning) for concurrency in self.profile.concurrency_levels]
+    
+    async def _run_level(self, concurrency: int, tuning: StoreTuning) -> WorkloadRunResult:
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as temp_dir:
+            store = SQLiteBenchmarkStore(f"benchmark_{self.profile.name}", str(Path(temp_dir) / "benchmark.db"), tuning)
+            await store.setup()
+            try:
+                rng = random.Random(self.profile.seed)
+                sizes = [size for size, _ in self.profile.payload_sizes]
+                weights = [weight for _, weight in self.profile.payload_sizes]
+                await store.preload([
+                    (f"key_{i % self.profile.key_space}", self._payloads[rng.choices(sizes, weights)[0]])
+                    for i in range(self.profile.preload_rows)
+                ])
+                store.connection_manager.reset_statistics()
+                
+                recorders = {"read": LatencyRecorder(), "write": LatencyRecorder(), "all": LatencyRecorder()}
+                errors = 0
+                
+                async def execute(operation: Tuple[str, str, int], issued_at: float):
+                    nonlocal errors
+                    kind, key, size = operation
+                    try:
+                        if kind == "read":
+                            await store.read(key)
+                        else:
+                            result = await store.consume({"key": key, "payload": self._payloads[size]})
+                            if not result["success"]:
+                                raise StoreOperationError(result["error_message"])
+                    except Exception as e:
+                        errors += 1
+                        logger.debug(f"Benchmark operation failed: {e}")
+                        return
+                    # Latency counts from when the operation was due (queueing included in open loop)
+                    latency = time.perf_counter() - issued_at
+                    recorders[kind].add(latency)
+                    recorders["all"].add(latency)
+                
+                start = time.perf_counter()
+                if self.profile.loop == "open":
+                    await self._replay_open_loop(execute, concurrency)
+                else:
+                    await self._replay_closed_loop(execute, concurrency)
+                duration = time.perf_counter() - start
+                
+                pool = store.connection_manager
+                completed = len(self._operations) - errors
+                return WorkloadRunResult(
+                    profile_name=self.profile.name,
+                    concurrency=concurrency,
+                    loop=self.profile.loop,
+                    operations=len(self._operations),
+                    errors=errors,
+                    duration=duration,
+                    throughput=completed / duration if duration > 0 else 0.0,
+                    latency={kind: recorder.summary() for kind, recorder in recorders.items()},
+                    pool_wait=pool.wait_times.summary(),
+                    pool_utilization=min(1.0, pool.busy_time / (duration * tuning.pool_size)) if duration > 0 else 0.0,
+                    tuning=asdict(tuning)
+                )
+            finally:
+                await store.cleanup()
+    
+    async def _replay_closed_loop(self, execute, concurrency: int):
+        """Each worker issues its next operation as soon as the previous one completes"""
+        operations = iter(self._operations)
+        
+        async def worker():
+            for operation in operations:
+                await execute(operation, time.perf_counter())
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    
+    async def _replay_open_loop(self, execute, concurrency: int):
+        """Operations arrive at arrival_rate (Poisson) whether or not earlier ones finished"""
+        rng = random.Random(self.profile.seed + 1)
+        in_flight = asyncio.Semaphore(concurrency)
+        
+        async def limited(operation, issued_at):
+            async with in_flight:
+                await execute(operation, issued_at)
+        
+        tasks = []
+        due = time.perf_counter()
+        for operation in self._operations:
+            due += rng.expovariate(self.profile.arrival_rate)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(limited(operation, due)))
+        await asyncio.gather(*tasks)
+    
+    async def ab_test(self, optimization) -> ABComparison:
+        """Compare current tuning against the tuning an optimization proposes; keep it only if it wins"""
+        candidate = _tuning_for_action(self.tuning, optimization.action_type, optimization.parameters)
+        if candidate == self.tuning:
+            comparison = ABComparison(
+                action_type=optimization.action_type,
+                description=optimization.description,
+                baseline_tuning=asdict(self.tuning),
+                candidate_tuning=asdict(candidate),
+                throughput_change=0.0,
+                p95_change=0.0,
+                accepted=False,
+                reason="no store setting changes"
+            )
+            self.comparisons.append(comparison)
+            return comparison
+        
+        baseline_runs = await self.run(self.tuning)
+        candidate_runs = await self.run(candidate)
+        
+        throughput_change = self._relative_change(
+            sum(run.throughput for run in baseline_runs), sum(run.throughput for run in candidate_runs)
+        )
+        p95_change = self._relative_change(
+            max(run.latency["all"]["p95"] for run in baseline_runs), max(run.latency["all"]["p95"] for run in candidate_runs)
+        )
+        
+        improved = throughput_change >= self.min_improvement or p95_change <= -self.min_improvement
+        regressed = throughput_change < -self.max_regression or p95_change > self.max_regression
+        accepted = improved and not regressed
+        if accepted:
+            reason = "improved"
+        elif regressed:
+            reason = "regressed"
+        else:
+            reason = f"change within {self.min_improvement:.0%} noise threshold"
+        
+        comparison = ABComparison(
+            action_type=optimization.action_type,
+            description=optimization.description,
+            baseline_tuning=asdict(self.tuning),
+            candidate_tuning=asdict(candidate),
+            throughput_change=throughput_change,
+            p95_change=p95_change,
+            accepted=accepted,
+            reason=reason,
+            baseline_runs=baseline_runs,
+            candidate_runs=candidate_runs
+        )
+        self.comparisons.append(comparison)
+        
+        if accepted:
+            self.tuning = candidate
+        logger.info(f"A/B {optimization.action_type}: throughput {throughput_change:+.1%}, "
+                    f"p95 {p95_change:+.1%} -> {'kept' if accepted else 'rejected'} ({reason})")
+        return comparison
+    
+    @staticmethod
+    def _relative_change(before: float, after: float) -> float:
+        return (after - before) / before if before > 0 else 0.0
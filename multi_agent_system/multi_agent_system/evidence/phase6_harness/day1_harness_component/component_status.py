@@ -69,9 +69,9 @@ class ComponentMetrics:
         )
         self.update_activity()
     
-    def record_message_sent(self):
-        """Record a sent message"""
-        self.total_messages_sent += 1
+    def record_message_sent(self, count: int = 1):
+        """Record sent messages (a batch counts each message it carries)"""
+        self.total_messages_sent += count
         self.update_activity()
     
     def record_error(self):
@@ -146,67 +146,71 @@ class ComponentStatus:
             InvalidStateTransitionError: If transition is not allowed
         """
         async with self._lock:
-            if isinstance(new_state, str):
-                new_state = ComponentState(new_state)
+            return self._transition_locked(new_state, context)
+    
+    def _transition_locked(self, new_state: ComponentState, context: Optional[Dict[str, Any]] = None) -> bool:
+        """Perform a state transition; caller must hold self._lock"""
+        if isinstance(new_state, str):
+            new_state = ComponentState(new_state)
+        
+        # Check if transition is valid
+        if new_state not in self.VALID_TRANSITIONS.get(self.state, []):
+            error_msg = f"Invalid transition from {self.state.value} to {new_state.value} for component '{self.name}'"
+            self.logger.error(f"❌ {error_msg}")
+            raise InvalidStateTransitionError(error_msg)
+        
+        # Record transition timing
+        transition_start = time.time()
+        
+        try:
+            # Update state
+            self.previous_state = self.state
+            self.state = new_state
+            current_time = time.time()
+            transition_duration = current_time - transition_start
             
-            # Check if transition is valid
-            if new_state not in self.VALID_TRANSITIONS.get(self.state, []):
-                error_msg = f"Invalid transition from {self.state.value} to {new_state.value} for component '{self.name}'"
-                self.logger.error(f"❌ {error_msg}")
-                raise InvalidStateTransitionError(error_msg)
+            # Record transition
+            transition = StateTransition(
+                from_state=self.previous_state,
+                to_state=new_state,
+                timestamp=current_time,
+                duration=transition_duration,
+                context=context
+            )
             
-            # Record transition timing
-            transition_start = time.time()
+            self._record_transition(transition)
             
-            try:
-                # Update state
-                self.previous_state = self.state
-                self.state = new_state
-                current_time = time.time()
-                transition_duration = current_time - transition_start
-                
-                # Record transition
-                transition = StateTransition(
-                    from_state=self.previous_state,
-                    to_state=new_state,
-                    timestamp=current_time,
-                    duration=transition_duration,
-                    context=context
-                )
-                
-                self._record_transition(transition)
-                
-                # Update timing
-                self.last_transition_time = current_time
-                
-                # Reset error count on successful transition to healthy states
-                if new_state in [ComponentState.READY, ComponentState.RUNNING]:
-                    self.error_count = 0
-                    self.recovery_attempts = 0
-                
-                # Update metrics
-                self.metrics.uptime_seconds = current_time - self.creation_time
-                self.metrics.update_activity()
-                
-                self.logger.info(f"✅ Component '{self.name}' transitioned {self.previous_state.value} → {self.state.value}")
-                
-                return True
-                
-            except Exception as e:
-                # Record failed transition
-                failed_transition = StateTransition(
-                    from_state=self.previous_state or self.state,
-                    to_state=new_state,
-                    timestamp=time.time(),
-                    duration=time.time() - transition_start,
-                    context=context,
-                    error=e
-                )
-                
-                self._record_transition(failed_transition)
-                
-                self.logger.error(f"❌ Transition failed for component '{self.name}': {e}")
-                raise ComponentStatusError(f"State transition failed: {e}") from e
+            # Update timing
+            self.last_transition_time = current_time
+            
+            # Reset error count on successful transition to healthy states
+            if new_state in [ComponentState.READY, ComponentState.RUNNING]:
+                self.error_count = 0
+                self.recovery_attempts = 0
+            
+            # Update metrics
+            self.metrics.uptime_seconds = current_time - self.creation_time
+            self.metrics.update_activity()
+            
+            self.logger.info(f"✅ Component '{self.name}' transitioned {self.previous_state.value} → {self.state.value}")
+            
+            return True
+            
+        except Exception as e:
+            # Record failed transition
+            failed_transition = StateTransition(
+                from_state=self.previous_state or self.state,
+                to_state=new_state,
+                timestamp=time.time(),
+                duration=time.time() - transition_start,
+                context=context,
+                error=e
+            )
+            
+            self._record_transition(failed_transition)
+            
+            self.logger.error(f"❌ Transition failed for component '{self.name}': {e}")
+            raise ComponentStatusError(f"State transition failed: {e}") from e
     
     def _record_transition(self, transition: StateTransition):
         """Record transition in history with size management"""
@@ -235,11 +239,11 @@ class ComponentStatus:
             # Transition to error state if not already in terminal state
             if self.state not in [ComponentState.ERROR, ComponentState.FAILED, ComponentState.STOPPED]:
                 try:
-                    await self.transition_to(ComponentState.ERROR, error_context)
+                    self._transition_locked(ComponentState.ERROR, error_context)
                 except InvalidStateTransitionError:
                     # If we can't transition to ERROR, try FAILED
                     try:
-                        await self.transition_to(ComponentState.FAILED, error_context)
+                        self._transition_locked(ComponentState.FAILED, error_context)
                     except InvalidStateTransitionError:
                         self.logger.warning(f"⚠️ Could not transition to error state from {self.state.value}")
     
@@ -267,7 +271,10 @@ class ComponentStatus:
             }
             
             try:
-                await self.transition_to(ComponentState.READY, recovery_context)
+                # Keep the attempt count across the transition so the limit still applies
+                recovery_attempts = self.recovery_attempts
+                self._transition_locked(ComponentState.READY, recovery_context)
+                self.recovery_attempts = recovery_attempts
                 self.logger.info(f"🔄 Recovery successful for component '{self.name}' (attempt {self.recovery_attempts})")
                 return True
             except Exception as e:
@@ -23,8 +23,8 @@ import time
 import logging
 from typing import Dict, Any, Optional, List, Callable, Union
 from abc import abstractmethod
-import uuid
 import json
+from collections import deque
 from dataclasses import dataclass, field
 
 # Import the existing enhanced base component
@@ -41,6 +41,15 @@ from evidence.phase2_component_library.day1_core_component_classes.enhanced_base
 )
 
 from .component_status import ComponentStatus, ComponentState, InvalidStateTransitionError
+from .harness_metrics import RollingMetric, MetricsSnapshot
+from .message_ids import next_message_id, now_ns
+
+
+@dataclass
+class SendBatchPolicy:
+    """Auto-coalescing settings for a send stream"""
+    max_batch_size: int = 64
+    linger_time: float = 0.005  # Seconds a partial batch may wait before it is flushed
 
 
 @dataclass
@@ -53,10 +62,17 @@ class StreamConnection:
     message_count: int = 0
     last_activity: float = field(default_factory=time.time)
     buffer_size: int = 100
+    inbox: Optional[asyncio.Queue] = None
+    reader_task: Optional[asyncio.Task] = None
+    end_of_stream: bool = False
+    pending: deque = field(default_factory=deque)  # Unpacked batch items not yet consumed
+    batch_policy: Optional[SendBatchPolicy] = None
+    send_buffer: List[Any] = field(default_factory=list)
+    linger_task: Optional[asyncio.Task] = None
     
-    def record_activity(self):
+    def record_activity(self, count: int = 1):
         """Record stream activity"""
-        self.message_count += 1
+        self.message_count += count
         self.last_activity = time.time()
 
 
@@ -75,6 +91,10 @@ class StreamOperationError(Exception):
     pass
 
 
+# Marker placed in a connection inbox once its underlying stream has ended
+_END_OF_STREAM = object()
+
+
 class HarnessComponent(EnhancedBaseComponent):
     """
     Base class for all harness-compatible components
@@ -105,9 +125,14 @@ class HarnessComponent(EnhancedBaseComponent):
         self._shutdown_event = asyncio.Event()
         self._processing_active = False
         
+        # Event-driven wakeup: set by stream readers on new input and on shutdown
+        self._wakeup_event = asyncio.Event()
+        self.idle_wakeup_interval: Optional[float] = 1.0  # None = wake only on input/shutdown
+        self.source_wakeup_interval: float = 0.001  # Pacing for components without receive streams
+        
         # Performance metrics
         self.start_time: Optional[float] = None
-        self.message_processing_times: List[float] = []
+        self.message_processing_times = RollingMetric(window_size=1000)
         self.last_heartbeat: float = time.time()
         
         # Error handling
@@ -197,6 +222,11 @@ class HarnessComponent(EnhancedBaseComponent):
         )
         
         self.receive_streams[name] = connection
+        
+        # Streams added while running need a reader so they can wake the loop
+        if self._processing_active:
+            self._start_stream_reader(connection)
+        
         self.logger.info(f"📥 Added receive stream '{name}' to component '{self.name}'")
     
     def add_send_stream(self, name: str, stream: MemoryObjectSendStream,
@@ -224,6 +254,31 @@ class HarnessComponent(EnhancedBaseComponent):
         self.send_streams[name] = connection
         self.logger.info(f"📤 Added send stream '{name}' to component '{self.name}'")
     
+    def configure_send_batching(self, stream_name: str, max_batch_size: int = 64,
+                                linger_time: float = 0.005):
+        """
+        Coalesce messages sent on a stream into batches
+        
+        Once enabled, send_message() buffers the payload and the buffer is sent as
+        a single batch when it reaches max_batch_size or after linger_time seconds.
+        
+        Args:
+            stream_name: Name of the send stream
+            max_batch_size: Number of messages that triggers an immediate flush
+            linger_time: Maximum seconds a partial batch waits before flushing
+        """
+        if stream_name not in self.send_streams:
+            raise StreamOperationError(f"Send stream '{stream_name}' not found")
+        
+        if max_batch_size < 1:
+            raise StreamOperationError("max_batch_size must be at least 1")
+        
+        self.send_streams[stream_name].batch_policy = SendBatchPolicy(
+            max_batch_size=max_batch_size,
+            linger_time=linger_time
+        )
+        self.logger.info(f"📦 Send batching on '{stream_name}': size={max_batch_size}, linger={linger_time}s")
+    
     async def send_message(self, stream_name: str, message: Any, timeout: float = 5.0) -> bool:
         """
         Send message through specified stream
@@ -234,37 +289,120 @@ class HarnessComponent(EnhancedBaseComponent):
             timeout: Send timeout in seconds
             
         Returns:
-            bool: True if message was sent successfully
+            bool: True if message was sent successfully (or buffered for a batch)
+        """
+        if stream_name not in self.send_streams:
+            raise StreamOperationError(f"Send stream '{stream_name}' not found")
+        
+        connection = self.send_streams[stream_name]
+        
+        if connection.batch_policy is None:
+            return await self._send_envelope(connection, [message], timeout)
+        
+        connection.send_buffer.append(message)
+        if len(connection.send_buffer) >= connection.batch_policy.max_batch_size:
+            return await self._flush_send_buffer(connection, timeout)
+        
+        if connection.linger_task is None:
+            connection.linger_task = asyncio.create_task(
+                self._linger_flush(connection, timeout),
+                name=f"linger_{self.name}_{stream_name}"
+            )
+        return True
+    
+    async def send_many(self, stream_name: str, messages: List[Any], timeout: float = 5.0) -> bool:
+        """
+        Send several messages as one batch
+        
+        The batch costs a single stream operation; receivers unpack it
+        transparently so receive_message() still yields one message at a time.
+        
+        Args:
+            stream_name: Name of the send stream
+            messages: Messages to send, in order
+            timeout: Send timeout in seconds
+            
+        Returns:
+            bool: True if the batch was sent successfully
         """
         if stream_name not in self.send_streams:
             raise StreamOperationError(f"Send stream '{stream_name}' not found")
         
+        if not messages:
+            return True
+        
         connection = self.send_streams[stream_name]
         
+        # Anything already coalescing goes first to keep ordering
+        if connection.send_buffer:
+            messages = connection.send_buffer + list(messages)
+            connection.send_buffer = []
+            self._cancel_linger_task(connection)
+        
+        return await self._send_envelope(connection, list(messages), timeout)
+    
+    async def flush_send_buffers(self, timeout: float = 5.0) -> bool:
+        """Send any partially filled batches immediately"""
+        results = [
+            await self._flush_send_buffer(connection, timeout)
+            for connection in self.send_streams.values()
+            if connection.send_buffer
+        ]
+        return all(results)
+    
+    async def _flush_send_buffer(self, connection: StreamConnection, timeout: float) -> bool:
+        """Send the buffered messages of a connection as one batch"""
+        self._cancel_linger_task(connection)
+        
+        if not connection.send_buffer:
+            return True
+        
+        batch = connection.send_buffer
+        connection.send_buffer = []
+        return await self._send_envelope(connection, batch, timeout)
+    
+    async def _linger_flush(self, connection: StreamConnection, timeout: float):
+        """Flush a partial batch once it has waited for the linger time"""
+        await asyncio.sleep(connection.batch_policy.linger_time)
+        connection.linger_task = None
+        await self._flush_send_buffer(connection, timeout)
+    
+    def _cancel_linger_task(self, connection: StreamConnection):
+        """Cancel a pending linger flush unless it is the caller"""
+        task = connection.linger_task
+        connection.linger_task = None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+    
+    async def _send_envelope(self, connection: StreamConnection, messages: List[Any], timeout: float) -> bool:
+        """Wrap one or more messages in a single envelope and send it"""
         try:
             # Add message metadata
             enhanced_message = {
-                "id": str(uuid.uuid4()),
+                "id": next_message_id(),
                 "sender": self.name,
-                "timestamp": time.time(),
-                "stream": stream_name,
-                "data": message
+                "timestamp_ns": now_ns(),
+                "stream": connection.name
             }
+            if len(messages) == 1:
+                enhanced_message["data"] = messages[0]
+            else:
+                enhanced_message["batch"] = messages
             
             # Send with timeout
             with anyio.fail_after(timeout):
                 await connection.stream.send(enhanced_message)
             
             # Record activity
-            connection.record_activity()
-            self._status.metrics.record_message_sent()
+            connection.record_activity(len(messages))
+            self._status.metrics.record_message_sent(len(messages))
             
-            self.logger.debug(f"📤 Message sent via '{stream_name}' from '{self.name}'")
+            self.logger.debug(f"📤 {len(messages)} message(s) sent via '{connection.name}' from '{self.name}'")
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Failed to send message via '{stream_name}': {e}")
-            await self._status.record_error(e, {"operation": "send_message", "stream": stream_name})
+            self.logger.error(f"❌ Failed to send message via '{connection.name}': {e}")
+            await self._status.record_error(e, {"operation": "send_message", "stream": connection.name})
             return False
     
     async def receive_message(self, stream_name: str, timeout: Optional[float] = None) -> Optional[Any]:
@@ -283,9 +421,16 @@ class HarnessComponent(EnhancedBaseComponent):
         
         connection = self.receive_streams[stream_name]
         
+        # Messages left over from an unpacked batch come first
+        if connection.pending:
+            connection.record_activity()
+            return connection.pending.popleft()
+        
         try:
             # Receive with optional timeout
-            if timeout:
+            if self._uses_inbox(connection):
+                message = await self._receive_from_inbox(connection, timeout)
+            elif timeout:
                 with anyio.fail_after(timeout):
                     message = await connection.stream.receive()
             else:
@@ -294,24 +439,183 @@ class HarnessComponent(EnhancedBaseComponent):
             # Record activity
             connection.record_activity()
             
-            # Extract data from enhanced message
-            if isinstance(message, dict) and "data" in message:
-                data = message["data"]
-                self.logger.debug(f"📥 Message received via '{stream_name}' at '{self.name}' from '{message.get('sender', 'unknown')}'")
-            else:
-                data = message
-                self.logger.debug(f"📥 Raw message received via '{stream_name}' at '{self.name}'")
-            
-            return data
+            self.logger.debug(f"📥 Message received via '{stream_name}' at '{self.name}'")
+            return self._unpack_envelope(connection, message)
             
         except anyio.EndOfStream:
             self.logger.info(f"📥 Stream '{stream_name}' closed")
             return None
+        except TimeoutError:
+            # Nothing arrived within the timeout - not a stream failure
+            return None
         except Exception as e:
             self.logger.error(f"❌ Failed to receive message via '{stream_name}': {e}")
             await self._status.record_error(e, {"operation": "receive_message", "stream": stream_name})
             return None
     
+    async def receive_many(self, stream_name: str, max_items: int = 100,
+                           max_wait: Optional[float] = None) -> List[Any]:
+        """
+        Receive up to max_items messages in one call
+        
+        Waits up to max_wait seconds for the first message (None waits
+        indefinitely), then takes whatever else is already available without
+        waiting further.
+        
+        Args:
+            stream_name: Name of the receive stream
+            max_items: Maximum number of messages to return
+            max_wait: Seconds to wait for the first message
+            
+        Returns:
+            List of message data, empty if nothing arrived in time
+        """
+        if stream_name not in self.receive_streams:
+            raise StreamOperationError(f"Receive stream '{stream_name}' not found")
+        
+        connection = self.receive_streams[stream_name]
+        items: List[Any] = []
+        
+        if not connection.pending:
+            if max_wait is not None and max_wait <= 0:
+                self._drain_ready(connection, items, max_items)
+                return items
+            
+            first = await self.receive_message(stream_name, timeout=max_wait)
+            if first is None:
+                return items
+            items.append(first)
+        
+        self._drain_ready(connection, items, max_items)
+        return items
+    
+    def _drain_ready(self, connection: StreamConnection, items: List[Any], max_items: int):
+        """Append already-available messages to items without waiting"""
+        while len(items) < max_items:
+            if connection.pending:
+                items.append(connection.pending.popleft())
+                connection.record_activity()
+                continue
+            
+            if self._uses_inbox(connection) and not connection.inbox.empty():
+                message = connection.inbox.get_nowait()
+                connection.inbox.task_done()
+                if message is _END_OF_STREAM:
+                    break
+            else:
+                try:
+                    message = connection.stream.receive_nowait()
+                except (anyio.WouldBlock, anyio.EndOfStream, anyio.ClosedResourceError):
+                    break
+            
+            connection.record_activity()
+            items.append(self._unpack_envelope(connection, message))
+    
+    def _unpack_envelope(self, connection: StreamConnection, message: Any) -> Any:
+        """Return the data of an envelope, queueing the remainder of a batch"""
+        if isinstance(message, dict):
+            if "batch" in message and "sender" in message:
+                batch = message["batch"]
+                connection.pending.extend(batch[1:])
+                return batch[0]
+            if "data" in message:
+                return message["data"]
+        return message
+    
+    def _uses_inbox(self, connection: StreamConnection) -> bool:
+        """Whether receives go through the inbox; a drained inbox whose reader has stopped is dropped"""
+        if connection.inbox is None:
+            return False
+        if connection.reader_task is None and connection.inbox.empty():
+            # Nothing fills it any more: receive from the stream directly
+            connection.inbox = None
+            return False
+        return True
+    
+    async def _receive_from_inbox(self, connection: StreamConnection, timeout: Optional[float]) -> Any:
+        """Take the next message a stream reader has pulled off the connection"""
+        if connection.end_of_stream and connection.inbox.empty():
+            raise anyio.EndOfStream
+        
+        if timeout:
+            with anyio.fail_after(timeout):
+                message = await connection.inbox.get()
+        else:
+            message = await connection.inbox.get()
+        
+        # Lets the reader pull the next message off the stream
+        connection.inbox.task_done()
+        
+        if message is _END_OF_STREAM:
+            raise anyio.EndOfStream
+        return message
+    
+    def _start_stream_reader(self, connection: StreamConnection):
+        """Start a reader task that wakes the processing loop when input arrives"""
+        if connection.reader_task is not None:
+            return
+        
+        if connection.inbox is None:
+            connection.inbox = asyncio.Queue()
+        connection.reader_task = asyncio.create_task(
+            self._stream_reader(connection),
+            name=f"reader_{self.name}_{connection.name}"
+        )
+    
+    async def _stream_reader(self, connection: StreamConnection):
+        """
+        Move messages from a receive stream into its inbox, signalling each arrival
+        
+        Only one message is held at a time: the reader waits for it to be consumed
+        before receiving the next, so backpressure on the stream is preserved and
+        cancelling the reader never drops a message it has already taken.
+        """
+        while True:
+            try:
+                message = await connection.stream.receive()
+            except (anyio.EndOfStream, anyio.ClosedResourceError):
+                connection.end_of_stream = True
+                connection.inbox.put_nowait(_END_OF_STREAM)
+                self._wakeup_event.set()
+                return
+            
+            connection.inbox.put_nowait(message)
+            self._wakeup_event.set()
+            await connection.inbox.join()
+    
+    async def _stop_stream_readers(self):
+        """Cancel all stream reader tasks; messages already in an inbox are kept until received"""
+        for connection in self.receive_streams.values():
+            task = connection.reader_task
+            if task is None:
+                continue
+            connection.reader_task = None
+            if not task.done():
+                task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.logger.warning(f"⚠️ Stream reader for '{connection.name}' failed: {e}")
+            self._uses_inbox(connection)
+    
+    async def _wait_for_work(self):
+        """
+        Block until there is new input, a shutdown request or the idle timer fires
+        
+        Components without receive streams have no input to wait for, so they
+        wake on source_wakeup_interval (or shutdown) instead.
+        """
+        # Items left over from an unpacked batch, or unread in an inbox, are work that is already here
+        if any(connection.pending or (connection.inbox is not None and not connection.inbox.empty())
+               for connection in self.receive_streams.values()):
+            return
+        
+        interval = self.idle_wakeup_interval if self.receive_streams else self.source_wakeup_interval
+        with anyio.move_on_after(interval):
+            await self._wakeup_event.wait()
+    
     async def start_processing(self) -> None:
         """Start the component's main processing loop"""
         if self._processing_active:
@@ -339,28 +643,42 @@ class HarnessComponent(EnhancedBaseComponent):
     
     async def _main_processing_loop(self):
         """Main processing loop - calls process() method with error handling"""
+        for connection in self.receive_streams.values():
+            self._start_stream_reader(connection)
+        
+        try:
+            await self._run_processing_iterations()
+        finally:
+            await self._stop_stream_readers()
+        
+        self._processing_active = False
+        self.logger.info(f"🏁 Processing loop ended for component '{self.name}'")
+    
+    async def _run_processing_iterations(self):
+        """Call process() each time the component has work, with error handling"""
         while self._processing_active and not self._shutdown_event.is_set():
             try:
                 # Reset consecutive error count on successful processing
                 self.consecutive_errors = 0
                 
+                # Input arriving from here on triggers the next iteration
+                self._wakeup_event.clear()
+                
                 # Call the component's process method
                 processing_start = time.time()
                 await self.process()
                 processing_time = time.time() - processing_start
                 
                 # Record processing metrics
-                self.message_processing_times.append(processing_time)
-                if len(self.message_processing_times) > 1000:  # Keep last 1000 measurements
-                    self.message_processing_times = self.message_processing_times[-1000:]
+                self.message_processing_times.record(processing_time)
                 
                 self._status.metrics.record_message_processed(processing_time)
                 
                 # Update heartbeat
                 self.last_heartbeat = time.time()
                 
-                # Small delay to prevent tight loop
-                await asyncio.sleep(0.001)
+                # Sleep until there is input to handle instead of polling
+                await self._wait_for_work()
                 
             except asyncio.CancelledError:
                 self.logger.info(f"🛑 Processing cancelled for component '{self.name}'")
@@ -380,9 +698,6 @@ class HarnessComponent(EnhancedBaseComponent):
                 else:
                     self.logger.error(f"❌ Max consecutive errors ({self.max_consecutive_errors}) reached in '{self.name}', stopping processing")
                     break
-        
-        self._processing_active = False
-        self.logger.info(f"🏁 Processing loop ended for component '{self.name}'")
     
     @abstractmethod
     async def process(self) -> None:
@@ -403,8 +718,9 @@ class HarnessComponent(EnhancedBaseComponent):
         try:
             self.logger.info(f"🛑 Stopping processing for component '{self.name}'")
             
-            # Signal shutdown
+            # Signal shutdown and wake the loop if it is waiting for input
             self._shutdown_event.set()
+            self._wakeup_event.set()
             self._processing_active = False
             
             # Wait for processing task to complete
@@ -419,11 +735,12 @@ class HarnessComponent(EnhancedBaseComponent):
                     except asyncio.CancelledError:
                         pass
             
-            # Transition to stopping state
-            await self._status.transition_to(ComponentState.STOPPING, {
-                "stop_time": time.time(),
-                "processing_duration": time.time() - (self.start_time or time.time())
-            })
+            # Transition to stopping state (an errored component goes straight to cleanup)
+            if ComponentState.STOPPING in ComponentStatus.VALID_TRANSITIONS.get(self.current_state, []):
+                await self._status.transition_to(ComponentState.STOPPING, {
+                    "stop_time": time.time(),
+                    "processing_duration": time.time() - (self.start_time or time.time())
+                })
             
             self.logger.info(f"✅ Processing stopped for component '{self.name}'")
             
@@ -440,6 +757,9 @@ class HarnessComponent(EnhancedBaseComponent):
             if self._processing_active:
                 await self.stop_processing()
             
+            # Deliver partially filled batches before the streams close
+            await self.flush_send_buffers()
+            
             # Close all send streams
             for name, connection in self.send_streams.items():
                 try:
@@ -559,9 +879,14 @@ class HarnessComponent(EnhancedBaseComponent):
             }
         }
     
+    def get_metrics_snapshot(self) -> MetricsSnapshot:
+        """Get a constant-cost summary of processing times for health monitoring"""
+        return self.message_processing_times.snapshot()
+    
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get detailed performance metrics"""
-        processing_times = self.message_processing_times[-100:]  # Last 100 measurements
+        processing_times = self.message_processing_times.recent(100)  # Last 100 measurements
+        processing_snapshot = self.message_processing_times.snapshot()
         
         return {
             "component": self.name,
@@ -573,7 +898,10 @@ class HarnessComponent(EnhancedBaseComponent):
                 "average_processing_time": self._status.metrics.average_processing_time,
                 "recent_processing_times": processing_times,
                 "min_processing_time": min(processing_times) if processing_times else 0,
-                "max_processing_time": max(processing_times) if processing_times else 0
+                "max_processing_time": max(processing_times) if processing_times else 0,
+                "p50_processing_time": processing_snapshot.p50,
+                "p95_processing_time": processing_snapshot.p95,
+                "p99_processing_time": processing_snapshot.p99
             },
             "error_metrics": {
                 "error_count": self._status.error_count,
@@ -595,6 +923,7 @@ class HarnessComponent(EnhancedBaseComponent):
 __all__ = [
     'HarnessComponent',
     'StreamConnection', 
+    'SendBatchPolicy',
     'HarnessContext',
     'StreamOperationError'
 ]
\ No newline at end of file
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Harness Metrics - Constant-time rolling metrics for harness components
+=====================================================================
+
+Shared metric primitives for the harness layer. Recording a sample never
+copies or sorts a window, so it stays cheap on the processing hot path:
+
+- RingBuffer: fixed-size window of recent samples with a running sum
+- LogHistogram: HDR-style log-bucketed histogram for p50/p95/p99
+- MonotonicCounter: ever-increasing count with a rate since creation
+- RollingMetric: RingBuffer + LogHistogram behind one record() call
+- MetricsSnapshot: immutable summary used by health monitoring
+"""
+
+import time
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, asdict
+
+
+class RingBuffer:
+    """Fixed-size circular buffer of the most recent float samples"""
+
+    __slots__ = ("capacity", "_values", "_index", "_count", "_sum")
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._values = [0.0] * capacity
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def append(self, value: float):
+        """Record a sample, overwriting the oldest once full"""
+        index = self._index
+        if self._count == self.capacity:
+            self._sum -= self._values[index]
+        else:
+            self._count += 1
+        self._values[index] = value
+        self._sum += value
+        index += 1
+        self._index = 0 if index == self.capacity else index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __iter__(self):
+        return iter(self.recent(self._count))
+
+    def recent(self, n: Optional[int] = None) -> List[float]:
+        """Get up to n most recent samples, oldest first"""
+        n = self._count if n is None else min(n, self._count)
+        if n <= 0:
+            return []
+        start = (self._index - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._values[start:start + n]
+        return self._values[start:] + self._values[:self._index]
+
+    @property
+    def mean(self) -> float:
+        """Mean of the samples in the window"""
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def last(self) -> Optional[float]:
+        """Most recent sample"""
+        return self._values[self._index - 1] if self._count else None
+
+    def clear(self):
+        """Drop all samples"""
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+
+
+class LogHistogram:
+    """
+    HDR-style histogram with log-linear buckets
+
+    Values are scaled to integers (nanoseconds by default) and bucketed by
+    power of two, each power split into 2**(precision_bits - 1) linear
+    sub-buckets. With the default 5 bits the relative error is under ~3%,
+    record() is O(1) and percentiles walk a few hundred buckets at most.
+    """
+
+    __slots__ = ("unit", "precision_bits", "_scale", "_sub_count", "_half", "_counts",
+                 "_max_index", "count", "total", "min", "max")
+
+    def __init__(self, unit: float = 1e-9, precision_bits: int = 5, max_value: float = 3600.0):
+        self.unit = unit
+        self.precision_bits = precision_bits
+        self._scale = 1.0 / unit
+        self._sub_count = 1 << precision_bits
+        self._half = self._sub_count >> 1
+        self._max_index = self._index_for(int(max_value / unit))
+        self._counts = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def _index_for(self, scaled: int) -> int:
+        if scaled < self._sub_count:
+            return scaled
+        shift = scaled.bit_length() - self.precision_bits
+        return shift * self._half + (scaled >> shift)
+
+    def _value_for(self, index: int) -> float:
+        """Midpoint of a bucket, converted back to the recorded unit"""
+        if index < self._sub_count:
+            return index * self.unit
+        shift = index // self._half - 1
+        lower = (index - shift * self._half) << shift
+        return (lower + ((1 << shift) - 1) / 2) * self.unit
+
+    def record(self, value: float):
+        """Record a non-negative sample"""
+        index = int(value * self._scale)
+        if index >= self._sub_count:
+            shift = index.bit_length() - self.precision_bits
+            index = shift * self._half + (index >> shift)
+            if index > self._max_index:
+                index = self._max_index
+        elif index < 0:
+            index = 0
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    def percentile(self, percent: float) -> float:
+        """Approximate value at the given percentile (0-100)"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= target:
+                    return min(max(self._value_for(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percents: List[float]) -> Dict[float, float]:
+        """Approximate values for several percentiles in one pass"""
+        results = {}
+        if self.count == 0:
+            return {p: 0.0 for p in percents}
+        targets = sorted((max(1, int(self.count * p / 100.0 + 0.5)), p) for p in percents)
+        seen = 0
+        position = 0
+        for index, bucket_count in enumerate(self._counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while position < len(targets) and seen >= targets[position][0]:
+                results[targets[position][1]] = min(max(self._value_for(index), self.min), self.max)
+                position += 1
+            if position == len(targets):
+                break
+        for _, p in targets[position:]:
+            results[p] = self.max
+        return results
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        """Clear all recorded samples"""
+        self._counts = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+
+class MonotonicCounter:
+    """Ever-increasing counter with a rate since creation"""
+
+    __slots__ = ("value", "created_at")
+
+    def __init__(self):
+        self.value = 0
+        self.created_at = time.monotonic()
+
+    def increment(self, amount: int = 1):
+        self.value += amount
+
+    @property
+    def rate_per_second(self) -> float:
+        elapsed = time.monotonic() - self.created_at
+        return self.value / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Point-in-time summary of a RollingMetric"""
+    count: int
+    mean: float
+    recent_mean: float
+    min: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RollingMetric:
+    """
+    Recent-window ring buffer plus all-time histogram behind one record()
+
+    Durations are recorded in seconds with nanosecond buckets by default;
+    pass unit=1.0 for integer quantities such as message sizes.
+    """
+
+    __slots__ = ("window", "histogram", "_append", "_record")
+
+    def __init__(self, window_size: int = 1000, unit: float = 1e-9, max_value: float = 3600.0):
+        self.window = RingBuffer(window_size)
+        self.histogram = LogHistogram(unit=unit, max_value=max_value)
+        # Bound methods cached to keep record() to two direct calls
+        self._append = self.window.append
+        self._record = self.histogram.record
+
+    def record(self, value: float):
+        """Record one sample in O(1)"""
+        self._append(value)
+        self._record(value)
+
+    def __len__(self) -> int:
+        return self.histogram.count
+
+    def __bool__(self) -> bool:
+        return self.histogram.count > 0
+
+    def recent(self, n: Optional[int] = None) -> List[float]:
+        return self.window.recent(n)
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Summarize without copying or sorting the sample window"""
+        histogram = self.histogram
+        quantiles = histogram.percentiles([50.0, 95.0, 99.0])
+        return MetricsSnapshot(
+            count=histogram.count,
+            mean=histogram.mean,
+            recent_mean=self.window.mean,
+            min=histogram.min if histogram.count else 0.0,
+            max=histogram.max,
+            p50=quantiles[50.0],
+            p95=quantiles[95.0],
+            p99=quantiles[99.0]
+        )
+
+
+# Export main classes
+__all__ = [
+    'RingBuffer',
+    'LogHistogram',
+    'MonotonicCounter',
+    'RollingMetric',
+    'MetricsSnapshot'
+]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Message IDs - Cheap unique identifiers and timestamps for the message hot path
+=============================================================================
+
+uuid4() reads from os.urandom and builds a UUID object for every message,
+which dominates per-message overhead at high rates. MessageIdGenerator
+instead draws randomness once per process and appends a counter:
+
+    <process prefix><counter>   e.g. "1f3a9c0e5b7d2a41-000000000000002a"
+
+- The prefix mixes the pid with 64 random bits, so ids stay unique across
+  the worker processes of a multi-process harness (spawned or forked)
+- The counter is an itertools.count, whose next() is atomic under the GIL
+- Timestamps are integer nanoseconds (time.time_ns) and only turned into
+  strings by format_timestamp_ns when rendered
+"""
+
+import itertools
+import os
+import time
+from datetime import datetime, timezone
+
+
+class MessageIdGenerator:
+    """Per-process unique id generator: random process prefix plus counter"""
+
+    __slots__ = ("prefix", "_counter", "_pid")
+
+    def __init__(self):
+        self._reseed()
+
+    def _reseed(self):
+        """Draw a fresh prefix and restart the counter (new process)"""
+        self._pid = os.getpid()
+        random_bits = int.from_bytes(os.urandom(8), "big")
+        self.prefix = f"{(random_bits ^ (self._pid << 40)) & 0xFFFFFFFFFFFFFFFF:016x}-"
+        self._counter = itertools.count()
+
+    def next_id(self) -> str:
+        """Get the next id, unique across processes"""
+        return f"{self.prefix}{next(self._counter):012x}"
+
+    def __call__(self) -> str:
+        return self.next_id()
+
+
+_default_generator = MessageIdGenerator()
+
+# A forked child inherits the parent's prefix and counter position
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_default_generator._reseed)
+
+
+def next_message_id() -> str:
+    """Get a new process-unique message id from the default generator"""
+    return f"{_default_generator.prefix}{next(_default_generator._counter):012x}"
+
+
+# Integer nanoseconds since the epoch
+now_ns = time.time_ns
+
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """Render an integer nanosecond timestamp as an ISO 8601 UTC string"""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    moment = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return f"{moment.strftime('%Y-%m-%dT%H:%M:%S')}.{nanos:09d}Z"
+
+
+# Export main classes
+__all__ = [
+    'MessageIdGenerator',
+    'next_message_id',
+    'now_ns',
+    'format_timestamp_ns'
+]
@@ -18,6 +18,8 @@ import time
 import logging
 from typing import Dict, Any, Optional
 import uuid
+import multiprocessing
+import subprocess
 
 import sys
 import os
@@ -30,6 +32,10 @@ from evidence.phase6_harness.day1_harness_component.harness_component import (
 from evidence.phase6_harness.day1_harness_component.component_status import (
     ComponentStatus, ComponentState, InvalidStateTransitionError
 )
+from evidence.phase6_harness.day1_harness_component.harness_metrics import RingBuffer, LogHistogram
+from evidence.phase6_harness.day1_harness_component.message_ids import (
+    MessageIdGenerator, next_message_id, format_timestamp_ns
+)
 
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO)
@@ -577,6 +583,335 @@ class TestConcurrentExecution:
         await bad_comp.cleanup()
 
 
+class CountingSink(HarnessComponent):
+    """Sink that counts process() calls and receives without polling delays"""
+    
+    def __init__(self, name: str):
+        config = ComponentConfiguration(
+            name=name,
+            component_type="data_sink",
+            service_type="data_sink",
+            base_type="sink"
+        )
+        super().__init__(config)
+        self.process_calls = 0
+        self.received_messages = []
+    
+    async def process(self):
+        """Drain whatever input is ready"""
+        self.process_calls += 1
+        for stream_name in self.receive_streams.keys():
+            message = await self.receive_message(stream_name, timeout=0.05)
+            if message is not None:
+                self.received_messages.append((message, time.time()))
+
+
+class TestEventDrivenProcessing:
+    """Test that the processing loop waits for input instead of polling"""
+    
+    async def test_idle_component_does_not_poll(self):
+        """An idle component with inputs should not call process() repeatedly"""
+        sink = CountingSink("idle_sink")
+        sink.idle_wakeup_interval = None
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.3)
+        
+        # Only the initial iteration runs while no input arrives
+        assert sink.process_calls == 1
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+    
+    async def test_input_wakes_processing_loop(self):
+        """Arriving input should trigger processing promptly"""
+        sink = CountingSink("wake_sink")
+        sink.idle_wakeup_interval = None
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.1)
+        
+        sent_at = time.time()
+        for i in range(3):
+            await send_stream.send({"data": f"msg_{i}"})
+        await asyncio.sleep(0.1)
+        
+        assert [m for m, _ in sink.received_messages] == ["msg_0", "msg_1", "msg_2"]
+        assert sink.received_messages[0][1] - sent_at < 0.05
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+    
+    async def test_idle_timer_wakes_processing_loop(self):
+        """The idle timer should still wake a component with no input"""
+        sink = CountingSink("timer_sink")
+        sink.idle_wakeup_interval = 0.05
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.5)
+        
+        assert sink.process_calls >= 3
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+    
+    async def test_stop_wakes_idle_component(self):
+        """Stopping an idle component should not wait for the idle timer"""
+        sink = CountingSink("stop_sink")
+        sink.idle_wakeup_interval = None
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.1)
+        
+        stop_start = time.time()
+        await sink.stop_processing()
+        assert time.time() - stop_start < 1.0
+        assert not sink._processing_active
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+
+    async def test_streamless_component_is_paced(self):
+        """A component without inputs should be paced by its wakeup interval, not spin"""
+        source = CountingSink("paced_source")
+        source.source_wakeup_interval = 0.01
+        await source.setup()
+        
+        await source.start_processing()
+        await asyncio.sleep(0.3)
+        
+        assert 5 <= source.process_calls <= 40
+        
+        stop_start = time.time()
+        await source.stop_processing()
+        assert time.time() - stop_start < 0.5
+        
+        await source.cleanup()
+
+
+class TestBatchedMessaging:
+    """Test batched send/receive between components"""
+    
+    async def test_send_many_and_receive_message(self):
+        """A batch sent with send_many is delivered message by message"""
+        producer = TestHarnessComponent("batch_producer")
+        consumer = TestHarnessComponent("batch_consumer")
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        producer.add_send_stream("output", send_stream)
+        consumer.add_receive_stream("input", receive_stream)
+        
+        assert await producer.send_many("output", [f"msg_{i}" for i in range(5)])
+        
+        # A single envelope crossed the stream
+        assert receive_stream.statistics().current_buffer_used == 1
+        received = [await consumer.receive_message("input", timeout=0.5) for _ in range(5)]
+        assert received == [f"msg_{i}" for i in range(5)]
+        assert producer._status.metrics.total_messages_sent == 5
+        
+        await send_stream.aclose()
+        await receive_stream.aclose()
+    
+    async def test_batch_remainder_drains_without_timer(self):
+        """Items after the first in an envelope are processed without waiting for new input"""
+        producer = TestHarnessComponent("remainder_producer")
+        sink = CountingSink("remainder_sink")
+        sink.idle_wakeup_interval = None
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        producer.add_send_stream("output", send_stream)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.05)
+        
+        assert await producer.send_many("output", [1, 2, 3, 4, 5])
+        await asyncio.sleep(0.2)
+        
+        assert [m for m, _ in sink.received_messages] == [1, 2, 3, 4, 5]
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+    
+    async def test_receive_after_processing_stops(self):
+        """Receives after the processing loop ends read the live stream, not a dead inbox"""
+        sink = CountingSink("stopped_sink")
+        sink.idle_wakeup_interval = None
+        await sink.setup()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        sink.add_receive_stream("input", receive_stream)
+        
+        await sink.start_processing()
+        await asyncio.sleep(0.05)
+        await sink.stop_processing()
+        assert sink.receive_streams["input"].inbox is None
+        
+        await send_stream.send("late")
+        assert await sink.receive_message("input", timeout=0.5) == "late"
+        
+        await sink.cleanup()
+        await send_stream.aclose()
+    
+    async def test_receive_many(self):
+        """receive_many drains everything that is already available"""
+        producer = TestHarnessComponent("drain_producer")
+        consumer = TestHarnessComponent("drain_consumer")
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        producer.add_send_stream("output", send_stream)
+        consumer.add_receive_stream("input", receive_stream)
+        
+        await producer.send_many("output", ["a", "b", "c"])
+        await producer.send_message("output", "d")
+        
+        assert await consumer.receive_many("input", max_items=10, max_wait=0.5) == ["a", "b", "c", "d"]
+        assert await consumer.receive_many("input", max_items=10, max_wait=0.05) == []
+        
+        await send_stream.aclose()
+        await receive_stream.aclose()
+    
+    async def test_send_batching_flushes(self):
+        """Buffered sends flush on batch size, linger timeout and explicit flush"""
+        producer = TestHarnessComponent("linger_producer")
+        consumer = TestHarnessComponent("linger_consumer")
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(10)
+        producer.add_send_stream("output", send_stream)
+        consumer.add_receive_stream("input", receive_stream)
+        producer.configure_send_batching("output", max_batch_size=3, linger_time=0.02)
+        
+        for i in range(4):
+            assert await producer.send_message("output", i)
+        assert receive_stream.statistics().current_buffer_used == 1
+        
+        await asyncio.sleep(0.1)
+        assert receive_stream.statistics().current_buffer_used == 2
+        
+        await producer.send_message("output", 4)
+        await producer.flush_send_buffers()
+        
+        assert await consumer.receive_many("input", max_items=10, max_wait=0.5) == [0, 1, 2, 3, 4]
+        await receive_stream.aclose()
+
+
+class TestHarnessMetrics:
+    """Test constant-time rolling metric primitives"""
+    
+    def test_ring_buffer_window(self):
+        """RingBuffer keeps the most recent samples and a running mean"""
+        ring = RingBuffer(capacity=4)
+        for value in range(1, 7):
+            ring.append(float(value))
+        
+        assert len(ring) == 4
+        assert ring.recent() == [3.0, 4.0, 5.0, 6.0]
+        assert ring.recent(2) == [5.0, 6.0]
+        assert ring.mean == 4.5
+        assert ring.last == 6.0
+    
+    def test_histogram_percentiles(self):
+        """LogHistogram percentiles stay within bucket precision"""
+        histogram = LogHistogram()
+        samples = [i / 10000 for i in range(1, 10001)]  # 0.1ms .. 1s
+        for value in samples:
+            histogram.record(value)
+        
+        quantiles = histogram.percentiles([50.0, 95.0, 99.0])
+        for percent, expected in [(50.0, 0.5), (95.0, 0.95), (99.0, 0.99)]:
+            assert abs(quantiles[percent] - expected) / expected < 0.05
+            assert histogram.percentile(percent) == quantiles[percent]
+        assert histogram.count == 10000
+        assert histogram.min == samples[0]
+        assert histogram.max == samples[-1]
+    
+    async def test_component_metrics_snapshot(self):
+        """Processing times are exposed through a snapshot"""
+        component = TestHarnessComponent("metrics_component")
+        await component.setup()
+        
+        await component.start_processing()
+        await asyncio.sleep(0.1)
+        await component.stop_processing()
+        
+        snapshot = component.get_metrics_snapshot()
+        assert snapshot.count >= 1
+        assert 0 < snapshot.p50 <= snapshot.p99 <= snapshot.max
+        
+        metrics = component.get_performance_metrics()
+        assert metrics["processing_metrics"]["p99_processing_time"] == snapshot.p99
+        
+        await component.cleanup()
+
+
+def _ids_from_child(connection):
+    """Send a few message ids generated in a child process back to the parent"""
+    connection.send([next_message_id() for _ in range(100)])
+    connection.close()
+
+
+class TestMessageIds:
+    """Test cheap message ids and nanosecond timestamps"""
+    
+    def test_ids_unique_across_processes(self):
+        """Ids never repeat within a process, a forked child or a fresh interpreter"""
+        local_ids = [next_message_id() for _ in range(10000)]
+        assert len(set(local_ids)) == len(local_ids)
+        
+        # A forked child starts from the parent's counter position, so it must reseed
+        context = multiprocessing.get_context("fork")
+        parent_end, child_end = context.Pipe()
+        child = context.Process(target=_ids_from_child, args=(child_end,))
+        child.start()
+        forked_ids = parent_end.recv()
+        child.join(timeout=10)
+        
+        spawned_ids = subprocess.run(
+            [sys.executable, "-c",
+             "import sys; sys.path.append(sys.argv[1]);"
+             "from evidence.phase6_harness.day1_harness_component.message_ids import next_message_id;"
+             "print(' '.join(next_message_id() for _ in range(100)))",
+             os.path.join(os.path.dirname(__file__), '../../..')],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        
+        all_ids = local_ids + forked_ids + spawned_ids + [MessageIdGenerator().next_id() for _ in range(100)]
+        assert len(spawned_ids) == 100
+        assert len(set(all_ids)) == len(all_ids)
+    
+    async def test_envelopes_use_generated_ids(self):
+        """Harness envelopes carry generated ids and integer nanosecond timestamps"""
+        component = TestHarnessComponent("id_component")
+        send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=2)
+        component.add_send_stream("output", send_stream)
+        
+        before = time.time_ns()
+        assert await component.send_message("output", {"value": 1})
+        envelope = receive_stream.receive_nowait()
+        
+        assert envelope["id"].startswith(next_message_id().split("-")[0])
+        assert isinstance(envelope["timestamp_ns"], int)
+        assert before <= envelope["timestamp_ns"] <= time.time_ns()
+        assert format_timestamp_ns(1_700_000_000_123_456_789) == "2023-11-14T22:13:20.123456789Z"
+
+
 # Test runner function
 async def run_all_tests():
     """Run all tests and collect results"""
@@ -614,6 +949,29 @@ async def run_all_tests():
         (TestConcurrentExecution, [
             "test_concurrent_component_execution",
             "test_component_failure_isolation"
+        ]),
+        (TestEventDrivenProcessing, [
+            "test_idle_component_does_not_poll",
+            "test_input_wakes_processing_loop",
+            "test_idle_timer_wakes_processing_loop",
+            "test_stop_wakes_idle_component",
+            "test_streamless_component_is_paced"
+        ]),
+        (TestBatchedMessaging, [
+            "test_send_many_and_receive_message",
+            "test_batch_remainder_drains_without_timer",
+            "test_receive_after_processing_stops",
+            "test_receive_many",
+            "test_send_batching_flushes"
+        ]),
+        (TestHarnessMetrics, [
+            "test_ring_buffer_window",
+            "test_histogram_percentiles",
+            "test_component_metrics_snapshot"
+        ]),
+        (TestMessageIds, [
+            "test_ids_unique_across_processes",
+            "test_envelopes_use_generated_ids"
         ])
     ]
     
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+ProcessExecution: Multi-process execution support for SystemExecutionHarness
+===========================================================================
+
+Places harness components into worker processes so CPU-bound components run
+in parallel instead of sharing one event loop and one GIL.
+
+Key Features:
+- Placement policies (round-robin over N workers, one worker per component,
+  explicit process groups)
+- Shared-memory ring buffers (multiprocessing.shared_memory) for connections
+  that cross process boundaries, carrying binary_codec frames; in-worker
+  connections stay AnyIO streams
+- Control channel per worker so the harness keeps driving setup, ordered
+  startup, health checks and graceful shutdown
+- Worker failure isolation: a crashed worker only fails its own components
+"""
+
+import asyncio
+import anyio
+import multiprocessing
+import os
+import struct
+import time
+import logging
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from enum import Enum
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+
+from evidence.phase6_harness.day1_harness_component.harness_component import (
+    HarnessComponent, HarnessContext
+)
+from evidence.phase6_harness.day1_harness_component.harness_metrics import MetricsSnapshot
+from evidence.phase6_harness.day3_stream_communication.binary_codec import (
+    BinaryEncoder, encode_frame, decode_frame, get_codec
+)
+
+
+RING_FRAME_TYPE = 0  # Message type code of ring records in the binary frame header
+_ring_encoder = BinaryEncoder()
+_ring_codec = get_codec("none")  # Ring records are copied between processes, not sent over a network
+
+
+def encode_ring_record(item: Any) -> bytes:
+    """Encode a message as a binary frame for a shared-memory ring"""
+    frame, _ = encode_frame(RING_FRAME_TYPE, _ring_encoder.encode(item), _ring_codec)
+    return frame
+
+
+def decode_ring_record(payload: bytes) -> Any:
+    """Decode a message read from a shared-memory ring"""
+    _, _, body = decode_frame(payload)
+    return _ring_encoder.decode(body)
+
+
+class ExecutionMode(Enum):
+    """Where SystemExecutionHarness runs its components"""
+    IN_PROCESS = "in_process"
+    MULTI_PROCESS = "multi_process"
+
+
+class PlacementPolicy(Enum):
+    """How components without an explicit process group are placed"""
+    ROUND_ROBIN = "round_robin"      # Spread over a fixed number of workers
+    PER_COMPONENT = "per_component"  # One worker per component
+
+
+class WorkerError(Exception):
+    """Raised when a worker process fails or reports an error"""
+    pass
+
+
+# Ring buffer header: write_pos, read_pos, write_count, read_count (u64),
+# then sender/receiver close flags at bytes 32 and 33
+_HEADER_SIZE = 64
+_LENGTH = struct.Struct("<I")
+_WRAP_MARKER = 0xFFFFFFFF
+
+
+class SharedMemoryRingBuffer:
+    """
+    Single-producer/single-consumer byte ring in a shared memory segment
+
+    Records are length-prefixed and never split: a record that does not fit
+    before the end of the ring is preceded by a wrap marker and written at
+    the start. Each side only ever writes its own counters, so no lock is
+    needed. max_messages caps records in flight, mirroring the buffer_size
+    of an AnyIO memory stream.
+
+    A record may use at most half the ring: a bigger one could need the
+    tail padding and the whole record at once, which never fits even when
+    the ring is empty.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 1 << 20,
+                 max_messages: int = 100, create: bool = True):
+        self.capacity = capacity
+        self.max_messages = max_messages
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity)
+            self.shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._buf = self.shm.buf
+
+    def _get(self, index: int) -> int:
+        return struct.unpack_from("<Q", self._buf, index * 8)[0]
+
+    def _set(self, index: int, value: int):
+        struct.pack_into("<Q", self._buf, index * 8, value)
+
+    def try_write(self, payload: bytes) -> bool:
+        """Append one record, returning False if the ring is full"""
+        record_size = _LENGTH.size + len(payload)
+        if record_size > self.capacity // 2:
+            raise ValueError(f"Message of {len(payload)} bytes exceeds half the ring capacity {self.capacity}")
+
+        write_pos, read_pos, write_count, read_count = (self._get(i) for i in range(4))
+        if write_count - read_count >= self.max_messages:
+            return False
+
+        offset = write_pos % self.capacity
+        tail_room = self.capacity - offset
+        padding = tail_room if tail_room < record_size else 0
+        if write_pos - read_pos + padding + record_size > self.capacity:
+            return False
+
+        if padding:
+            if tail_room >= _LENGTH.size:
+                _LENGTH.pack_into(self._buf, _HEADER_SIZE + offset, _WRAP_MARKER)
+            write_pos += padding
+            offset = 0
+
+        start = _HEADER_SIZE + offset
+        _LENGTH.pack_into(self._buf, start, len(payload))
+        self._buf[start + _LENGTH.size:start + record_size] = payload
+
+        # Publish data before the counters the reader polls
+        self._set(0, write_pos + record_size)
+        self._set(2, write_count + 1)
+        return True
+
+    def try_read(self) -> Optional[bytes]:
+        """Remove the oldest record, returning None if the ring is empty"""
+        read_count = self._get(3)
+        if self._get(2) == read_count:
+            return None
+
+        read_pos = self._get(1)
+        offset = read_pos % self.capacity
+        tail_room = self.capacity - offset
+        if tail_room < _LENGTH.size:
+            read_pos += tail_room
+            offset = 0
+        else:
+            length = _LENGTH.unpack_from(self._buf, _HEADER_SIZE + offset)[0]
+            if length == _WRAP_MARKER:
+                read_pos += tail_room
+                offset = 0
+
+        start = _HEADER_SIZE + offset
+        length = _LENGTH.unpack_from(self._buf, start)[0]
+        payload = bytes(self._buf[start + _LENGTH.size:start + _LENGTH.size + length])
+
+        self._set(1, read_pos + _LENGTH.size + length)
+        self._set(3, read_count + 1)
+        return payload
+
+    def __len__(self) -> int:
+        return self._get(2) - self._get(3)
+
+    @property
+    def sender_closed(self) -> bool:
+        return self._buf[32] == 1
+
+    @property
+    def receiver_closed(self) -> bool:
+        return self._buf[33] == 1
+
+    def mark_sender_closed(self):
+        self._buf[32] = 1
+
+    def mark_receiver_closed(self):
+        self._buf[33] = 1
+
+    def close(self):
+        """Detach from the segment"""
+        self._buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the segment (creator only)"""
+        self.shm.unlink()
+
+
+@dataclass
+class SharedMemoryChannelSpec:
+    """Picklable description of a cross-process connection"""
+    shm_name: str
+    capacity: int
+    max_messages: int
+
+
+class _SharedMemoryStreamBase:
+    """Polling helpers shared by both stream halves"""
+
+    min_poll_interval = 0.0001
+    max_poll_interval = 0.005  # Bounds idle wakeups per stream to ~200/s
+
+    def __init__(self, spec: SharedMemoryChannelSpec):
+        self.spec = spec
+        self.ring = SharedMemoryRingBuffer(spec.shm_name, spec.capacity, spec.max_messages, create=False)
+        self._closed = False
+
+    async def _backoff(self, delay: float) -> float:
+        await asyncio.sleep(delay)
+        return min(max(delay * 2, self.min_poll_interval), self.max_poll_interval)
+
+
+class SharedMemorySendStream(_SharedMemoryStreamBase):
+    """Sending half of a shared-memory channel with the AnyIO send API"""
+
+    def send_nowait(self, item: Any):
+        if self._closed:
+            raise anyio.ClosedResourceError
+        if self.ring.receiver_closed:
+            raise anyio.BrokenResourceError
+        if not self.ring.try_write(encode_ring_record(item)):
+            raise anyio.WouldBlock
+
+    async def send(self, item: Any):
+        payload = encode_ring_record(item)
+        delay = 0.0
+        while True:
+            if self._closed:
+                raise anyio.ClosedResourceError
+            if self.ring.receiver_closed:
+                raise anyio.BrokenResourceError
+            if self.ring.try_write(payload):
+                return
+            delay = await self._backoff(delay)
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self.ring.mark_sender_closed()
+            self.ring.close()
+
+
+class SharedMemoryReceiveStream(_SharedMemoryStreamBase):
+    """Receiving half of a shared-memory channel with the AnyIO receive API"""
+
+    def receive_nowait(self) -> Any:
+        if self._closed:
+            raise anyio.ClosedResourceError
+        payload = self.ring.try_read()
+        if payload is None:
+            if self.ring.sender_closed:
+                raise anyio.EndOfStream
+            raise anyio.WouldBlock
+        return decode_ring_record(payload)
+
+    async def receive(self) -> Any:
+        delay = 0.0
+        while True:
+            try:
+                return self.receive_nowait()
+            except anyio.WouldBlock:
+                delay = await self._backoff(delay)
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self.ring.mark_receiver_closed()
+            self.ring.close()
+
+
+@dataclass
+class WorkerSpec:
+    """Everything a worker process needs to host its components"""
+    worker_id: str
+    harness_id: str
+    components: Dict[str, HarnessComponent] = field(default_factory=dict)
+    # (from_component, from_port, to_component, to_port, buffer_size)
+    local_connections: List[Tuple[str, str, str, str, int]] = field(default_factory=list)
+    # (component, port, peer_component, buffer_size, channel)
+    outgoing_channels: List[Tuple[str, str, str, int, SharedMemoryChannelSpec]] = field(default_factory=list)
+    incoming_channels: List[Tuple[str, str, str, int, SharedMemoryChannelSpec]] = field(default_factory=list)
+    log_level: str = "INFO"
+
+
+class _WorkerRuntime:
+    """Runs inside a worker process and executes control commands"""
+
+    def __init__(self, spec: WorkerSpec, control):
+        self.spec = spec
+        self.control = control
+        self.components = spec.components
+        self.logger = logging.getLogger(f"HarnessWorker.{spec.worker_id}")
+
+    def _wire_streams(self):
+        for from_component, from_port, to_component, to_port, buffer_size in self.spec.local_connections:
+            send_stream, receive_stream = anyio.create_memory_object_stream(buffer_size)
+            self.components[from_component].add_send_stream(from_port, send_stream, to_component, buffer_size)
+            self.components[to_component].add_receive_stream(to_port, receive_stream, from_component, buffer_size)
+
+        for component, port, peer, buffer_size, channel in self.spec.outgoing_channels:
+            self.components[component].add_send_stream(port, SharedMemorySendStream(channel), peer, buffer_size)
+
+        for component, port, peer, buffer_size, channel in self.spec.incoming_channels:
+            self.components[component].add_receive_stream(port, SharedMemoryReceiveStream(channel), peer, buffer_size)
+
+    async def serve(self):
+        self._wire_streams()
+        handlers = {
+            "setup": self._setup,
+            "start": self._start,
+            "stop": self._stop,
+            "health": self._health,
+            "cleanup": self._cleanup
+        }
+
+        while True:
+            try:
+                request_id, command, args = await anyio.to_thread.run_sync(self.control.recv)
+            except (EOFError, OSError):
+                # Harness went away: shut down what we host
+                await self._cleanup()
+                return
+
+            if command == "exit":
+                self.control.send((request_id, "ok", None))
+                return
+
+            try:
+                result = await handlers[command](*args)
+                self.control.send((request_id, "ok", result))
+            except Exception as e:
+                self.control.send((request_id, "error", f"{type(e).__name__}: {e}"))
+
+    async def _setup(self, start_time: float) -> Dict[str, Optional[str]]:
+        context = HarnessContext(
+            harness_id=self.spec.harness_id,
+            component_registry=dict(self.components),
+            global_config={"worker_id": self.spec.worker_id, "start_time": start_time}
+        )
+        results = {}
+        for name, component in self.components.items():
+            try:
+                await component.setup(context)
+                results[name] = None
+            except Exception as e:
+                results[name] = str(e)
+        return results
+
+    async def _start(self, name: str):
+        await self.components[name].start_processing()
+
+    async def _stop(self, name: str):
+        await self.components[name].stop_processing()
+
+    async def _health(self) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        return {
+            name: (await component.health_check(), component.get_metrics_snapshot().to_dict())
+            for name, component in self.components.items()
+        }
+
+    async def _cleanup(self):
+        for name, component in self.components.items():
+            try:
+                await component.cleanup()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Component '{name}' cleanup failed in worker: {e}")
+
+
+def _worker_main(spec: WorkerSpec, control):
+    """Entry point of a worker process"""
+    logging.basicConfig(level=getattr(logging, spec.log_level, logging.INFO))
+    asyncio.run(_WorkerRuntime(spec, control).serve())
+
+
+class WorkerHandle:
+    """Harness-side handle for one worker process"""
+
+    def __init__(self, spec: WorkerSpec, process, control):
+        self.spec = spec
+        self.worker_id = spec.worker_id
+        self.process = process
+        self.control = control
+        self._lock = asyncio.Lock()
+        self._next_request_id = 0
+
+    @property
+    def component_names(self) -> List[str]:
+        return list(self.spec.components.keys())
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    async def request(self, command: str, *args, timeout: float = 30.0) -> Any:
+        """
+        Send a control command and wait for its reply
+
+        Each request carries an id; a late reply to an earlier request that
+        timed out is discarded instead of being taken as this one's answer.
+        """
+        async with self._lock:
+            if not self.is_alive():
+                raise WorkerError(f"Worker '{self.worker_id}' is not running (exit code {self.process.exitcode})")
+            self._next_request_id += 1
+            request_id = self._next_request_id
+            self.control.send((request_id, command, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                ready = remaining > 0 and await anyio.to_thread.run_sync(self.control.poll, remaining)
+                if not ready:
+                    raise WorkerError(f"Worker '{self.worker_id}' did not answer '{command}' within {timeout}s")
+                reply_id, status, result = self.control.recv()
+                if reply_id == request_id:
+                    break
+        if status == "error":
+            raise WorkerError(f"Worker '{self.worker_id}' failed '{command}': {result}")
+        return result
+
+
+class ProcessExecutor:
+    """
+    Places components into worker processes and drives them for the harness
+
+    Args:
+        harness_id: ID of the owning harness
+        components: Component name -> (component, explicit process group or None)
+        connections: (from_component, from_port, to_component, to_port, buffer_size)
+        placement_policy: Placement for components without a process group
+        worker_processes: Worker count for ROUND_ROBIN (defaults to CPU count)
+        start_method: multiprocessing start method
+        shared_memory_bytes: Ring size of each cross-process connection
+        log_level: Logging level inside workers
+    """
+
+    def __init__(self,
+                 harness_id: str,
+                 components: Dict[str, Tuple[HarnessComponent, Optional[str]]],
+                 connections: List[Tuple[str, str, str, str, int]],
+                 placement_policy: PlacementPolicy = PlacementPolicy.ROUND_ROBIN,
+                 worker_processes: Optional[int] = None,
+                 start_method: str = "spawn",
+                 shared_memory_bytes: int = 1 << 20,
+                 log_level: str = "INFO"):
+        self.harness_id = harness_id
+        self.components = components
+        self.connections = connections
+        self.placement_policy = placement_policy
+        self.worker_processes = worker_processes or os.cpu_count() or 1
+        self.start_method = start_method
+        self.shared_memory_bytes = shared_memory_bytes
+        self.log_level = log_level
+
+        self.placement: Dict[str, str] = {}  # component -> worker_id
+        self.workers: Dict[str, WorkerHandle] = {}
+        self.rings: List[SharedMemoryRingBuffer] = []
+
+        self.logger = logging.getLogger(f"ProcessExecutor.{harness_id[:8]}")
+
+    def compute_placement(self, order: List[str]) -> Dict[str, str]:
+        """
+        Assign each component to a worker
+
+        Components sharing an explicit process group share a worker; the rest
+        follow the placement policy in startup order.
+        """
+        placement = {}
+        slot = 0
+        for name in order:
+            _, group = self.components[name]
+            if group is not None:
+                placement[name] = f"group-{group}"
+            elif self.placement_policy == PlacementPolicy.PER_COMPONENT:
+                placement[name] = f"component-{name}"
+            else:
+                placement[name] = f"worker-{slot % self.worker_processes}"
+                slot += 1
+        return placement
+
+    def _build_worker_specs(self) -> Dict[str, WorkerSpec]:
+        specs: Dict[str, WorkerSpec] = {}
+        for name, worker_id in self.placement.items():
+            spec = specs.setdefault(worker_id, WorkerSpec(
+                worker_id=worker_id, harness_id=self.harness_id, log_level=self.log_level
+            ))
+            spec.components[name] = self.components[name][0]
+
+        for from_component, from_port, to_component, to_port, buffer_size in self.connections:
+            source_worker = self.placement[from_component]
+            target_worker = self.placement[to_component]
+            if source_worker == target_worker:
+                specs[source_worker].local_connections.append(
+                    (from_component, from_port, to_component, to_port, buffer_size)
+                )
+                continue
+
+            ring = SharedMemoryRingBuffer(capacity=self.shared_memory_bytes, max_messages=buffer_size)
+            self.rings.append(ring)
+            channel = SharedMemoryChannelSpec(ring.name, ring.capacity, buffer_size)
+            specs[source_worker].outgoing_channels.append((from_component, from_port, to_component, buffer_size, channel))
+            specs[target_worker].incoming_channels.append((to_component, to_port, from_component, buffer_size, channel))
+
+        return specs
+
+    async def start_workers(self, order: List[str]):
+        """Place components, allocate shared-memory channels and spawn workers"""
+        self.placement = self.compute_placement(order)
+        specs = self._build_worker_specs()
+        context = multiprocessing.get_context(self.start_method)
+
+        for worker_id, spec in specs.items():
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker_main, args=(spec, child_end),
+                                      name=f"harness-{worker_id}", daemon=True)
+            process.start()
+            child_end.close()
+            self.workers[worker_id] = WorkerHandle(spec, process, parent_end)
+            self.logger.info(f"👷 Started worker '{worker_id}' (pid {process.pid}) hosting {list(spec.components)}")
+
+        self.logger.info(f"✅ {len(self.workers)} workers started, {len(self.rings)} shared-memory channels")
+
+    def worker_for(self, name: str) -> WorkerHandle:
+        return self.workers[self.placement[name]]
+
+    def is_alive(self, name: str) -> bool:
+        return self.worker_for(name).is_alive()
+
+    async def setup_all(self, start_time: float, timeout: float) -> Dict[str, Optional[str]]:
+        """Setup every component in its worker, returning name -> error (None on success)"""
+        results: Dict[str, Optional[str]] = {}
+        replies = await asyncio.gather(
+            *(worker.request("setup", start_time, timeout=timeout) for worker in self.workers.values()),
+            return_exceptions=True
+        )
+        for worker, reply in zip(self.workers.values(), replies):
+            if isinstance(reply, Exception):
+                results.update({name: str(reply) for name in worker.component_names})
+            else:
+                results.update(reply)
+        return results
+
+    async def start_component(self, name: str, timeout: float):
+        await self.worker_for(name).request("start", name, timeout=timeout)
+
+    async def stop_component(self, name: str, timeout: float):
+        await self.worker_for(name).request("stop", name, timeout=timeout)
+
+    async def health_check(self, timeout: float = 5.0) -> Dict[str, Tuple[Dict[str, Any], Optional[MetricsSnapshot]]]:
+        """Collect (health, metrics snapshot) for every component, one round trip per worker"""
+        results = {}
+        for worker in self.workers.values():
+            try:
+                reply = await worker.request("health", timeout=timeout)
+                for name, (health, snapshot) in reply.items():
+                    results[name] = (health, MetricsSnapshot(**snapshot))
+            except WorkerError as e:
+                for name in worker.component_names:
+                    results[name] = ({"component": name, "healthy": False, "error": str(e)}, None)
+        return results
+
+    async def shutdown(self, timeout: float):
+        """Clean up components, stop workers and release shared memory"""
+        for worker in self.workers.values():
+            if worker.is_alive():
+                try:
+                    await worker.request("cleanup", timeout=timeout)
+                    await worker.request("exit", timeout=timeout)
+                except WorkerError as e:
+                    self.logger.warning(f"⚠️ Worker '{worker.worker_id}' shutdown failed: {e}")
+
+        for worker in self.workers.values():
+            await anyio.to_thread.run_sync(worker.process.join, timeout)
+            if worker.process.is_alive():
+                self.logger.warning(f"⚠️ Terminating unresponsive worker '{worker.worker_id}'")
+                worker.process.terminate()
+                await anyio.to_thread.run_sync(worker.process.join, timeout)
+            worker.control.close()
+
+        for ring in self.rings:
+            ring.close()
+            ring.unlink()
+
+        self.workers.clear()
+        self.rings.clear()
+        self.logger.info("✅ Worker processes stopped and shared memory released")
+
+
+# Export main classes
+__all__ = [
+    'ExecutionMode',
+    'PlacementPolicy',
+    'WorkerError',
+    'SharedMemoryRingBuffer',
+    'SharedMemoryChannelSpec',
+    'SharedMemorySendStream',
+    'SharedMemoryReceiveStream',
+    'WorkerSpec',
+    'WorkerHandle',
+    'ProcessExecutor'
+]
@@ -14,6 +14,7 @@ Key Features:
 - Graceful shutdown with proper resource cleanup
 - Error handling and component failure recovery
 - Performance monitoring and health checks
+- Optional multi-process execution over shared-memory channels
 """
 
 import asyncio
@@ -34,7 +35,11 @@ from evidence.phase6_harness.day1_harness_component.harness_component import (
     HarnessComponent, HarnessContext, StreamOperationError
 )
 from evidence.phase6_harness.day1_harness_component.component_status import ComponentState
+from evidence.phase6_harness.day1_harness_component.harness_metrics import MetricsSnapshot
 from evidence.phase6_harness.day2_execution_harness.stream_manager import StreamManager, StreamManagerError
+from evidence.phase6_harness.day2_execution_harness.process_execution import (
+    ExecutionMode, PlacementPolicy, ProcessExecutor, WorkerError
+)
 
 
 class HarnessState(Enum):
@@ -57,6 +62,7 @@ class ComponentRegistration:
     start_priority: int = 0
     dependencies: List[str] = field(default_factory=list)
     required_for: List[str] = field(default_factory=list)
+    process_group: Optional[str] = None
 
 
 @dataclass
@@ -84,6 +90,11 @@ class HarnessConfiguration:
     enable_health_monitoring: bool = True
     enable_performance_monitoring: bool = True
     log_level: str = "INFO"
+    execution_mode: ExecutionMode = ExecutionMode.IN_PROCESS
+    placement_policy: PlacementPolicy = PlacementPolicy.ROUND_ROBIN
+    worker_processes: Optional[int] = None  # Defaults to CPU count
+    process_start_method: str = "spawn"
+    shared_memory_bytes: int = 1 << 20  # Ring size per cross-process connection
 
 
 class ComponentAlreadyRegisteredError(Exception):
@@ -141,6 +152,7 @@ class SystemExecutionHarness:
         self.stream_manager = StreamManager(default_buffer_size=self.config.stream_buffer_size)
         
         # Execution management
+        self.process_executor: Optional[ProcessExecutor] = None
         self.task_group: Optional[TaskGroup] = None
         self.component_tasks: Dict[str, asyncio.Task] = {}
         self.running = False
@@ -149,6 +161,7 @@ class SystemExecutionHarness:
         self.health_check_task: Optional[asyncio.Task] = None
         self.last_health_check: float = 0
         self.component_health_status: Dict[str, Dict[str, Any]] = {}
+        self.component_metrics_snapshots: Dict[str, MetricsSnapshot] = {}
         
         # Error tracking
         self.startup_errors: List[str] = []
@@ -172,7 +185,8 @@ class SystemExecutionHarness:
             self.logger.setLevel(getattr(logging, self.config.log_level))
     
     def register_component(self, name: str, component: HarnessComponent, 
-                          start_priority: int = 0, dependencies: Optional[List[str]] = None):
+                          start_priority: int = 0, dependencies: Optional[List[str]] = None,
+                          process_group: Optional[str] = None):
         """
         Register a component with the harness
         
@@ -181,6 +195,8 @@ class SystemExecutionHarness:
             component: HarnessComponent instance
             start_priority: Priority for startup order (higher = later)
             dependencies: List of component names this component depends on
+            process_group: Components with the same group share a worker process
+                (multi-process mode only)
             
         Raises:
             ComponentAlreadyRegisteredError: If component name already exists
@@ -196,7 +212,8 @@ class SystemExecutionHarness:
             component=component,
             registration_time=time.time(),
             start_priority=start_priority,
-            dependencies=dependencies or []
+            dependencies=dependencies or [],
+            process_group=process_group
         )
         
         self.components[name] = registration
@@ -266,20 +283,23 @@ class SystemExecutionHarness:
         if to_component not in self.components:
             raise ComponentNotFoundError(f"Target component '{to_component}' not found")
         
-        # Create stream
         buffer_size = buffer_size or self.config.stream_buffer_size
-        send_stream, receive_stream = self.stream_manager.create_stream(
-            buffer_size=buffer_size,
-            source_component=from_component,
-            target_component=to_component
-        )
         
-        # Connect streams to components
-        from_comp = self.components[from_component].component
-        to_comp = self.components[to_component].component
-        
-        from_comp.add_send_stream(from_port, send_stream, to_component)
-        to_comp.add_receive_stream(to_port, receive_stream, from_component)
+        # In multi-process mode the transport depends on placement, so streams
+        # are created by the ProcessExecutor when the harness runs
+        if self.config.execution_mode == ExecutionMode.IN_PROCESS:
+            send_stream, receive_stream = self.stream_manager.create_stream(
+                buffer_size=buffer_size,
+                source_component=from_component,
+                target_component=to_component
+            )
+            
+            # Connect streams to components
+            from_comp = self.components[from_component].component
+            to_comp = self.components[to_component].component
+            
+            from_comp.add_send_stream(from_port, send_stream, to_component)
+            to_comp.add_receive_stream(to_port, receive_stream, from_component)
         
         # Track connection
         connection_id = str(uuid.uuid4())
@@ -351,6 +371,10 @@ class SystemExecutionHarness:
             async with anyio.create_task_group() as tg:
                 self.task_group = tg
                 
+                # Spawn worker processes before setup in multi-process mode
+                if self.config.execution_mode == ExecutionMode.MULTI_PROCESS:
+                    await self._start_process_executor()
+                
                 # Setup all components first
                 await self._setup_all_components(context)
                 
@@ -379,10 +403,38 @@ class SystemExecutionHarness:
         finally:
             await self._cleanup_execution()
     
+    async def _start_process_executor(self):
+        """Place components into worker processes and wire their connections"""
+        self.process_executor = ProcessExecutor(
+            harness_id=self.harness_id,
+            components={name: (reg.component, reg.process_group) for name, reg in self.components.items()},
+            connections=[
+                (conn.from_component, conn.from_port, conn.to_component, conn.to_port, conn.buffer_size)
+                for conn in self.stream_connections.values()
+            ],
+            placement_policy=self.config.placement_policy,
+            worker_processes=self.config.worker_processes,
+            start_method=self.config.process_start_method,
+            shared_memory_bytes=self.config.shared_memory_bytes,
+            log_level=self.config.log_level
+        )
+        await self.process_executor.start_workers(self._calculate_startup_order())
+    
     async def _setup_all_components(self, context: HarnessContext):
         """Setup all registered components concurrently"""
         self.logger.info(f"🔧 Setting up {len(self.components)} components")
         
+        if self.process_executor:
+            setup_errors = await self.process_executor.setup_all(self.start_time, self.config.startup_timeout)
+            failed_setups = [f"{name}: {error}" for name, error in setup_errors.items() if error]
+            self.failed_components.update(name for name, error in setup_errors.items() if error)
+            if failed_setups:
+                error_msg = f"Component setup failures: {failed_setups}"
+                self.startup_errors.append(error_msg)
+                raise ComponentStartupError(error_msg)
+            self.logger.info("✅ All components setup completed successfully")
+            return
+        
         setup_tasks = []
         for name, registration in self.components.items():
             setup_tasks.append(
@@ -439,8 +491,11 @@ class SystemExecutionHarness:
                 # Start component with timeout
                 start_time = time.time()
                 
-                with anyio.fail_after(self.config.startup_timeout):
-                    await component.start_processing()
+                if self.process_executor:
+                    await self.process_executor.start_component(name, self.config.startup_timeout)
+                else:
+                    with anyio.fail_after(self.config.startup_timeout):
+                        await component.start_processing()
                 
                 startup_time = time.time() - start_time
                 startup_times.append(startup_time)
@@ -524,6 +579,14 @@ class SystemExecutionHarness:
     async def _monitor_component_processing(self, name: str, component: HarnessComponent):
         """Monitor a component's processing with error handling"""
         try:
+            if self.process_executor:
+                # The component lives in a worker; a dead worker fails only its own components
+                while self.running:
+                    if not self.process_executor.is_alive(name):
+                        raise WorkerError(f"worker '{self.process_executor.placement[name]}' exited")
+                    await asyncio.sleep(0.1)
+                return
+            
             # Component is already started, just wait for completion
             while component.is_running and self.running:
                 await asyncio.sleep(0.1)
@@ -556,21 +619,22 @@ class SystemExecutionHarness:
         
         self.logger.debug("🏥 Performing system health check")
         
-        # Check component health
+        # Check component health (one round trip per worker in multi-process mode)
+        if self.process_executor:
+            health_results = await self.process_executor.health_check()
+        else:
+            health_results = await self._collect_component_health()
+        
         healthy_components = 0
-        for name, registration in self.components.items():
-            try:
-                health = await registration.component.health_check()
-                self.component_health_status[name] = health
-                
-                if health.get("healthy", False):
-                    healthy_components += 1
-                else:
-                    self.logger.warning(f"⚠️ Component '{name}' reports unhealthy: {health}")
-                    
-            except Exception as e:
-                self.logger.warning(f"⚠️ Health check failed for component '{name}': {e}")
-                self.component_health_status[name] = {"healthy": False, "error": str(e)}
+        for name, (health, snapshot) in health_results.items():
+            self.component_health_status[name] = health
+            if snapshot is not None:
+                self.component_metrics_snapshots[name] = snapshot
+            
+            if health.get("healthy", False):
+                healthy_components += 1
+            else:
+                self.logger.warning(f"⚠️ Component '{name}' reports unhealthy: {health}")
         
         # Check stream health
         stream_health = await self.stream_manager.health_check_streams()
@@ -589,6 +653,18 @@ class SystemExecutionHarness:
         else:
             self.logger.debug(f"✅ Health check: All systems healthy")
     
+    async def _collect_component_health(self) -> Dict[str, Tuple[Dict[str, Any], Optional[MetricsSnapshot]]]:
+        """Query health and metrics snapshots of in-process components"""
+        results = {}
+        for name, registration in self.components.items():
+            try:
+                health = await registration.component.health_check()
+                results[name] = (health, registration.component.get_metrics_snapshot())
+            except Exception as e:
+                self.logger.warning(f"⚠️ Health check failed for component '{name}': {e}")
+                results[name] = ({"healthy": False, "error": str(e)}, None)
+        return results
+    
     async def stop(self):
         """
         Gracefully stop the harness and all components
@@ -647,8 +723,11 @@ class SystemExecutionHarness:
                 component = registration.component
                 
                 try:
-                    with anyio.fail_after(self.config.shutdown_timeout):
-                        await component.stop_processing()
+                    if self.process_executor:
+                        await self.process_executor.stop_component(name, self.config.shutdown_timeout)
+                    else:
+                        with anyio.fail_after(self.config.shutdown_timeout):
+                            await component.stop_processing()
                     
                     self.logger.debug(f"✅ Component '{name}' stopped")
                     
@@ -660,9 +739,16 @@ class SystemExecutionHarness:
         self.logger.info("🧹 Cleaning up harness resources")
         
         try:
-            # Cleanup all components
+            # Worker processes clean up their own components
+            if self.process_executor:
+                await self.process_executor.shutdown(self.config.shutdown_timeout)
+                self.process_executor = None
+            
+            # Cleanup all in-process components
             cleanup_tasks = []
             for name, registration in self.components.items():
+                if self.config.execution_mode != ExecutionMode.IN_PROCESS:
+                    continue
                 cleanup_tasks.append(
                     asyncio.create_task(
                         self._cleanup_component_with_timeout(name, registration.component),
@@ -748,6 +834,7 @@ class SystemExecutionHarness:
             },
             "component_info": component.get_component_info(),
             "health_status": self.component_health_status.get(name, {}),
+            "metrics_snapshot": component.get_metrics_snapshot().to_dict(),
             "stream_info": component.get_stream_info(),
             "performance_metrics": component.get_performance_metrics(),
             "is_failed": name in self.failed_components,
@@ -779,6 +866,8 @@ __all__ = [
     'HarnessState',
     'ComponentRegistration',
     'StreamConnection',
+    'ExecutionMode',
+    'PlacementPolicy',
     'ComponentAlreadyRegisteredError',
     'ComponentNotFoundError', 
     'HarnessAlreadyRunningError',
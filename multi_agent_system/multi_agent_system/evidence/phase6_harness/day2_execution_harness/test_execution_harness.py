@@ -15,6 +15,7 @@ import asyncio
 import anyio
 import pytest
 import time
+import multiprocessing
 import logging
 from typing import Dict, Any, List
 
@@ -28,9 +29,13 @@ from evidence.phase6_harness.day1_harness_component.component_status import Comp
 from evidence.phase6_harness.day2_execution_harness.system_execution_harness import (
     SystemExecutionHarness, HarnessConfiguration, HarnessState,
     ComponentAlreadyRegisteredError, ComponentNotFoundError, 
-    HarnessAlreadyRunningError, ComponentStartupError
+    HarnessAlreadyRunningError, ComponentStartupError, ExecutionMode, PlacementPolicy
 )
 from evidence.phase6_harness.day2_execution_harness.stream_manager import StreamManager
+from evidence.phase6_harness.day2_execution_harness.process_execution import (
+    SharedMemoryRingBuffer, ProcessExecutor, SharedMemoryChannelSpec,
+    SharedMemorySendStream, SharedMemoryReceiveStream, WorkerHandle, WorkerSpec, WorkerError
+)
 
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO)
@@ -150,6 +155,15 @@ class TestSinkComponent(HarnessComponent):
         await asyncio.sleep(0.01)
 
 
+class TestReportingSinkComponent(TestSinkComponent):
+    """Sink that reports its collected count through health checks"""
+    
+    async def health_check(self) -> Dict[str, Any]:
+        health = await super().health_check()
+        health["collected"] = len(self.collected_messages)
+        return health
+
+
 class TestErrorComponent(HarnessComponent):
     """Component that generates errors for testing error handling"""
     
@@ -536,6 +550,148 @@ class TestSystemExecutionHarness:
             assert len(sink.collected_messages) > 0, f"Sink {i} should have received messages"
 
 
+class TestMultiProcessExecution:
+    """Test running components in worker processes"""
+    
+    def test_shared_memory_ring_wraparound(self):
+        """Records stay intact and ordered across ring wraparound"""
+        ring = SharedMemoryRingBuffer(capacity=64, max_messages=3)
+        try:
+            payloads = [bytes([i]) * (i % 13 + 1) for i in range(50)]
+            received = []
+            for payload in payloads:
+                assert ring.try_write(payload)
+                received.append(ring.try_read())
+            assert received == payloads
+            assert ring.try_read() is None
+            
+            # max_messages bounds records in flight like a stream buffer_size
+            assert ring.try_write(b"a") and ring.try_write(b"b") and ring.try_write(b"c")
+            assert not ring.try_write(b"d")
+        finally:
+            ring.close()
+            ring.unlink()
+    
+    def test_shared_memory_ring_rejects_oversized_records(self):
+        """Records over half the ring are refused instead of never fitting"""
+        ring = SharedMemoryRingBuffer(capacity=64, max_messages=8)
+        try:
+            # Leave the empty ring's positions mid-buffer
+            assert ring.try_write(b"x" * 20) and ring.try_read() == b"x" * 20
+            with pytest.raises(ValueError):
+                ring.try_write(b"y" * 30)
+            assert ring.try_write(b"z" * 28) and ring.try_read() == b"z" * 28
+        finally:
+            ring.close()
+            ring.unlink()
+    
+    async def test_worker_request_discards_stale_reply(self):
+        """A reply that arrives after its request timed out is not taken as the next answer"""
+        class _Process:
+            exitcode = None
+            
+            def is_alive(self):
+                return True
+        
+        harness_end, worker_end = multiprocessing.Pipe()
+        handle = WorkerHandle(WorkerSpec(worker_id="w", harness_id="h"), _Process(), harness_end)
+        try:
+            with pytest.raises(WorkerError):
+                await handle.request("health", timeout=0.05)
+            
+            # The worker answers the timed-out request late, then the next one
+            first_id, _, _ = worker_end.recv()
+            worker_end.send((first_id, "ok", "late"))
+            worker_end.send((first_id + 1, "ok", "fresh"))
+            assert await handle.request("health", timeout=1.0) == "fresh"
+            assert worker_end.recv()[0] == first_id + 1
+        finally:
+            harness_end.close()
+            worker_end.close()
+    
+    async def test_shared_memory_channel_carries_binary_frames(self):
+        """Messages cross the ring as binary_codec frames, not pickles"""
+        ring = SharedMemoryRingBuffer(capacity=4096, max_messages=8)
+        spec = SharedMemoryChannelSpec(shm_name=ring.name, capacity=4096, max_messages=8)
+        send_stream, receive_stream = SharedMemorySendStream(spec), SharedMemoryReceiveStream(spec)
+        try:
+            message = {"data": {"values": [1, 2, 3], "label": "x"}, "sender": "source", "timestamp": 1.5}
+            await send_stream.send(message)
+            
+            record = ring.try_read()
+            assert record[:2] == b"MP"
+            assert ring.try_write(record)
+            assert await receive_stream.receive() == message
+            
+            await send_stream.aclose()
+            with pytest.raises(anyio.EndOfStream):
+                await receive_stream.receive()
+        finally:
+            await receive_stream.aclose()
+            ring.close()
+            ring.unlink()
+    
+    def test_placement_policies(self):
+        """Explicit groups share a worker, the rest follow the policy"""
+        components = {
+            "a": (TestSourceComponent("a"), None),
+            "b": (TestProcessorComponent("b"), "heavy"),
+            "c": (TestProcessorComponent("c"), "heavy"),
+            "d": (TestSinkComponent("d"), None),
+            "e": (TestSinkComponent("e"), None)
+        }
+        order = ["a", "b", "c", "d", "e"]
+        
+        round_robin = ProcessExecutor("test", components, [], PlacementPolicy.ROUND_ROBIN, worker_processes=2)
+        placement = round_robin.compute_placement(order)
+        assert placement["b"] == placement["c"]
+        assert placement["a"] != placement["d"]
+        assert placement["a"] == placement["e"]
+        
+        per_component = ProcessExecutor("test", components, [], PlacementPolicy.PER_COMPONENT)
+        placement = per_component.compute_placement(order)
+        assert len({placement[name] for name in ["a", "d", "e"]}) == 3
+        assert placement["b"] == placement["c"]
+    
+    async def test_multi_process_pipeline(self):
+        """A pipeline split across worker processes delivers every message"""
+        harness = SystemExecutionHarness(
+            HarnessConfiguration(
+                execution_mode=ExecutionMode.MULTI_PROCESS,
+                placement_policy=PlacementPolicy.PER_COMPONENT,
+                health_check_interval=0.2,
+                component_startup_delay=0.0
+            )
+        )
+        
+        harness.register_component("source", TestSourceComponent("source", message_count=5))
+        harness.register_component("processor", TestProcessorComponent("processor", processing_delay=0.01),
+                                   dependencies=["source"])
+        harness.register_component("sink", TestReportingSinkComponent("sink"), dependencies=["processor"])
+        harness.connect("source.output", "processor.input", buffer_size=4)
+        harness.connect("processor.output", "sink.input", buffer_size=4)
+        
+        harness_task = asyncio.create_task(harness.run())
+        
+        try:
+            deadline = time.time() + 20.0
+            while time.time() < deadline:
+                if harness.component_health_status.get("sink", {}).get("collected") == 5:
+                    break
+                await asyncio.sleep(0.1)
+            
+            assert harness.component_health_status["sink"]["collected"] == 5
+            assert len(set(harness.process_executor.placement.values())) == 3
+            assert len(harness.process_executor.rings) == 2
+            assert harness.component_metrics_snapshots["sink"].count > 0
+        finally:
+            await harness.stop()
+            await asyncio.wait_for(harness_task, timeout=20.0)
+        
+        assert harness.state == HarnessState.STOPPED
+        assert harness.process_executor is None
+
+
 # Test runner function
 async def run_all_harness_tests():
     """Run all SystemExecutionHarness tests"""
@@ -563,6 +719,14 @@ async def run_all_harness_tests():
             "test_health_monitoring",
             "test_harness_status_reporting",
             "test_concurrent_component_execution"
+        ]),
+        (TestMultiProcessExecution, [
+            "test_shared_memory_ring_wraparound",
+            "test_shared_memory_ring_rejects_oversized_records",
+            "test_worker_request_discards_stale_reply",
+            "test_shared_memory_channel_carries_binary_frames",
+            "test_placement_policies",
+            "test_multi_process_pipeline"
         ])
     ]
     
@@ -574,7 +738,10 @@ async def run_all_harness_tests():
                 logger.info(f"🧪 Running {test_class.__name__}.{method_name}")
                 
                 test_method = getattr(test_instance, method_name)
-                await test_method()
+                if asyncio.iscoroutinefunction(test_method):
+                    await test_method()
+                else:
+                    test_method()
                 
                 test_results["passed"] += 1
                 test_results["details"].append(f"✅ {test_class.__name__}.{method_name}")
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+BinaryCodec: Versioned binary frame format for MessageProtocol
+==============================================================
+
+Compact alternative to the JSON wire format. Every frame is a fixed header
+followed by the (optionally compressed) body:
+
+    magic "MP" | version u8 | message type u8 | codec u8 | flags u8 | body length u32 | raw length u32
+
+The header says which compression codec produced the body, so decoding never
+has to guess. The body is a tagged binary encoding of the value types the
+JSON path understands (None, bool, int, float, str, bytes, list/tuple, dict,
+set, datetime, enums and plain objects) with no pickle fallback.
+
+Key Features:
+- Single-pass encoding: each value is written exactly once
+- Pluggable stdlib compression codecs (zlib at any level, lzma, gzip)
+- Codec registry keyed by the id carried in the frame header
+"""
+
+import struct
+import zlib
+import lzma
+import gzip
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
+from dataclasses import dataclass
+
+
+FRAME_MAGIC = b"MP"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("!2sBBBBII")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+
+
+class BinaryCodecError(Exception):
+    """Raised when a value cannot be encoded or a frame cannot be decoded"""
+    pass
+
+
+@dataclass(frozen=True)
+class CompressionCodec:
+    """A compression algorithm addressable by the id stored in frame headers"""
+    codec_id: int
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+_codecs_by_id: Dict[int, CompressionCodec] = {}
+_codecs_by_name: Dict[str, CompressionCodec] = {}
+
+
+def register_codec(codec: CompressionCodec):
+    """
+    Register a compression codec for encoding and decoding frames
+
+    Args:
+        codec: Codec to register; its id must fit in one byte and be unused
+    """
+    if not 0 <= codec.codec_id <= 255:
+        raise ValueError("codec_id must fit in one byte")
+    existing = _codecs_by_id.get(codec.codec_id)
+    if existing is not None and existing.name != codec.name:
+        raise ValueError(f"codec id {codec.codec_id} is already used by '{existing.name}'")
+    _codecs_by_id[codec.codec_id] = codec
+    _codecs_by_name[codec.name] = codec
+
+
+def get_codec(name: str) -> CompressionCodec:
+    """Look up a registered codec by name"""
+    try:
+        return _codecs_by_name[name]
+    except KeyError:
+        raise BinaryCodecError(f"Unknown compression codec '{name}'") from None
+
+
+def zlib_codec(level: int = 1) -> Callable[[bytes], bytes]:
+    """Get a zlib compress function for the given level (1 = fastest, 9 = smallest)"""
+    return lambda data: zlib.compress(data, level)
+
+
+register_codec(CompressionCodec(0, "none", bytes, bytes))
+register_codec(CompressionCodec(1, "zlib", zlib_codec(1), zlib.decompress))
+register_codec(CompressionCodec(2, "lzma", lzma.compress, lzma.decompress))
+register_codec(CompressionCodec(3, "gzip", gzip.compress, gzip.decompress))
+
+
+# Value tags
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"i"
+_BIGINT = b"I"
+_FLOAT = b"d"
+_STR = b"s"
+_BYTES = b"b"
+_LIST = b"l"
+_INT_ARRAY = b"a"
+_DICT = b"m"
+_SET = b"S"
+_DATETIME = b"t"
+_ENUM = b"e"
+
+_pack_int = struct.Struct("!cq").pack
+_pack_float = struct.Struct("!cd").pack
+_pack_sized = struct.Struct("!cI").pack
+_unpack_unsigned = struct.Struct("!I").unpack_from
+_unpack_signed = struct.Struct("!q").unpack_from
+_unpack_double = struct.Struct("!d").unpack_from
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_INT_ONLY = {int}
+
+# Integer tag values, as seen when indexing into a bytes body
+_TAG_NONE, _TAG_TRUE, _TAG_FALSE = _NONE[0], _TRUE[0], _FALSE[0]
+_TAG_INT, _TAG_BIGINT, _TAG_FLOAT = _INT[0], _BIGINT[0], _FLOAT[0]
+_TAG_STR, _TAG_BYTES, _TAG_LIST, _TAG_INT_ARRAY = _STR[0], _BYTES[0], _LIST[0], _INT_ARRAY[0]
+_TAG_DICT, _TAG_SET, _TAG_DATETIME, _TAG_ENUM = _DICT[0], _SET[0], _DATETIME[0], _ENUM[0]
+
+
+class BinaryEncoder:
+    """
+    Tagged binary encoder for message bodies
+
+    enum_types maps enum class names to classes so decoding can rebuild the
+    enum members; unknown enums decode to their plain value. Strings, int64s
+    and floats inside containers are handled inline, and lists of int64s are
+    packed with a single struct call, since those dominate message payloads.
+    """
+
+    def __init__(self, enum_types: Dict[str, type] = None):
+        self.enum_types = dict(enum_types or {})
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value to bytes"""
+        out: List[bytes] = []
+        self._encode(value, out.append)
+        return b"".join(out)
+
+    def _encode(self, value: Any, write: Callable[[bytes], None]):
+        value_type = type(value)
+        if value_type is str:
+            data = value.encode("utf-8")
+            write(_pack_sized(_STR, len(data)) + data)
+        elif value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            write(_pack_int(_INT, value))
+        elif value_type is float:
+            write(_pack_float(_FLOAT, value))
+        elif value_type is dict:
+            write(_pack_sized(_DICT, len(value)))
+            encode = self._encode
+            for key, item in value.items():
+                if type(key) is str:
+                    data = key.encode("utf-8")
+                    write(_pack_sized(_STR, len(data)) + data)
+                else:
+                    encode(key, write)
+                item_type = type(item)
+                if item_type is str:
+                    data = item.encode("utf-8")
+                    write(_pack_sized(_STR, len(data)) + data)
+                elif item_type is int and _INT64_MIN <= item <= _INT64_MAX:
+                    write(_pack_int(_INT, item))
+                elif item_type is float:
+                    write(_pack_float(_FLOAT, item))
+                else:
+                    encode(item, write)
+        elif value_type is list or value_type is tuple:
+            count = len(value)
+            if count and type(value[0]) is int and set(map(type, value)) == _INT_ONLY:
+                try:
+                    packed = struct.pack(f"!{count}q", *value)
+                except struct.error:
+                    pass  # Some value needs more than 64 bits
+                else:
+                    write(_pack_sized(_INT_ARRAY, count))
+                    write(packed)
+                    return
+            write(_pack_sized(_LIST, count))
+            encode = self._encode
+            for item in value:
+                item_type = type(item)
+                if item_type is str:
+                    data = item.encode("utf-8")
+                    write(_pack_sized(_STR, len(data)) + data)
+                elif item_type is int and _INT64_MIN <= item <= _INT64_MAX:
+                    write(_pack_int(_INT, item))
+                elif item_type is float:
+                    write(_pack_float(_FLOAT, item))
+                elif item is None:
+                    write(_NONE)
+                else:
+                    encode(item, write)
+        elif value is None:
+            write(_NONE)
+        elif value is True:
+            write(_TRUE)
+        elif value is False:
+            write(_FALSE)
+        else:
+            self._encode_other(value, write)
+
+    def _encode_other(self, value: Any, write: Callable[[bytes], None]):
+        """Encode the less common types, including subclasses of the fast-path ones"""
+        if isinstance(value, Enum):
+            write(_ENUM)
+            self._encode(type(value).__name__, write)
+            self._encode(value.value, write)
+        elif isinstance(value, bool):
+            write(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                write(_pack_int(_INT, int(value)))
+            else:
+                data = int(value).to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+                write(_pack_sized(_BIGINT, len(data)) + data)
+        elif isinstance(value, float):
+            self._encode(float(value), write)
+        elif isinstance(value, str):
+            self._encode(str(value), write)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+            write(_pack_sized(_BYTES, len(data)) + data)
+        elif isinstance(value, datetime):
+            write(_DATETIME)
+            self._encode(value.isoformat(), write)
+        elif isinstance(value, (set, frozenset)):
+            write(_pack_sized(_SET, len(value)))
+            for item in value:
+                self._encode(item, write)
+        elif isinstance(value, dict):
+            self._encode(dict(value), write)
+        elif isinstance(value, (list, tuple)):
+            self._encode(list(value), write)
+        elif hasattr(value, "__dict__"):
+            # Plain objects travel as their attribute dict, like the JSON path
+            self._encode(dict(vars(value)), write)
+        else:
+            raise BinaryCodecError(f"Cannot encode object of type {type(value).__name__}")
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a single value that spans all of data"""
+        value, offset = self.decode_from(data, 0)
+        if offset != len(data):
+            raise BinaryCodecError(f"{len(data) - offset} trailing bytes after value")
+        return value
+
+    def decode_from(self, data: bytes, offset: int) -> Tuple[Any, int]:
+        """
+        Decode one value starting at offset
+
+        Returns:
+            Tuple of (value, offset just past the value)
+        """
+        try:
+            return self._decode(data, offset, len(data))
+        except (struct.error, IndexError, UnicodeDecodeError, ValueError, TypeError) as e:
+            raise BinaryCodecError(f"Malformed body at offset {offset}: {e}") from e
+
+    def _decode(self, data: bytes, offset: int, size: int) -> Tuple[Any, int]:
+        tag = data[offset]
+        offset += 1
+        if tag == _TAG_STR:
+            end = offset + 4 + _unpack_unsigned(data, offset)[0]
+            if end > size:
+                raise ValueError("string runs past end of body")
+            return data[offset + 4:end].decode("utf-8"), end
+        if tag == _TAG_INT:
+            return _unpack_signed(data, offset)[0], offset + 8
+        if tag == _TAG_FLOAT:
+            return _unpack_double(data, offset)[0], offset + 8
+        if tag == _TAG_DICT:
+            count = _unpack_unsigned(data, offset)[0]
+            offset += 4
+            result = {}
+            decode = self._decode
+            for _ in range(count):
+                if data[offset] == _TAG_STR:
+                    end = offset + 5 + _unpack_unsigned(data, offset + 1)[0]
+                    if end > size:
+                        raise ValueError("string runs past end of body")
+                    key = data[offset + 5:end].decode("utf-8")
+                    offset = end
+                else:
+                    key, offset = decode(data, offset, size)
+                item_tag = data[offset]
+                if item_tag == _TAG_STR:
+                    end = offset + 5 + _unpack_unsigned(data, offset + 1)[0]
+                    if end > size:
+                        raise ValueError("string runs past end of body")
+                    result[key] = data[offset + 5:end].decode("utf-8")
+                    offset = end
+                elif item_tag == _TAG_INT:
+                    result[key] = _unpack_signed(data, offset + 1)[0]
+                    offset += 9
+                elif item_tag == _TAG_FLOAT:
+                    result[key] = _unpack_double(data, offset + 1)[0]
+                    offset += 9
+                else:
+                    result[key], offset = decode(data, offset, size)
+            return result, offset
+        if tag == _TAG_INT_ARRAY:
+            count = _unpack_unsigned(data, offset)[0]
+            offset += 4
+            return list(struct.unpack_from(f"!{count}q", data, offset)), offset + 8 * count
+        if tag == _TAG_LIST or tag == _TAG_SET:
+            count = _unpack_unsigned(data, offset)[0]
+            offset += 4
+            items = []
+            append = items.append
+            decode = self._decode
+            for _ in range(count):
+                item_tag = data[offset]
+                if item_tag == _TAG_STR:
+                    end = offset + 5 + _unpack_unsigned(data, offset + 1)[0]
+                    if end > size:
+                        raise ValueError("string runs past end of body")
+                    append(data[offset + 5:end].decode("utf-8"))
+                    offset = end
+                elif item_tag == _TAG_INT:
+                    append(_unpack_signed(data, offset + 1)[0])
+                    offset += 9
+                elif item_tag == _TAG_FLOAT:
+                    append(_unpack_double(data, offset + 1)[0])
+                    offset += 9
+                elif item_tag == _TAG_NONE:
+                    append(None)
+                    offset += 1
+                else:
+                    item, offset = decode(data, offset, size)
+                    append(item)
+            return (items if tag == _TAG_LIST else set(items)), offset
+        if tag == _TAG_NONE:
+            return None, offset
+        if tag == _TAG_TRUE:
+            return True, offset
+        if tag == _TAG_FALSE:
+            return False, offset
+        if tag == _TAG_BYTES or tag == _TAG_BIGINT:
+            end = offset + 4 + _unpack_unsigned(data, offset)[0]
+            if end > size:
+                raise ValueError("value runs past end of body")
+            raw = bytes(data[offset + 4:end])
+            if tag == _TAG_BIGINT:
+                return int.from_bytes(raw, "big", signed=True), end
+            return raw, end
+        if tag == _TAG_DATETIME:
+            text, offset = self._decode(data, offset, size)
+            return datetime.fromisoformat(text), offset
+        if tag == _TAG_ENUM:
+            class_name, offset = self._decode(data, offset, size)
+            value, offset = self._decode(data, offset, size)
+            enum_type = self.enum_types.get(class_name)
+            return (enum_type(value) if enum_type is not None else value), offset
+        raise ValueError(f"unknown tag {tag!r}")
+
+
+def encode_frame(message_type: int, body: bytes, codec: CompressionCodec,
+                 compression_threshold: int = 0) -> Tuple[bytes, CompressionCodec]:
+    """
+    Wrap an encoded body in a frame header, compressing it if worthwhile
+
+    Args:
+        message_type: Message type code stored in the header
+        body: Encoded message body
+        codec: Codec to try when the body exceeds compression_threshold
+        compression_threshold: Minimum body size in bytes worth compressing
+
+    Returns:
+        Tuple of (frame bytes, codec actually used)
+    """
+    raw_length = len(body)
+    if codec.codec_id and raw_length > compression_threshold:
+        compressed = codec.compress(body)
+        # Keep compression only if it actually reduces size
+        if len(compressed) < raw_length:
+            header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, message_type,
+                                       codec.codec_id, 0, len(compressed), raw_length)
+            return header + compressed, codec
+
+    none_codec = _codecs_by_id[0]
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, message_type, 0, 0, raw_length, raw_length)
+    return header + body, none_codec
+
+
+def decode_frame(data: bytes) -> Tuple[int, CompressionCodec, bytes]:
+    """
+    Validate a frame header and return its decompressed body
+
+    Returns:
+        Tuple of (message type code, codec used, body bytes)
+    """
+    if len(data) < FRAME_HEADER_SIZE:
+        raise BinaryCodecError("Frame shorter than header")
+    magic, version, message_type, codec_id, _, body_length, raw_length = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise BinaryCodecError("Not a binary frame")
+    if version != FRAME_VERSION:
+        raise BinaryCodecError(f"Unsupported frame version {version}")
+    if len(data) - FRAME_HEADER_SIZE != body_length:
+        raise BinaryCodecError(f"Frame body is {len(data) - FRAME_HEADER_SIZE} bytes, header says {body_length}")
+
+    codec = _codecs_by_id.get(codec_id)
+    if codec is None:
+        raise BinaryCodecError(f"Unknown compression codec id {codec_id}")
+
+    body = data[FRAME_HEADER_SIZE:]
+    if codec_id:
+        try:
+            body = codec.decompress(body)
+        except Exception as e:
+            raise BinaryCodecError(f"Cannot decompress {codec.name} body: {e}") from e
+        if len(body) != raw_length:
+            raise BinaryCodecError(f"Decompressed body is {len(body)} bytes, header says {raw_length}")
+    return message_type, codec, body
+
+
+def is_binary_frame(data: bytes) -> bool:
+    """Check whether data starts with the binary frame magic"""
+    return data[:2] == FRAME_MAGIC
+
+
+# Export main classes
+__all__ = [
+    'BinaryEncoder',
+    'BinaryCodecError',
+    'CompressionCodec',
+    'register_codec',
+    'get_codec',
+    'zlib_codec',
+    'encode_frame',
+    'decode_frame',
+    'is_binary_frame',
+    'FRAME_VERSION'
+]
@@ -8,17 +8,16 @@ complex data types, message validation, and protocol versioning for the
 SystemExecutionHarness stream communication framework.
 
 Key Features:
-- JSON-based message serialization with metadata
+- Versioned binary frames (default) or JSON-based serialization with metadata
 - Support for complex data types (datetime, bytes, custom objects)
 - Message validation and error handling
 - Protocol versioning and compatibility
-- Message compression for large payloads
+- Pluggable message compression for large payloads (zlib, lzma, gzip)
 - Performance optimization and metrics
 """
 
 import json
 import time
-import uuid
 import gzip
 import base64
 import pickle
@@ -26,9 +25,22 @@ from typing import Any, Dict, List, Optional, Union, Type
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from enum import Enum
+from collections import deque
 import logging
 import hashlib
 
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+
+from evidence.phase6_harness.day1_harness_component.harness_metrics import RollingMetric
+from evidence.phase6_harness.day1_harness_component.message_ids import (
+    next_message_id, now_ns, format_timestamp_ns
+)
+from evidence.phase6_harness.day3_stream_communication.binary_codec import (
+    BinaryEncoder, CompressionCodec, get_codec, zlib_codec, encode_frame, decode_frame, is_binary_frame
+)
+
 
 class MessageType(Enum):
     """Standard message types"""
@@ -44,6 +56,20 @@ class CompressionType(Enum):
     """Supported compression types"""
     NONE = "none"
     GZIP = "gzip"
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+
+class WireFormat(Enum):
+    """Supported serialized message formats"""
+    JSON = "json"
+    BINARY = "binary"
+
+
+# Header codes for the binary frame, keyed by enum value
+_MESSAGE_TYPE_CODES = {message_type.value: code for code, message_type in enumerate(MessageType)}
+_MESSAGE_TYPES_BY_CODE = list(MessageType)
+_COMPRESSION_BY_NAME = {compression.value: compression for compression in CompressionType}
 
 
 @dataclass
@@ -51,7 +77,7 @@ class MessageMetadata:
     """Metadata for all messages"""
     id: str
     type: MessageType
-    timestamp: float
+    timestamp_ns: int  # Integer nanoseconds since the epoch
     sender: Optional[str] = None
     recipient: Optional[str] = None
     correlation_id: Optional[str] = None
@@ -63,15 +89,24 @@ class MessageMetadata:
     content_hash: Optional[str] = None
     content_size: int = 0
     
+    @property
+    def timestamp(self) -> float:
+        """Creation time in seconds since the epoch"""
+        return self.timestamp_ns / 1e9
+    
+    def format_timestamp(self) -> str:
+        """Render the creation time as an ISO 8601 UTC string"""
+        return format_timestamp_ns(self.timestamp_ns)
+    
     def is_expired(self) -> bool:
         """Check if message has expired"""
         if self.ttl is None:
             return False
-        return time.time() > (self.timestamp + self.ttl)
+        return now_ns() > self.timestamp_ns + int(self.ttl * 1e9)
     
     def age_seconds(self) -> float:
         """Get message age in seconds"""
-        return time.time() - self.timestamp
+        return (now_ns() - self.timestamp_ns) / 1e9
 
 
 @dataclass 
@@ -103,6 +138,10 @@ class Message:
             if isinstance(metadata_dict["compression"], str):
                 metadata_dict["compression"] = CompressionType(metadata_dict["compression"])
         
+        # Older senders stored float seconds under "timestamp"
+        if "timestamp" in metadata_dict:
+            metadata_dict["timestamp_ns"] = int(metadata_dict.pop("timestamp") * 1e9)
+        
         metadata = MessageMetadata(**metadata_dict)
         return cls(metadata=metadata, payload=data["payload"])
 
@@ -132,9 +171,9 @@ class MessageProtocol:
     Message serialization/deserialization with advanced features
     
     Provides:
-    - JSON-based serialization with complex type support
+    - Binary or JSON serialization with complex type support
     - Message validation and integrity checking
-    - Compression for large messages
+    - Compression for large messages with a configurable codec
     - Protocol versioning and compatibility
     - Performance metrics and optimization
     """
@@ -143,18 +182,33 @@ class MessageProtocol:
                  compression_threshold: int = 1024,
                  enable_compression: bool = True,
                  enable_validation: bool = True,
-                 max_message_size: int = 10 * 1024 * 1024):  # 10MB
+                 max_message_size: int = 10 * 1024 * 1024,  # 10MB
+                 wire_format: WireFormat = WireFormat.BINARY,
+                 compression: CompressionType = CompressionType.ZLIB,
+                 compression_level: int = 1):
         
         self.compression_threshold = compression_threshold
         self.enable_compression = enable_compression
         self.enable_validation = enable_validation
         self.max_message_size = max_message_size
+        self.wire_format = wire_format
+        self.compression = compression
+        
+        # Binary frame encoding; zlib gets its own compressor so the level is tunable
+        self._encoder = BinaryEncoder({"MessageType": MessageType, "CompressionType": CompressionType})
+        codec = get_codec(compression.value if enable_compression else CompressionType.NONE.value)
+        if codec.name == CompressionType.ZLIB.value:
+            codec = CompressionCodec(codec.codec_id, codec.name, zlib_codec(compression_level), codec.decompress)
+        self._codec = codec
         
         # Performance tracking
-        self.serialization_times: List[float] = []
-        self.deserialization_times: List[float] = []
-        self.compression_ratios: List[float] = []
-        self.message_sizes: List[int] = []
+        self.serialization_times = RollingMetric()
+        self.deserialization_times = RollingMetric()
+        self.compression_ratios: deque = deque(maxlen=1000)  # Recent ratios
+        self.total_compressed = 0
+        self._compression_ratio_sum = 0.0
+        self.best_compression_ratio = 1.0
+        self.message_sizes = RollingMetric(unit=1.0, max_value=max_message_size)
         
         # Error tracking
         self.serialization_errors = 0
@@ -166,7 +220,7 @@ class MessageProtocol:
         
         # Logging
         self.logger = logging.getLogger("MessageProtocol")
-        self.logger.info(f"✨ MessageProtocol initialized (compression: {enable_compression}, validation: {enable_validation})")
+        self.logger.info(f"✨ MessageProtocol initialized (format: {wire_format.value}, compression: {codec.name}, validation: {enable_validation})")
     
     def create_message(self,
                       payload: Any,
@@ -192,9 +246,9 @@ class MessageProtocol:
             Message object with metadata
         """
         metadata = MessageMetadata(
-            id=str(uuid.uuid4()),
+            id=next_message_id(),
             type=message_type,
-            timestamp=time.time(),
+            timestamp_ns=now_ns(),
             sender=sender,
             recipient=recipient,
             correlation_id=correlation_id,
@@ -203,18 +257,8 @@ class MessageProtocol:
             protocol_version=self.protocol_version
         )
         
-        message = Message(metadata=metadata, payload=payload)
-        
-        # Calculate content hash and size
-        try:
-            serialized_payload = self._serialize_payload(payload)
-            metadata.content_size = len(serialized_payload)
-            metadata.content_hash = hashlib.sha256(serialized_payload.encode()).hexdigest()[:16]
-        except Exception:
-            # If we can't serialize for hash/size, that's okay for now
-            pass
-        
-        return message
+        # Content hash and size are filled in by serialize() from the encoded payload
+        return Message(metadata=metadata, payload=payload)
     
     def serialize(self, message: Union[Message, Any]) -> bytes:
         """
@@ -240,52 +284,19 @@ class MessageProtocol:
             if self.enable_validation:
                 self._validate_message(message)
             
-            # Serialize to JSON
-            message_dict = message.to_dict()
-            json_data = json.dumps(message_dict, default=self._json_serializer, separators=(',', ':'))
-            
-            # Apply compression if enabled and beneficial
-            final_data = json_data.encode('utf-8')
-            
-            if (self.enable_compression and 
-                len(final_data) > self.compression_threshold):
-                
-                compressed_data = gzip.compress(final_data)
-                
-                # Only use compression if it actually reduces size
-                if len(compressed_data) < len(final_data):
-                    message.metadata.compression = CompressionType.GZIP
-                    final_data = compressed_data
-                    
-                    # Track compression ratio
-                    ratio = len(compressed_data) / len(final_data) if len(final_data) > 0 else 1.0
-                    self.compression_ratios.append(ratio)
+            if self.wire_format == WireFormat.BINARY:
+                final_data = self._serialize_binary(message)
+            else:
+                final_data = self._serialize_json(message)
             
             # Check size limits
             if len(final_data) > self.max_message_size:
                 raise MessageSerializationError(f"Message size {len(final_data)} exceeds limit {self.max_message_size}")
             
-            # Update metadata with final size and compression info
-            message.metadata.content_size = len(final_data)
-            
-            # Re-serialize with updated metadata if compression was applied
-            if message.metadata.compression != CompressionType.NONE:
-                message_dict = message.to_dict()
-                json_data = json.dumps(message_dict, default=self._json_serializer, separators=(',', ':'))
-                final_data = json_data.encode('utf-8')
-                
-                if message.metadata.compression == CompressionType.GZIP:
-                    final_data = gzip.compress(final_data)
-            
             # Track performance
             serialization_time = time.time() - start_time
-            self.serialization_times.append(serialization_time)
-            self.message_sizes.append(len(final_data))
-            
-            # Keep only recent measurements
-            if len(self.serialization_times) > 1000:
-                self.serialization_times = self.serialization_times[-1000:]
-                self.message_sizes = self.message_sizes[-1000:]
+            self.serialization_times.record(serialization_time)
+            self.message_sizes.record(len(final_data))
             
             self.logger.debug(f"📦 Serialized message {message.metadata.id[:8]} ({len(final_data)} bytes, {serialization_time:.3f}ms)")
             
@@ -312,23 +323,11 @@ class MessageProtocol:
         start_time = time.time()
         
         try:
-            # Try to decompress if it looks like compressed data
-            decompressed_data = data
-            
-            # First, try to decompress to see if it's GZIP data
-            try:
-                if data[:2] == b'\x1f\x8b':  # GZIP magic number
-                    decompressed_data = gzip.decompress(data)
-            except Exception:
-                # Not compressed or decompression failed, use original data
-                decompressed_data = data
-            
-            # Decode JSON
-            json_str = decompressed_data.decode('utf-8')
-            message_dict = json.loads(json_str, object_hook=self._json_deserializer)
-            
-            # Reconstruct message
-            message = Message.from_dict(message_dict, self._json_deserializer)
+            # The frame format is identified by its leading bytes, never by trial decoding
+            if is_binary_frame(data):
+                message = self._deserialize_binary(data)
+            else:
+                message = self._deserialize_json(data)
             
             # Validate message if enabled
             if self.enable_validation:
@@ -340,11 +339,7 @@ class MessageProtocol:
             
             # Track performance
             deserialization_time = time.time() - start_time
-            self.deserialization_times.append(deserialization_time)
-            
-            # Keep only recent measurements
-            if len(self.deserialization_times) > 1000:
-                self.deserialization_times = self.deserialization_times[-1000:]
+            self.deserialization_times.record(deserialization_time)
             
             self.logger.debug(f"📦 Deserialized message {message.metadata.id[:8]} ({len(data)} bytes, {deserialization_time:.3f}ms)")
             
@@ -355,6 +350,92 @@ class MessageProtocol:
             self.logger.error(f"❌ Deserialization failed: {e}")
             raise MessageDeserializationError(f"Failed to deserialize message: {e}") from e
     
+    def _serialize_binary(self, message: Message) -> bytes:
+        """Encode a message once into a binary frame"""
+        metadata = message.metadata
+        payload_data = self._encoder.encode(message.payload)
+        metadata.content_size = len(payload_data)
+        metadata.content_hash = hashlib.sha256(payload_data).hexdigest()[:16]
+        
+        metadata_data = self._encoder.encode([
+            metadata.id, metadata.timestamp_ns, metadata.sender, metadata.recipient,
+            metadata.correlation_id, metadata.reply_to, metadata.ttl, metadata.priority,
+            metadata.protocol_version, metadata.content_hash, metadata.content_size
+        ])
+        body = metadata_data + payload_data
+        
+        frame, codec = encode_frame(_MESSAGE_TYPE_CODES[metadata.type.value], body,
+                                    self._codec, self.compression_threshold)
+        if codec.codec_id:
+            self._record_compression_ratio(len(frame) / len(body))
+        metadata.compression = _COMPRESSION_BY_NAME.get(codec.name, metadata.compression)
+        return frame
+    
+    def _deserialize_binary(self, data: bytes) -> Message:
+        """Decode a binary frame"""
+        type_code, codec, body = decode_frame(data)
+        (message_id, timestamp_ns, sender, recipient, correlation_id, reply_to, ttl, priority,
+         protocol_version, content_hash, content_size), offset = self._encoder.decode_from(body, 0)
+        payload = self._encoder.decode(body[offset:])
+        
+        metadata = MessageMetadata(
+            id=message_id,
+            type=_MESSAGE_TYPES_BY_CODE[type_code],
+            timestamp_ns=timestamp_ns,
+            sender=sender,
+            recipient=recipient,
+            correlation_id=correlation_id,
+            reply_to=reply_to,
+            ttl=ttl,
+            priority=priority,
+            protocol_version=protocol_version,
+            compression=_COMPRESSION_BY_NAME.get(codec.name, CompressionType.NONE),
+            content_hash=content_hash,
+            content_size=content_size
+        )
+        return Message(metadata=metadata, payload=payload)
+    
+    def _serialize_json(self, message: Message) -> bytes:
+        """Encode a message as JSON, gzip-compressed when large enough to benefit"""
+        serialized_payload = self._serialize_payload(message.payload).encode('utf-8')
+        message.metadata.content_size = len(serialized_payload)
+        message.metadata.content_hash = hashlib.sha256(serialized_payload).hexdigest()[:16]
+        
+        # Splice the already-encoded payload into the envelope instead of encoding it again
+        metadata_data = json.dumps(asdict(message.metadata), default=self._json_serializer,
+                                   separators=(',', ':')).encode('utf-8')
+        final_data = b'{"metadata":' + metadata_data + b',"payload":' + serialized_payload + b'}'
+        
+        if self.enable_compression and len(final_data) > self.compression_threshold:
+            compressed_data = gzip.compress(final_data)
+            
+            # Only use compression if it actually reduces size; the gzip magic marks it
+            if len(compressed_data) < len(final_data):
+                self._record_compression_ratio(len(compressed_data) / len(final_data))
+                message.metadata.compression = CompressionType.GZIP
+                final_data = compressed_data
+        
+        return final_data
+    
+    def _record_compression_ratio(self, ratio: float):
+        """Track a compressed/uncompressed size ratio in constant memory"""
+        self.compression_ratios.append(ratio)
+        self.total_compressed += 1
+        self._compression_ratio_sum += ratio
+        self.best_compression_ratio = min(self.best_compression_ratio, ratio)
+    
+    def _deserialize_json(self, data: bytes) -> Message:
+        """Decode a JSON message, decompressing it first if it is gzipped"""
+        compressed = data[:2] == b'\x1f\x8b'  # GZIP magic number
+        if compressed:
+            data = gzip.decompress(data)
+        
+        message_dict = json.loads(data.decode('utf-8'), object_hook=self._json_deserializer)
+        message = Message.from_dict(message_dict, self._json_deserializer)
+        if compressed:
+            message.metadata.compression = CompressionType.GZIP
+        return message
+    
     def _serialize_payload(self, payload: Any) -> str:
         """Serialize payload to JSON string"""
         return json.dumps(payload, default=self._json_serializer, separators=(',', ':'))
@@ -448,7 +529,7 @@ class MessageProtocol:
             if not isinstance(message.metadata.type, MessageType):
                 raise MessageValidationError("Invalid message type")
             
-            if message.metadata.timestamp <= 0:
+            if message.metadata.timestamp_ns <= 0:
                 raise MessageValidationError("Invalid timestamp")
             
             if message.metadata.priority < 0:
@@ -469,33 +550,39 @@ class MessageProtocol:
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get protocol performance metrics"""
+        serialization = self.serialization_times.snapshot()
+        deserialization = self.deserialization_times.snapshot()
+        sizes = self.message_sizes.snapshot()
+        
         return {
             "serialization": {
-                "total_operations": len(self.serialization_times),
-                "average_time_ms": sum(self.serialization_times) / len(self.serialization_times) * 1000 if self.serialization_times else 0,
-                "min_time_ms": min(self.serialization_times) * 1000 if self.serialization_times else 0,
-                "max_time_ms": max(self.serialization_times) * 1000 if self.serialization_times else 0,
+                "total_operations": serialization.count,
+                "average_time_ms": serialization.mean * 1000,
+                "min_time_ms": serialization.min * 1000,
+                "max_time_ms": serialization.max * 1000,
+                "p99_time_ms": serialization.p99 * 1000,
                 "errors": self.serialization_errors
             },
             "deserialization": {
-                "total_operations": len(self.deserialization_times),
-                "average_time_ms": sum(self.deserialization_times) / len(self.deserialization_times) * 1000 if self.deserialization_times else 0,
-                "min_time_ms": min(self.deserialization_times) * 1000 if self.deserialization_times else 0,
-                "max_time_ms": max(self.deserialization_times) * 1000 if self.deserialization_times else 0,
+                "total_operations": deserialization.count,
+                "average_time_ms": deserialization.mean * 1000,
+                "min_time_ms": deserialization.min * 1000,
+                "max_time_ms": deserialization.max * 1000,
+                "p99_time_ms": deserialization.p99 * 1000,
                 "errors": self.deserialization_errors
             },
             "compression": {
-                "total_compressed": len(self.compression_ratios),
-                "average_compression_ratio": sum(self.compression_ratios) / len(self.compression_ratios) if self.compression_ratios else 1.0,
-                "best_compression_ratio": min(self.compression_ratios) if self.compression_ratios else 1.0,
+                "total_compressed": self.total_compressed,
+                "average_compression_ratio": self._compression_ratio_sum / self.total_compressed if self.total_compressed else 1.0,
+                "best_compression_ratio": self.best_compression_ratio,
                 "compression_threshold": self.compression_threshold,
                 "enabled": self.enable_compression
             },
             "messages": {
-                "total_processed": len(self.message_sizes),
-                "average_size_bytes": sum(self.message_sizes) / len(self.message_sizes) if self.message_sizes else 0,
-                "min_size_bytes": min(self.message_sizes) if self.message_sizes else 0,
-                "max_size_bytes": max(self.message_sizes) if self.message_sizes else 0,
+                "total_processed": sizes.count,
+                "average_size_bytes": sizes.mean,
+                "min_size_bytes": sizes.min,
+                "max_size_bytes": sizes.max,
                 "max_allowed_size": self.max_message_size
             },
             "validation": {
@@ -574,6 +661,7 @@ __all__ = [
     'MessageMetadata',
     'MessageType',
     'CompressionType',
+    'WireFormat',
     'MessageValidationError',
     'MessageSerializationError',
     'MessageDeserializationError',
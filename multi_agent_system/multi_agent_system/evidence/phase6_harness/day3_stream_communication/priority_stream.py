@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+PriorityStream: Priority-aware bounded stream for StreamFramework endpoints
+========================================================================
+
+Drop-in alternative to an AnyIO memory object stream pair that delivers
+higher-priority items first instead of in plain FIFO order.
+
+Key Features:
+- Per-priority FIFO sub-queues sharing one bounded capacity
+- Aging so low-priority items cannot be starved indefinitely
+- AnyIO-compatible send/receive halves (send, receive, *_nowait, aclose)
+- Per-priority depth and wait-time metrics
+"""
+
+import asyncio
+import anyio
+import time
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from collections import deque
+
+
+@dataclass
+class PriorityLevelMetrics:
+    """Metrics for a single priority level"""
+    enqueued: int = 0
+    dequeued: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    def record_dequeue(self, wait_time: float):
+        """Record an item leaving the queue after wait_time seconds"""
+        self.dequeued += 1
+        self.total_wait_time += wait_time
+        if wait_time > self.max_wait_time:
+            self.max_wait_time = wait_time
+
+    @property
+    def average_wait_time(self) -> float:
+        """Get average queueing time in seconds"""
+        return self.total_wait_time / self.dequeued if self.dequeued else 0.0
+
+
+@dataclass
+class PriorityStreamStatistics:
+    """Snapshot of a priority stream, mirroring AnyIO's stream statistics"""
+    current_buffer_used: int
+    max_buffer_size: int
+    depth_by_priority: Dict[int, int] = field(default_factory=dict)
+    aged_promotions: int = 0
+
+
+class PriorityMessageQueue:
+    """
+    Bounded multi-level queue shared by a PrioritySendStream/PriorityReceiveStream pair
+
+    Items are kept in one FIFO deque per priority level. A receive takes the
+    head of the level with the highest effective priority, where effective
+    priority is the base priority plus one level per aging_interval seconds
+    the head item has waited. Ties go to the higher base priority.
+
+    Senders blocked on a full queue are admitted in priority order too: each
+    freed slot is handed straight to the highest-priority waiting sender, so
+    bulk producers cannot keep a full queue away from control traffic.
+    """
+
+    def __init__(self, capacity: int = 1000, aging_interval: Optional[float] = 0.1):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.aging_interval = aging_interval
+
+        self._levels: Dict[int, deque] = {}  # priority -> deque of (enqueue_time, item)
+        self._size = 0
+        self._not_empty = asyncio.Event()
+        self._put_waiters: Dict[int, deque] = {}  # priority -> deque of futures
+        self._reserved = 0  # Slots granted to blocked senders that have not resumed yet
+
+        self.send_closed = False
+        self.receive_closed = False
+
+        self.level_metrics: Dict[int, PriorityLevelMetrics] = {}
+        self.aged_promotions = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put_nowait(self, item: Any, priority: int = 0):
+        """Add an item, raising anyio.WouldBlock if the queue is full"""
+        if self.receive_closed:
+            raise anyio.BrokenResourceError
+        if self.send_closed:
+            raise anyio.ClosedResourceError
+        if self._size + self._reserved >= self.capacity:
+            raise anyio.WouldBlock
+
+        self._append(item, priority, time.perf_counter())
+
+    async def put(self, item: Any, priority: int = 0):
+        """
+        Add an item, waiting for free capacity
+
+        A freed slot is reserved for the waiting sender, which enqueues its
+        item itself on resuming: a put() that raises CancelledError has never
+        enqueued, so retrying it cannot duplicate the item.
+        """
+        try:
+            self.put_nowait(item, priority)
+            return
+        except anyio.WouldBlock:
+            pass
+
+        enqueued_at = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._put_waiters.setdefault(priority, deque()).append(waiter)
+        try:
+            # Resolved by get_nowait() once a slot has been reserved for this sender
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted but cancelled before resuming: pass the slot on
+                self._reserved -= 1
+                self._admit_waiting_sender()
+            raise
+
+        self._reserved -= 1
+        if self.receive_closed:
+            raise anyio.BrokenResourceError
+        self._append(item, priority, enqueued_at)
+
+    def _append(self, item: Any, priority: int, enqueued_at: float):
+        """Insert an item into its priority level"""
+        level = self._levels.get(priority)
+        if level is None:
+            level = self._levels[priority] = deque()
+            self.level_metrics.setdefault(priority, PriorityLevelMetrics())
+        level.append((enqueued_at, item))
+
+        self.level_metrics[priority].enqueued += 1
+        self._size += 1
+        self._not_empty.set()
+
+    def _admit_waiting_sender(self):
+        """Reserve a freed slot for the highest-priority blocked sender"""
+        while self._put_waiters and self._size + self._reserved < self.capacity:
+            priority = max(self._put_waiters)
+            waiters = self._put_waiters[priority]
+            waiter = waiters.popleft()
+            if not waiters:
+                del self._put_waiters[priority]
+            if waiter.done():
+                continue  # Sender was cancelled while waiting
+            self._reserved += 1
+            waiter.set_result(None)
+            return
+
+    def get_nowait(self) -> Any:
+        """Remove the next item, raising anyio.WouldBlock (or EndOfStream once closed) if empty"""
+        if self._size == 0:
+            if self.send_closed:
+                raise anyio.EndOfStream
+            raise anyio.WouldBlock
+
+        now = time.perf_counter()
+        priority = self._select_level(now)
+        level = self._levels[priority]
+        enqueued_at, item = level.popleft()
+        if not level:
+            del self._levels[priority]
+
+        self.level_metrics[priority].record_dequeue(now - enqueued_at)
+        self._size -= 1
+        self._admit_waiting_sender()
+        if self._size == 0:
+            self._not_empty.clear()
+        return item
+
+    async def get(self) -> Any:
+        """Remove the next item, waiting until one is available"""
+        while True:
+            try:
+                return self.get_nowait()
+            except anyio.WouldBlock:
+                await self._not_empty.wait()
+
+    def _select_level(self, now: float) -> int:
+        """Pick the priority level whose head item should be delivered next"""
+        highest = max(self._levels)
+        if self.aging_interval is None or len(self._levels) == 1:
+            return highest
+
+        best_priority = highest
+        best_score = highest + (now - self._levels[highest][0][0]) / self.aging_interval
+        for priority, level in self._levels.items():
+            score = priority + (now - level[0][0]) / self.aging_interval
+            if score > best_score:
+                best_priority, best_score = priority, score
+
+        if best_priority != highest:
+            self.aged_promotions += 1
+        return best_priority
+
+    def close_send(self):
+        """Mark the sending side closed and wake blocked receivers"""
+        self.send_closed = True
+        self._not_empty.set()
+
+    def close_receive(self):
+        """Mark the receiving side closed and fail blocked senders"""
+        self.receive_closed = True
+        for waiters in self._put_waiters.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(anyio.BrokenResourceError())
+        self._put_waiters.clear()
+
+    def statistics(self) -> PriorityStreamStatistics:
+        """Get a snapshot of queue occupancy"""
+        return PriorityStreamStatistics(
+            current_buffer_used=self._size,
+            max_buffer_size=self.capacity,
+            depth_by_priority={priority: len(level) for priority, level in self._levels.items()},
+            aged_promotions=self.aged_promotions
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get per-priority depth and wait-time metrics"""
+        depths = {priority: len(level) for priority, level in self._levels.items()}
+        return {
+            "capacity": self.capacity,
+            "depth": self._size,
+            "aging_interval": self.aging_interval,
+            "aged_promotions": self.aged_promotions,
+            "priorities": {
+                priority: {
+                    "depth": depths.get(priority, 0),
+                    "enqueued": metrics.enqueued,
+                    "dequeued": metrics.dequeued,
+                    "average_wait_ms": metrics.average_wait_time * 1000,
+                    "max_wait_ms": metrics.max_wait_time * 1000
+                }
+                for priority, metrics in sorted(self.level_metrics.items(), reverse=True)
+            }
+        }
+
+
+class PrioritySendStream:
+    """Sending half of a priority stream"""
+
+    def __init__(self, queue: PriorityMessageQueue):
+        self.queue = queue
+
+    async def send(self, item: Any, priority: int = 0):
+        """Send an item at the given priority, waiting for capacity"""
+        await self.queue.put(item, priority)
+
+    def send_nowait(self, item: Any, priority: int = 0):
+        """Send an item without waiting, raising anyio.WouldBlock when full"""
+        self.queue.put_nowait(item, priority)
+
+    async def aclose(self):
+        """Close the sending side"""
+        self.queue.close_send()
+
+    def statistics(self) -> PriorityStreamStatistics:
+        return self.queue.statistics()
+
+
+class PriorityReceiveStream:
+    """Receiving half of a priority stream"""
+
+    def __init__(self, queue: PriorityMessageQueue):
+        self.queue = queue
+
+    async def receive(self) -> Any:
+        """Receive the next item in priority order"""
+        return await self.queue.get()
+
+    def receive_nowait(self) -> Any:
+        """Receive without waiting, raising anyio.WouldBlock when empty"""
+        return self.queue.get_nowait()
+
+    async def aclose(self):
+        """Close the receiving side"""
+        self.queue.close_receive()
+
+    def statistics(self) -> PriorityStreamStatistics:
+        return self.queue.statistics()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.receive()
+        except anyio.EndOfStream:
+            raise StopAsyncIteration
+
+
+def create_priority_stream(capacity: int = 1000,
+                           aging_interval: Optional[float] = 0.1) -> Tuple[PrioritySendStream, PriorityReceiveStream]:
+    """
+    Create a connected priority stream pair
+
+    Args:
+        capacity: Maximum number of queued items across all priorities
+        aging_interval: Seconds of waiting that raise an item by one priority
+            level (None disables aging)
+
+    Returns:
+        Tuple of (send_stream, receive_stream)
+    """
+    queue = PriorityMessageQueue(capacity=capacity, aging_interval=aging_interval)
+    return PrioritySendStream(queue), PriorityReceiveStream(queue)
+
+
+# Export main classes
+__all__ = [
+    'PriorityMessageQueue',
+    'PrioritySendStream',
+    'PriorityReceiveStream',
+    'PriorityLevelMetrics',
+    'PriorityStreamStatistics',
+    'create_priority_stream'
+]
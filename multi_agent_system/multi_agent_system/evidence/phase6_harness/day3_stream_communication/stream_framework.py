@@ -14,6 +14,7 @@ Key Features:
 - Error handling and recovery mechanisms
 - Performance monitoring and optimization
 - Flow control and backpressure management
+- Priority-ordered delivery over PriorityStream endpoints
 """
 
 import asyncio
@@ -34,6 +35,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 from evidence.phase6_harness.day3_stream_communication.message_protocol import (
     MessageProtocol, Message, MessageType, MessageMetadata
 )
+from evidence.phase6_harness.day1_harness_component.harness_metrics import RingBuffer, RollingMetric
+from evidence.phase6_harness.day3_stream_communication.priority_stream import (
+    PrioritySendStream, PriorityReceiveStream, create_priority_stream
+)
 
 
 class StreamState(Enum):
@@ -64,65 +69,58 @@ class StreamMetrics:
     bytes_received: int = 0
     send_errors: int = 0
     receive_errors: int = 0
-    send_times: List[float] = field(default_factory=list)
-    receive_times: List[float] = field(default_factory=list)
-    queue_depths: List[int] = field(default_factory=list)
+    send_times: RollingMetric = field(default_factory=RollingMetric)
+    receive_times: RollingMetric = field(default_factory=RollingMetric)
+    queue_depths: RingBuffer = field(default_factory=lambda: RingBuffer(100))
+    first_activity: Optional[float] = None
     last_activity: float = field(default_factory=time.time)
     
-    def record_send(self, message_size: int, send_time: float):
+    def record_send(self, message_size: int, send_time: float, message_count: int = 1):
         """Record a successful send operation"""
-        self.messages_sent += 1
+        self.messages_sent += message_count
         self.bytes_sent += message_size
-        self.send_times.append(send_time)
-        self.last_activity = time.time()
-        
-        # Keep only recent measurements
-        if len(self.send_times) > 1000:
-            self.send_times = self.send_times[-1000:]
+        self.send_times.record(send_time)
+        self._touch()
     
-    def record_receive(self, message_size: int, receive_time: float):
+    def record_receive(self, message_size: int, receive_time: float, message_count: int = 1):
         """Record a successful receive operation"""
-        self.messages_received += 1
+        self.messages_received += message_count
         self.bytes_received += message_size
-        self.receive_times.append(receive_time)
-        self.last_activity = time.time()
-        
-        # Keep only recent measurements
-        if len(self.receive_times) > 1000:
-            self.receive_times = self.receive_times[-1000:]
+        self.receive_times.record(receive_time)
+        self._touch()
+    
+    def _touch(self):
+        now = time.time()
+        if self.first_activity is None:
+            self.first_activity = now
+        self.last_activity = now
     
     def record_queue_depth(self, depth: int):
         """Record queue depth for monitoring"""
         self.queue_depths.append(depth)
-        if len(self.queue_depths) > 100:
-            self.queue_depths = self.queue_depths[-100:]
     
     @property
     def average_send_time(self) -> float:
-        """Get average send time in seconds"""
-        return sum(self.send_times) / len(self.send_times) if self.send_times else 0.0
+        """Get average send time in seconds over the recent window"""
+        return self.send_times.window.mean
     
     @property
     def average_receive_time(self) -> float:
-        """Get average receive time in seconds"""
-        return sum(self.receive_times) / len(self.receive_times) if self.receive_times else 0.0
+        """Get average receive time in seconds over the recent window"""
+        return self.receive_times.window.mean
     
     @property
     def average_queue_depth(self) -> float:
         """Get average queue depth"""
-        return sum(self.queue_depths) / len(self.queue_depths) if self.queue_depths else 0.0
+        return self.queue_depths.mean
     
     @property
     def throughput_messages_per_second(self) -> float:
-        """Calculate throughput in messages per second"""
-        if not self.send_times and not self.receive_times:
+        """Calculate throughput in messages per second since the first operation"""
+        if self.first_activity is None:
             return 0.0
         
-        all_times = self.send_times + self.receive_times
-        if len(all_times) < 2:
-            return 0.0
-        
-        duration = max(all_times) - min(all_times)
+        duration = self.last_activity - self.first_activity
         total_messages = self.messages_sent + self.messages_received
         
         return total_messages / duration if duration > 0 else 0.0
@@ -134,12 +132,17 @@ class StreamEndpoint:
     name: str
     component: str
     stream_type: str  # 'send' or 'receive'
-    stream: Union[MemoryObjectSendStream, MemoryObjectReceiveStream]
+    stream: Union[MemoryObjectSendStream, MemoryObjectReceiveStream, PrioritySendStream, PriorityReceiveStream]
     state: StreamState = StreamState.CREATED
     metrics: StreamMetrics = field(default_factory=StreamMetrics)
     filters: List[Callable[[Message], bool]] = field(default_factory=list)
     flow_control: FlowControlMode = FlowControlMode.BACKPRESSURE
     max_queue_size: int = 1000
+    max_batch_size: int = 1  # > 1 enables auto-coalescing of sends
+    linger_time: float = 0.005
+    send_buffer: List[Message] = field(default_factory=list)
+    linger_task: Optional[asyncio.Task] = None
+    pending_messages: deque = field(default_factory=deque)  # Unpacked batch items
 
 
 class StreamOperationError(Exception):
@@ -214,7 +217,8 @@ class StreamFramework:
     def register_endpoint(self, 
                          name: str,
                          component: str,
-                         stream: Union[MemoryObjectSendStream, MemoryObjectReceiveStream],
+                         stream: Union[MemoryObjectSendStream, MemoryObjectReceiveStream,
+                                       PrioritySendStream, PriorityReceiveStream],
                          flow_control: FlowControlMode = FlowControlMode.BACKPRESSURE,
                          max_queue_size: int = 1000) -> str:
         """
@@ -223,7 +227,7 @@ class StreamFramework:
         Args:
             name: Unique name for the endpoint
             component: Component that owns this endpoint
-            stream: AnyIO stream object
+            stream: AnyIO stream object or PriorityStream half
             flow_control: Flow control mode
             max_queue_size: Maximum queue size for flow control
             
@@ -234,7 +238,7 @@ class StreamFramework:
             raise StreamOperationError(f"Endpoint '{name}' already registered")
         
         # Determine stream type
-        stream_type = "send" if isinstance(stream, MemoryObjectSendStream) else "receive"
+        stream_type = "send" if isinstance(stream, (MemoryObjectSendStream, PrioritySendStream)) else "receive"
         
         endpoint = StreamEndpoint(
             name=name,
@@ -256,6 +260,36 @@ class StreamFramework:
         self.logger.info(f"📍 Registered {stream_type} endpoint '{name}' for component '{component}'")
         return name
     
+    def create_priority_channel(self,
+                                send_name: str,
+                                receive_name: str,
+                                sender: str,
+                                receiver: str,
+                                capacity: int = 1000,
+                                aging_interval: Optional[float] = 0.1) -> Tuple[str, str]:
+        """
+        Create and register a priority-ordered endpoint pair
+        
+        Messages sent on the send endpoint are received highest priority
+        first; aging_interval bounds how long lower priorities can starve.
+        
+        Args:
+            send_name: Name for the send endpoint
+            receive_name: Name for the receive endpoint
+            sender: Component owning the send endpoint
+            receiver: Component owning the receive endpoint
+            capacity: Maximum queued messages across all priorities
+            aging_interval: Seconds of waiting that raise a message one priority level
+            
+        Returns:
+            Tuple of (send endpoint ID, receive endpoint ID)
+        """
+        send_stream, receive_stream = create_priority_stream(capacity, aging_interval)
+        send_id = self.register_endpoint(send_name, sender, send_stream, max_queue_size=capacity)
+        receive_id = self.register_endpoint(receive_name, receiver, receive_stream, max_queue_size=capacity)
+        self.connections[f"{send_name}->{receive_name}"] = (send_id, receive_id)
+        return send_id, receive_id
+    
     def unregister_endpoint(self, name: str):
         """Unregister a stream endpoint"""
         if name not in self.endpoints:
@@ -313,6 +347,29 @@ class StreamFramework:
         self.endpoints[endpoint].filters.append(filter_func)
         self.logger.info(f"🔍 Added filter to endpoint '{endpoint}'")
     
+    def configure_batching(self, endpoint: str, max_batch_size: int, linger_time: float = 0.005):
+        """
+        Coalesce messages sent through an endpoint into batch messages
+        
+        Args:
+            endpoint: Send endpoint name
+            max_batch_size: Number of buffered messages that triggers a flush
+            linger_time: Maximum seconds a partial batch waits before flushing
+        """
+        if endpoint not in self.endpoints:
+            raise StreamOperationError(f"Endpoint '{endpoint}' not found")
+        
+        endpoint_obj = self.endpoints[endpoint]
+        if endpoint_obj.stream_type != "send":
+            raise StreamOperationError(f"Endpoint '{endpoint}' is not a send endpoint")
+        
+        if max_batch_size < 1:
+            raise StreamOperationError("max_batch_size must be at least 1")
+        
+        endpoint_obj.max_batch_size = max_batch_size
+        endpoint_obj.linger_time = linger_time
+        self.logger.info(f"📦 Batching on endpoint '{endpoint}': size={max_batch_size}, linger={linger_time}s")
+    
     def add_global_filter(self, filter_func: Callable[[Message], bool]):
         """Add a global message filter"""
         self.global_filters.append(filter_func)
@@ -370,29 +427,23 @@ class StreamFramework:
                 self.logger.debug(f"🔍 Message filtered out at endpoint '{endpoint}'")
                 return False
             
+            # Coalesce into a batch when enabled
+            if endpoint_obj.max_batch_size > 1:
+                endpoint_obj.send_buffer.append(message)
+                if len(endpoint_obj.send_buffer) >= endpoint_obj.max_batch_size:
+                    return await self._flush_endpoint(endpoint_obj, timeout)
+                
+                if endpoint_obj.linger_task is None:
+                    endpoint_obj.linger_task = asyncio.create_task(
+                        self._linger_flush(endpoint_obj, timeout),
+                        name=f"linger_{endpoint}"
+                    )
+                return True
+            
             # Check flow control
             await self._check_flow_control(endpoint)
             
-            # Serialize message
-            start_time = time.time()
-            serialized = self.message_protocol.serialize(message)
-            
-            # Send with timeout and retries
-            success = await self._send_with_retries(endpoint_obj, serialized, timeout)
-            
-            if success:
-                # Update metrics
-                send_time = time.time() - start_time
-                if self.enable_metrics:
-                    endpoint_obj.metrics.record_send(len(serialized), send_time)
-                
-                # Handle routing
-                await self._route_message(endpoint, message)
-                
-                self.logger.debug(f"📤 Message sent via '{endpoint}': {message.metadata.id[:8]}")
-                return True
-            else:
-                return False
+            return await self._send_messages(endpoint_obj, [message], timeout)
                 
         except Exception as e:
             if self.enable_metrics:
@@ -403,6 +454,163 @@ class StreamFramework:
             self.logger.error(f"❌ Failed to send message via '{endpoint}': {e}")
             return False
     
+    async def send_many(self,
+                        endpoint: str,
+                        payloads: List[Any],
+                        message_type: MessageType = MessageType.DATA,
+                        recipient: Optional[str] = None,
+                        timeout: Optional[float] = None,
+                        priority: int = 0) -> bool:
+        """
+        Send several payloads as a single batch message
+        
+        The batch is serialized and sent once; receive_message() on the other
+        end unpacks it and returns the individual messages in order.
+        
+        Args:
+            endpoint: Endpoint name
+            payloads: Message payloads, in order
+            message_type: Type of each message
+            recipient: Recipient component name
+            timeout: Send timeout (uses default if None)
+            priority: Message priority
+            
+        Returns:
+            True if the batch was sent successfully
+        """
+        if endpoint not in self.endpoints:
+            raise StreamOperationError(f"Endpoint '{endpoint}' not found")
+        
+        endpoint_obj = self.endpoints[endpoint]
+        
+        if endpoint_obj.stream_type != "send":
+            raise StreamOperationError(f"Endpoint '{endpoint}' is not a send endpoint")
+        
+        if endpoint_obj.state != StreamState.CONNECTED:
+            raise StreamClosedError(f"Endpoint '{endpoint}' is not connected")
+        
+        if endpoint in self.failed_endpoints:
+            raise StreamOperationError(f"Endpoint '{endpoint}' has failed")
+        
+        timeout = timeout or self.default_timeout
+        
+        try:
+            messages = []
+            for payload in payloads:
+                message = self.message_protocol.create_message(
+                    payload=payload,
+                    message_type=message_type,
+                    sender=endpoint_obj.component,
+                    recipient=recipient,
+                    priority=priority
+                )
+                if await self._apply_filters(message, endpoint):
+                    messages.append(message)
+            
+            # Anything already coalescing goes first to keep ordering
+            if endpoint_obj.send_buffer:
+                messages = endpoint_obj.send_buffer + messages
+                endpoint_obj.send_buffer = []
+                self._cancel_linger_task(endpoint_obj)
+            
+            if not messages:
+                return True
+            
+            await self._check_flow_control(endpoint)
+            return await self._send_messages(endpoint_obj, messages, timeout)
+            
+        except Exception as e:
+            if self.enable_metrics:
+                endpoint_obj.metrics.send_errors += 1
+            
+            await self._handle_error(e, endpoint)
+            self.logger.error(f"❌ Failed to send batch via '{endpoint}': {e}")
+            return False
+    
+    async def flush(self, endpoint: Optional[str] = None) -> bool:
+        """Send partially filled batches now (all endpoints if none is given)"""
+        names = [endpoint] if endpoint else list(self.endpoints.keys())
+        results = []
+        for name in names:
+            endpoint_obj = self.endpoints.get(name)
+            if endpoint_obj is not None and endpoint_obj.send_buffer:
+                results.append(await self._flush_endpoint(endpoint_obj, self.default_timeout))
+        return all(results)
+    
+    async def _send_messages(self, endpoint_obj: StreamEndpoint, messages: List[Message], timeout: float) -> bool:
+        """Send messages in order, one frame per run of messages sharing a priority"""
+        start = 0
+        while start < len(messages):
+            priority = messages[start].metadata.priority
+            end = start + 1
+            while end < len(messages) and messages[end].metadata.priority == priority:
+                end += 1
+            if not await self._send_frame(endpoint_obj, messages[start:end], timeout, priority):
+                return False
+            start = end
+        return True
+    
+    async def _send_frame(self, endpoint_obj: StreamEndpoint, messages: List[Message],
+                          timeout: float, priority: int) -> bool:
+        """Serialize one message, or a batch of several, and send it as one frame"""
+        start_time = time.time()
+        
+        if len(messages) == 1:
+            frame = messages[0]
+        else:
+            frame = self.message_protocol.create_batch_message(messages, sender=endpoint_obj.component)
+        serialized = self.message_protocol.serialize(frame)
+        
+        # Send with timeout and retries
+        success = await self._send_with_retries(endpoint_obj, serialized, timeout, priority)
+        if not success:
+            return False
+        
+        # Update metrics
+        send_time = time.time() - start_time
+        if self.enable_metrics:
+            endpoint_obj.metrics.record_send(len(serialized), send_time, message_count=len(messages))
+        
+        # Handle routing
+        for message in messages:
+            await self._route_message(endpoint_obj.name, message)
+        
+        self.logger.debug(f"📤 {len(messages)} message(s) sent via '{endpoint_obj.name}': {frame.metadata.id[:8]}")
+        return True
+    
+    async def _flush_endpoint(self, endpoint_obj: StreamEndpoint, timeout: float) -> bool:
+        """Send the buffered messages of an endpoint as one batch"""
+        self._cancel_linger_task(endpoint_obj)
+        
+        if not endpoint_obj.send_buffer:
+            return True
+        
+        messages = endpoint_obj.send_buffer
+        endpoint_obj.send_buffer = []
+        
+        try:
+            await self._check_flow_control(endpoint_obj.name)
+            return await self._send_messages(endpoint_obj, messages, timeout)
+        except Exception as e:
+            if self.enable_metrics:
+                endpoint_obj.metrics.send_errors += 1
+            await self._handle_error(e, endpoint_obj.name)
+            self.logger.error(f"❌ Failed to flush batch via '{endpoint_obj.name}': {e}")
+            return False
+    
+    async def _linger_flush(self, endpoint_obj: StreamEndpoint, timeout: float):
+        """Flush a partial batch once it has waited for the linger time"""
+        await asyncio.sleep(endpoint_obj.linger_time)
+        endpoint_obj.linger_task = None
+        await self._flush_endpoint(endpoint_obj, timeout)
+    
+    def _cancel_linger_task(self, endpoint_obj: StreamEndpoint):
+        """Cancel a pending linger flush unless it is the caller"""
+        task = endpoint_obj.linger_task
+        endpoint_obj.linger_task = None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+    
     async def receive_message(self, 
                              endpoint: str,
                              timeout: Optional[float] = None) -> Optional[Message]:
@@ -430,6 +638,10 @@ class StreamFramework:
         if endpoint in self.failed_endpoints:
             raise StreamOperationError(f"Endpoint '{endpoint}' has failed")
         
+        # Messages left over from an unpacked batch come first
+        if endpoint_obj.pending_messages:
+            return await self._take_pending(endpoint_obj)
+        
         timeout = timeout or self.default_timeout
         
         try:
@@ -444,6 +656,16 @@ class StreamFramework:
             
             # Deserialize message
             message = self.message_protocol.deserialize(serialized)
+            message_count = 1
+            
+            # Unpack batches, keeping the remainder for later calls
+            if message.metadata.type == MessageType.BATCH:
+                batch = self.message_protocol.extract_batch_messages(message)
+                message_count = len(batch)
+                if not batch:
+                    return None
+                message = batch[0]
+                endpoint_obj.pending_messages.extend(batch[1:])
             
             # Apply filters
             if not await self._apply_filters(message, endpoint):
@@ -453,7 +675,7 @@ class StreamFramework:
             # Update metrics
             receive_time = time.time() - start_time
             if self.enable_metrics:
-                endpoint_obj.metrics.record_receive(len(serialized), receive_time)
+                endpoint_obj.metrics.record_receive(len(serialized), receive_time, message_count=message_count)
             
             self.logger.debug(f"📥 Message received via '{endpoint}': {message.metadata.id[:8]}")
             return message
@@ -470,6 +692,78 @@ class StreamFramework:
             self.logger.error(f"❌ Failed to receive message via '{endpoint}': {e}")
             return None
     
+    async def receive_many(self,
+                           endpoint: str,
+                           max_items: int = 100,
+                           max_wait: Optional[float] = None) -> List[Message]:
+        """
+        Receive up to max_items messages in one call
+        
+        Waits up to max_wait seconds (default timeout if None) for the first
+        message, then takes whatever else is already available without waiting.
+        
+        Args:
+            endpoint: Endpoint name
+            max_items: Maximum number of messages to return
+            max_wait: Seconds to wait for the first message
+            
+        Returns:
+            List of received messages, empty if nothing arrived in time
+        """
+        if endpoint not in self.endpoints:
+            raise StreamOperationError(f"Endpoint '{endpoint}' not found")
+        
+        endpoint_obj = self.endpoints[endpoint]
+        messages: List[Message] = []
+        
+        if not endpoint_obj.pending_messages:
+            first = await self.receive_message(endpoint, timeout=max_wait)
+            if first is None:
+                return messages
+            messages.append(first)
+        
+        while len(messages) < max_items:
+            if endpoint_obj.pending_messages:
+                message = await self._take_pending(endpoint_obj)
+            else:
+                try:
+                    serialized = endpoint_obj.stream.receive_nowait()
+                except (anyio.WouldBlock, anyio.EndOfStream, anyio.ClosedResourceError):
+                    break
+                message = await self._accept_frame(endpoint_obj, serialized)
+            
+            if message is not None:
+                messages.append(message)
+        
+        return messages
+    
+    async def _take_pending(self, endpoint_obj: StreamEndpoint) -> Optional[Message]:
+        """Return the next message of an already unpacked batch"""
+        message = endpoint_obj.pending_messages.popleft()
+        if not await self._apply_filters(message, endpoint_obj.name):
+            return None
+        return message
+    
+    async def _accept_frame(self, endpoint_obj: StreamEndpoint, serialized: bytes) -> Optional[Message]:
+        """Deserialize a frame received without waiting, unpacking batches"""
+        message = self.message_protocol.deserialize(serialized)
+        message_count = 1
+        
+        if message.metadata.type == MessageType.BATCH:
+            batch = self.message_protocol.extract_batch_messages(message)
+            message_count = len(batch)
+            if not batch:
+                return None
+            message = batch[0]
+            endpoint_obj.pending_messages.extend(batch[1:])
+        
+        if self.enable_metrics:
+            endpoint_obj.metrics.record_receive(len(serialized), 0.0, message_count=message_count)
+        
+        if not await self._apply_filters(message, endpoint_obj.name):
+            return None
+        return message
+    
     async def broadcast_message(self, 
                                endpoints: List[str],
                                payload: Any,
@@ -568,12 +862,16 @@ class StreamFramework:
     async def _send_with_retries(self, 
                                 endpoint: StreamEndpoint,
                                 data: bytes,
-                                timeout: float) -> bool:
+                                timeout: float,
+                                priority: int = 0) -> bool:
         """Send with retry logic"""
         for attempt in range(self.max_retries + 1):
             try:
                 with anyio.fail_after(timeout):
-                    await endpoint.stream.send(data)
+                    if isinstance(endpoint.stream, PrioritySendStream):
+                        await endpoint.stream.send(data, priority)
+                    else:
+                        await endpoint.stream.send(data)
                 return True
                 
             except Exception as e:
@@ -633,7 +931,7 @@ class StreamFramework:
         endpoint_obj = self.endpoints[endpoint]
         metrics = endpoint_obj.metrics
         
-        return {
+        endpoint_metrics = {
             "endpoint": endpoint,
             "component": endpoint_obj.component,
             "type": endpoint_obj.stream_type,
@@ -646,10 +944,18 @@ class StreamFramework:
             "receive_errors": metrics.receive_errors,
             "average_send_time_ms": metrics.average_send_time * 1000,
             "average_receive_time_ms": metrics.average_receive_time * 1000,
+            "send_time_p99_ms": metrics.send_times.snapshot().p99 * 1000,
+            "receive_time_p99_ms": metrics.receive_times.snapshot().p99 * 1000,
             "average_queue_depth": metrics.average_queue_depth,
             "throughput_msg_per_sec": metrics.throughput_messages_per_second,
             "last_activity": metrics.last_activity
         }
+        
+        # Per-priority depth and wait times for priority endpoints
+        if isinstance(endpoint_obj.stream, (PrioritySendStream, PriorityReceiveStream)):
+            endpoint_metrics["priority_queue"] = endpoint_obj.stream.queue.get_metrics()
+        
+        return endpoint_metrics
     
     def get_framework_metrics(self) -> Dict[str, Any]:
         """Get overall framework metrics"""
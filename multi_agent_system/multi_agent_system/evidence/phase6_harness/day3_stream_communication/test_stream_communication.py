@@ -10,20 +10,25 @@ Tests cover:
 - Performance characteristics
 """
 
+import asyncio
 import pytest
 import anyio
 import time
 import json
 import gzip
+import random
+from datetime import datetime, timezone, timedelta
 from typing import Any, Dict
 
 from message_protocol import (
-    MessageProtocol, Message, MessageType, CompressionType,
+    MessageProtocol, Message, MessageType, CompressionType, WireFormat,
     MessageSerializationError, MessageDeserializationError
 )
+from binary_codec import BinaryEncoder, BinaryCodecError, decode_frame
 from stream_framework import (
     StreamFramework, StreamOperationError, MessageFilterError
 )
+from priority_stream import create_priority_stream
 
 
 class TestMessageProtocol:
@@ -47,7 +52,7 @@ class TestMessageProtocol:
     
     def test_json_serialization(self):
         """Test JSON serialization and deserialization"""
-        protocol = MessageProtocol()  # JSON is the default format
+        protocol = MessageProtocol(wire_format=WireFormat.JSON)
         
         message = protocol.create_message(
             payload={"number": 42, "text": "hello", "list": [1, 2, 3]},
@@ -209,6 +214,117 @@ class TestMessageProtocol:
         assert stats['messages']['average_size_bytes'] > 0
 
 
+def _random_value(rng: random.Random, depth: int = 0) -> Any:
+    """Build a random nested value from the types both wire formats support"""
+    scalar_makers = [
+        lambda: None,
+        lambda: rng.random() < 0.5,
+        lambda: rng.randint(-2**70, 2**70) if rng.random() < 0.2 else rng.randint(-1000, 1000),
+        lambda: rng.uniform(-1e12, 1e12),
+        lambda: "".join(chr(rng.choice([rng.randint(32, 126), rng.randint(0x400, 0x4ff), 0x1f600]))
+                        for _ in range(rng.randint(0, 20))),
+        lambda: bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 32))),
+        lambda: datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=rng.randint(-12, 12))))
+                + timedelta(seconds=rng.randint(0, 10**8), microseconds=rng.randint(0, 999999)),
+        lambda: rng.choice(list(MessageType)),
+        lambda: {rng.randint(0, 100) for _ in range(rng.randint(0, 5))},
+    ]
+    if depth >= 3 or rng.random() < 0.4:
+        return rng.choice(scalar_makers)()
+    if rng.random() < 0.5:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 6))]
+    return {f"k{rng.randint(0, 10**6)}": _random_value(rng, depth + 1) for _ in range(rng.randint(0, 6))}
+
+
+class TestBinaryFrames:
+    """Test the binary frame format and compression codecs"""
+    
+    def test_binary_round_trip_fuzz(self):
+        """Random nested payloads survive a binary round trip unchanged"""
+        rng = random.Random(1234)
+        encoder = BinaryEncoder({"MessageType": MessageType})
+        protocol = MessageProtocol(compression_threshold=64)
+        
+        for _ in range(300):
+            value = _random_value(rng)
+            assert encoder.decode(encoder.encode(value)) == value
+            
+            message = protocol.create_message(payload={"value": value}, priority=rng.randint(0, 9),
+                                              ttl=rng.choice([None, 60.0]))
+            decoded = protocol.deserialize(protocol.serialize(message))
+            assert decoded.payload == message.payload
+            assert decoded.metadata == message.metadata
+    
+    def test_codec_is_read_from_header(self):
+        """Each codec is recorded in the header and decoded without trial and error"""
+        payload = {"text": "compressible " * 200, "numbers": list(range(200))}
+        frames = {}
+        
+        for compression in [CompressionType.NONE, CompressionType.ZLIB, CompressionType.LZMA, CompressionType.GZIP]:
+            protocol = MessageProtocol(compression=compression, compression_threshold=100, compression_level=6)
+            message = protocol.create_message(payload=payload)
+            frames[compression] = protocol.serialize(message)
+            assert message.metadata.compression == compression
+            
+            _, codec, _ = decode_frame(frames[compression])
+            assert codec.name == compression.value
+            
+            # Any protocol instance can decode any codec
+            assert MessageProtocol().deserialize(frames[compression]).payload == payload
+        
+        assert len(frames[CompressionType.ZLIB]) < len(frames[CompressionType.NONE])
+        assert len(frames[CompressionType.LZMA]) < len(frames[CompressionType.NONE])
+    
+    def test_formats_interoperate_and_reject_garbage(self):
+        """A protocol decodes both wire formats and rejects malformed frames"""
+        binary = MessageProtocol()
+        legacy = MessageProtocol(wire_format=WireFormat.JSON)
+        payload = {"id": 7, "tags": ["a", "b"], "raw": b"\x00\x01"}
+        
+        assert binary.deserialize(legacy.serialize(legacy.create_message(payload=payload))).payload == payload
+        frame = binary.serialize(binary.create_message(payload=payload))
+        assert legacy.deserialize(frame).payload == payload
+        
+        # Tuples travel as lists, as with JSON
+        assert BinaryEncoder().decode(BinaryEncoder().encode((1, 2))) == [1, 2]
+        
+        with pytest.raises(BinaryCodecError):
+            BinaryEncoder().encode(complex(1, 2))
+        for corrupt in [frame[:-1], frame[:5], frame[:2] + b"\x09" + frame[3:]]:
+            with pytest.raises(MessageDeserializationError):
+                binary.deserialize(corrupt)
+    
+    
+    def test_corrupt_compressed_body_and_bounded_stats(self):
+        """Bad compressed bodies raise BinaryCodecError and ratio tracking stays bounded"""
+        protocol = MessageProtocol(compression=CompressionType.ZLIB, compression_threshold=10)
+        frame = protocol.serialize(protocol.create_message(payload={"text": "compressible " * 50}))
+        _, codec, _ = decode_frame(frame)
+        assert codec.name == "zlib"
+        
+        corrupt = frame[:-8] + b"\xff" * 8
+        with pytest.raises(BinaryCodecError):
+            decode_frame(corrupt)
+        
+        for _ in range(1500):
+            protocol.serialize(protocol.create_message(payload={"text": "compressible " * 50}))
+        metrics = protocol.get_performance_metrics()["compression"]
+        assert metrics["total_compressed"] == 1501
+        assert len(protocol.compression_ratios) == 1000
+        assert metrics["best_compression_ratio"] < metrics["average_compression_ratio"] * 1.01
+    
+    def test_json_payload_encoded_once(self):
+        """The JSON envelope embeds the same payload bytes that were hashed"""
+        protocol = MessageProtocol(wire_format=WireFormat.JSON, enable_compression=False)
+        message = protocol.create_message(payload={"id": 1, "when": datetime(2024, 1, 1, tzinfo=timezone.utc)})
+        data = protocol.serialize(message)
+        
+        envelope = json.loads(data)
+        payload_bytes = json.dumps(envelope["payload"], separators=(',', ':')).encode('utf-8')
+        assert message.metadata.content_size == len(payload_bytes)
+        assert protocol.deserialize(data).payload == message.payload
+
+
 class TestStreamFramework:
     """Test StreamFramework functionality"""
     
@@ -406,6 +522,189 @@ class TestStreamFramework:
             framework.create_broadcast_group("bad_group", ["non-existent"])
 
 
+class TestBatchedStreaming:
+    """Test batched send/receive on StreamFramework endpoints"""
+    
+    async def test_send_many_receive_individually(self):
+        """Test that a batch sent with send_many unpacks in order"""
+        framework = StreamFramework()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=10)
+        framework.register_endpoint("output", "producer", send_stream)
+        framework.register_endpoint("input", "consumer", receive_stream)
+        
+        assert await framework.send_many("output", [{"n": i} for i in range(5)])
+        
+        # One frame on the wire, five messages to the reader
+        assert receive_stream.statistics().current_buffer_used == 1
+        received = [await framework.receive_message("input") for _ in range(5)]
+        assert [m.payload["n"] for m in received] == list(range(5))
+        assert framework.endpoints["output"].metrics.messages_sent == 5
+    
+    async def test_receive_many(self):
+        """Test draining several messages in one call"""
+        framework = StreamFramework()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=10)
+        framework.register_endpoint("output", "producer", send_stream)
+        framework.register_endpoint("input", "consumer", receive_stream)
+        
+        await framework.send_many("output", [{"n": i} for i in range(3)])
+        await framework.send_message("output", {"n": 3})
+        
+        received = await framework.receive_many("input", max_items=10, max_wait=0.5)
+        assert [m.payload["n"] for m in received] == [0, 1, 2, 3]
+        
+        # Nothing left: returns empty after max_wait
+        assert await framework.receive_many("input", max_items=10, max_wait=0.05) == []
+    
+    async def test_auto_batching_flushes(self):
+        """Test size-triggered and linger-triggered flushes"""
+        framework = StreamFramework()
+        
+        send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=10)
+        framework.register_endpoint("output", "producer", send_stream)
+        framework.register_endpoint("input", "consumer", receive_stream)
+        framework.configure_batching("output", max_batch_size=3, linger_time=0.02)
+        
+        for i in range(4):
+            assert await framework.send_message("output", {"n": i})
+        
+        # First three went out as one batch, the fourth is lingering
+        assert receive_stream.statistics().current_buffer_used == 1
+        await anyio.sleep(0.1)
+        assert receive_stream.statistics().current_buffer_used == 2
+        
+        received = await framework.receive_many("input", max_items=10, max_wait=0.5)
+        assert [m.payload["n"] for m in received] == [0, 1, 2, 3]
+
+
+class TestPriorityStreaming:
+    """Test priority-ordered delivery"""
+    
+    async def test_priority_order_within_capacity(self):
+        """Higher priorities are received first, FIFO within a level"""
+        send_stream, receive_stream = create_priority_stream(capacity=10, aging_interval=None)
+        
+        for item, priority in [("d1", 0), ("d2", 0), ("c1", 9), ("h1", 5), ("c2", 9)]:
+            await send_stream.send(item, priority)
+        
+        received = [await receive_stream.receive() for _ in range(5)]
+        assert received == ["c1", "c2", "h1", "d1", "d2"]
+        
+        stats = receive_stream.statistics()
+        assert stats.current_buffer_used == 0
+        assert stats.max_buffer_size == 10
+    
+    async def test_capacity_is_shared_and_blocks(self):
+        """One capacity covers all priorities and send waits when full"""
+        send_stream, receive_stream = create_priority_stream(capacity=2)
+        
+        send_stream.send_nowait("a", 0)
+        send_stream.send_nowait("b", 5)
+        with pytest.raises(anyio.WouldBlock):
+            send_stream.send_nowait("c", 9)
+        
+        with anyio.move_on_after(0.05) as scope:
+            await send_stream.send("c", 9)
+        assert scope.cancelled_caught
+        
+        assert await receive_stream.receive() == "b"
+        await send_stream.send("c", 9)
+        assert await receive_stream.receive() == "c"
+        
+        await send_stream.aclose()
+        assert await receive_stream.receive() == "a"
+        with pytest.raises(anyio.EndOfStream):
+            await receive_stream.receive()
+    
+    async def test_blocked_senders_admitted_by_priority(self):
+        """A freed slot goes to the highest-priority blocked sender"""
+        send_stream, receive_stream = create_priority_stream(capacity=1, aging_interval=None)
+        send_stream.send_nowait("first", 0)
+        
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(send_stream.send, "bulk", 0)
+            await anyio.sleep(0.01)
+            tg.start_soon(send_stream.send, "control", 9)
+            await anyio.sleep(0.01)
+            
+            assert await receive_stream.receive() == "first"
+            assert await receive_stream.receive() == "control"
+            assert await receive_stream.receive() == "bulk"
+    
+    async def test_cancelled_send_is_not_enqueued(self):
+        """A send cancelled after its slot was granted does not leave its item behind"""
+        send_stream, receive_stream = create_priority_stream(capacity=1, aging_interval=None)
+        send_stream.send_nowait("first", 0)
+        
+        sender = asyncio.ensure_future(send_stream.send("retried", 0))
+        await anyio.sleep(0.01)
+        
+        # Free the slot, then cancel the sender before it resumes
+        assert receive_stream.receive_nowait() == "first"
+        sender.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sender
+        
+        assert receive_stream.statistics().current_buffer_used == 0
+        await send_stream.send("retried", 0)
+        assert receive_stream.receive_nowait() == "retried"
+        with pytest.raises(anyio.WouldBlock):
+            receive_stream.receive_nowait()
+    
+    async def test_aging_prevents_starvation(self):
+        """A waiting low-priority item eventually overtakes fresh high-priority ones"""
+        send_stream, receive_stream = create_priority_stream(capacity=10, aging_interval=0.01)
+        
+        await send_stream.send("bulk", 0)
+        await anyio.sleep(0.1)  # Waited ~10 levels
+        await send_stream.send("control", 5)
+        
+        assert await receive_stream.receive() == "bulk"
+        assert receive_stream.statistics().aged_promotions == 1
+    
+    async def test_framework_priority_channel(self):
+        """StreamFramework delivers by message priority and reports per-priority metrics"""
+        framework = StreamFramework()
+        send_id, recv_id = framework.create_priority_channel("out", "in", "producer", "consumer", capacity=20)
+        
+        for i in range(3):
+            await framework.send_message(send_id, {"n": i}, priority=0)
+        await framework.send_message(send_id, {"control": "stop"}, priority=10)
+        
+        first = await framework.receive_message(recv_id)
+        assert first.payload == {"control": "stop"}
+        assert first.metadata.priority == 10
+        
+        rest = await framework.receive_many(recv_id, max_items=10, max_wait=0.5)
+        assert [m.payload["n"] for m in rest] == [0, 1, 2]
+        
+        queue_metrics = framework.get_endpoint_metrics(recv_id)["priority_queue"]
+        assert queue_metrics["depth"] == 0
+        assert queue_metrics["priorities"][10]["dequeued"] == 1
+        assert queue_metrics["priorities"][0]["dequeued"] == 3
+    
+    async def test_batches_do_not_mix_priorities(self):
+        """A flushed buffer goes out as one frame per priority, each at its own priority"""
+        framework = StreamFramework()
+        send_id, recv_id = framework.create_priority_channel("out", "in", "producer", "consumer", capacity=20)
+        framework.configure_batching(send_id, max_batch_size=4, linger_time=1.0)
+        
+        for i in range(3):
+            await framework.send_message(send_id, {"n": i}, priority=0)
+        await framework.send_message(send_id, {"control": "stop"}, priority=10)
+        
+        queue_metrics = framework.get_endpoint_metrics(recv_id)["priority_queue"]
+        assert queue_metrics["priorities"][10]["enqueued"] == 1
+        assert queue_metrics["priorities"][0]["enqueued"] == 1
+        
+        first = await framework.receive_message(recv_id)
+        assert first.payload == {"control": "stop"}
+        rest = await framework.receive_many(recv_id, max_items=10, max_wait=0.5)
+        assert [m.payload["n"] for m in rest] == [0, 1, 2]
+
+
 class TestIntegration:
     """Integration tests combining protocol and framework"""
     
@@ -523,6 +822,12 @@ def run_sync_tests():
         protocol_tests.test_protocol_statistics()
         print("✓ Protocol statistics test passed")
         
+        frame_tests = TestBinaryFrames()
+        frame_tests.test_binary_round_trip_fuzz()
+        frame_tests.test_codec_is_read_from_header()
+        frame_tests.test_formats_interoperate_and_reject_garbage()
+        print("✓ Binary frame tests passed")
+        
         print("✓ All MessageProtocol sync tests passed")
         return True
         
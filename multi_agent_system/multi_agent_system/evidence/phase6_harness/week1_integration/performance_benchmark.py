@@ -17,10 +17,13 @@ Benchmark Categories:
 """
 
 import asyncio
+import anyio
 import time
 import logging
 import statistics
 import gc
+import hashlib
+import uuid
 import psutil
 import os
 from typing import Dict, List, Any, Optional
@@ -32,8 +35,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 from evidence.phase2_component_library.day1_core_component_classes.enhanced_base import ComponentConfiguration
 from evidence.phase6_harness.day1_harness_component.harness_component import HarnessComponent
 from evidence.phase6_harness.day1_harness_component.component_status import ComponentState
+from evidence.phase6_harness.day1_harness_component.message_ids import next_message_id, now_ns
 from evidence.phase6_harness.day2_execution_harness.stream_manager import StreamManager
-from evidence.phase6_harness.day3_stream_communication.message_protocol import MessageProtocol, MessageType
+from evidence.phase6_harness.day2_execution_harness.system_execution_harness import (
+    SystemExecutionHarness, HarnessConfiguration, ExecutionMode, PlacementPolicy
+)
+from evidence.phase6_harness.day3_stream_communication.message_protocol import (
+    MessageProtocol, MessageType, WireFormat, CompressionType
+)
+from evidence.phase6_harness.day3_stream_communication.stream_framework import StreamFramework
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -165,6 +175,27 @@ class LatencyTestComponent(HarnessComponent):
         await asyncio.sleep(0.001)
 
 
+class IdleSinkComponent(HarnessComponent):
+    """Receive-only component used to measure idle overhead"""
+    
+    def __init__(self, name: str):
+        config = ComponentConfiguration(
+            name=name,
+            component_type="idle_sink",
+            service_type="benchmark",
+            base_type="sink"
+        )
+        super().__init__(config)
+        self.messages_received = 0
+        
+    async def process(self):
+        """Drain any pending input"""
+        for stream_name in self.receive_streams.keys():
+            message = await self.receive_message(stream_name, timeout=0.001)
+            if message is not None:
+                self.messages_received += 1
+
+
 async def benchmark_component_startup() -> BenchmarkResult:
     """Benchmark component startup performance"""
     logger.info("🚀 Starting Component Startup Benchmark")
@@ -378,10 +409,11 @@ async def benchmark_message_latency() -> BenchmarkResult:
             avg_latency = statistics.mean(latencies)
             min_latency = min(latencies)
             max_latency = max(latencies)
+            p50_latency = statistics.median(latencies)
             p95_latency = statistics.quantiles(latencies, n=20)[18]  # 95th percentile
             p99_latency = statistics.quantiles(latencies, n=100)[98]  # 99th percentile
         else:
-            avg_latency = min_latency = max_latency = p95_latency = p99_latency = 0
+            avg_latency = min_latency = max_latency = p50_latency = p95_latency = p99_latency = 0
         
         # Cleanup
         await sender.cleanup()
@@ -401,6 +433,7 @@ async def benchmark_message_latency() -> BenchmarkResult:
                 "avg_latency_ms": avg_latency,
                 "min_latency_ms": min_latency,
                 "max_latency_ms": max_latency,
+                "p50_latency_ms": p50_latency,
                 "p95_latency_ms": p95_latency,
                 "p99_latency_ms": p99_latency,
                 "latency_requirement_met": avg_latency < 10  # < 10ms requirement
@@ -422,6 +455,415 @@ async def benchmark_message_latency() -> BenchmarkResult:
         )
 
 
+async def benchmark_idle_cpu() -> BenchmarkResult:
+    """Benchmark CPU consumed by idle components waiting for input"""
+    logger.info("💤 Starting Idle CPU Benchmark")
+    start_time = time.time()
+    
+    try:
+        stream_manager = StreamManager(default_buffer_size=10)
+        component_count = 200
+        idle_duration = 3.0
+        
+        components = []
+        send_streams = []
+        for i in range(component_count):
+            comp = IdleSinkComponent(f"idle_{i}")
+            await comp.setup()
+            send_stream, receive_stream = stream_manager.create_stream(
+                source_component="benchmark",
+                target_component=comp.name
+            )
+            comp.add_receive_stream("input", receive_stream)
+            send_streams.append(send_stream)
+            components.append(comp)
+        
+        for comp in components:
+            await comp.start_processing()
+        
+        # Let the initial iterations settle, then measure CPU while idle
+        await asyncio.sleep(0.5)
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await asyncio.sleep(idle_duration)
+        cpu_used = time.process_time() - cpu_start
+        wall_elapsed = time.perf_counter() - wall_start
+        
+        idle_cpu_percent = cpu_used / wall_elapsed * 100
+        process_calls = sum(comp._status.metrics.total_messages_processed for comp in components)
+        
+        for comp in components:
+            await comp.stop_processing()
+            await comp.cleanup()
+        await stream_manager.close_all_streams()
+        
+        return BenchmarkResult(
+            benchmark_name="Idle CPU Usage",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements={
+                "idle_components": component_count,
+                "idle_duration_seconds": idle_duration,
+                "total_process_calls": process_calls
+            },
+            performance_metrics={
+                "idle_cpu_percent": idle_cpu_percent,
+                "cpu_seconds_used": cpu_used,
+                "idle_cpu_requirement_met": idle_cpu_percent < 5.0  # < 5% of one core
+            },
+            resource_usage={}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Idle CPU benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Idle CPU Usage",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
+async def _measure_transfer(message_count: int, batch_size: int) -> float:
+    """Move message_count messages between two components, returning messages/second"""
+    stream_manager = StreamManager(default_buffer_size=1000)
+    producer = IdleSinkComponent("transfer_producer")
+    consumer = IdleSinkComponent("transfer_consumer")
+    send_stream, receive_stream = stream_manager.create_stream(
+        source_component=producer.name,
+        target_component=consumer.name
+    )
+    producer.add_send_stream("output", send_stream)
+    consumer.add_receive_stream("input", receive_stream)
+    
+    async def produce():
+        if batch_size == 1:
+            for i in range(message_count):
+                await producer.send_message("output", {"id": i})
+        else:
+            for offset in range(0, message_count, batch_size):
+                chunk = [{"id": i} for i in range(offset, min(offset + batch_size, message_count))]
+                await producer.send_many("output", chunk)
+    
+    async def consume():
+        received = 0
+        while received < message_count:
+            if batch_size == 1:
+                if await consumer.receive_message("input", timeout=5.0) is not None:
+                    received += 1
+            else:
+                received += len(await consumer.receive_many("input", max_items=batch_size, max_wait=5.0))
+    
+    transfer_start = time.perf_counter()
+    await asyncio.gather(produce(), consume())
+    elapsed = time.perf_counter() - transfer_start
+    
+    await stream_manager.close_all_streams()
+    return message_count / elapsed
+
+
+async def benchmark_batched_throughput() -> BenchmarkResult:
+    """Benchmark send_many/receive_many against per-message send/receive"""
+    logger.info("📦 Starting Batched Throughput Benchmark")
+    start_time = time.time()
+    
+    try:
+        message_count = 20000
+        batch_sizes = [1, 16, 64, 256]
+        
+        throughput_by_batch = {}
+        for batch_size in batch_sizes:
+            throughput_by_batch[batch_size] = await _measure_transfer(message_count, batch_size)
+            logger.info(f"   batch={batch_size}: {throughput_by_batch[batch_size]:.0f} msg/s")
+        
+        baseline = throughput_by_batch[1]
+        best_batch = max(throughput_by_batch, key=throughput_by_batch.get)
+        speedup = throughput_by_batch[best_batch] / baseline
+        
+        return BenchmarkResult(
+            benchmark_name="Batched Message Throughput",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements={
+                "message_count": message_count,
+                "throughput_by_batch_size": throughput_by_batch
+            },
+            performance_metrics={
+                "unbatched_msgs_per_second": baseline,
+                "best_batched_msgs_per_second": throughput_by_batch[best_batch],
+                "best_batch_size": best_batch,
+                "batching_speedup": speedup,
+                "batching_speedup_requirement_met": speedup >= 2.0
+            },
+            resource_usage={}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Batched throughput benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Batched Message Throughput",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
+async def _measure_control_latency(framework: StreamFramework, send_id: str, recv_id: str,
+                                   duration: float) -> List[float]:
+    """Saturate a channel with bulk data and return control message latencies"""
+    control_latencies = []
+    stop_event = asyncio.Event()
+    
+    async def bulk_producer():
+        i = 0
+        while not stop_event.is_set():
+            await framework.send_message(send_id, {"bulk": i}, priority=0)
+            i += 1
+    
+    async def control_producer():
+        while not stop_event.is_set():
+            await asyncio.sleep(0.02)
+            await framework.send_message(send_id, {"control": time.perf_counter()}, priority=10)
+    
+    async def consumer():
+        while not stop_event.is_set():
+            message = await framework.receive_message(recv_id, timeout=1.0)
+            if message is None:
+                continue
+            if "control" in message.payload:
+                control_latencies.append(time.perf_counter() - message.payload["control"])
+            await asyncio.sleep(0.0005)  # Per-message work keeps the consumer the bottleneck
+    
+    tasks = [asyncio.create_task(coro()) for coro in (bulk_producer, control_producer, consumer)]
+    await asyncio.sleep(duration)
+    stop_event.set()
+    
+    # Drain so blocked producers can observe the stop flag
+    while any(not task.done() for task in tasks[:2]):
+        await framework.receive_many(recv_id, max_items=1000, max_wait=0.01)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return control_latencies
+
+
+async def benchmark_priority_latency() -> BenchmarkResult:
+    """Benchmark control message latency on a saturated channel, FIFO vs priority"""
+    logger.info("🚦 Starting Mixed-Load Priority Benchmark")
+    start_time = time.time()
+    
+    try:
+        capacity = 100
+        duration = 2.0
+        framework = StreamFramework(enable_metrics=False)
+        
+        # FIFO baseline: plain memory object stream with the same capacity
+        fifo_send, fifo_recv = anyio.create_memory_object_stream(capacity)
+        framework.register_endpoint("fifo_out", "bulk_producer", fifo_send)
+        framework.register_endpoint("fifo_in", "consumer", fifo_recv)
+        fifo_latencies = await _measure_control_latency(framework, "fifo_out", "fifo_in", duration)
+        
+        framework.create_priority_channel("prio_out", "prio_in", "bulk_producer", "consumer", capacity=capacity)
+        priority_latencies = await _measure_control_latency(framework, "prio_out", "prio_in", duration)
+        
+        def p99_ms(latencies: List[float]) -> float:
+            ordered = sorted(latencies)
+            return ordered[int(len(ordered) * 0.99)] * 1000 if ordered else 0.0
+        
+        fifo_p99 = p99_ms(fifo_latencies)
+        priority_p99 = p99_ms(priority_latencies)
+        queue_metrics = framework.get_endpoint_metrics("prio_in")["priority_queue"]
+        
+        return BenchmarkResult(
+            benchmark_name="Mixed-Load Priority Latency",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements={
+                "channel_capacity": capacity,
+                "duration_seconds": duration,
+                "fifo_control_messages": len(fifo_latencies),
+                "priority_control_messages": len(priority_latencies),
+                "priority_queue": queue_metrics["priorities"]
+            },
+            performance_metrics={
+                "fifo_control_p50_ms": statistics.median(fifo_latencies) * 1000 if fifo_latencies else 0.0,
+                "fifo_control_p99_ms": fifo_p99,
+                "priority_control_p50_ms": statistics.median(priority_latencies) * 1000 if priority_latencies else 0.0,
+                "priority_control_p99_ms": priority_p99,
+                "control_latency_requirement_met": priority_p99 < 10.0  # < 10ms under saturation
+            },
+            resource_usage={}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Priority latency benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Mixed-Load Priority Latency",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
+class CpuBoundSourceComponent(HarnessComponent):
+    """Emits work items round-robin across its output streams"""
+    
+    def __init__(self, name: str, item_count: int):
+        super().__init__(ComponentConfiguration(
+            name=name, component_type="cpu_source", service_type="data_source", base_type="source"))
+        self.item_count = item_count
+        self.sent = 0
+    
+    async def process(self):
+        if self.sent >= self.item_count:
+            await asyncio.sleep(0.05)
+            return
+        outputs = sorted(self.send_streams)
+        await self.send_message(outputs[self.sent % len(outputs)], {"seed": self.sent})
+        self.sent += 1
+
+
+class CpuBoundWorkerComponent(HarnessComponent):
+    """Runs a fixed amount of hashing per message, holding the GIL"""
+    
+    def __init__(self, name: str, rounds: int):
+        super().__init__(ComponentConfiguration(
+            name=name, component_type="cpu_worker", service_type="data_processor", base_type="transformer"))
+        self.rounds = rounds
+    
+    async def process(self):
+        message = await self.receive_message("input", timeout=0.1)
+        if message is None:
+            return
+        digest = str(message["seed"]).encode()
+        for _ in range(self.rounds):
+            digest = hashlib.sha256(digest).digest()
+        await self.send_message("output", {"seed": message["seed"], "digest": digest.hex()})
+
+
+class CountingSinkComponent(HarnessComponent):
+    """Counts received messages and reports the count through health checks"""
+    
+    def __init__(self, name: str):
+        super().__init__(ComponentConfiguration(
+            name=name, component_type="counting_sink", service_type="data_sink", base_type="sink"))
+        self.received = 0
+    
+    async def process(self):
+        for stream_name in list(self.receive_streams):
+            message = await self.receive_message(stream_name, timeout=0.01)
+            if message is not None:
+                self.received += 1
+    
+    async def health_check(self) -> Dict[str, Any]:
+        health = await super().health_check()
+        health["received"] = self.received
+        return health
+
+
+async def _measure_cpu_pipeline(mode: ExecutionMode, worker_count: int, item_count: int,
+                                rounds: int) -> float:
+    """Run source -> N hashing workers -> sink and return seconds until the sink has everything"""
+    harness = SystemExecutionHarness(HarnessConfiguration(
+        execution_mode=mode,
+        placement_policy=PlacementPolicy.PER_COMPONENT,
+        health_check_interval=0.05,
+        component_startup_delay=0.0,
+        log_level="WARNING"
+    ))
+    
+    harness.register_component("source", CpuBoundSourceComponent("source", item_count))
+    harness.register_component("sink", CountingSinkComponent("sink"))
+    for i in range(worker_count):
+        harness.register_component(f"worker_{i}", CpuBoundWorkerComponent(f"worker_{i}", rounds),
+                                   dependencies=["source"])
+        harness.connect(f"source.output_{i}", f"worker_{i}.input")
+        harness.connect(f"worker_{i}.output", f"sink.input_{i}")
+    
+    harness_task = asyncio.create_task(harness.run())
+    try:
+        # Time from the harness reaching RUNNING so worker spawn cost is excluded
+        while harness.start_time is None and not harness_task.done():
+            await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        while harness.component_health_status.get("sink", {}).get("received", 0) < item_count:
+            if harness_task.done():
+                raise RuntimeError("harness exited before the pipeline drained")
+            await asyncio.sleep(0.02)
+        return time.perf_counter() - started
+    finally:
+        await harness.stop()
+        await asyncio.wait_for(harness_task, timeout=30.0)
+
+
+async def benchmark_multi_process_pipeline() -> BenchmarkResult:
+    """Benchmark a CPU-bound pipeline in one process vs one worker process per component"""
+    logger.info("🧮 Starting Multi-Process Pipeline Benchmark")
+    start_time = time.time()
+    
+    try:
+        worker_count = 4
+        item_count = 200
+        rounds = 5000
+        cpu_count = os.cpu_count() or 1
+        
+        in_process_seconds = await _measure_cpu_pipeline(ExecutionMode.IN_PROCESS, worker_count, item_count, rounds)
+        multi_process_seconds = await _measure_cpu_pipeline(ExecutionMode.MULTI_PROCESS, worker_count, item_count, rounds)
+        speedup = in_process_seconds / multi_process_seconds
+        
+        notes = []
+        if cpu_count < 2:
+            notes.append(f"Only {cpu_count} CPU available; multi-process scaling cannot show here")
+        
+        return BenchmarkResult(
+            benchmark_name="Multi-Process CPU-Bound Pipeline",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements={
+                "cpu_count": cpu_count,
+                "worker_components": worker_count,
+                "item_count": item_count,
+                "hash_rounds_per_item": rounds
+            },
+            performance_metrics={
+                "in_process_items_per_second": item_count / in_process_seconds,
+                "multi_process_items_per_second": item_count / multi_process_seconds,
+                "multi_process_speedup": speedup,
+                # Only meaningful with spare cores for the workers
+                "multi_process_scaling_requirement_met": speedup >= 1.5 if cpu_count >= worker_count else True
+            },
+            resource_usage={},
+            notes=notes
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Multi-process pipeline benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Multi-Process CPU-Bound Pipeline",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
 async def benchmark_message_protocol() -> BenchmarkResult:
     """Benchmark message protocol serialization/deserialization performance"""
     logger.info("📦 Starting Message Protocol Benchmark")
@@ -501,6 +943,133 @@ async def benchmark_message_protocol() -> BenchmarkResult:
         )
 
 
+def _measure_round_trips(protocol: MessageProtocol, payload: Any, iterations: int) -> Dict[str, float]:
+    """Time create+serialize+deserialize round trips and return throughput and frame size"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        frame = protocol.serialize(protocol.create_message(payload))
+        protocol.deserialize(frame)
+    elapsed = time.perf_counter() - start
+    return {"round_trips_per_second": iterations / elapsed, "frame_bytes": len(frame)}
+
+
+async def benchmark_wire_formats() -> BenchmarkResult:
+    """Benchmark binary frames against the JSON wire format"""
+    logger.info("🧬 Starting Wire Format Benchmark")
+    start_time = time.time()
+    
+    try:
+        payloads = {
+            "small": {"seed": 42, "status": "ok"},
+            "medium": {"data": list(range(100)), "labels": {f"k{i}": f"v{i}" for i in range(20)}},
+            "large": {"rows": [{"id": i, "name": f"row_{i}", "score": i * 0.5} for i in range(500)]}
+        }
+        iterations = {"small": 5000, "medium": 2000, "large": 100}
+        
+        formats = {
+            "json_gzip": MessageProtocol(wire_format=WireFormat.JSON),
+            "binary_zlib1": MessageProtocol(compression=CompressionType.ZLIB, compression_level=1),
+            "binary_lzma": MessageProtocol(compression=CompressionType.LZMA)
+        }
+        
+        # Keep per-message logging out of the timed loops
+        logging.getLogger("MessageProtocol").setLevel(logging.WARNING)
+        
+        results = {}
+        for size, payload in payloads.items():
+            results[size] = {
+                name: _measure_round_trips(protocol, payload, iterations[size])
+                for name, protocol in formats.items()
+            }
+            for name, result in results[size].items():
+                logger.info(f"   {size}/{name}: {result['round_trips_per_second']:.0f} msg/s, {result['frame_bytes']} bytes")
+        
+        def speedup(size: str) -> float:
+            return (results[size]["binary_zlib1"]["round_trips_per_second"] /
+                    results[size]["json_gzip"]["round_trips_per_second"])
+        
+        return BenchmarkResult(
+            benchmark_name="Wire Format Throughput",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements=results,
+            performance_metrics={
+                "small_binary_speedup": speedup("small"),
+                "medium_binary_speedup": speedup("medium"),
+                "large_binary_speedup": speedup("large"),
+                "small_binary_frame_bytes": results["small"]["binary_zlib1"]["frame_bytes"],
+                "small_json_frame_bytes": results["small"]["json_gzip"]["frame_bytes"],
+                "binary_throughput_requirement_met": speedup("small") >= 1.5
+            },
+            resource_usage={}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Wire format benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Wire Format Throughput",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
+async def benchmark_message_creation() -> BenchmarkResult:
+    """Micro-benchmark per-message id/timestamp and create_message cost"""
+    logger.info("🆔 Starting Message Creation Benchmark")
+    start_time = time.time()
+    
+    try:
+        iterations = 200000
+        
+        def per_call_ns(func) -> float:
+            begin = time.perf_counter_ns()
+            for _ in range(iterations):
+                func()
+            return (time.perf_counter_ns() - begin) / iterations
+        
+        uuid_ns = per_call_ns(lambda: (str(uuid.uuid4()), time.time()))
+        generated_ns = per_call_ns(lambda: (next_message_id(), now_ns()))
+        
+        protocol = MessageProtocol()
+        payload = {"seed": 1}
+        create_ns = per_call_ns(lambda: protocol.create_message(payload))
+        
+        return BenchmarkResult(
+            benchmark_name="Message Creation Cost",
+            start_time=start_time,
+            end_time=time.time(),
+            success=True,
+            measurements={"iterations": iterations},
+            performance_metrics={
+                "uuid4_id_and_timestamp_ns": uuid_ns,
+                "generated_id_and_timestamp_ns": generated_ns,
+                "create_message_ns": create_ns,
+                "id_generation_speedup": uuid_ns / generated_ns,
+                "id_generation_requirement_met": generated_ns < uuid_ns / 2
+            },
+            resource_usage={}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Message creation benchmark failed: {e}")
+        return BenchmarkResult(
+            benchmark_name="Message Creation Cost",
+            start_time=start_time,
+            end_time=time.time(),
+            success=False,
+            measurements={},
+            performance_metrics={},
+            resource_usage={},
+            notes=[f"Error: {e}"]
+        )
+
+
 async def benchmark_resource_usage() -> BenchmarkResult:
     """Benchmark resource usage under load"""
     logger.info("🔧 Starting Resource Usage Benchmark")
@@ -612,7 +1181,13 @@ async def run_all_benchmarks():
         ("Component Startup", benchmark_component_startup),
         ("Message Throughput", benchmark_message_throughput),
         ("Message Latency", benchmark_message_latency),
+        ("Idle CPU", benchmark_idle_cpu),
+        ("Batched Throughput", benchmark_batched_throughput),
+        ("Priority Latency", benchmark_priority_latency),
+        ("Multi-Process Pipeline", benchmark_multi_process_pipeline),
         ("Message Protocol", benchmark_message_protocol),
+        ("Wire Formats", benchmark_wire_formats),
+        ("Message Creation", benchmark_message_creation),
         ("Resource Usage", benchmark_resource_usage)
     ]
     